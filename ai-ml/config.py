@@ -27,6 +27,13 @@ class DatabaseConfig(BaseSettings):
     url: str = Field(default="sqlite:///./superhack_ai.db", env="DATABASE_URL")
     postgres_url: Optional[str] = Field(default=None, env="POSTGRES_URL")
     echo: bool = Field(default=False, env="DATABASE_ECHO")
+    pool_size: int = Field(default=5, env="DATABASE_POOL_SIZE")
+    busy_timeout_ms: int = Field(default=5000, env="DATABASE_BUSY_TIMEOUT_MS")
+    cache_size_kb: int = Field(default=20000, env="DATABASE_CACHE_SIZE_KB")
+    write_batch_size: int = Field(default=1000, env="DATABASE_WRITE_BATCH_SIZE")
+    write_flush_interval_ms: int = Field(default=200, env="DATABASE_WRITE_FLUSH_INTERVAL_MS")
+    write_max_pending: int = Field(default=50000, env="DATABASE_WRITE_MAX_PENDING")
+    write_max_retries: int = Field(default=3, env="DATABASE_WRITE_MAX_RETRIES")
     
     class Config:
         env_file = ".env"
@@ -66,6 +73,8 @@ class SuperOpsAPIConfig(BaseSettings):
     timeout: int = Field(default=30, env="SUPEROPS_API_TIMEOUT")
     max_retries: int = Field(default=3, env="SUPEROPS_API_MAX_RETRIES")
     rate_limit_delay: float = Field(default=0.1, env="SUPEROPS_API_RATE_LIMIT_DELAY")
+    page_size: int = Field(default=500, env="SUPEROPS_API_PAGE_SIZE")
+    sync_state_path: str = Field(default=str(DATA_DIR / "superops_sync_state.json"), env="SUPEROPS_SYNC_STATE_PATH")
     
     class Config:
         env_file = ".env"
@@ -121,6 +130,10 @@ class ModelServerConfig(BaseSettings):
     port: int = Field(default=8000, env="MODEL_SERVER_PORT")
     workers: int = Field(default=4, env="MODEL_SERVER_WORKERS")
     reload: bool = Field(default=False, env="RELOAD")
+    rate_limit_backend: str = Field(default="memory", env="RATE_LIMIT_BACKEND")  # "memory" or "redis"
+    rate_limit_eviction_interval: int = Field(default=60, env="RATE_LIMIT_EVICTION_INTERVAL")  # seconds
+    rate_limit_redis_timeout_ms: int = Field(default=50, env="RATE_LIMIT_REDIS_TIMEOUT_MS")
+    rate_limit_redis_cooldown: int = Field(default=30, env="RATE_LIMIT_REDIS_COOLDOWN")  # seconds
     
     class Config:
         env_file = ".env"
@@ -185,7 +198,15 @@ class ModelConfig(BaseSettings):
     registry_path: str = Field(default=str(MODELS_DIR), env="MODEL_REGISTRY_PATH")
     cache_size: int = Field(default=10, env="MODEL_CACHE_SIZE")
     update_frequency: int = Field(default=24, env="MODEL_UPDATE_FREQUENCY")  # hours
-    
+    preload_on_startup: bool = Field(default=True, env="MODEL_PRELOAD_ON_STARTUP")
+    inference_only: bool = Field(default=True, env="MODEL_INFERENCE_ONLY")
+    load_retry_interval: int = Field(default=60, env="MODEL_LOAD_RETRY_INTERVAL")  # seconds
+    scheduler_enabled: bool = Field(default=True, env="SCHEDULER_ENABLED")
+    scheduler_max_workers: int = Field(default=2, env="SCHEDULER_MAX_WORKERS")
+    scheduler_model_concurrency: int = Field(default=1, env="SCHEDULER_MODEL_CONCURRENCY")
+    scheduler_resync_interval: int = Field(default=300, env="SCHEDULER_RESYNC_INTERVAL")  # seconds
+    scheduler_job_timeout: int = Field(default=3600, env="SCHEDULER_JOB_TIMEOUT")  # seconds
+
     class Config:
         env_file = ".env"
         extra = "ignore"  # Ignore extra fields from environment
@@ -196,6 +217,7 @@ class DataProcessingConfig(BaseSettings):
     batch_size: int = Field(default=1000, env="BATCH_SIZE")
     max_workers: int = Field(default=4, env="MAX_WORKERS")
     validation_enabled: bool = Field(default=True, env="DATA_VALIDATION_ENABLED")
+    columnar_cache_path: str = Field(default=str(DATA_DIR / "columnar_cache"), env="COLUMNAR_CACHE_PATH")
     
     class Config:
         env_file = ".env"
@@ -207,6 +229,11 @@ class MonitoringConfig(BaseSettings):
     prometheus_enabled: bool = Field(default=True, env="PROMETHEUS_ENABLED")
     prometheus_port: int = Field(default=9090, env="PROMETHEUS_PORT")
     health_check_interval: int = Field(default=30, env="HEALTH_CHECK_INTERVAL")  # seconds
+    drift_reference_size: int = Field(default=1000, env="DRIFT_REFERENCE_SIZE")
+    drift_window_size: int = Field(default=1000, env="DRIFT_WINDOW_SIZE")
+    drift_bins: int = Field(default=10, env="DRIFT_BINS")
+    drift_psi_threshold: float = Field(default=0.2, env="DRIFT_PSI_THRESHOLD")
+    drift_ks_threshold: float = Field(default=0.2, env="DRIFT_KS_THRESHOLD")
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,154 @@
+"""
+Benchmark for vectorized batch inference.
+Loads the persisted models through the serving pool and reports rows/sec
+for batch sizes 1, 100 and 10k, next to a per-row loop baseline.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.model_pool import ModelServingPool, ModelNotLoadedError
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("benchmark_batch_inference")
+
+DEFAULT_BATCH_SIZES = [1, 100, 10000]
+DEFAULT_MODELS = ["client_churn", "client_profitability", "revenue_leak_detector"]
+
+
+def make_records(feature_names, n_rows, seed=42):
+    """Generate synthetic client records over the model's feature columns."""
+    rng = np.random.default_rng(seed)
+    values = rng.gamma(2.0, 50.0, size=(n_rows, len(feature_names)))
+    return [
+        {"client_id": f"client_{i}", **dict(zip(feature_names, row))}
+        for i, row in enumerate(values.tolist())
+    ]
+
+
+def make_profitability_records(n_rows, seed=42):
+    """Generate raw client financials in the shape the feature engineer expects."""
+    rng = np.random.default_rng(seed)
+    contract_types = ["monthly", "quarterly", "annual", "biennial"]
+    industries = ["Finance", "Healthcare", "Retail", "Technology", "Manufacturing"]
+    records = []
+    for i in range(n_rows):
+        total_revenue = float(rng.uniform(5000, 150000))
+        total_costs = float(total_revenue * rng.uniform(0.4, 1.1))
+        profit = total_revenue - total_costs
+        records.append({
+            "client_id": f"client_{i}",
+            "contract_value": float(rng.uniform(10000, 200000)),
+            "total_revenue": total_revenue,
+            "total_costs": total_costs,
+            "profit": profit,
+            "profit_margin": profit / total_revenue,
+            "service_count": int(rng.integers(1, 12)),
+            "total_quantity": int(rng.integers(1, 100)),
+            "start_date": "2024-01-01",
+            "end_date": "2026-12-31",
+            "contract_type": contract_types[i % len(contract_types)],
+            "industry": industries[i % len(industries)],
+            "is_active": bool(i % 7),
+        })
+    return records
+
+
+def feature_names_for(model_name, engine):
+    """Feature columns the fitted model expects."""
+    if model_name == "client_churn":
+        return engine.get_model_feature_names()
+    if model_name == "revenue_leak_detector":
+        return engine.anomaly_models["ensemble"].feature_names or []
+    raise KeyError(model_name)
+
+
+async def score_batch(model_name, engine, records):
+    """One vectorized call for the whole batch."""
+    if model_name == "client_churn":
+        return engine.predict_records(records)
+    if model_name == "client_profitability":
+        return await engine.batch_predict(records)
+    if model_name == "revenue_leak_detector":
+        return engine.score_records(records)
+    raise KeyError(model_name)
+
+
+async def time_call(coro_factory, repeats):
+    """Best wall time (seconds) over several repeats."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await coro_factory()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def benchmark(models, batch_sizes, repeats, loop_rows):
+    pool = ModelServingPool()
+    results = []
+
+    for model_name in models:
+        try:
+            engine = await pool.get_engine(model_name)
+        except ModelNotLoadedError as e:
+            print(f"{model_name}: skipped ({e})")
+            continue
+
+        if model_name == "client_profitability":
+            records = make_profitability_records(max(batch_sizes))
+        else:
+            records = make_records(feature_names_for(model_name, engine), max(batch_sizes))
+
+        # Warm-up so lazy graph building is not counted
+        await score_batch(model_name, engine, records[:2])
+
+        for batch_size in batch_sizes:
+            batch = records[:batch_size]
+            elapsed = await time_call(lambda: score_batch(model_name, engine, batch), repeats)
+            results.append((model_name, "batch", batch_size, batch_size / elapsed))
+
+        # Per-row baseline: the old behaviour of one model call per client
+        rows = records[:loop_rows]
+
+        async def per_row():
+            for record in rows:
+                await score_batch(model_name, engine, [record])
+
+        elapsed = await time_call(per_row, 1)
+        results.append((model_name, "per-row loop", loop_rows, loop_rows / elapsed))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized batch inference")
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=DEFAULT_BATCH_SIZES)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--loop-rows", type=int, default=100,
+                        help="Rows scored one at a time for the per-row baseline")
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args.models, args.batch_sizes, args.repeats, args.loop_rows))
+
+    print(f"{'model':<24}{'mode':<16}{'rows':>8}{'rows/sec':>14}")
+    for model_name, mode, rows, rows_per_sec in results:
+        print(f"{model_name:<24}{mode:<16}{rows:>8}{rows_per_sec:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark for prediction logging.
+Compares one INSERT + commit per prediction against the buffered bulk writer
+and reports rows/sec and the latency added to the caller.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.database import DatabaseManager, close_connection_pools
+from src.utils.bulk_writer import BufferedBulkWriter
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("benchmark_bulk_writer")
+
+
+def make_predictions(n_rows):
+    return [
+        {"model_name": "client_churn", "prediction": (i % 100) / 100, "client_id": f"client_{i}",
+         "confidence": 0.85, "features": "{}"}
+        for i in range(n_rows)
+    ]
+
+
+def bench_single_row(db_path, predictions):
+    manager = DatabaseManager(db_path)
+    manager.initialize_tables()
+    start = time.perf_counter()
+    for i, prediction in enumerate(predictions):
+        manager.save_historical_prediction({**prediction, "id": f"single_{i}"})
+    return time.perf_counter() - start
+
+
+async def bench_buffered(db_path, predictions, request_size):
+    writer = BufferedBulkWriter(db_path)
+    await writer.initialize()
+
+    start = time.perf_counter()
+    enqueue_time = 0.0
+    for offset in range(0, len(predictions), request_size):
+        enqueue_start = time.perf_counter()
+        await writer.log_predictions(predictions[offset:offset + request_size])
+        enqueue_time += time.perf_counter() - enqueue_start
+    await writer.cleanup()
+    total = time.perf_counter() - start
+
+    requests = -(-len(predictions) // request_size)
+    return total, enqueue_time / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark buffered prediction logging")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--single-rows", type=int, default=2000,
+                        help="Rows written one commit at a time for the baseline")
+    parser.add_argument("--request-size", type=int, default=100,
+                        help="Predictions logged per simulated request")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        single_elapsed = bench_single_row(str(Path(tmp_dir) / "single.db"), make_predictions(args.single_rows))
+        buffered_elapsed, per_request = asyncio.run(
+            bench_buffered(str(Path(tmp_dir) / "buffered.db"), make_predictions(args.rows), args.request_size)
+        )
+        close_connection_pools()
+
+    print(f"{'mode':<22}{'rows':>10}{'rows/sec':>14}")
+    print(f"{'single-row commit':<22}{args.single_rows:>10}{args.single_rows / single_elapsed:>14,.0f}")
+    print(f"{'buffered bulk writer':<22}{args.rows:>10}{args.rows / buffered_elapsed:>14,.0f}")
+    print(f"added latency per request of {args.request_size} rows: {per_request * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark for client genome similarity search.
+Builds exact and IVF genome indexes over synthetic 50-dimensional genomes and
+reports top-k latency and IVF recall, next to the per-pair dictionary loop.
+"""
+
+import sys
+import time
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.preprocessing.client_genome.genome_index import create_genome_index
+from src.data.preprocessing.client_genome.similarity_calculator import SimilarityCalculator
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("benchmark_genome_index")
+
+
+def make_genomes(n_clients, n_segments=40, seed=42):
+    """Generate clustered genomes in [0, 1] so partitions resemble real client segments."""
+    rng = np.random.default_rng(seed)
+    centers = rng.random((n_segments, 50))
+    segments = rng.integers(0, n_segments, n_clients)
+    genomes = np.clip(centers[segments] + rng.normal(0, 0.08, (n_clients, 50)), 0, 1)
+    return {f"client_{i}": genome for i, genome in enumerate(genomes)}
+
+
+def per_pair_search(target, client_genomes, top_k, metric):
+    """The previous implementation: one similarity call per client."""
+    calculator = SimilarityCalculator()
+    scores = {
+        "cosine": calculator.calculate_cosine_similarity,
+        "euclidean": calculator.calculate_euclidean_similarity,
+        "manhattan": calculator.calculate_manhattan_similarity,
+    }[metric]
+    similarities = [(client_id, scores(target, genome)) for client_id, genome in client_genomes.items()]
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:top_k]
+
+
+def time_queries(search, queries):
+    """Median latency in milliseconds and the results for each query."""
+    timings, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark client genome similarity search")
+    parser.add_argument("--clients", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--metric", default="cosine", choices=["cosine", "euclidean", "manhattan"])
+    parser.add_argument("--loop-clients", type=int, default=5000,
+                        help="Clients scanned by the per-pair loop baseline")
+    args = parser.parse_args()
+
+    client_genomes = make_genomes(args.clients)
+    rng = np.random.default_rng(7)
+    query_ids = rng.choice(list(client_genomes), size=args.queries, replace=False)
+    queries = [client_genomes[client_id] for client_id in query_ids]
+
+    rows = []
+    exact_results = None
+    for index_type in ("exact", "ivf"):
+        index = create_genome_index(index_type)
+        start = time.perf_counter()
+        index.add(client_genomes)
+        # The IVF index trains its partitions on first use
+        index.search(queries[0], args.top_k, args.metric)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        latency_ms, results = time_queries(lambda q: index.search(q, args.top_k, args.metric), queries)
+        if exact_results is None:
+            exact_results = results
+            recall = 1.0
+        else:
+            recall = np.mean([
+                len({c for c, _ in approx} & {c for c, _ in exact}) / args.top_k
+                for approx, exact in zip(results, exact_results)
+            ])
+        rows.append((index_type, args.clients, build_ms, latency_ms, recall))
+
+    loop_genomes = dict(list(client_genomes.items())[:args.loop_clients])
+    latency_ms, _ = time_queries(lambda q: per_pair_search(q, loop_genomes, args.top_k, args.metric), queries[:5])
+    rows.append(("per-pair loop", args.loop_clients, 0.0, latency_ms, 1.0))
+
+    print(f"{'search':<16}{'clients':>10}{'build ms':>12}{'query ms':>12}{'recall@k':>10}")
+    for name, n_clients, build_ms, query_ms, recall in rows:
+        print(f"{name:<16}{n_clients:>10}{build_ms:>12.1f}{query_ms:>12.2f}{recall:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark for the API middleware stack.
+Drives a trivial route through the ASGI interface directly (no sockets) and reports
+the per-request middleware tax: the pure ASGI stack used by the model server, and
+five no-op BaseHTTPMiddleware layers for the structural cost the old stack paid.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import logging
+import statistics
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.middleware.auth import AuthMiddleware, API_KEYS
+from src.api.middleware.error_handler import ErrorHandlerMiddleware
+from src.api.middleware.logging import LoggingMiddleware
+from src.api.middleware.metrics import MetricsMiddleware
+from src.api.middleware.ratelimit import RateLimitMiddleware
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("benchmark_middleware")
+
+BENCHMARK_KEY = "benchmark_key"
+UNLIMITED = 10 ** 9
+
+
+class PassThroughMiddleware(BaseHTTPMiddleware):
+    """A BaseHTTPMiddleware layer that does nothing but call the next app."""
+
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def make_app(stack):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if stack == "asgi":
+        # Same order as src/api/main.py, with limits lifted so only the cost is measured
+        app.add_middleware(AuthMiddleware)
+        app.add_middleware(RateLimitMiddleware, requests_per_hour=UNLIMITED, ip_requests_per_minute=UNLIMITED)
+        app.add_middleware(LoggingMiddleware)
+        app.add_middleware(MetricsMiddleware)
+        app.add_middleware(ErrorHandlerMiddleware)
+    elif stack == "base_http":
+        for _ in range(5):
+            app.add_middleware(PassThroughMiddleware)
+    return app
+
+
+async def time_requests(app, n_requests):
+    """Per-request latencies in microseconds for GET /ping."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/ping", "raw_path": b"/ping", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"authorization", f"Bearer {BENCHMARK_KEY}".encode())],
+        "client": ("127.0.0.1", 50000), "server": ("localhost", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    statuses = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    timings = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        await app(dict(scope, state={}), receive, send)
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    if any(status != 200 for status in statuses):
+        raise RuntimeError(f"Unexpected statuses: {sorted(set(statuses))}")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the per-request middleware overhead")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--budget-us", type=float, default=150.0,
+                        help="Maximum median overhead of the ASGI stack over the bare route")
+    args = parser.parse_args()
+
+    API_KEYS[BENCHMARK_KEY] = {"name": "benchmark", "permissions": ["read"], "rate_limit": UNLIMITED}
+
+    async def run():
+        results = {}
+        for stack in ("bare", "asgi", "base_http"):
+            app = make_app(stack)
+            await time_requests(app, args.warmup)
+            results[stack] = await time_requests(app, args.requests)
+        return results
+
+    results = asyncio.run(run())
+    bare = statistics.median(results["bare"])
+
+    print(f"{'stack':<34}{'median us':>12}{'p95 us':>12}{'overhead us':>14}")
+    labels = {
+        "bare": "bare route",
+        "asgi": "pure ASGI stack (5 concerns)",
+        "base_http": "5x no-op BaseHTTPMiddleware",
+    }
+    for stack, timings in results.items():
+        median = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(f"{labels[stack]:<34}{median:>12.1f}{p95:>12.1f}{median - bare:>14.1f}")
+
+    overhead = statistics.median(results["asgi"]) - bare
+    within = overhead <= args.budget_us
+    print(f"\nASGI stack overhead {overhead:.1f}us "
+          f"({'within' if within else 'OVER'} budget of {args.budget_us:.0f}us)")
+    sys.exit(0 if within else 1)
+
+
+if __name__ == "__main__":
+    main()
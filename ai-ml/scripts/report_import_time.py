@@ -0,0 +1,74 @@
+"""
+Import-time report for the model server.
+Runs `python -X importtime -c "import src.api.main"` in a fresh interpreter, prints the
+slowest modules by cumulative import time, and fails if a heavy ML library is pulled in
+at import time or the total exceeds the budget.
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+# Libraries that must only load when a model is first used
+HEAVY_MODULES = (
+    "tensorflow", "keras", "xgboost", "shap", "statsmodels", "prophet",
+    "mlflow", "pandas",
+)
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_importtime(module):
+    """Import a module in a child interpreter and return (name, self_us, cumulative_us, depth) rows."""
+    pythonpath = os.pathsep.join(filter(None, [str(project_root), os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, PYTHONPATH=pythonpath)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.strip().splitlines()[-10:])
+        raise RuntimeError(f"Importing {module} failed:\n{tail}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report and check the model server's import time")
+    parser.add_argument("--module", default="src.api.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-s", type=float, default=1.0,
+                        help="Maximum total import time of the module")
+    args = parser.parse_args()
+
+    rows = run_importtime(args.module)
+    total_us = sum(self_us for _, self_us, _, _ in rows)
+
+    print(f"{'module':<60}{'self ms':>10}{'cumulative ms':>16}")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{name:<60}{self_us / 1000:>10.1f}{cumulative_us / 1000:>16.1f}")
+
+    heavy = sorted({name for name, _, _, _ in rows if name.split(".")[0] in HEAVY_MODULES})
+    within = total_us / 1e6 <= args.budget_s
+    print(f"\nTotal import time {total_us / 1e6:.2f}s "
+          f"({'within' if within else 'OVER'} budget of {args.budget_s:.2f}s)")
+    if heavy:
+        print(f"Heavy modules imported eagerly: {', '.join(heavy)}")
+    sys.exit(0 if within and not heavy else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 import sys
 import os
+import argparse
 from pathlib import Path
 
 project_root = Path(__file__).resolve().parent.parent
@@ -20,6 +21,11 @@ MODEL_DIR = project_root / "models" / "churn"
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Train churn prediction models")
+    parser.add_argument("--cpu-budget", type=int, default=-1,
+                        help="CPU cores for training the base models in parallel (-1 uses all)")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Churn Predictor Training Script")
     print("=" * 60)
@@ -72,7 +78,7 @@ def main():
     # 3. Initialize predictor and engineer features
     print("\n[3/5] Engineering features...")
     from src.models.churn_predictor.churn_predictor import ChurnPredictor
-    predictor = ChurnPredictor()
+    predictor = ChurnPredictor(n_jobs=args.cpu_budget)
 
     features = predictor.engineer_features(data)
     if features.empty:
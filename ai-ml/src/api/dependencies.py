@@ -3,15 +3,21 @@ API Dependencies
 Dependency injection for services and utilities
 """
 
+import asyncio
 import logging
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Optional
+
+from fastapi import HTTPException
 
 from src.utils.model_registry import ModelRegistry
 from src.utils.metrics_collector import MetricsCollector
 from src.utils.monitoring import MonitoringService
 from src.utils.admin import AdminService
 from src.utils.health_checker import HealthChecker
+from src.utils.model_pool import ModelServingPool, ModelNotLoadedError
+from src.utils.bulk_writer import BufferedBulkWriter
+from src.utils.scheduler import ScheduledRunExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +27,10 @@ _metrics_collector: Optional[MetricsCollector] = None
 _monitoring_service: Optional[MonitoringService] = None
 _admin_service: Optional[AdminService] = None
 _health_checker: Optional[HealthChecker] = None
+_model_pool: Optional[ModelServingPool] = None
+_bulk_writer: Optional[BufferedBulkWriter] = None
+_scheduler: Optional[ScheduledRunExecutor] = None
+_warmup_task: Optional[asyncio.Task] = None
 
 
 @lru_cache()
@@ -73,10 +83,71 @@ def get_health_checker() -> HealthChecker:
     return _health_checker
 
 
+@lru_cache()
+def get_model_pool() -> ModelServingPool:
+    """Get model serving pool instance"""
+    global _model_pool
+    if _model_pool is None:
+        _model_pool = ModelServingPool()
+        logger.info("Model serving pool initialized")
+    return _model_pool
+
+
+@lru_cache()
+def get_bulk_writer() -> BufferedBulkWriter:
+    """Get buffered bulk writer instance"""
+    global _bulk_writer
+    if _bulk_writer is None:
+        _bulk_writer = BufferedBulkWriter()
+        logger.info("Bulk writer initialized")
+    return _bulk_writer
+
+
+@lru_cache()
+def get_scheduler() -> ScheduledRunExecutor:
+    """Get scheduled run executor instance"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ScheduledRunExecutor(model_pool=get_model_pool())
+        logger.info("Scheduled run executor initialized")
+    return _scheduler
+
+
+async def get_serving_engine(model_name: str) -> Any:
+    """Get a warm engine from the serving pool, failing fast if it cannot be served"""
+    try:
+        return await get_model_pool().get_engine(model_name)
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def set_warmup_task(task: Optional[asyncio.Task]):
+    """Register the background task loading the registry and model pool"""
+    global _warmup_task
+    _warmup_task = task
+
+
+def is_warmed_up() -> bool:
+    """Whether background warm-up has finished (successfully or not)"""
+    return _warmup_task is None or _warmup_task.done()
+
+
+async def cancel_warmup():
+    """Stop a warm-up that is still running"""
+    global _warmup_task
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+    _warmup_task = None
+
+
 def cleanup_dependencies():
     """Cleanup all dependency instances"""
     global _model_registry, _metrics_collector
-    global _monitoring_service, _admin_service, _health_checker
+    global _monitoring_service, _admin_service, _health_checker, _model_pool, _bulk_writer, _scheduler
     
     if _model_registry:
         _model_registry.cleanup()
@@ -98,4 +169,13 @@ def cleanup_dependencies():
         _health_checker.cleanup()
         _health_checker = None
     
+    if _model_pool:
+        _model_pool = None
+    
+    if _bulk_writer:
+        _bulk_writer = None
+    
+    if _scheduler:
+        _scheduler = None
+    
     logger.info("All dependencies cleaned up")
@@ -3,6 +3,7 @@ FastAPI Main Application
 Model serving API with comprehensive monitoring and management
 """
 
+import asyncio
 import logging
 import sys
 import os
@@ -22,9 +23,11 @@ from src.api.middleware.logging import LoggingMiddleware
 from src.api.middleware.metrics import MetricsMiddleware
 from src.api.middleware.error_handler import ErrorHandlerMiddleware
 from src.api.middleware.auth import AuthMiddleware
-from src.api.middleware.ratelimit import RateLimitMiddleware
-from src.api.dependencies import get_model_registry, get_metrics_collector
+from src.api.middleware.ratelimit import RateLimitMiddleware, close_rate_limit_backend
+from src.api.dependencies import get_model_registry, get_metrics_collector, get_model_pool, get_bulk_writer, get_scheduler
+from src.api.dependencies import set_warmup_task, cancel_warmup
 from src.utils.logging_config import setup_logging
+from src.utils.database import close_connection_pools
 from config import settings
 
 # Set up logging
@@ -32,28 +35,61 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 
+async def warm_up_models(model_registry, model_pool):
+    """Load the model registry and warm the serving pool off the startup path"""
+    try:
+        await model_registry.initialize()
+    except Exception as e:
+        logger.error(f"Model registry unavailable, continuing without it: {e}")
+    
+    if settings.models.preload_on_startup:
+        try:
+            await model_pool.initialize()
+        except Exception as e:
+            logger.error(f"Model pool warm-up failed, models will load on first request: {e}")
+    
+    logger.info("Model warm-up completed")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
     # Startup
     logger.info("Starting SuperHack AI/ML Model Server...")
     
-    # Initialize model registry
-    model_registry = get_model_registry()
-    await model_registry.initialize()
-    
     # Initialize metrics collector
     metrics_collector = get_metrics_collector()
     await metrics_collector.initialize()
     
+    # Start the write-behind buffer for prediction and performance logging
+    bulk_writer = get_bulk_writer()
+    await bulk_writer.initialize()
+    
+    # Run due scheduled runs (retraining, batch jobs) in-process on a bounded pool
+    scheduler = get_scheduler()
+    if settings.models.scheduler_enabled:
+        await scheduler.initialize()
+    
+    # Initialize the model registry and warm the serving pool in the background so
+    # the server answers /api/health immediately; /api/health/ready waits for it
+    model_registry = get_model_registry()
+    model_pool = get_model_pool()
+    set_warmup_task(asyncio.create_task(warm_up_models(model_registry, model_pool)))
+    
     logger.info("Model server startup completed")
     
     yield
     
     # Shutdown
     logger.info("Shutting down SuperHack AI/ML Model Server...")
+    await cancel_warmup()
+    await scheduler.cleanup()
     await model_registry.cleanup()
     await metrics_collector.cleanup()
+    await model_pool.cleanup()
+    await bulk_writer.cleanup()
+    await close_rate_limit_backend()
+    close_connection_pools()
     logger.info("Model server shutdown completed")
 
 
@@ -7,8 +7,8 @@ import logging
 from typing import Optional, Dict, Any
 from fastapi import Request, HTTPException, Depends
 from fastapi.security import APIKeyHeader
-import hashlib
-import time
+
+from src.api.middleware.ratelimit import RateLimit, get_rate_limit_backend, hash_api_key
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +31,9 @@ API_KEYS = {
     }
 }
 
-# Simple in-memory rate limiting (in production, use Redis or similar)
-rate_limit_store: Dict[str, Dict[str, Any]] = {}
+
+# Skip authentication for health checks and docs
+AUTH_SKIP_PATHS = ("/api/health", "/docs", "/redoc", "/openapi.json")
 
 
 class AuthMiddleware:
@@ -45,10 +46,10 @@ class AuthMiddleware:
     async def __call__(self, scope, receive, send):
         # Handle HTTP requests
         if scope["type"] == "http":
-            request = Request(scope, receive)
-            
             # Check if authentication is required for this path
-            if self._requires_auth(request.url.path):
+            if self._requires_auth(scope["path"]):
+                request = Request(scope, receive)
+                
                 # Extract API key
                 api_key = await self._extract_api_key(request)
                 if not api_key:
@@ -66,7 +67,7 @@ class AuthMiddleware:
                     )
                 
                 # Check rate limits
-                if not self._check_rate_limit(api_key, user_info):
+                if not await self._check_rate_limit(api_key, user_info):
                     raise HTTPException(
                         status_code=429, 
                         detail="Rate limit exceeded"
@@ -79,12 +80,7 @@ class AuthMiddleware:
     
     def _requires_auth(self, path: str) -> bool:
         """Check if authentication is required for a path"""
-        # Skip authentication for health checks and docs
-        skip_paths = ["/api/health", "/docs", "/redoc", "/openapi.json"]
-        for skip_path in skip_paths:
-            if path.startswith(skip_path):
-                return False
-        return True
+        return not path.startswith(AUTH_SKIP_PATHS)
     
     async def _extract_api_key(self, request: Request) -> Optional[str]:
         """Extract API key from request"""
@@ -111,34 +107,11 @@ class AuthMiddleware:
                 return user_info
         return None
     
-    def _check_rate_limit(self, api_key: str, user_info: Dict[str, Any]) -> bool:
+    async def _check_rate_limit(self, api_key: str, user_info: Dict[str, Any]) -> bool:
         """Check rate limits for API key"""
-        current_time = int(time.time())
-        hour_ago = current_time - 3600  # 1 hour ago
-        
-        # Initialize rate limit store for this key if needed
-        if api_key not in rate_limit_store:
-            rate_limit_store[api_key] = {
-                "requests": [],
-                "limit": user_info.get("rate_limit", 100)
-            }
-        
-        # Clean old requests
-        rate_limit_store[api_key]["requests"] = [
-            req_time for req_time in rate_limit_store[api_key]["requests"]
-            if req_time > hour_ago
-        ]
-        
-        # Check if limit exceeded
-        current_requests = len(rate_limit_store[api_key]["requests"])
-        limit = rate_limit_store[api_key]["limit"]
-        
-        if current_requests >= limit:
-            return False
-        
-        # Add current request
-        rate_limit_store[api_key]["requests"].append(current_time)
-        return True
+        hourly = RateLimit(user_info.get("rate_limit", 100), 3600)
+        result = await get_rate_limit_backend().check(f"auth:{hash_api_key(api_key)}", (hourly,))
+        return result.allowed
 
 
 # Dependency for FastAPI routes
@@ -5,43 +5,60 @@ Global error handling and response formatting
 
 import logging
 import traceback
-from typing import Callable
-from fastapi import Request, Response, HTTPException
+from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger(__name__)
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
-    """Middleware for global error handling"""
-    
+class ErrorHandlerMiddleware:
+    """Pure ASGI middleware for global error handling"""
+
     def __init__(self, app, include_traceback: bool = False):
-        super().__init__(app)
+        self.app = app
         self.include_traceback = include_traceback
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
-            
+            await self.app(scope, receive, send_wrapper)
+
         except HTTPException as e:
+            # A response already on the wire cannot be replaced
+            if response_started:
+                raise
             # Handle FastAPI HTTP exceptions
-            return self._handle_http_exception(request, e)
-            
+            response = self._handle_http_exception(Request(scope), e)
+            await response(scope, receive, send)
+
         except Exception as e:
+            if response_started:
+                raise
             # Handle unexpected exceptions
-            return self._handle_unexpected_exception(request, e)
-    
+            response = self._handle_unexpected_exception(Request(scope), e)
+            await response(scope, receive, send)
+
     def _handle_http_exception(self, request: Request, exc: HTTPException) -> JSONResponse:
         """Handle HTTP exceptions"""
         correlation_id = getattr(request.state, "correlation_id", "unknown")
-        
+
         logger.warning(
             f"HTTP exception - {request.method} {request.url.path} - "
             f"Status: {exc.status_code} - Detail: {exc.detail} - "
             f"Correlation ID: {correlation_id}"
         )
-        
+
         # Include additional error details if available
         error_content = {
             "error": "HTTP Error",
@@ -51,27 +68,28 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             "path": request.url.path,
             "method": request.method
         }
-        
+
         # Add headers if available
         if hasattr(exc, 'headers') and exc.headers:
             error_content["headers"] = exc.headers
-        
+
         return JSONResponse(
             status_code=exc.status_code,
-            content=error_content
+            content=error_content,
+            headers=getattr(exc, 'headers', None)
         )
-    
+
     def _handle_unexpected_exception(self, request: Request, exc: Exception) -> JSONResponse:
         """Handle unexpected exceptions"""
         correlation_id = getattr(request.state, "correlation_id", "unknown")
-        
+
         # Log the full exception
         logger.error(
             f"Unexpected exception - {request.method} {request.url.path} - "
             f"Error: {str(exc)} - Correlation ID: {correlation_id}",
             exc_info=True
         )
-        
+
         # Prepare error response
         error_response = {
             "error": type(exc).__name__,
@@ -81,11 +99,11 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             "path": request.url.path,
             "method": request.method
         }
-        
+
         # Include traceback in development mode
         if self.include_traceback:
             error_response["traceback"] = traceback.format_exc()
-        
+
         # Add request details for debugging
         try:
             error_response["request_details"] = {
@@ -94,7 +112,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             }
         except Exception:
             pass  # Ignore if we can't serialize request details
-        
+
         return JSONResponse(
             status_code=500,
             content=error_response
@@ -6,96 +6,134 @@ Request/response logging and correlation ID management
 import logging
 import time
 import uuid
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for request/response logging"""
-    
+class LoggingMiddleware:
+    """Pure ASGI middleware for request/response logging"""
+
     def __init__(self, app, log_requests: bool = True, log_responses: bool = True):
-        super().__init__(app)
+        self.app = app
         self.log_requests = log_requests
         self.log_responses = log_responses
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Generate correlation ID
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Generate correlation ID (request.state reads scope["state"])
         correlation_id = str(uuid.uuid4())
-        request.state.correlation_id = correlation_id
-        
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
+
         # Log request
         if self.log_requests:
-            await self._log_request(request, correlation_id)
-        
+            receive = await self._log_request(scope, receive, correlation_id)
+
         # Process request
-        start_time = time.time()
+        start_time = time.perf_counter()
+        processing_time = 0.0
+        status_code = 500
+        content_length = "unknown"
+
+        async def send_wrapper(message):
+            nonlocal processing_time, status_code, content_length
+            if message["type"] == "http.response.start":
+                processing_time = time.perf_counter() - start_time
+                status_code = message["status"]
+
+                # Add correlation ID to response headers
+                headers = MutableHeaders(scope=message)
+                content_length = headers.get("content-length", "unknown")
+                headers["X-Correlation-ID"] = correlation_id
+            await send(message)
+
         try:
-            response = await call_next(request)
-            processing_time = time.time() - start_time
-            
-            # Log response
-            if self.log_responses:
-                await self._log_response(request, response, processing_time, correlation_id)
-            
-            # Add correlation ID to response headers
-            response.headers["X-Correlation-ID"] = correlation_id
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             logger.error(
-                f"Request failed - {request.method} {request.url.path} - "
+                f"Request failed - {scope['method']} {scope['path']} - "
                 f"Error: {str(e)} - Time: {processing_time:.3f}s - "
                 f"Correlation ID: {correlation_id}"
             )
             raise
-    
-    async def _log_request(self, request: Request, correlation_id: str):
-        """Log incoming request"""
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
-        
+
+        # Log response
+        if self.log_responses:
+            self._log_response(scope, status_code, content_length, processing_time, correlation_id)
+
+    async def _log_request(self, scope, receive, correlation_id: str):
+        """
+        Log incoming request
+
+        Returns:
+            The receive channel to pass on (replaying the body if it was read for logging)
+        """
+        method = scope["method"]
+        log_body = settings.debug and method in ["POST", "PUT", "PATCH"] and logger.isEnabledFor(logging.DEBUG)
+        if not logger.isEnabledFor(logging.INFO) and not log_body:
+            return receive
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        user_agent = Headers(scope=scope).get("user-agent", "unknown")
+
         # Get user info if available
-        user_info = getattr(request.state, "user", None)
+        user_info = scope.get("state", {}).get("user")
         user_name = user_info.get("name", "anonymous") if user_info else "anonymous"
-        
+
         # Log basic request info
         logger.info(
-            f"Request started - {request.method} {request.url.path} - "
+            f"Request started - {method} {scope['path']} - "
             f"Client IP: {client_ip} - User-Agent: {user_agent} - "
             f"User: {user_name} - Correlation ID: {correlation_id}"
         )
-        
+
         # Log request body for POST/PUT requests (in debug mode only)
-        if hasattr(settings, 'debug') and settings.debug and request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await request.body()
-                if body:
-                    logger.debug(f"Request body: {body.decode('utf-8')[:500]}...")
-            except Exception:
-                pass  # Ignore if we can't read the body
-    
-    async def _log_response(self, request: Request, response: Response, 
-                          processing_time: float, correlation_id: str):
+        if not log_body:
+            return receive
+
+        messages = []
+        try:
+            more_body = True
+            while more_body:
+                message = await receive()
+                messages.append(message)
+                more_body = message.get("type") == "http.request" and message.get("more_body", False)
+            body = b"".join(m.get("body", b"") for m in messages)
+            if body:
+                logger.debug(f"Request body: {body.decode('utf-8')[:500]}...")
+        except Exception:
+            pass  # Ignore if we can't read the body
+
+        async def replay():
+            # Hand the buffered body to the app, then fall through to the real channel
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        return replay
+
+    def _log_response(self, scope, status_code: int, content_length: str,
+                      processing_time: float, correlation_id: str):
         """Log outgoing response"""
-        status_code = response.status_code
-        content_length = response.headers.get("content-length", "unknown")
-        
         log_level = logging.INFO
         if status_code >= 400:
             log_level = logging.WARNING
         if status_code >= 500:
             log_level = logging.ERROR
-        
+
+        if not logger.isEnabledFor(log_level):
+            return
+
         logger.log(
             log_level,
-            f"Request completed - {request.method} {request.url.path} - "
+            f"Request completed - {scope['method']} {scope['path']} - "
             f"Status: {status_code} - Time: {processing_time:.3f}s - "
             f"Size: {content_length} - Correlation ID: {correlation_id}"
         )
@@ -3,156 +3,356 @@ Rate Limiting Middleware
 Request rate limiting and throttling
 """
 
+import hashlib
 import logging
+import math
 import time
-from typing import Dict, Any
-from collections import defaultdict
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence
+from fastapi import HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+
+from config import settings
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-# In-memory store for rate limiting (in production, use Redis)
-rate_limit_store: Dict[str, Dict[str, Any]] = defaultdict(dict)
 
+@dataclass(frozen=True)
+class RateLimit:
+    """At most `limit` requests per `period` seconds, allowing bursts up to `limit`"""
+    limit: int
+    period: float
+
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the sustained rate"""
+        return self.period / max(self.limit, 1)
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one rate limit check"""
+    allowed: bool
+    remaining: int
+    retry_after: float = 0.0
+
+
+class RateLimitBackend(ABC):
+    """Stores GCRA state: one theoretical arrival time (TAT) per key and limit"""
+
+    @abstractmethod
+    async def check(self, key: str, limits: Sequence[RateLimit]) -> RateLimitResult:
+        """Admit one request against every limit, consuming capacity only if all allow it"""
+
+    async def close(self):
+        """Release backend resources"""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process GCRA counters with periodic eviction of idle keys"""
+
+    def __init__(self, eviction_interval: float = 60.0, clock=time.monotonic):
+        """
+        Args:
+            eviction_interval: Seconds between sweeps for idle keys
+            clock: Monotonic time source
+        """
+        self.eviction_interval = eviction_interval
+        self.clock = clock
+        self._tats: Dict[str, List[float]] = {}
+        self._next_eviction = clock() + eviction_interval
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    async def check(self, key: str, limits: Sequence[RateLimit]) -> RateLimitResult:
+        return self.check_now(key, limits)
+
+    def check_now(self, key: str, limits: Sequence[RateLimit], now: Optional[float] = None) -> RateLimitResult:
+        """Synchronous check; O(number of limits) regardless of request volume"""
+        now = self.clock() if now is None else now
+        if now >= self._next_eviction:
+            self.evict_idle(now)
+
+        tats = self._tats.get(key)
+        if tats is None or len(tats) != len(limits):
+            tats = [now] * len(limits)
+
+        new_tats = []
+        remaining = None
+        retry_after = 0.0
+        for tat, limit in zip(tats, limits):
+            new_tat = max(tat, now) + limit.interval
+            # The request fits if the bucket would not overflow the burst allowance
+            wait = new_tat - limit.period - now
+            if wait > 1e-9:
+                retry_after = max(retry_after, wait)
+            left = int((limit.period - (new_tat - now)) / limit.interval + 1e-9)
+            remaining = left if remaining is None else min(remaining, left)
+            new_tats.append(new_tat)
+
+        if retry_after > 0:
+            return RateLimitResult(allowed=False, remaining=0, retry_after=retry_after)
+
+        self._tats[key] = new_tats
+        return RateLimitResult(allowed=True, remaining=max(remaining or 0, 0))
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Drop keys whose buckets have fully refilled
+
+        A key whose every TAT is in the past behaves exactly like an unseen key,
+        so eviction never changes a limiting decision.
+
+        Returns:
+            Number of keys evicted
+        """
+        now = self.clock() if now is None else now
+        idle = [key for key, tats in self._tats.items() if max(tats) <= now]
+        for key in idle:
+            del self._tats[key]
+        self._next_eviction = now + self.eviction_interval
+        if idle:
+            logger.debug(f"Evicted {len(idle)} idle rate limit keys")
+        return len(idle)
+
+
+# GCRA over several limits in one atomic step, timed by the Redis server clock so
+# every worker agrees; keys expire once their buckets have refilled
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + tonumber(t[2]) / 1000
+local n = tonumber(ARGV[1])
+local new_tats = {}
+local remaining = -1
+local retry_after = 0
+local max_tat = now
+for i = 1, n do
+  local interval = tonumber(ARGV[2 * i])
+  local period = tonumber(ARGV[2 * i + 1])
+  local tat = tonumber(redis.call('HGET', KEYS[1], i) or now)
+  if tat < now then tat = now end
+  local new_tat = tat + interval
+  local wait = new_tat - period - now
+  if wait > 1e-6 and wait > retry_after then retry_after = wait end
+  local left = math.floor((period - (new_tat - now)) / interval + 1e-9)
+  if remaining < 0 or left < remaining then remaining = left end
+  if new_tat > max_tat then max_tat = new_tat end
+  new_tats[i] = new_tat
+end
+if retry_after > 0 then
+  return {0, 0, tostring(retry_after)}
+end
+for i = 1, n do
+  redis.call('HSET', KEYS[1], i, tostring(new_tats[i]))
+end
+redis.call('PEXPIRE', KEYS[1], math.ceil(max_tat - now))
+return {1, math.max(remaining, 0), '0'}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """GCRA counters shared by every worker through Redis, behind a circuit breaker"""
+
+    def __init__(self, url: str, password: Optional[str] = None, prefix: str = "ratelimit:",
+                 fallback: Optional[RateLimitBackend] = None, timeout: float = 0.05,
+                 cooldown: float = 30.0, clock=time.monotonic):
+        """
+        Args:
+            url: Redis connection URL
+            password: Redis password
+            prefix: Key prefix for rate limit state
+            fallback: Backend used while Redis is unreachable (in-process by default)
+            timeout: Connect and read timeout in seconds, so a stalled Redis cannot stall requests
+            cooldown: Seconds to skip Redis after a failure before trying it again
+            clock: Monotonic time source
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis package is required for the Redis rate limit backend")
+        self.prefix = prefix
+        self._redis = aioredis.from_url(url, password=password, socket_timeout=timeout,
+                                        socket_connect_timeout=timeout)
+        self._script = self._redis.register_script(GCRA_SCRIPT)
+        self.fallback = fallback or InMemoryRateLimitBackend()
+        self.cooldown = cooldown
+        self.clock = clock
+        self._open_until = 0.0
+        self._degraded = False
+
+    async def check(self, key: str, limits: Sequence[RateLimit]) -> RateLimitResult:
+        # Circuit open: skip Redis entirely until the cooldown has passed
+        if self.clock() < self._open_until:
+            return await self.fallback.check(key, limits)
+
+        args: List[Any] = [len(limits)]
+        for limit in limits:
+            args += [limit.interval * 1000, limit.period * 1000]
+
+        try:
+            allowed, remaining, retry_after = await self._script(keys=[self.prefix + key], args=args)
+        except Exception as e:
+            # Degrade to per-worker limits rather than failing every request
+            self._open_until = self.clock() + self.cooldown
+            if not self._degraded:
+                logger.error(
+                    f"Redis rate limiting unavailable, using in-process limits for {self.cooldown:.0f}s: {e}"
+                )
+                self._degraded = True
+            return await self.fallback.check(key, limits)
+
+        if self._degraded:
+            logger.info("Redis rate limiting restored")
+            self._degraded = False
+        return RateLimitResult(allowed=bool(allowed), remaining=int(remaining),
+                               retry_after=float(retry_after) / 1000)
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def create_rate_limit_backend(backend: Optional[str] = None) -> RateLimitBackend:
+    """Create the rate limit backend selected in settings ("memory" or "redis")"""
+    backend = backend or settings.model_server.rate_limit_backend
+    if backend == "redis":
+        if REDIS_AVAILABLE:
+            return RedisRateLimitBackend(
+                settings.redis.url, settings.redis.password,
+                timeout=settings.model_server.rate_limit_redis_timeout_ms / 1000,
+                cooldown=settings.model_server.rate_limit_redis_cooldown
+            )
+        logger.warning("redis package not available, falling back to in-process rate limiting")
+    return InMemoryRateLimitBackend(settings.model_server.rate_limit_eviction_interval)
+
+
+_rate_limit_backend: Optional[RateLimitBackend] = None
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    """Get the process-wide rate limit backend"""
+    global _rate_limit_backend
+    if _rate_limit_backend is None:
+        _rate_limit_backend = create_rate_limit_backend()
+    return _rate_limit_backend
+
+
+async def close_rate_limit_backend():
+    """Close the process-wide rate limit backend"""
+    global _rate_limit_backend
+    if _rate_limit_backend is not None:
+        await _rate_limit_backend.close()
+        _rate_limit_backend = None
+
+
+def hash_api_key(api_key: str) -> str:
+    """Stable identifier for an API key, so raw keys never become store keys"""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:32]
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware for request rate limiting and throttling"""
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware for request rate limiting and throttling"""
-    
-    def __init__(self, app, 
+    def __init__(self, app,
                  requests_per_minute: int = 100,
                  requests_per_hour: int = 1000,
-                 ip_requests_per_minute: int = 100):
-        super().__init__(app)
+                 ip_requests_per_minute: int = 100,
+                 backend: Optional[RateLimitBackend] = None):
+        self.app = app
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
         self.ip_requests_per_minute = ip_requests_per_minute
-    
-    async def dispatch(self, request: Request, call_next):
-        client_ip = self._get_client_ip(request)
-        
+        self.backend = backend
+        self.ip_limits = (RateLimit(requests_per_hour, 3600), RateLimit(ip_requests_per_minute, 60))
+        self._limit_headers = {
+            "X-RateLimit-Limit-Minute": str(requests_per_minute),
+            "X-RateLimit-Limit-Hour": str(requests_per_hour),
+            "X-RateLimit-IP-Limit-Minute": str(ip_requests_per_minute),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client_ip = self._get_client_ip(scope, headers)
+
         # Check IP-based rate limits
-        if not self._check_ip_rate_limit(client_ip):
+        result = await self._check_ip_rate_limit(client_ip)
+        if not result.allowed:
             raise HTTPException(
                 status_code=429,
-                detail="Too many requests from this IP address"
+                detail="Too many requests from this IP address",
+                headers={"Retry-After": str(math.ceil(result.retry_after))}
             )
-        
+
         # Check API key-based rate limits (if authenticated)
-        if hasattr(request.state, 'user') and request.state.user:
-            api_key = request.headers.get("Authorization", "")
+        user = scope.get("state", {}).get("user")
+        if user:
+            api_key = headers.get("Authorization", "")
             if api_key.startswith("Bearer "):
                 api_key = api_key[7:]
-            
-            if not self._check_api_key_rate_limit(api_key, request.state.user):
+
+            key_result = await self._check_api_key_rate_limit(api_key, user)
+            if not key_result.allowed:
                 raise HTTPException(
                     status_code=429,
-                    detail="Rate limit exceeded for your API key"
+                    detail="Rate limit exceeded for your API key",
+                    headers={"Retry-After": str(math.ceil(key_result.retry_after))}
                 )
-        
+            result = key_result
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # Add rate limit headers to response
+                response_headers = MutableHeaders(scope=message)
+                response_headers.update(self._limit_headers)
+                response_headers["X-RateLimit-Remaining"] = str(result.remaining)
+            await send(message)
+
         # Process request
-        response = await call_next(request)
-        
-        # Add rate limit headers to response
-        response.headers["X-RateLimit-Limit-Minute"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Limit-Hour"] = str(self.requests_per_hour)
-        response.headers["X-RateLimit-IP-Limit-Minute"] = str(self.ip_requests_per_minute)
-        
-        return response
-    
-    def _get_client_ip(self, request: Request) -> str:
+        await self.app(scope, receive, send_wrapper)
+
+    def _get_client_ip(self, scope, headers: Headers) -> str:
         """Get client IP address"""
         # Check for forwarded IP (from load balancer/proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
+        forwarded_for = headers.get("X-Forwarded-For")
         if forwarded_for:
             return forwarded_for.split(",")[0].strip()
-        
+
         # Check for real IP
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get("X-Real-IP")
         if real_ip:
             return real_ip
-        
+
         # Fallback to client host
-        if request.client:
-            return request.client.host
-        
+        client = scope.get("client")
+        if client:
+            return client[0]
+
         return "unknown"
-    
-    def _check_ip_rate_limit(self, ip: str) -> bool:
+
+    def _get_backend(self) -> RateLimitBackend:
+        if self.backend is None:
+            self.backend = get_rate_limit_backend()
+        return self.backend
+
+    async def _check_ip_rate_limit(self, ip: str) -> RateLimitResult:
         """Check rate limits for IP address"""
-        current_time = int(time.time())
-        minute_ago = current_time - 60
-        hour_ago = current_time - 3600
-        
-        # Initialize store for this IP if needed
-        if ip not in rate_limit_store:
-            rate_limit_store[ip] = {
-                "requests": [],
-                "minute_requests": []
-            }
-        
-        # Clean old requests
-        rate_limit_store[ip]["requests"] = [
-            req_time for req_time in rate_limit_store[ip]["requests"]
-            if req_time > hour_ago
-        ]
-        rate_limit_store[ip]["minute_requests"] = [
-            req_time for req_time in rate_limit_store[ip]["minute_requests"]
-            if req_time > minute_ago
-        ]
-        
-        # Check limits
-        total_requests = len(rate_limit_store[ip]["requests"])
-        minute_requests = len(rate_limit_store[ip]["minute_requests"])
-        
-        if total_requests >= self.requests_per_hour or minute_requests >= self.ip_requests_per_minute:
-            return False
-        
-        # Add current request
-        rate_limit_store[ip]["requests"].append(current_time)
-        rate_limit_store[ip]["minute_requests"].append(current_time)
-        
-        return True
-    
-    def _check_api_key_rate_limit(self, api_key: str, user_info: Dict[str, Any]) -> bool:
+        return await self._get_backend().check(f"ip:{ip}", self.ip_limits)
+
+    async def _check_api_key_rate_limit(self, api_key: str, user_info: Dict[str, Any]) -> RateLimitResult:
         """Check rate limits for API key"""
-        current_time = int(time.time())
-        minute_ago = current_time - 60
-        hour_ago = current_time - 3600
-        
-        # Use API key as identifier
-        key_id = f"api_key:{api_key}"
-        
-        # Initialize store for this key if needed
-        if key_id not in rate_limit_store:
-            rate_limit_store[key_id] = {
-                "requests": [],
-                "minute_requests": []
-            }
-        
-        # Clean old requests
-        rate_limit_store[key_id]["requests"] = [
-            req_time for req_time in rate_limit_store[key_id]["requests"]
-            if req_time > hour_ago
-        ]
-        rate_limit_store[key_id]["minute_requests"] = [
-            req_time for req_time in rate_limit_store[key_id]["minute_requests"]
-            if req_time > minute_ago
-        ]
-        
         # Get user-specific limits
         user_limit_hour = user_info.get("rate_limit", self.requests_per_hour)
-        user_limit_minute = min(user_limit_hour // 60, self.requests_per_minute)
-        
-        # Check limits
-        total_requests = len(rate_limit_store[key_id]["requests"])
-        minute_requests = len(rate_limit_store[key_id]["minute_requests"])
-        
-        if total_requests >= user_limit_hour or minute_requests >= user_limit_minute:
-            return False
-        
-        # Add current request
-        rate_limit_store[key_id]["requests"].append(current_time)
-        rate_limit_store[key_id]["minute_requests"].append(current_time)
-        
-        return True
\ No newline at end of file
+        user_limit_minute = max(1, min(user_limit_hour // 60, self.requests_per_minute))
+
+        limits = (RateLimit(user_limit_hour, 3600), RateLimit(user_limit_minute, 60))
+        return await self._get_backend().check(f"api_key:{hash_api_key(api_key)}", limits)
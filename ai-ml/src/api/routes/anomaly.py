@@ -6,7 +6,6 @@ Real-time anomaly detection and alerting endpoints
 import logging
 import time
 import numpy as np
-import pandas as pd
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -18,7 +17,7 @@ from ..models.schemas import (
     BatchPredictionRequest,
     BatchPredictionResponse
 )
-from ...models.anomaly_detector.anomaly_orchestrator import AnomalyDetectorOrchestrator
+from ..dependencies import get_serving_engine
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -37,8 +36,8 @@ async def detect_anomalies(
     and generates alerts when anomalies are detected.
     """
     try:
-        # Initialize anomaly detector orchestrator
-        anomaly_detector = AnomalyDetectorOrchestrator()
+        # Get shared anomaly detector orchestrator from the serving pool
+        anomaly_detector = await get_serving_engine("anomaly_detector")
         
         # Prepare data for anomaly detection
         detection_data = {
@@ -49,6 +48,7 @@ async def detect_anomalies(
         }
         
         # Run anomaly detection (sync method, takes pd.DataFrame)
+        import pandas as pd  # Loaded with the engine; kept out of router import time
         start_time = time.perf_counter()
         data_df = pd.DataFrame(request.data) if request.data else pd.DataFrame()
         result = anomaly_detector.detect_anomalies(data_df)
@@ -119,6 +119,8 @@ async def detect_anomalies(
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Anomaly detection failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to detect anomalies")
@@ -135,8 +137,8 @@ async def batch_detect_anomalies(
     This endpoint allows processing multiple anomaly detections in a single request.
     """
     try:
-        # Initialize anomaly detector orchestrator
-        anomaly_detector = AnomalyDetectorOrchestrator()
+        # Get shared anomaly detector orchestrator from the serving pool
+        anomaly_detector = await get_serving_engine("anomaly_detector")
         
         # Prepare data for batch detections
         if request.data:
@@ -145,6 +147,7 @@ async def batch_detect_anomalies(
             raise HTTPException(status_code=400, detail="Batch data is required")
         
         # Run anomaly detection on combined data
+        import pandas as pd  # Loaded with the engine; kept out of router import time
         start_time = time.perf_counter()
         data_df = pd.DataFrame(detection_data_list) if detection_data_list else pd.DataFrame()
         result = anomaly_detector.detect_anomalies(data_df)
@@ -225,7 +228,7 @@ async def get_anomaly_model_info(
     Get anomaly detection model information and capabilities
     """
     try:
-        anomaly_detector = AnomalyDetectorOrchestrator()
+        anomaly_detector = await get_serving_engine("anomaly_detector")
         model_info = {"model_name": model_name, "version": "1.0.0", "status": "initialized"}
         
         if not model_info:
@@ -248,11 +251,13 @@ async def get_anomaly_model_health(
     Get anomaly detection model health status
     """
     try:
-        anomaly_detector = AnomalyDetectorOrchestrator()
+        anomaly_detector = await get_serving_engine("anomaly_detector")
         health_status = {"model_name": model_name, "status": "healthy"}
         
         return health_status
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get anomaly model health: {e}")
         raise HTTPException(status_code=500, detail="Failed to get model health")
\ No newline at end of file
@@ -16,7 +16,7 @@ from ..models.schemas import (
     BatchPredictionRequest,
     BatchPredictionResponse
 )
-from ...models.budget_optimizer.budget_optimizer import BudgetOptimizer
+from ..dependencies import get_serving_engine
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -35,8 +35,8 @@ async def optimize_budget(
     to recommend optimal budget allocation with expected ROI improvements.
     """
     try:
-        # Initialize budget optimizer
-        budget_optimizer = BudgetOptimizer()
+        # Get shared budget optimizer from the serving pool
+        budget_optimizer = await get_serving_engine("budget_optimizer")
         
         # Prepare data for budget optimization
         optimization_data = {
@@ -79,6 +79,8 @@ async def optimize_budget(
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Budget optimization failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to optimize budget")
@@ -95,8 +97,8 @@ async def batch_optimize_budgets(
     This endpoint allows processing multiple budget optimizations in a single request.
     """
     try:
-        # Initialize budget optimizer
-        budget_optimizer = BudgetOptimizer()
+        # Get shared budget optimizer from the serving pool
+        budget_optimizer = await get_serving_engine("budget_optimizer")
         
         # Prepare data for batch optimizations
         if request.data:
@@ -165,7 +167,7 @@ async def get_budget_model_info(
     Get budget optimization model information and capabilities
     """
     try:
-        budget_optimizer = BudgetOptimizer()
+        budget_optimizer = await get_serving_engine("budget_optimizer")
         model_info = {"model_name": model_name, "version": "1.0.0", "status": "initialized"}
         
         if not model_info:
@@ -188,11 +190,13 @@ async def get_budget_model_health(
     Get budget optimization model health status
     """
     try:
-        budget_optimizer = BudgetOptimizer()
+        budget_optimizer = await get_serving_engine("budget_optimizer")
         health_status = {"model_name": model_name, "status": "healthy"}
         
         return health_status
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get budget model health: {e}")
         raise HTTPException(status_code=500, detail="Failed to get model health")
\ No newline at end of file
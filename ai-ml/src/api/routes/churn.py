@@ -5,7 +5,6 @@ Client churn prediction and prevention endpoints
 
 import logging
 import time
-import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -17,7 +16,8 @@ from ..models.schemas import (
     BatchPredictionRequest,
     BatchPredictionResponse
 )
-from ...models.churn_predictor.churn_predictor import ChurnPredictor
+from ..dependencies import get_serving_engine
+from ...utils.model_pool import run_blocking
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -36,25 +36,18 @@ async def predict_client_churn(
     The churn probability ranges from 0-1, where higher values indicate higher risk of churn.
     """
     try:
-        # Initialize churn predictor
-        churn_predictor = ChurnPredictor()
+        # Get shared churn predictor from the serving pool
+        churn_predictor = await get_serving_engine("client_churn")
         
-        # Compute date range from request timeframe
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=request.timeframe_days)
-        
-        # Run churn prediction pipeline
+        # Score the client with the already-fitted models (no training on the request path)
         start_time = time.perf_counter()
-        result = await churn_predictor.run_full_pipeline(start_date=start_date, end_date=end_date)
+        predictions = await run_blocking(
+            churn_predictor.predict_records, [{"client_id": request.client_id, **request.features}]
+        )
         
-        # Extract churn probability from pipeline results
         churn_probability = 0.5  # default fallback
-        if result and 'risk_scores' in result:
-            risk_scores = result['risk_scores']
-            if isinstance(risk_scores, pd.DataFrame) and not risk_scores.empty and 'churn_probability' in risk_scores.columns:
-                churn_probability = float(risk_scores['churn_probability'].mean())
-            elif isinstance(risk_scores, list) and risk_scores:
-                churn_probability = float(np.mean([r.get('churn_probability', 0.5) for r in risk_scores]))
+        if not predictions.empty and 'churn_probability' in predictions.columns:
+            churn_probability = float(predictions['churn_probability'].iloc[0])
         
         # Determine risk level
         if churn_probability >= 0.7:
@@ -94,6 +87,8 @@ async def predict_client_churn(
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Churn prediction failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to predict client churn")
@@ -110,8 +105,8 @@ async def batch_predict_churn(
     This endpoint allows processing multiple client predictions in a single request.
     """
     try:
-        # Initialize churn predictor
-        churn_predictor = ChurnPredictor()
+        # Get shared churn predictor from the serving pool
+        churn_predictor = await get_serving_engine("client_churn")
         
         # Prepare data for batch prediction
         if request.data:
@@ -119,25 +114,26 @@ async def batch_predict_churn(
         else:
             raise HTTPException(status_code=400, detail="Batch data is required")
         
-        # Run churn prediction pipeline
+        # Score all clients as one feature matrix with the already-fitted models
         start_time = time.perf_counter()
-        result = await churn_predictor.run_full_pipeline()
+        records = [
+            {"client_id": client_data.get("client_id"), **client_data["features"]}
+            if isinstance(client_data.get("features"), dict) else client_data
+            for client_data in clients_data
+        ]
+        predictions = await run_blocking(churn_predictor.predict_records, records)
+        
+        if not predictions.empty and 'churn_probability' in predictions.columns:
+            churn_probabilities = predictions['churn_probability'].astype(float).tolist()
+        else:
+            churn_probabilities = [0.5] * len(clients_data)  # default fallback
         
-        # Extract churn probability from pipeline (or use defaults for each client)
-        default_probability = 0.5
-        if result and 'risk_scores' in result:
-            risk_scores = result['risk_scores']
-            if isinstance(risk_scores, pd.DataFrame) and not risk_scores.empty and 'churn_probability' in risk_scores.columns:
-                default_probability = float(risk_scores['churn_probability'].mean())
-            elif isinstance(risk_scores, list) and risk_scores:
-                default_probability = float(np.mean([r.get('churn_probability', 0.5) for r in risk_scores]))
+        per_client_time_ms = (time.perf_counter() - start_time) * 1000 / len(churn_probabilities)
+        timestamp = datetime.now()
         
         # Convert to proper format
         formatted_predictions = []
-        for i, client_data in enumerate(clients_data):
-            # Per-client variation around the pipeline result
-            churn_probability = min(1.0, max(0.0, default_probability + 0.05 * (i % 5 - 2)))
-            
+        for i, churn_probability in enumerate(churn_probabilities):
             # Determine risk level
             if churn_probability >= 0.7:
                 risk_level = "high"
@@ -150,9 +146,9 @@ async def batch_predict_churn(
                 prediction=churn_probability,
                 model_name="client_churn",
                 model_version=model_version or "1.0.0",
-                prediction_id="churn_batch_" + str(i) + "_" + str(datetime.now().timestamp()),
-                timestamp=datetime.now(),
-                processing_time_ms=(time.perf_counter() - start_time) * 1000,
+                prediction_id="churn_batch_" + str(i) + "_" + str(timestamp.timestamp()),
+                timestamp=timestamp,
+                processing_time_ms=per_client_time_ms,
                 confidence=0.85,
                 churn_probability=churn_probability,
                 risk_level=risk_level,
@@ -186,7 +182,7 @@ async def get_churn_model_info(
     Get churn model information and capabilities
     """
     try:
-        churn_predictor = ChurnPredictor()
+        churn_predictor = await get_serving_engine("client_churn")
         model_info = {"model_name": model_name, "version": "1.0.0", "status": "initialized"}
         
         if not model_info:
@@ -209,11 +205,13 @@ async def get_churn_model_health(
     Get churn model health status
     """
     try:
-        churn_predictor = ChurnPredictor()
+        churn_predictor = await get_serving_engine("client_churn")
         health_status = {"model_name": model_name, "status": "healthy", "is_trained": churn_predictor.is_trained}
         
         return health_status
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get churn model health: {e}")
         raise HTTPException(status_code=500, detail="Failed to get model health")
\ No newline at end of file
@@ -16,7 +16,7 @@ from ..models.schemas import (
     BatchPredictionRequest,
     BatchPredictionResponse
 )
-from ...models.demand_forecaster.demand_forecaster import DemandForecaster
+from ..dependencies import get_serving_engine
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -35,8 +35,8 @@ async def forecast_demand(
     with confidence intervals and seasonal components.
     """
     try:
-        # Initialize demand forecaster
-        demand_forecaster = DemandForecaster()
+        # Get shared demand forecaster from the serving pool
+        demand_forecaster = await get_serving_engine("demand_forecaster")
         
         # Prepare data for demand forecasting
         forecasting_data = {
@@ -111,6 +111,8 @@ async def forecast_demand(
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Demand forecasting failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to forecast demand")
@@ -127,8 +129,8 @@ async def batch_forecast_demand(
     This endpoint allows processing multiple demand forecasts in a single request.
     """
     try:
-        # Initialize demand forecaster
-        demand_forecaster = DemandForecaster()
+        # Get shared demand forecaster from the serving pool
+        demand_forecaster = await get_serving_engine("demand_forecaster")
         
         # Prepare data for batch forecasts
         if request.data:
@@ -226,7 +228,7 @@ async def get_demand_model_info(
     Get demand forecasting model information and capabilities
     """
     try:
-        demand_forecaster = DemandForecaster()
+        demand_forecaster = await get_serving_engine("demand_forecaster")
         model_info = {"model_name": model_name, "version": "1.0.0", "status": "initialized"}
         
         if not model_info:
@@ -249,11 +251,13 @@ async def get_demand_model_health(
     Get demand forecasting model health status
     """
     try:
-        demand_forecaster = DemandForecaster()
+        demand_forecaster = await get_serving_engine("demand_forecaster")
         health_status = {"model_name": model_name, "status": "healthy"}
         
         return health_status
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get demand model health: {e}")
         raise HTTPException(status_code=500, detail="Failed to get model health")
\ No newline at end of file
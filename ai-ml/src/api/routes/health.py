@@ -10,6 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from ...utils.health_checker import HealthChecker
+from ..dependencies import is_warmed_up
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -64,6 +65,10 @@ async def detailed_health_check():
 async def readiness_check():
     """Kubernetes readiness probe"""
     try:
+        # Models are still loading in the background
+        if not is_warmed_up():
+            raise HTTPException(status_code=503, detail="Models warming up")
+        
         health_checker = HealthChecker()
         is_ready = await health_checker.is_ready()
         
@@ -72,6 +77,8 @@ async def readiness_check():
         else:
             raise HTTPException(status_code=503, detail="Service not ready")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Readiness check failed: {e}")
         raise HTTPException(status_code=503, detail="Service not ready")
@@ -14,6 +14,7 @@ from ..models.schemas import (
     PerformanceMetrics
 )
 from ...utils.database import DatabaseManager
+from ...utils.drift_monitor import get_drift_monitor
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -176,32 +177,50 @@ async def get_model_performance_report(
         )
 
 
+def _drift_recommendations(drift_analysis: Dict[str, Any]) -> List[str]:
+    """Turn a drift analysis into operator guidance"""
+    if drift_analysis["status"] == "no_data":
+        return ["No predictions logged for this model since startup"]
+    if drift_analysis["status"] == "collecting_reference":
+        return ["Collecting the reference distribution; drift scores are available once it is complete"]
+    
+    recommendations = []
+    if drift_analysis["data_drift_detected"]:
+        features = ", ".join(drift_analysis["drifted_features"][:5])
+        recommendations.append(f"Input distributions shifted for: {features}")
+        recommendations.append("Review upstream data quality and consider retraining")
+    if drift_analysis["concept_drift_detected"]:
+        recommendations.append("Prediction distribution shifted; validate model accuracy against recent outcomes")
+    if not recommendations:
+        recommendations = [
+            "Continue monitoring input data distributions",
+            "No significant drift detected in the current window"
+        ]
+    return recommendations
+
+
 @router.get("/drift/{model_name}", response_model=Dict[str, Any])
 async def get_drift_analysis(
     model_name: str,
-    days: int = Query(30, description="Number of days of history to analyze"),
+    days: int = Query(30, description="Number of days of saved drift reports to include"),
+    save_report: bool = Query(False, description="Persist this analysis to the drift report tables"),
     db: DatabaseManager = Depends(get_database_manager)
 ):
     """
     Get data drift analysis for a model
     
-    This endpoint provides analysis of data drift that might affect model performance.
+    This endpoint scores the current window of logged predictions against the
+    reference distribution (PSI, KS and Jensen-Shannon per feature) from streaming
+    sketches, so the cost does not grow with prediction history.
     """
     try:
-        # In a real implementation, this would analyze feature distributions over time
-        # and detect significant changes that might indicate data drift
-        drift_analysis = {
-            "model_name": model_name,
-            "analysis_period_days": days,
-            "data_drift_detected": False,
-            "concept_drift_detected": False,
-            "drift_score": 0.0,
-            "drifted_features": [],
-            "recommendations": [
-                "Continue monitoring input data distributions",
-                "No significant drift detected in the analyzed period"
-            ]
-        }
+        drift_analysis = get_drift_monitor().get_drift(model_name)
+        drift_analysis["analysis_period_days"] = days
+        drift_analysis["recommendations"] = _drift_recommendations(drift_analysis)
+        
+        if save_report and drift_analysis["status"] == "analyzed":
+            drift_analysis["report_id"] = db.save_drift_report(drift_analysis)
+        drift_analysis["recent_reports"] = db.get_drift_reports(model_name, days)
         
         logger.info(f"Performed drift analysis for model {model_name}")
         return drift_analysis
@@ -211,4 +230,30 @@ async def get_drift_analysis(
         raise HTTPException(
             status_code=500,
             detail="Failed to perform drift analysis"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/drift/{model_name}/reference", response_model=Dict[str, Any])
+async def reset_drift_reference(model_name: str):
+    """
+    Reset the drift reference for a model
+    
+    This endpoint promotes the current window to the reference distribution,
+    e.g. after the model was retrained on recent data.
+    """
+    try:
+        reset_count = get_drift_monitor().reset_reference(model_name)
+        
+        logger.info(f"Reset drift reference for model {model_name} ({reset_count} sketches)")
+        return {
+            "model_name": model_name,
+            "sketches_reset": reset_count,
+            "message": "Drift reference reset successfully" if reset_count else "No current window to promote"
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to reset drift reference for {model_name}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to reset drift reference"
+        )
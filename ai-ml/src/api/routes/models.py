@@ -9,7 +9,7 @@ from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from pydantic import BaseModel, Field
 
-from ..dependencies import get_model_registry
+from ..dependencies import get_model_registry, get_model_pool
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -74,6 +74,18 @@ async def list_models(
         raise HTTPException(status_code=500, detail="Failed to list models")
 
 
+@router.get("/serving/stats", response_model=Dict[str, Any])
+async def get_serving_stats():
+    """Get load time and resident memory of the warm model serving pool"""
+    try:
+        model_pool = get_model_pool()
+        return model_pool.get_stats()
+
+    except Exception as e:
+        logger.error(f"Failed to get serving stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get serving stats")
+
+
 @router.get("/{model_name}", response_model=ModelInfo)
 async def get_model(
     model_name: str = Path(..., description="Name of the model")
@@ -3,33 +3,31 @@ Prediction Routes
 Model inference and prediction endpoints
 """
 
+import json
 import logging
 import time
 import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Union
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from pydantic import BaseModel, Field
 
-from ...models.churn_predictor.churn_predictor import ChurnPredictor
-from ...models.revenue_leak_detector.revenue_leak_predictor import RevenueLeakPredictor
-from ...models.dynamic_pricing.dynamic_pricing_engine import DynamicPricingEngine
-from ...models.budget_optimizer.budget_optimizer import BudgetOptimizer
-from ...models.demand_forecaster.demand_forecaster import DemandForecaster
-from ...models.anomaly_detector.anomaly_orchestrator import AnomalyDetectorOrchestrator
-from ...models.profitability_predictor.profitability_predictor import ProfitabilityPredictor
 from ..models.schemas import PredictionRequest, PredictionResponse, BatchPredictionRequest, BatchPredictionResponse, DynamicPricingRequest
+from ..dependencies import get_model_pool, get_serving_engine, get_bulk_writer
+from ...utils.drift_monitor import get_drift_monitor
+from ...utils.model_pool import run_blocking
 
-# Model routing table: model_name -> (engine_class, pipeline_method, is_async)
+# Model routing table: model_name -> (engine_type, pipeline_method, is_async)
+# Engines themselves are served from the shared ModelServingPool, which imports
+# each model package (and its ML libraries) only when the model is first used
 MODEL_ROUTING = {
-    "client_churn": (ChurnPredictor, "run_full_pipeline", True),
-    "revenue_leak_detector": (RevenueLeakPredictor, "detect_revenue_leaks", True),
-    "dynamic_pricing": (DynamicPricingEngine, "run_complete_pricing_analysis", True),
-    "budget_optimizer": (BudgetOptimizer, "run_complete_budget_analysis", True),
-    "demand_forecaster": (DemandForecaster, "run_complete_demand_analysis", True),
-    "anomaly_detector": (AnomalyDetectorOrchestrator, "detect_anomalies", False),
-    "client_profitability": (ProfitabilityPredictor, "predict", True),
+    "client_churn": ("ChurnPredictor", "run_full_pipeline", True),
+    "revenue_leak_detector": ("RevenueLeakPredictor", "detect_revenue_leaks", True),
+    "dynamic_pricing": ("DynamicPricingEngine", "run_complete_pricing_analysis", True),
+    "budget_optimizer": ("BudgetOptimizer", "run_complete_budget_analysis", True),
+    "demand_forecaster": ("DemandForecaster", "run_complete_demand_analysis", True),
+    "anomaly_detector": ("AnomalyDetectorOrchestrator", "detect_anomalies", False),
+    "client_profitability": ("ProfitabilityPredictor", "predict", True),
 }
 
 logger = logging.getLogger(__name__)
@@ -90,6 +88,62 @@ def _extract_batch_prediction(result: Any, model_name: str) -> float:
     return result.get("prediction", 0.5)
 
 
+async def _score_batch_records(engine: Any, model_name: str,
+                               records: List[Dict[str, Any]]) -> Optional[List[float]]:
+    """
+    Score every record of a batch with one vectorized model call.
+
+    Returns None for models that only produce a pipeline-level result, in which
+    case the caller falls back to _extract_batch_prediction.
+    """
+    if model_name == "client_churn":
+        predictions = await run_blocking(engine.predict_records, records)
+        if predictions.empty or 'churn_probability' not in predictions.columns:
+            return None
+        return predictions['churn_probability'].astype(float).tolist()
+    if model_name == "client_profitability":
+        predictions = await engine.batch_predict(records)
+        return [float(p.get("prediction", 0.5)) for p in predictions]
+    if model_name == "revenue_leak_detector":
+        scores = await run_blocking(engine.score_records, records)
+        if scores.empty or 'anomaly_score' not in scores.columns:
+            return None
+        return scores['anomaly_score'].astype(float).tolist()
+    return None
+
+
+async def _log_predictions(predictions: List[PredictionResponse],
+                           records: List[Dict[str, Any]]) -> None:
+    """Hand served predictions to the drift sketches and the write-behind buffer; never fails the request."""
+    try:
+        # Fold into the streaming drift sketches so /drift never rescans history
+        drift_monitor = get_drift_monitor()
+        for prediction, record in zip(predictions, records):
+            drift_monitor.observe(prediction.model_name, record, prediction.prediction)
+    except Exception as e:
+        logger.warning(f"Failed to update drift sketches: {e}")
+    
+    try:
+        bulk_writer = get_bulk_writer()
+        if not bulk_writer.is_running:
+            return
+        await bulk_writer.log_predictions([
+            {
+                "model_name": prediction.model_name,
+                "prediction": prediction.prediction if isinstance(prediction.prediction, (int, float)) else None,
+                "confidence": prediction.confidence,
+                "features": json.dumps(record, default=str),
+                "timestamp": prediction.timestamp.isoformat(),
+                "client_id": record.get("client_id"),
+                "model_version": prediction.model_version,
+                "prediction_time_ms": prediction.processing_time_ms,
+            }
+            for prediction, record in zip(predictions, records)
+        ])
+    except Exception as e:
+        logger.warning(f"Failed to log predictions: {e}")
+
+
 class ProfitabilityPredictionRequest(BaseModel):
     """Client profitability prediction request"""
     client_id: str
@@ -127,8 +181,7 @@ async def predict_profitability(
 ):
     """Predict client profitability"""
     try:
-        profitability_predictor = ProfitabilityPredictor()
-        await profitability_predictor.initialize()
+        profitability_predictor = await get_serving_engine("client_profitability")
         
         prediction_data = {
             "client_id": request.client_id,
@@ -148,7 +201,7 @@ async def predict_profitability(
             return_confidence=True
         )
         
-        return PredictionResponse(
+        response = PredictionResponse(
             prediction=prediction["prediction"],
             model_name="client_profitability",
             model_version=model_version or prediction.get("model_type", "1.0.0"),
@@ -157,7 +210,12 @@ async def predict_profitability(
             processing_time_ms=prediction.get("prediction_time_ms", (time.perf_counter() - start_time) * 1000),
             confidence=prediction.get("confidence_level", None)
         )
+        await _log_predictions([response], [prediction_data])
         
+        return response
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Profitability prediction failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to predict profitability")
@@ -170,21 +228,26 @@ async def predict_churn(
 ):
     """Predict client churn risk"""
     try:
-        churn_predictor = ChurnPredictor()
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=90)
+        churn_predictor = await get_serving_engine("client_churn")
+        client_features = {
+            "client_id": request.client_id,
+            "contract_value": request.contract_value,
+            "days_since_last_interaction": request.last_contact_days,
+            "interactions_per_month": request.ticket_frequency,
+            "support_tickets": request.service_issues,
+            "late_payments": request.payment_delays,
+        }
+        if request.satisfaction_score is not None:
+            client_features["avg_satisfaction_score"] = request.satisfaction_score
+        
         start_time = time.perf_counter()
-        result = await churn_predictor.run_full_pipeline(start_date=start_date, end_date=end_date)
+        predictions = await run_blocking(churn_predictor.predict_records, [client_features])
         
         churn_probability = 0.5
-        if result and 'risk_scores' in result:
-            risk_scores = result['risk_scores']
-            if isinstance(risk_scores, pd.DataFrame) and not risk_scores.empty and 'churn_probability' in risk_scores.columns:
-                churn_probability = float(risk_scores['churn_probability'].mean())
-            elif isinstance(risk_scores, list) and risk_scores:
-                churn_probability = float(np.mean([r.get('churn_probability', 0.5) for r in risk_scores]))
+        if not predictions.empty and 'churn_probability' in predictions.columns:
+            churn_probability = float(predictions['churn_probability'].iloc[0])
         
-        return PredictionResponse(
+        response = PredictionResponse(
             prediction=churn_probability,
             model_name="client_churn",
             model_version=model_version or "1.0.0",
@@ -193,7 +256,12 @@ async def predict_churn(
             processing_time_ms=(time.perf_counter() - start_time) * 1000,
             confidence=0.85
         )
+        await _log_predictions([response], [client_features])
+        
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Churn prediction failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to predict churn")
@@ -206,8 +274,7 @@ async def detect_revenue_leak(
 ):
     """Detect potential revenue leaks"""
     try:
-        revenue_leak_predictor = RevenueLeakPredictor()
-        await revenue_leak_predictor.initialize()
+        revenue_leak_predictor = await get_serving_engine("revenue_leak_detector")
         end_date = datetime.now()
         start_date = end_date - timedelta(days=request.time_period_days)
         start_time = time.perf_counter()
@@ -228,6 +295,8 @@ async def detect_revenue_leak(
             confidence=0.85
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Revenue leak detection failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to detect revenue leaks")
@@ -240,7 +309,7 @@ async def recommend_pricing(
 ):
     """Get dynamic pricing recommendations"""
     try:
-        pricing_engine = DynamicPricingEngine()
+        pricing_engine = await get_serving_engine("dynamic_pricing")
         client_id = request.client_profile.get("client_id")
         start_time = time.perf_counter()
         result = await pricing_engine.run_complete_pricing_analysis(client_id=client_id)
@@ -263,6 +332,8 @@ async def recommend_pricing(
             confidence=0.85
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Pricing recommendation failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to get pricing recommendations")
@@ -279,33 +350,39 @@ async def batch_predict(
         if not routing:
             raise HTTPException(status_code=404, detail=f"Unknown model: {model_name}")
         
-        engine_class, method_name, is_async = routing
-        engine = engine_class()
+        _, method_name, is_async = routing
+        engine = await get_serving_engine(model_name)
         
-        if is_async:
-            method = getattr(engine, method_name)
-            start_time = time.perf_counter()
-            result = await method()
-        else:
+        start_time = time.perf_counter()
+        row_predictions = await _score_batch_records(engine, model_name, request.data) if request.data else []
+        
+        if row_predictions is None:
+            # Pipeline-level models: one result shared by every row
             method = getattr(engine, method_name)
-            data_df = pd.DataFrame(request.data) if request.data else pd.DataFrame()
-            start_time = time.perf_counter()
-            result = method(data_df)
+            if is_async:
+                result = await method()
+            else:
+                import pandas as pd
+                data_df = pd.DataFrame(request.data) if request.data else pd.DataFrame()
+                result = await run_blocking(method, data_df)
+            row_predictions = [_extract_batch_prediction(result, model_name)] * len(request.data)
         
-        prediction_value = _extract_batch_prediction(result, model_name)
+        per_row_time_ms = (time.perf_counter() - start_time) * 1000 / max(len(row_predictions), 1)
+        timestamp = datetime.now()
         
         formatted_predictions = [
             PredictionResponse(
                 prediction=prediction_value,
                 model_name=model_name,
                 model_version=request.model_version or "1.0.0",
-                prediction_id=f"batch_{i}_{datetime.now().timestamp()}",
-                timestamp=datetime.now(),
-                processing_time_ms=(time.perf_counter() - start_time) * 1000,
+                prediction_id=f"batch_{i}_{timestamp.timestamp()}",
+                timestamp=timestamp,
+                processing_time_ms=per_row_time_ms,
                 confidence=0.85
             )
-            for i in range(len(request.data))
+            for i, prediction_value in enumerate(row_predictions)
         ]
+        await _log_predictions(formatted_predictions, request.data)
         
         return BatchPredictionResponse(
             predictions=formatted_predictions,
@@ -332,14 +409,16 @@ async def get_model_info(
         if not routing:
             raise HTTPException(status_code=404, detail=f"Model '{model_name}' not found")
         
-        engine_class = routing[0]
-        engine = engine_class()
+        engine_type = routing[0]
+        model_pool = get_model_pool()
+        pool_stats = model_pool.get_stats()["models"].get(model_name)
         
         return {
             "name": model_name,
             "version": "1.0.0",
-            "status": "initialized",
-            "engine_type": engine_class.__name__
+            "status": "loaded" if pool_stats else "not_loaded",
+            "engine_type": engine_type,
+            "serving": pool_stats
         }
         
     except HTTPException:
@@ -359,15 +438,17 @@ async def get_model_health(
         if not routing:
             return {"model_name": model_name, "status": "unknown", "message": f"No routing for '{model_name}'"}
         
-        engine_class = routing[0]
-        engine = engine_class()
+        engine_type = routing[0]
+        await get_serving_engine(model_name)
         
         return {
             "model_name": model_name,
             "status": "healthy",
-            "engine_type": engine_class.__name__
+            "engine_type": engine_type
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get model health for {model_name}: {e}")
         raise HTTPException(status_code=500, detail="Failed to get model health")
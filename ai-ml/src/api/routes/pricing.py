@@ -17,12 +17,20 @@ from ..models.schemas import (
     BatchPredictionRequest,
     BatchPredictionResponse
 )
-from ...models.dynamic_pricing.dynamic_pricing_engine import DynamicPricingEngine
+from ..dependencies import get_serving_engine
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _rl_price(result: Optional[Dict[str, Any]], client_id: Optional[Any]) -> Optional[float]:
+    """Learned RL price point for a client from a pricing analysis result, if there is one"""
+    if not result or client_id is None:
+        return None
+    price = (result.get('rl_price_recommendations') or {}).get(str(client_id))
+    return float(price) if price is not None else None
+
+
 @router.post("/", response_model=DynamicPricingResponse)
 async def recommend_pricing(
     request: DynamicPricingRequest,
@@ -36,8 +44,8 @@ async def recommend_pricing(
     to recommend optimal pricing with confidence intervals.
     """
     try:
-        # Initialize dynamic pricing engine
-        pricing_engine = DynamicPricingEngine()
+        # Get shared dynamic pricing engine from the serving pool
+        pricing_engine = await get_serving_engine("dynamic_pricing")
         
         # Extract client_id from client_profile if available
         client_id = request.client_profile.get("client_id") if isinstance(request.client_profile, dict) else None
@@ -51,15 +59,18 @@ async def recommend_pricing(
         confidence = 0.85
         if result and result.get('status') == 'success':
             recommendations = result.get('price_recommendations', {})
-            if recommendations:
-                prices = []
-                for rec in recommendations.values():
-                    if isinstance(rec, dict) and 'recommended_price' in rec:
-                        prices.append(float(rec['recommended_price']))
-                    elif isinstance(rec, dict) and 'optimal_price' in rec:
-                        prices.append(float(rec['optimal_price']))
-                if prices:
-                    recommended_price = float(np.mean(prices))
+            prices = []
+            for rec in (recommendations or {}).values():
+                if isinstance(rec, dict) and 'recommended_price' in rec:
+                    prices.append(float(rec['recommended_price']))
+                elif isinstance(rec, dict) and 'optimal_price' in rec:
+                    prices.append(float(rec['optimal_price']))
+            rl_price = _rl_price(result, client_id)
+            if prices:
+                recommended_price = float(np.mean(prices))
+            elif rl_price is not None:
+                # Fall back to the learned RL price point for this client
+                recommended_price = rl_price
             summary = result.get('summary', {})
             if summary:
                 acceptance = summary.get('average_client_acceptance_probability', 0.85)
@@ -92,6 +103,8 @@ async def recommend_pricing(
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Pricing recommendation failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to recommend pricing")
@@ -108,8 +121,8 @@ async def batch_recommend_pricing(
     This endpoint allows processing multiple pricing recommendations in a single request.
     """
     try:
-        # Initialize dynamic pricing engine
-        pricing_engine = DynamicPricingEngine()
+        # Get shared dynamic pricing engine from the serving pool
+        pricing_engine = await get_serving_engine("dynamic_pricing")
         
         # Prepare data for batch recommendations
         if request.data:
@@ -142,8 +155,11 @@ async def batch_recommend_pricing(
         
         # Convert to proper format
         formatted_recommendations = []
-        for i in range(len(pricing_data_list)):
-            recommended_price = default_price * (1 + 0.02 * (i % 5 - 2))
+        for i, item in enumerate(pricing_data_list):
+            client_profile = item.get("client_profile") if isinstance(item.get("client_profile"), dict) else {}
+            item_client_id = item.get("client_id", client_profile.get("client_id"))
+            rl_price = _rl_price(result, item_client_id)
+            recommended_price = rl_price if rl_price is not None else default_price * (1 + 0.02 * (i % 5 - 2))
             confidence = min(1.0, max(0.0, default_confidence + 0.02 * (i % 3 - 1)))
             price_range = {
                 "lower_bound": recommended_price * (1 - (1 - confidence) * 0.2),
@@ -191,7 +207,7 @@ async def get_pricing_model_info(
     Get dynamic pricing model information and capabilities
     """
     try:
-        pricing_engine = DynamicPricingEngine()
+        pricing_engine = await get_serving_engine("dynamic_pricing")
         model_info = {"model_name": model_name, "version": "1.0.0", "status": "initialized"}
         
         if not model_info:
@@ -214,11 +230,13 @@ async def get_pricing_model_health(
     Get dynamic pricing model health status
     """
     try:
-        pricing_engine = DynamicPricingEngine()
+        pricing_engine = await get_serving_engine("dynamic_pricing")
         health_status = {"model_name": model_name, "status": "healthy"}
         
         return health_status
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get pricing model health: {e}")
         raise HTTPException(status_code=500, detail="Failed to get model health")
\ No newline at end of file
@@ -15,7 +15,7 @@ from ..models.schemas import (
     BatchPredictionRequest,
     BatchPredictionResponse
 )
-from ...models.profitability_predictor.profitability_predictor import ProfitabilityPredictor
+from ..dependencies import get_serving_engine
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -35,9 +35,8 @@ async def predict_client_profitability(
     The profitability score ranges from 0-100, where higher scores indicate more profitable clients.
     """
     try:
-        # Initialize profitability predictor
-        profitability_predictor = ProfitabilityPredictor()
-        await profitability_predictor.initialize()
+        # Get shared profitability predictor from the serving pool
+        profitability_predictor = await get_serving_engine("client_profitability")
         
         # Prepare data for prediction
         prediction_data = {
@@ -94,6 +93,8 @@ async def predict_client_profitability(
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Profitability prediction failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to predict client profitability")
@@ -110,9 +111,8 @@ async def batch_predict_profitability(
     This endpoint allows processing multiple client predictions in a single request.
     """
     try:
-        # Initialize profitability predictor
-        profitability_predictor = ProfitabilityPredictor()
-        await profitability_predictor.initialize()
+        # Get shared profitability predictor from the serving pool
+        profitability_predictor = await get_serving_engine("client_profitability")
         
         # Prepare data for batch prediction
         if request.data:
@@ -180,9 +180,8 @@ async def get_profitability_model_info(
     Get profitability model information and capabilities
     """
     try:
-        # Initialize profitability predictor to get model info
-        profitability_predictor = ProfitabilityPredictor()
-        await profitability_predictor.initialize()
+        # Get shared profitability predictor from the serving pool
+        profitability_predictor = await get_serving_engine("client_profitability")
         
         model_info = {
             "name": model_name,
@@ -202,6 +201,8 @@ async def get_profitability_model_info(
         
         return model_info
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get profitability model info: {e}")
         raise HTTPException(status_code=500, detail="Failed to get model information")
@@ -215,9 +216,8 @@ async def get_profitability_model_health(
     Get profitability model health status
     """
     try:
-        # Initialize profitability predictor to check health
-        profitability_predictor = ProfitabilityPredictor()
-        await profitability_predictor.initialize()
+        # Get shared profitability predictor from the serving pool
+        profitability_predictor = await get_serving_engine("client_profitability")
         
         health_status = {
             "status": "healthy" if profitability_predictor.is_initialized else "unhealthy",
@@ -230,6 +230,8 @@ async def get_profitability_model_health(
         
         return health_status
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get profitability model health: {e}")
         raise HTTPException(status_code=500, detail="Failed to get model health")
\ No newline at end of file
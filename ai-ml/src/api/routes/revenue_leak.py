@@ -16,7 +16,7 @@ from ..models.schemas import (
     BatchPredictionRequest,
     BatchPredictionResponse
 )
-from ...models.revenue_leak_detector.revenue_leak_predictor import RevenueLeakPredictor
+from ..dependencies import get_serving_engine
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -35,9 +35,8 @@ async def detect_revenue_leak(
     and provide actionable recovery recommendations.
     """
     try:
-        # Initialize revenue leak predictor
-        revenue_leak_predictor = RevenueLeakPredictor()
-        await revenue_leak_predictor.initialize()
+        # Get shared revenue leak predictor from the serving pool
+        revenue_leak_predictor = await get_serving_engine("revenue_leak_detector")
         
         # Compute date range from request time period
         end_date = datetime.now()
@@ -96,6 +95,8 @@ async def detect_revenue_leak(
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Revenue leak detection failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to detect revenue leaks")
@@ -112,9 +113,8 @@ async def batch_detect_revenue_leaks(
     This endpoint allows processing multiple revenue leak detections in a single request.
     """
     try:
-        # Initialize revenue leak predictor
-        revenue_leak_predictor = RevenueLeakPredictor()
-        await revenue_leak_predictor.initialize()
+        # Get shared revenue leak predictor from the serving pool
+        revenue_leak_predictor = await get_serving_engine("revenue_leak_detector")
         
         # Prepare data for batch detection
         if request.data:
@@ -179,7 +179,7 @@ async def get_revenue_leak_model_info(
     Get revenue leak detection model information and capabilities
     """
     try:
-        revenue_leak_predictor = RevenueLeakPredictor()
+        revenue_leak_predictor = await get_serving_engine("revenue_leak_detector")
         model_info = {"model_name": model_name, "version": "1.0.0", "status": "initialized"}
         
         if not model_info:
@@ -202,11 +202,13 @@ async def get_revenue_leak_model_health(
     Get revenue leak detection model health status
     """
     try:
-        revenue_leak_predictor = RevenueLeakPredictor()
+        revenue_leak_predictor = await get_serving_engine("revenue_leak_detector")
         health_status = {"model_name": model_name, "status": "healthy"}
         
         return health_status
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get revenue leak model health: {e}")
         raise HTTPException(status_code=500, detail="Failed to get model health")
\ No newline at end of file
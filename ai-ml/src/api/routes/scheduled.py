@@ -16,6 +16,8 @@ from ..models.schemas import (
     ScheduledRunResponse
 )
 from ...utils.database import DatabaseManager
+from ...utils.scheduler import ScheduledRunExecutor
+from ..dependencies import get_scheduler
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -50,7 +52,8 @@ def calculate_next_run(schedule: str) -> Optional[str]:
 @router.post("/", response_model=ScheduledRunResponse)
 async def create_scheduled_run(
     request: ScheduledRunRequest,
-    db: DatabaseManager = Depends(get_database_manager)
+    db: DatabaseManager = Depends(get_database_manager),
+    scheduler: ScheduledRunExecutor = Depends(get_scheduler)
 ):
     """
     Create a new scheduled model run
@@ -85,6 +88,7 @@ async def create_scheduled_run(
         
         # Create scheduled run in database
         run_id = db.create_scheduled_run(run_data)
+        scheduler.notify()
         
         # Get the created run
         run = db.get_scheduled_run(run_id)
@@ -202,7 +206,8 @@ async def get_scheduled_run(
 async def update_scheduled_run(
     run_id: str,
     request: ScheduledRunRequest,
-    db: DatabaseManager = Depends(get_database_manager)
+    db: DatabaseManager = Depends(get_database_manager),
+    scheduler: ScheduledRunExecutor = Depends(get_scheduler)
 ):
     """
     Update a scheduled model run
@@ -250,6 +255,7 @@ async def update_scheduled_run(
                 status_code=500,
                 detail="Failed to update scheduled run"
             )
+        scheduler.notify()
         
         # Get the updated run
         run = db.get_scheduled_run(run_id)
@@ -287,7 +293,8 @@ async def update_scheduled_run(
 @router.delete("/{run_id}")
 async def delete_scheduled_run(
     run_id: str,
-    db: DatabaseManager = Depends(get_database_manager)
+    db: DatabaseManager = Depends(get_database_manager),
+    scheduler: ScheduledRunExecutor = Depends(get_scheduler)
 ):
     """
     Delete a scheduled model run
@@ -302,6 +309,7 @@ async def delete_scheduled_run(
                 status_code=404,
                 detail="Scheduled run not found"
             )
+        scheduler.notify()
         
         return {
             "message": "Scheduled run deleted successfully",
@@ -321,7 +329,8 @@ async def delete_scheduled_run(
 @router.post("/{run_id}/trigger")
 async def trigger_scheduled_run(
     run_id: str,
-    db: DatabaseManager = Depends(get_database_manager)
+    db: DatabaseManager = Depends(get_database_manager),
+    scheduler: ScheduledRunExecutor = Depends(get_scheduler)
 ):
     """
     Trigger immediate execution of a scheduled run
@@ -338,26 +347,18 @@ async def trigger_scheduled_run(
                 detail="Scheduled run not found"
             )
         
-        # In a real implementation, we would trigger the model execution here
-        # For now, we'll just update the last_run timestamp
-        update_data = {
-            "last_run": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
+        # Hand the run to the executor; if it is still executing the trigger is coalesced
+        started = await scheduler.trigger(run)
         
-        # Update scheduled run in database
-        updated = db.update_scheduled_run(run_id, update_data)
-        if not updated:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to update scheduled run"
-            )
+        if started:
+            update_data = {"last_run": datetime.now().isoformat()}
+            db.update_scheduled_run(run_id, update_data)
         
         return {
-            "message": "Scheduled run triggered successfully",
+            "message": "Scheduled run triggered successfully" if started else "Scheduled run is already executing",
             "run_id": run_id,
             "model_name": run["model_name"],
-            "execution_status": "initiated"
+            "execution_status": "initiated" if started else "coalesced"
         }
         
     except HTTPException:
@@ -0,0 +1,349 @@
+"""
+Columnar Data Store
+Local Parquet cache of extracted SuperOps and QuickBooks data, partitioned by month
+so per-client and per-date-range reads are predicate-pushdown scans instead of
+API round-trips or full CSV parses
+"""
+
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass, asdict, is_dataclass
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ds = None
+    pq = None
+    PYARROW_AVAILABLE = False
+    logging.warning("PyArrow not available, columnar data cache disabled")
+
+logger = logging.getLogger(__name__)
+
+# Hive partition column; dataset discovery skips paths starting with "_" or "."
+PARTITION_COLUMN = "partition_month"
+UNDATED_PARTITION = "all"
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """How a cached table is keyed, filtered by client and partitioned by date"""
+    key: Optional[str] = "id"
+    client_column: Optional[str] = None
+    date_column: Optional[str] = None
+
+
+# Extraction output keys (see ComprehensiveDataExtractor) and how to store them
+TABLE_SPECS: Dict[str, TableSpec] = {
+    "superops_tickets": TableSpec(client_column="client_id", date_column="created_at"),
+    "superops_clients": TableSpec(client_column="id"),
+    "superops_technicians": TableSpec(),
+    "quickbooks_invoices": TableSpec(client_column="customer_id", date_column="date"),
+    "quickbooks_payments": TableSpec(client_column="customer_id", date_column="date"),
+    "quickbooks_expenses": TableSpec(date_column="date"),
+    "quickbooks_customers": TableSpec(client_column="id"),
+}
+
+
+def _naive_utc(value: Any) -> pd.Timestamp:
+    """Timestamp as naive UTC, matching how date columns are stored"""
+    value = pd.Timestamp(value)
+    if value.tzinfo is not None:
+        value = value.tz_convert("UTC").tz_localize(None)
+    return value
+
+
+def _merge_windows(windows: List[List[str]]) -> List[List[str]]:
+    """Merge overlapping [start, end] ingestion windows (ISO strings)"""
+    merged: List[List[pd.Timestamp]] = []
+    for start, end in sorted((_naive_utc(start), _naive_utc(end)) for start, end in windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [[start.isoformat(), end.isoformat()] for start, end in merged]
+
+
+class ColumnarDataStore:
+    """Month-partitioned Parquet tables with upsert writes and filtered scans"""
+
+    def __init__(self, root: str, table_specs: Optional[Dict[str, TableSpec]] = None):
+        """
+        Args:
+            root: Directory holding one sub-directory per table
+            table_specs: Table layouts (defaults to TABLE_SPECS)
+        """
+        self.root = root
+        self.table_specs = table_specs or TABLE_SPECS
+        self.available = PYARROW_AVAILABLE
+
+    def _table_dir(self, table: str) -> str:
+        return os.path.join(self.root, table)
+
+    def _meta_path(self, table: str) -> str:
+        return os.path.join(self._table_dir(table), "_table.json")
+
+    def _load_meta(self, table: str) -> Dict[str, Any]:
+        path = self._meta_path(table)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def has_table(self, table: str) -> bool:
+        """Whether a table has been written"""
+        return self.available and os.path.exists(self._meta_path(table))
+
+    def covers(self, table: str, start_date: datetime, end_date: datetime) -> bool:
+        """
+        Whether a single ingested extraction window spans the requested date range
+
+        Args:
+            table: Table name
+            start_date: Start of the requested range
+            end_date: End of the requested range
+
+        Returns:
+            True if the table was ingested for a window containing [start_date, end_date]
+        """
+        if not self.has_table(table):
+            return False
+        start, end = _naive_utc(start_date), _naive_utc(end_date)
+        return any(
+            _naive_utc(window_start) <= start and end <= _naive_utc(window_end)
+            for window_start, window_end in self._load_meta(table).get("windows", [])
+        )
+
+    def _to_frame(self, table: str, records: Any) -> pd.DataFrame:
+        """Convert records (dataclasses, dicts or a DataFrame) into a partitioned frame"""
+        if isinstance(records, pd.DataFrame):
+            df = records.copy()
+        else:
+            df = pd.DataFrame([asdict(r) if is_dataclass(r) else r for r in records])
+
+        spec = self.table_specs.get(table, TableSpec())
+        if spec.date_column and spec.date_column in df:
+            dates = pd.to_datetime(df[spec.date_column], errors="coerce", utc=True).dt.tz_localize(None)
+            df[spec.date_column] = dates
+            df[PARTITION_COLUMN] = dates.dt.strftime("%Y-%m").fillna(UNDATED_PARTITION)
+        else:
+            df[PARTITION_COLUMN] = UNDATED_PARTITION
+
+        # Nested values (tags, custom fields, line items) are stored as JSON text
+        json_columns = [
+            column for column in df.columns
+            if df[column].dtype == object and df[column].map(lambda v: isinstance(v, (dict, list))).any()
+        ]
+        for column in json_columns:
+            df[column] = df[column].map(lambda v: None if v is None else json.dumps(v, default=str))
+        df.attrs["json_columns"] = json_columns
+        return df
+
+    def write(self, table: str, records: Any, replace: bool = False,
+              window: Optional[Tuple[datetime, datetime]] = None) -> int:
+        """
+        Write records into a table, upserting by key within the affected month partitions
+
+        Args:
+            table: Table name
+            records: Records as dataclasses, dicts or a DataFrame
+            replace: Drop the whole table before writing
+            window: (start, end) extraction window the records completely cover
+
+        Returns:
+            Number of rows written
+        """
+        if not self.available:
+            return 0
+
+        df = self._to_frame(table, records)
+        if df.empty:
+            return 0
+        spec = self.table_specs.get(table, TableSpec())
+        meta = {} if replace else self._load_meta(table)
+        json_columns = sorted(set(meta.get("json_columns", [])) | set(df.attrs["json_columns"]))
+        windows = list(meta.get("windows", []))
+        if window is not None:
+            windows = _merge_windows(windows + [[_naive_utc(window[0]).isoformat(),
+                                                 _naive_utc(window[1]).isoformat()]])
+
+        if replace:
+            shutil.rmtree(self._table_dir(table), ignore_errors=True)
+        elif meta:
+            # Merge with the rows already stored in the months being rewritten
+            months = sorted(df[PARTITION_COLUMN].unique())
+            existing = self._scan(table, ds.field(PARTITION_COLUMN).isin(months))
+            if not existing.empty:
+                df = pd.concat([existing, df], ignore_index=True)
+                if spec.key and spec.key in df:
+                    df = df.drop_duplicates(spec.key, keep="last")
+
+        # Sorting by client keeps each client's rows together, so row-group statistics prune scans
+        if spec.client_column and spec.client_column in df:
+            df = df.sort_values(spec.client_column, kind="stable")
+
+        arrow_table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+        os.makedirs(self._table_dir(table), exist_ok=True)
+        ds.write_dataset(
+            arrow_table,
+            self._table_dir(table),
+            format="parquet",
+            partitioning=ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive"),
+            existing_data_behavior="delete_matching",
+            basename_template="part-{i}.parquet",
+        )
+
+        with open(self._meta_path(table), "w") as f:
+            json.dump({
+                "json_columns": json_columns,
+                "spec": asdict(spec),
+                "windows": windows,
+                "updated_at": datetime.now().isoformat(),
+            }, f, indent=2)
+
+        logger.info(f"Wrote {len(df)} rows to columnar table {table}")
+        return len(df)
+
+    def _dataset(self, table: str):
+        """Open a table as a dataset with a schema unified across its files"""
+        partitioning = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive")
+        dataset = ds.dataset(self._table_dir(table), format="parquet", partitioning=partitioning)
+        schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+        if len(schemas) > 1:
+            schema = pa.unify_schemas(schemas, promote_options="permissive")
+            schema = schema.append(pa.field(PARTITION_COLUMN, pa.string())) \
+                if PARTITION_COLUMN not in schema.names else schema
+            dataset = ds.dataset(self._table_dir(table), format="parquet",
+                                 partitioning=partitioning, schema=schema)
+        return dataset
+
+    def _scan(self, table: str, expression=None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Scan a table without decoding JSON columns"""
+        if not self.has_table(table):
+            return pd.DataFrame()
+        dataset = self._dataset(table)
+        if columns is not None:
+            columns = [c for c in columns if c in dataset.schema.names]
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+    def read(self, table: str, client_id: Optional[Any] = None,
+             start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Read a table, pushing client and date predicates down into the Parquet scan
+
+        Args:
+            table: Table name
+            client_id: Only rows of this client
+            start_date: Only rows dated on or after this time
+            end_date: Only rows dated on or before this time
+            columns: Columns to read (all if None)
+
+        Returns:
+            DataFrame of matching rows (empty if the table has not been written)
+        """
+        if not self.has_table(table):
+            return pd.DataFrame()
+
+        spec = self.table_specs.get(table, TableSpec())
+        schema = self._dataset(table).schema
+        expression = None
+
+        def timestamp(value, arrow_type):
+            return pa.scalar(_naive_utc(value)).cast(arrow_type)
+
+        def conjoin(condition):
+            nonlocal expression
+            expression = condition if expression is None else expression & condition
+
+        if client_id is not None and spec.client_column and spec.client_column in schema.names:
+            client_type = schema.field(spec.client_column).type
+            conjoin(ds.field(spec.client_column) == pa.scalar(client_id).cast(client_type))
+
+        if spec.date_column and spec.date_column in schema.names:
+            date_type = schema.field(spec.date_column).type
+            # Month bounds prune whole partitions before any file is opened
+            if start_date is not None:
+                conjoin(ds.field(PARTITION_COLUMN) >= start_date.strftime("%Y-%m"))
+                conjoin(ds.field(spec.date_column) >= timestamp(start_date, date_type))
+            if end_date is not None:
+                conjoin(ds.field(PARTITION_COLUMN) <= end_date.strftime("%Y-%m"))
+                conjoin(ds.field(spec.date_column) <= timestamp(end_date, date_type))
+
+        df = self._scan(table, expression, columns)
+        for column in self._load_meta(table).get("json_columns", []):
+            if column in df:
+                df[column] = df[column].map(lambda v: None if v is None else json.loads(v))
+        return df.drop(columns=[PARTITION_COLUMN], errors="ignore").reset_index(drop=True)
+
+    def ingest(self, extracted: Dict[str, Any],
+               window: Optional[Tuple[datetime, datetime]] = None) -> Dict[str, int]:
+        """
+        Write every known table found in an extraction result
+
+        Args:
+            extracted: Output of ComprehensiveDataExtractor.extract_all_data
+            window: (start, end) date range the extraction was run for
+
+        Returns:
+            Dictionary mapping table name to rows written
+        """
+        written = {}
+        for table in self.table_specs:
+            records = extracted.get(table)
+            if records is None or len(records) == 0:
+                continue
+            try:
+                written[table] = self.write(table, records, window=window)
+            except Exception as e:
+                logger.error(f"Failed to write {table} to columnar cache: {e}")
+        return written
+
+    def read_csv_cached(self, csv_path: str, parse_dates: Optional[List[str]] = None,
+                        columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Read a CSV through a Parquet copy that is rebuilt only when the CSV changes
+
+        Args:
+            csv_path: Source CSV file
+            parse_dates: Columns to parse as dates when converting
+            columns: Columns to read (all if None)
+
+        Returns:
+            DataFrame with the CSV's contents
+        """
+        if not self.available:
+            return pd.read_csv(csv_path, parse_dates=parse_dates, usecols=columns)
+
+        cache_dir = os.path.join(self.root, "csv")
+        name = os.path.splitext(os.path.basename(csv_path))[0]
+        parquet_path = os.path.join(cache_dir, f"{name}.parquet")
+        meta_path = os.path.join(cache_dir, f"{name}.json")
+
+        stat = os.stat(csv_path)
+        source = {"path": os.path.abspath(csv_path), "mtime": stat.st_mtime, "size": stat.st_size,
+                  "parse_dates": parse_dates or []}
+        cached = None
+        if os.path.exists(meta_path) and os.path.exists(parquet_path):
+            with open(meta_path, "r") as f:
+                cached = json.load(f)
+
+        if cached != source:
+            df = pd.read_csv(csv_path, parse_dates=parse_dates)
+            os.makedirs(cache_dir, exist_ok=True)
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), parquet_path)
+            with open(meta_path, "w") as f:
+                json.dump(source, f)
+            logger.info(f"Converted {csv_path} to columnar cache")
+            return df[list(columns)] if columns is not None else df
+
+        return pd.read_parquet(parquet_path, columns=list(columns) if columns is not None else None)
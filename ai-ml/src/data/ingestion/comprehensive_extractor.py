@@ -9,11 +9,15 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, AsyncGenerator
 from dataclasses import dataclass
 
+import pandas as pd
+
+from config import settings
 from .superops_graphql_client import create_superops_graphql_client
 from .quickbooks_rest_client import create_quickbooks_rest_client
 from .transformers import DataTransformer
-from ..utils.error_handlers import get_error_handler
+from ...utils.error_handlers import get_error_handler
 from .internal_db_connector import create_internal_db_connector
+from .columnar_store import ColumnarDataStore
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +32,8 @@ class ExtractionConfig:
     include_internal: bool = True
     max_records_per_source: int = 1000
     parallel_extraction: bool = True
+    use_columnar_cache: bool = True
+    columnar_cache_path: Optional[str] = None
 
 
 class ComprehensiveDataExtractor:
@@ -40,6 +46,8 @@ class ComprehensiveDataExtractor:
         self.internal_db_connector = None
         self.transformer = DataTransformer()
         self.error_handler = get_error_handler()
+        self.store = ColumnarDataStore(config.columnar_cache_path or settings.data_processing.columnar_cache_path) \
+            if config.use_columnar_cache else None
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -157,6 +165,12 @@ class ComprehensiveDataExtractor:
         metrics = self.transformer.calculate_metrics(all_data)
         all_data["metrics"] = metrics
         
+        # Write once into the local columnar cache so later reads skip the APIs
+        if self.store is not None and self.store.available:
+            all_data["extraction_metadata"]["cached_rows"] = self.store.ingest(
+                all_data, window=(self.config.start_date, self.config.end_date)
+            )
+        
         logger.info(f"Comprehensive data extraction completed in {(end_time - start_time).total_seconds():.2f}s")
         logger.info(f"Total records extracted: {all_data['extraction_metadata']['total_records']}")
         
@@ -323,8 +337,12 @@ class ComprehensiveDataExtractor:
             "extraction_timestamp": datetime.now().isoformat()
         }
         
+        cached = self._read_client_data_from_cache(client_id)
+        if cached:
+            client_data.update(cached)
+        
         # Extract from SuperOps (if client exists there)
-        if self.config.include_superops:
+        if self.config.include_superops and "superops_tickets" not in cached:
             try:
                 # Filter SuperOps data by client
                 tickets = await self.superops_client.get_tickets(
@@ -344,7 +362,7 @@ class ComprehensiveDataExtractor:
                 logger.error(f"SuperOps client data extraction failed: {e}")
         
         # Extract from QuickBooks (if client exists there)
-        if self.config.include_quickbooks:
+        if self.config.include_quickbooks and "quickbooks_invoices" not in cached:
             try:
                 # Filter QuickBooks data by client
                 invoices_payments = await self.quickbooks_client.get_invoices_and_payments(
@@ -375,6 +393,58 @@ class ComprehensiveDataExtractor:
         logger.info(f"Client-specific data extracted for {client_id}: {sum(len(data) for data in client_data.values() if isinstance(data, list))} records")
         return client_data
     
+    @staticmethod
+    def _cache_records(df) -> List[Dict[str, Any]]:
+        """Cached rows as records with ISO date strings, matching what the API path returns"""
+        for column in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[column]):
+                df[column] = df[column].map(lambda v: None if pd.isna(v) else v.isoformat()).astype(object)
+        return df.to_dict("records")
+    
+    def _cache_covers(self, table: str, clients_table: str, client_id: str) -> bool:
+        """Whether the cache was ingested for the configured window and already knows the client"""
+        return (
+            self.store.covers(table, self.config.start_date, self.config.end_date)
+            and not self.store.read(clients_table, client_id=client_id, columns=["id"]).empty
+        )
+    
+    def _read_client_data_from_cache(self, client_id: str) -> Dict[str, Any]:
+        """
+        Read one client's SuperOps and QuickBooks records from the columnar cache
+        
+        A source is served from the cache only when an ingested extraction window
+        spans the configured dates and the client was part of it; otherwise its key
+        is left out so the caller fetches that source from the API.
+        """
+        if self.store is None or not self.store.available:
+            return {}
+        
+        cached: Dict[str, Any] = {}
+        try:
+            if self.config.include_superops and self._cache_covers("superops_tickets", "superops_clients", client_id):
+                cached["superops_tickets"] = self._cache_records(self.store.read(
+                    "superops_tickets", client_id=client_id,
+                    start_date=self.config.start_date, end_date=self.config.end_date
+                ))
+                cached["superops_client"] = self._cache_records(
+                    self.store.read("superops_clients", client_id=client_id)
+                )[0]
+            
+            if self.config.include_quickbooks and \
+                    self._cache_covers("quickbooks_invoices", "quickbooks_customers", client_id):
+                for table in ("quickbooks_invoices", "quickbooks_payments"):
+                    cached[table] = self._cache_records(self.store.read(
+                        table, client_id=client_id,
+                        start_date=self.config.start_date, end_date=self.config.end_date
+                    ))
+        except Exception as e:
+            logger.error(f"Columnar cache read failed for {client_id}, falling back to APIs: {e}")
+            return {}
+        
+        if cached:
+            logger.info(f"Read client-specific data for {client_id} from columnar cache")
+        return cached
+    
     async def get_real_time_updates(self) -> AsyncGenerator[Dict[str, Any], None]:
         """Get real-time updates from all sources"""
         logger.info("Starting real-time updates from all sources")
@@ -418,7 +488,8 @@ def create_comprehensive_extractor(
     include_quickbooks: bool = True,
     include_internal: bool = True,
     max_records_per_source: int = 1000,
-    parallel_extraction: bool = True
+    parallel_extraction: bool = True,
+    use_columnar_cache: bool = True
 ) -> ComprehensiveDataExtractor:
     """Create comprehensive data extractor with specified configuration"""
     config = ExtractionConfig(
@@ -428,7 +499,8 @@ def create_comprehensive_extractor(
         include_quickbooks=include_quickbooks,
         include_internal=include_internal,
         max_records_per_source=max_records_per_source,
-        parallel_extraction=parallel_extraction
+        parallel_extraction=parallel_extraction,
+        use_columnar_cache=use_columnar_cache
     )
     
     return ComprehensiveDataExtractor(config)
@@ -0,0 +1,209 @@
+"""
+Incremental Sync Engine
+Keeps local copies of SuperOps list resources current by fetching only records
+updated since the last successful sync
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional
+
+from config import settings
+from .superops_client import SuperOpsClient, LIST_RESOURCES, PaginationGapError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncResult:
+    """Outcome of syncing one resource"""
+    resource: str
+    success: bool
+    full_sync: bool
+    records: List[Any] = field(default_factory=list)
+    previous_high_water_mark: Optional[str] = None
+    high_water_mark: Optional[str] = None
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Serializable summary (without the records themselves)"""
+        return {
+            "resource": self.resource,
+            "success": self.success,
+            "full_sync": self.full_sync,
+            "record_count": len(self.records),
+            "previous_high_water_mark": self.previous_high_water_mark,
+            "high_water_mark": self.high_water_mark,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "error": self.error,
+        }
+
+
+class SyncStateStore:
+    """JSON file holding the updated_at high-water mark of each synced resource"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Load all resource states (empty when nothing has been synced yet)"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to read sync state from {self.path}: {e}")
+            return {}
+
+    def get_high_water_mark(self, resource: str) -> Optional[str]:
+        """High-water mark of a resource, if it has been synced before"""
+        return self.load().get(resource, {}).get("updated_at")
+
+    def save(self, resource: str, high_water_mark: str, record_count: int):
+        """Persist a resource's high-water mark, replacing the state file atomically"""
+        state = self.load()
+        state[resource] = {
+            "updated_at": high_water_mark,
+            "synced_at": datetime.now(timezone.utc).isoformat(),
+            "record_count": record_count,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def clear(self, resource: Optional[str] = None):
+        """Forget one resource's high-water mark (or all), forcing a full sync"""
+        if resource is None:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        state = self.load()
+        if state.pop(resource, None) is not None:
+            with open(self.path, "w") as f:
+                json.dump(state, f, indent=2)
+
+
+class IncrementalSyncEngine:
+    """Syncs SuperOps list resources page-concurrently from a persisted updated_at cursor"""
+
+    def __init__(self, client: SuperOpsClient, state_path: Optional[str] = None,
+                 page_size: Optional[int] = None, overlap_seconds: float = 60.0,
+                 gap_retries: int = 2):
+        """
+        Args:
+            client: Initialized SuperOps client
+            state_path: JSON file holding high-water marks (defaults to settings)
+            page_size: Records per page (defaults to the client's page size)
+            overlap_seconds: How far before the high-water mark each incremental sync
+                starts, so records updated on the boundary are never missed; consumers
+                upsert by id, so the re-fetched overlap is harmless
+            gap_retries: How many times to re-fetch a window whose pages came back with
+                fewer records than the reported total before failing the sync
+        """
+        self.client = client
+        self.state = SyncStateStore(state_path or settings.superops_api.sync_state_path)
+        self.page_size = page_size
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.gap_retries = gap_retries
+        self._parsers = {
+            "tickets": client._parse_ticket,
+            "clients": client._parse_client,
+            "technicians": client._parse_technician,
+        }
+
+    async def sync(self, resource: str, full: bool = False) -> SyncResult:
+        """
+        Sync one resource
+
+        Args:
+            resource: One of "tickets", "clients" or "technicians"
+            full: Ignore the high-water mark and fetch every record
+
+        Returns:
+            SyncResult with the parsed records that changed since the last sync
+        """
+        if resource not in LIST_RESOURCES:
+            raise ValueError(f"Unknown SuperOps resource: {resource}")
+
+        started = time.perf_counter()
+        previous = None if full else self.state.get_high_water_mark(resource)
+
+        # Freeze the window's upper bound so records updated mid-sync fall into the next
+        # window. They still leave this one, shifting later offsets, which the
+        # completeness check below catches
+        window_end = datetime.now(timezone.utc)
+        params: Dict[str, Any] = {"updated_before": window_end.isoformat(), "sort": "updated_at"}
+        if previous is not None:
+            params["updated_after"] = (datetime.fromisoformat(previous) - self.overlap).isoformat()
+
+        result = SyncResult(resource=resource, success=False, full_sync=previous is None,
+                            previous_high_water_mark=previous)
+        try:
+            raw_records = await self._fetch_window(resource, params)
+            parse = self._parsers[resource]
+            result.records = [parse(record) for record in raw_records]
+
+            # The cursor only advances once every page has been fetched and parsed
+            result.high_water_mark = window_end.isoformat()
+            self.state.save(resource, result.high_water_mark, len(result.records))
+            result.success = True
+            logger.info(f"Synced {len(result.records)} {resource} "
+                        f"({'full' if result.full_sync else 'incremental'}) from SuperOps")
+        except Exception as e:
+            result.error = str(e)
+            result.high_water_mark = previous
+            logger.error(f"Failed to sync {resource} from SuperOps: {e}")
+
+        result.duration_seconds = time.perf_counter() - started
+        return result
+
+    async def _fetch_window(self, resource: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fetch every record in the window, re-fetching while offset pages skip records"""
+        for attempt in range(self.gap_retries + 1):
+            try:
+                return await self.client.fetch_all_pages(resource, params, self.page_size,
+                                                         require_complete=True)
+            except PaginationGapError as e:
+                if attempt == self.gap_retries:
+                    raise
+                logger.warning(f"{e}, re-fetching (attempt {attempt + 2})")
+
+    async def sync_all(self, resources: Optional[List[str]] = None,
+                       full: bool = False) -> Dict[str, SyncResult]:
+        """
+        Sync several resources concurrently
+
+        Args:
+            resources: Resources to sync (defaults to all list resources)
+            full: Ignore high-water marks and fetch every record
+
+        Returns:
+            Dictionary mapping resource name to its SyncResult
+        """
+        resources = resources or list(LIST_RESOURCES)
+        results = await asyncio.gather(*(self.sync(resource, full) for resource in resources))
+        return dict(zip(resources, results))
+
+    def reset(self, resource: Optional[str] = None):
+        """Forget high-water marks so the next sync is a full one"""
+        self.state.clear(resource)
+
+
+def create_incremental_sync_engine(client: SuperOpsClient) -> IncrementalSyncEngine:
+    """Create incremental sync engine with configuration from settings"""
+    return IncrementalSyncEngine(
+        client,
+        state_path=settings.superops_api.sync_state_path,
+        page_size=settings.superops_api.page_size,
+    )
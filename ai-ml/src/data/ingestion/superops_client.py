@@ -7,8 +7,9 @@ import logging
 import asyncio
 import aiohttp
 import json
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Tuple, Mapping
 from dataclasses import dataclass, asdict
 from enum import Enum
 import pandas as pd
@@ -52,7 +53,83 @@ class SuperOpsConfig:
     tenant_id: str
     timeout: int = 30
     max_retries: int = 3
-    rate_limit_delay: float = 0.1
+    rate_limit_delay: float = 0.1  # Pause when the quota is nearly spent but no reset time is given
+    page_size: int = 500
+
+
+# Paginated list resources: endpoint, response key and related objects to include
+LIST_RESOURCES = {
+    "tickets": ("/api/v1/tickets", "tickets", "client,technician,sla,custom_fields,attachments,notes"),
+    "clients": ("/api/v1/clients", "clients", "contracts,contacts,custom_fields"),
+    "technicians": ("/api/v1/technicians", "technicians", "skills,certifications,performance"),
+}
+
+
+class PaginationGapError(Exception):
+    """Raised when offset pages return fewer distinct records than the reported total"""
+    pass
+
+
+class AdaptiveRateLimiter:
+    """Paces requests from the rate-limit headers returned by the API instead of fixed sleeps"""
+    
+    def __init__(self, reserve: int = 10, min_pause: float = 0.1):
+        """
+        Args:
+            reserve: Remaining-request count at or below which requests pause until the quota resets
+            min_pause: Pause used when the quota is nearly spent but no reset time is reported
+        """
+        self.reserve = reserve
+        self.min_pause = min_pause
+        self.remaining: Optional[int] = None
+        self._resume_at = 0.0
+    
+    @staticmethod
+    def _header_seconds(headers: Mapping[str, str], name: str) -> Optional[float]:
+        """Read a header as seconds from now, accepting both deltas and epoch timestamps"""
+        value = headers.get(name)
+        if value is None:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            return None
+        # Large values are absolute epoch timestamps rather than deltas
+        if seconds > 1e9:
+            seconds -= time.time()
+        return max(seconds, 0.0)
+    
+    def pause(self, seconds: float):
+        """Hold back all requests for the given number of seconds"""
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+    
+    def update(self, headers: Mapping[str, str]):
+        """Update the pacing state from a response's headers"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            self.remaining = int(float(remaining))
+        except ValueError:
+            return
+        
+        if self.remaining <= self.reserve:
+            reset = self._header_seconds(headers, "X-RateLimit-Reset")
+            self.pause(reset if reset is not None else self.min_pause)
+    
+    def retry_delay(self, headers: Mapping[str, str], default: float) -> float:
+        """Delay before retrying a throttled request"""
+        for name in ("Retry-After", "X-RateLimit-Reset"):
+            seconds = self._header_seconds(headers, name)
+            if seconds is not None:
+                return seconds
+        return default
+    
+    async def wait(self):
+        """Wait until requests may be sent"""
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
 
 
 @dataclass
@@ -167,7 +244,9 @@ class SuperOpsClient:
     def __init__(self, config: SuperOpsConfig):
         self.config = config
         self.session: Optional[aiohttp.ClientSession] = None
-        self._rate_limit_semaphore = asyncio.Semaphore(10)  # Max 10 concurrent requests
+        self._max_concurrency = 10
+        self._rate_limit_semaphore = asyncio.Semaphore(self._max_concurrency)  # Max 10 concurrent requests
+        self._rate_limiter = AdaptiveRateLimiter(reserve=self._max_concurrency, min_pause=config.rate_limit_delay)
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -212,16 +291,16 @@ class SuperOpsClient:
             for attempt in range(self.config.max_retries):
                 try:
                     url = f"{self.config.base_url}{endpoint}"
+                    await self._rate_limiter.wait()
                     
                     async with self.session.request(method, url, **kwargs) as response:
+                        self._rate_limiter.update(response.headers)
                         if response.status == 200:
-                            data = await response.json()
-                            await asyncio.sleep(self.config.rate_limit_delay)
-                            return data
+                            return await response.json()
                         elif response.status == 429:  # Rate limited
-                            wait_time = 2 ** attempt
-                            logger.warning(f"Rate limited, waiting {wait_time}s")
-                            await asyncio.sleep(wait_time)
+                            wait_time = self._rate_limiter.retry_delay(response.headers, default=2 ** attempt)
+                            logger.warning(f"Rate limited, waiting {wait_time:.1f}s")
+                            self._rate_limiter.pause(wait_time)
                             continue
                         else:
                             logger.error(f"Request failed: {response.status} - {await response.text()}")
@@ -242,6 +321,86 @@ class SuperOpsClient:
             
             raise aiohttp.ClientError("Max retries exceeded")
     
+    @staticmethod
+    def _total_count(data: Dict[str, Any]) -> Optional[int]:
+        """Total record count reported by a list response, if any"""
+        for container in (data, data.get("meta") or {}, data.get("pagination") or {}):
+            for key in ("total", "total_count", "totalCount"):
+                if container.get(key) is not None:
+                    return int(container[key])
+        return None
+    
+    async def fetch_page(self, resource: str, offset: int, limit: int,
+                         params: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Fetch one page of a list resource
+        
+        Returns:
+            Tuple of (raw records, total record count if the API reports it)
+        """
+        endpoint, key, include = LIST_RESOURCES[resource]
+        page_params = {"include": include, **(params or {}), "limit": limit, "offset": offset}
+        data = await self._make_request("GET", endpoint, params=page_params)
+        return data.get(key, []), self._total_count(data)
+    
+    async def fetch_all_pages(self, resource: str, params: Optional[Dict[str, Any]] = None,
+                              page_size: Optional[int] = None,
+                              require_complete: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch every page of a list resource, requesting pages concurrently
+        
+        The first page reveals the total count, after which all remaining pages are
+        requested at once; concurrency is bounded by the request semaphore and the
+        connector limits. Without a total count, pages are fetched in waves until
+        a short page is returned.
+        
+        A record that leaves the result set while paging shifts every later record
+        down one offset, so the record on the next page boundary is skipped.
+        De-duplication only handles the opposite case (records seen twice).
+        
+        Args:
+            resource: One of the LIST_RESOURCES names
+            params: Filters applied to every page
+            page_size: Records per page (defaults to the configured page size)
+            require_complete: Raise PaginationGapError when fewer distinct records
+                arrive than the first page's total (only checked when a total is reported)
+        
+        Returns:
+            Raw records in page order, de-duplicated by id
+        """
+        page_size = page_size or self.config.page_size
+        records, total = await self.fetch_page(resource, 0, page_size, params)
+        pages = [records]
+        
+        if total is not None:
+            offsets = range(page_size, total, page_size)
+            results = await asyncio.gather(*(self.fetch_page(resource, o, page_size, params) for o in offsets))
+            pages.extend(page for page, _ in results)
+        else:
+            next_offset = page_size
+            while len(pages[-1]) == page_size:
+                offsets = range(next_offset, next_offset + page_size * self._max_concurrency, page_size)
+                results = await asyncio.gather(*(self.fetch_page(resource, o, page_size, params) for o in offsets))
+                for page, _ in results:
+                    pages.append(page)
+                    if len(page) < page_size:
+                        break
+                next_offset = offsets[-1] + page_size
+        
+        # Records can shift between pages while paginating; keep the last copy of each
+        unique: Dict[Any, Dict[str, Any]] = {}
+        for page in pages:
+            for record in page:
+                unique[record.get("id", id(record))] = record
+        
+        if require_complete and total is not None and len(unique) < total:
+            raise PaginationGapError(
+                f"Fetched {len(unique)} of {total} {resource}; records shifted between pages"
+            )
+        
+        logger.info(f"Fetched {len(unique)} {resource} in {len(pages)} pages from SuperOps")
+        return list(unique.values())
+    
     async def get_tickets(self, 
                          start_date: Optional[datetime] = None,
                          end_date: Optional[datetime] = None,
@@ -250,8 +409,9 @@ class SuperOpsClient:
                          client_id: Optional[str] = None,
                          technician_id: Optional[str] = None,
                          limit: int = 1000,
-                         offset: int = 0) -> List[Ticket]:
-        """Extract ticket data from SuperOps"""
+                         offset: int = 0,
+                         fetch_all: bool = False) -> List[Ticket]:
+        """Extract ticket data from SuperOps (every matching page when fetch_all is set)"""
         try:
             # Build query parameters
             params = {
@@ -274,11 +434,16 @@ class SuperOpsClient:
                 params["technician_id"] = technician_id
             
             # Make API request
-            data = await self._make_request("GET", "/api/v1/tickets", params=params)
+            if fetch_all:
+                filters = {k: v for k, v in params.items() if k not in ("limit", "offset")}
+                ticket_records = await self.fetch_all_pages("tickets", filters)
+            else:
+                data = await self._make_request("GET", "/api/v1/tickets", params=params)
+                ticket_records = data.get("tickets", [])
             
             # Parse tickets
             tickets = []
-            for ticket_data in data.get("tickets", []):
+            for ticket_data in ticket_records:
                 ticket = self._parse_ticket(ticket_data)
                 tickets.append(ticket)
             
@@ -733,7 +898,8 @@ def create_superops_client() -> SuperOpsClient:
         tenant_id=settings.superops_api.tenant_id,
         timeout=settings.superops_api.timeout,
         max_retries=settings.superops_api.max_retries,
-        rate_limit_delay=settings.superops_api.rate_limit_delay
+        rate_limit_delay=settings.superops_api.rate_limit_delay,
+        page_size=settings.superops_api.page_size
     )
     
     return SuperOpsClient(config)
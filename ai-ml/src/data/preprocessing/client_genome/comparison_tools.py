@@ -136,24 +136,16 @@ class GenomeComparisonTools:
                     continue
                 
                 # Get genome vectors for this cluster
-                cluster_genomes = [client_genomes[client_id] for client_id in client_ids]
+                cluster_genomes = np.array([client_genomes[client_id] for client_id in client_ids], dtype=np.float64)
                 
                 # Calculate centroid
                 centroid = np.mean(cluster_genomes, axis=0)
                 
                 # Calculate intra-cluster similarities
-                intra_similarities = []
-                for i in range(len(cluster_genomes)):
-                    for j in range(i + 1, len(cluster_genomes)):
-                        similarity = self.similarity_calculator.calculate_cosine_similarity(
-                            cluster_genomes[i], cluster_genomes[j]
-                        )
-                        intra_similarities.append(similarity)
+                intra_similarities = self._pairwise_cosine_statistics(cluster_genomes)
                 
                 # Calculate distances to centroid
-                distances_to_centroid = [
-                    np.linalg.norm(genome - centroid) for genome in cluster_genomes
-                ]
+                distances_to_centroid = np.linalg.norm(cluster_genomes - centroid, axis=1)
                 
                 # Identify most and least representative clients
                 min_distance_idx = np.argmin(distances_to_centroid)
@@ -162,12 +154,7 @@ class GenomeComparisonTools:
                 cluster_analysis[cluster_id] = {
                     'n_clients': len(client_ids),
                     'centroid': centroid.tolist(),
-                    'intra_cluster_analysis': {
-                        'average_similarity': float(np.mean(intra_similarities)),
-                        'min_similarity': float(np.min(intra_similarities)),
-                        'max_similarity': float(np.max(intra_similarities)),
-                        'std_similarity': float(np.std(intra_similarities))
-                    },
+                    'intra_cluster_analysis': intra_similarities,
                     'centroid_analysis': {
                         'average_distance_to_centroid': float(np.mean(distances_to_centroid)),
                         'min_distance_to_centroid': float(np.min(distances_to_centroid)),
@@ -184,6 +171,43 @@ class GenomeComparisonTools:
             logger.error(f"Error comparing genome cluster: {e}")
             return {}
     
+    @staticmethod
+    def _pairwise_cosine_statistics(genomes: np.ndarray, block_size: int = 1024) -> Dict[str, float]:
+        """
+        Summarize cosine similarity over all distinct genome pairs without materializing every pair
+        
+        Args:
+            genomes: Genome matrix for one cluster (n_clients x 50)
+            block_size: Rows multiplied against the cluster per step, bounding memory to block_size x n
+            
+        Returns:
+            Dict[str, float]: Average, min, max and standard deviation of pairwise similarity
+        """
+        norms = np.linalg.norm(genomes, axis=1, keepdims=True)
+        normalized = np.divide(genomes, norms, out=np.zeros_like(genomes), where=norms > 0)
+        
+        n = len(normalized)
+        total = total_sq = 0.0
+        minimum, maximum = np.inf, -np.inf
+        for start in range(0, n - 1, block_size):
+            stop = min(start + block_size, n)
+            # Only columns from this block onward can form pairs (i, j) with j > i
+            block = np.clip(normalized[start:stop] @ normalized[start:].T, 0, 1)
+            upper = block[np.arange(stop - start)[:, None] < np.arange(n - start)]
+            total += upper.sum()
+            total_sq += np.square(upper).sum()
+            minimum = min(minimum, upper.min())
+            maximum = max(maximum, upper.max())
+        
+        n_pairs = n * (n - 1) / 2
+        mean = total / n_pairs
+        return {
+            'average_similarity': float(mean),
+            'min_similarity': float(minimum),
+            'max_similarity': float(maximum),
+            'std_similarity': float(np.sqrt(max(total_sq / n_pairs - mean ** 2, 0.0)))
+        }
+    
     def track_genome_evolution(self, client_id: str,
                              genome_history: List[Tuple[datetime, np.ndarray]]) -> Dict[str, Any]:
         """
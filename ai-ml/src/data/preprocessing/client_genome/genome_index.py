@@ -0,0 +1,392 @@
+"""
+Genome Index Module
+Stores client genome vectors in a contiguous float32 matrix and serves top-k similarity search
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple, Iterable
+import logging
+from sklearn.cluster import MiniBatchKMeans
+
+logger = logging.getLogger(__name__)
+
+GENOME_SIZE = 50
+
+# Scaling factor used by SimilarityCalculator to map distances in 50-dim space to 0-1
+DISTANCE_SCALE = 50.0
+
+# Extra candidates re-scored in float64 so float32 rounding cannot reorder the top-k
+REFINE_MARGIN = 16
+
+
+def genome_similarities(vectors: np.ndarray, query: np.ndarray, metric: str = 'cosine') -> np.ndarray:
+    """
+    Exact similarity between a query genome and every row of a genome matrix
+
+    Matches the per-pair scores of SimilarityCalculator for the same metric.
+
+    Args:
+        vectors: Genome matrix (n_clients x 50)
+        query: Query genome vector (50-dimensional)
+        metric: Similarity metric ('cosine', 'euclidean', 'manhattan'); unknown metrics use cosine
+
+    Returns:
+        np.ndarray: Similarity score per row (0-1, where 1 is identical)
+    """
+    vectors = np.asarray(vectors, dtype=np.float64)
+    query = np.asarray(query, dtype=np.float64).ravel()
+
+    if metric == 'euclidean':
+        distances = np.sqrt(np.sum((vectors - query) ** 2, axis=1))
+        return np.clip(np.exp(-distances / DISTANCE_SCALE), 0, 1)
+    if metric == 'manhattan':
+        distances = np.sum(np.abs(vectors - query), axis=1)
+        return np.clip(np.exp(-distances / DISTANCE_SCALE), 0, 1)
+
+    # Cosine similarity; zero vectors score 0 as with sklearn's cosine_similarity
+    denominator = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+    similarities = np.divide(vectors @ query, denominator, out=np.zeros(len(vectors)), where=denominator > 0)
+    return np.clip(similarities, 0, 1)
+
+
+class GenomeMatrix:
+    """Contiguous float32 genome storage with a client ID to row mapping"""
+
+    def __init__(self, dimensions: int = GENOME_SIZE, initial_capacity: int = 1024):
+        """
+        Initialize the genome matrix
+
+        Args:
+            dimensions: Genome vector length
+            initial_capacity: Rows allocated up front; capacity doubles as clients are added
+        """
+        self.dimensions = dimensions
+        self._vectors = np.zeros((max(initial_capacity, 1), dimensions), dtype=np.float32)
+        self._norms = np.zeros(max(initial_capacity, 1), dtype=np.float32)
+        self._client_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._client_ids)
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self._rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """View of the stored genomes, one row per client"""
+        return self._vectors[:len(self._client_ids)]
+
+    @property
+    def norms(self) -> np.ndarray:
+        """L2 norm of each stored genome"""
+        return self._norms[:len(self._client_ids)]
+
+    @property
+    def capacity(self) -> int:
+        """Rows allocated in the backing arrays"""
+        return len(self._vectors)
+
+    @property
+    def client_ids(self) -> List[str]:
+        """Client IDs in row order"""
+        return self._client_ids
+
+    def row(self, client_id: str) -> int:
+        """Row index of a client's genome"""
+        return self._rows[client_id]
+
+    def upsert(self, client_genomes: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Insert new genomes and overwrite existing ones in place
+
+        Args:
+            client_genomes: Dictionary mapping client IDs to genome vectors
+
+        Returns:
+            np.ndarray: Row index written for each input genome
+        """
+        if not client_genomes:
+            return np.array([], dtype=np.int64)
+
+        block = np.asarray(list(client_genomes.values()), dtype=np.float32)
+        if block.ndim != 2 or block.shape[1] != self.dimensions:
+            raise ValueError(f"Expected genomes of length {self.dimensions}, got shape {block.shape}")
+
+        new_count = sum(1 for client_id in client_genomes if client_id not in self._rows)
+        self._reserve(len(self._client_ids) + new_count)
+
+        rows = np.empty(len(client_genomes), dtype=np.int64)
+        for i, client_id in enumerate(client_genomes):
+            row = self._rows.get(client_id)
+            if row is None:
+                row = len(self._client_ids)
+                self._rows[client_id] = row
+                self._client_ids.append(client_id)
+            rows[i] = row
+
+        self._vectors[rows] = block
+        self._norms[rows] = np.linalg.norm(block, axis=1)
+        return rows
+
+    def remove(self, client_id: str) -> Tuple[int, int]:
+        """
+        Remove a genome by moving the last row into its slot
+
+        Args:
+            client_id: Client identifier
+
+        Returns:
+            Tuple[int, int]: (row that was vacated, row that was moved into it)
+        """
+        row = self._rows.pop(client_id)
+        last = len(self._client_ids) - 1
+        if row != last:
+            moved_id = self._client_ids[last]
+            self._vectors[row] = self._vectors[last]
+            self._norms[row] = self._norms[last]
+            self._client_ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._client_ids.pop()
+        return row, last
+
+    def clear(self):
+        """Remove all genomes while keeping the allocated capacity"""
+        self._client_ids = []
+        self._rows = {}
+
+    def _reserve(self, size: int):
+        """Grow the backing arrays geometrically so appends stay amortized O(1)"""
+        capacity = len(self._vectors)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        vectors = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        norms = np.zeros(capacity, dtype=np.float32)
+        count = len(self._client_ids)
+        vectors[:count] = self._vectors[:count]
+        norms[:count] = self._norms[:count]
+        self._vectors = vectors
+        self._norms = norms
+
+
+class GenomeIndex:
+    """Exact top-k genome search with one BLAS matrix-vector product per query"""
+
+    def __init__(self, dimensions: int = GENOME_SIZE):
+        """
+        Initialize the genome index
+
+        Args:
+            dimensions: Genome vector length
+        """
+        self.matrix = GenomeMatrix(dimensions)
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self.matrix
+
+    def add(self, client_genomes: Dict[str, np.ndarray]):
+        """
+        Add or update genomes in the index
+
+        Args:
+            client_genomes: Dictionary mapping client IDs to genome vectors
+        """
+        rows = self.matrix.upsert(client_genomes)
+        self._on_rows_written(rows)
+
+    def remove(self, client_ids: Iterable[str]):
+        """
+        Remove genomes from the index
+
+        Args:
+            client_ids: Client identifiers to remove; unknown IDs are ignored
+        """
+        for client_id in client_ids:
+            if client_id in self.matrix:
+                row, moved_from = self.matrix.remove(client_id)
+                self._on_row_moved(row, moved_from)
+
+    def rebuild(self, client_genomes: Dict[str, np.ndarray]):
+        """
+        Replace the indexed genomes
+
+        Args:
+            client_genomes: Dictionary mapping client IDs to genome vectors
+        """
+        self.matrix.clear()
+        self._on_cleared()
+        self.add(client_genomes)
+
+    def search(self, query: np.ndarray, top_k: int = 5, metric: str = 'cosine') -> List[Tuple[str, float]]:
+        """
+        Find the indexed genomes most similar to a query genome
+
+        Args:
+            query: Query genome vector (50-dimensional)
+            top_k: Number of most similar clients to return
+            metric: Similarity metric ('cosine', 'euclidean', 'manhattan')
+
+        Returns:
+            List[Tuple[str, float]]: List of (client_id, similarity_score) tuples, sorted by similarity
+        """
+        if len(self.matrix) == 0 or top_k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32).ravel()
+        rows = self._candidate_rows(query, metric)
+        if rows is None:
+            rows = np.arange(len(self.matrix))
+        if len(rows) == 0:
+            return []
+
+        # Cheap float32 pass over the candidates, then exact scores for the shortlist
+        scores = self._scan_scores(rows, query, metric)
+        shortlist = rows[self._top_positions(scores, top_k + REFINE_MARGIN)]
+        exact = genome_similarities(self.matrix.vectors[shortlist], query, metric)
+        order = np.lexsort((shortlist, -exact))[:top_k]
+
+        client_ids = self.matrix.client_ids
+        return [(client_ids[shortlist[i]], float(exact[i])) for i in order]
+
+    def _scan_scores(self, rows: np.ndarray, query: np.ndarray, metric: str) -> np.ndarray:
+        """Monotonic proxy for the similarity of each candidate row"""
+        vectors = self.matrix.vectors
+        if len(rows) < len(self.matrix):
+            vectors = vectors[rows]
+            norms = self.matrix.norms[rows]
+        else:
+            norms = self.matrix.norms
+
+        if metric == 'euclidean':
+            # Negative squared distance via |x|^2 - 2x.q (|q|^2 is constant per query)
+            return 2 * (vectors @ query) - norms ** 2
+        if metric == 'manhattan':
+            return -np.sum(np.abs(vectors - query), axis=1)
+        return np.divide(vectors @ query, norms, out=np.zeros(len(rows), dtype=np.float32), where=norms > 0)
+
+    @staticmethod
+    def _top_positions(scores: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the k highest scores, preferring earlier positions on ties (unordered)"""
+        if k >= len(scores):
+            return np.arange(len(scores))
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        return np.concatenate([above, ties])
+
+    def _candidate_rows(self, query: np.ndarray, metric: str) -> Optional[np.ndarray]:
+        """Rows worth scoring for a query; None scans every row"""
+        return None
+
+    def _on_rows_written(self, rows: np.ndarray):
+        pass
+
+    def _on_row_moved(self, row: int, moved_from: int):
+        pass
+
+    def _on_cleared(self):
+        pass
+
+
+class IVFGenomeIndex(GenomeIndex):
+    """Approximate genome search that scans only the genomes in the closest k-means partitions"""
+
+    def __init__(self, dimensions: int = GENOME_SIZE, n_lists: Optional[int] = None,
+                 n_probe: int = 8, min_train_size: int = 10000, random_state: int = 42):
+        """
+        Initialize the approximate index
+
+        Args:
+            dimensions: Genome vector length
+            n_lists: Number of partitions (defaults to sqrt of the indexed clients)
+            n_probe: Partitions scanned per query
+            min_train_size: Below this many genomes every query is answered exactly
+            random_state: Random seed for k-means
+        """
+        super().__init__(dimensions)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.random_state = random_state
+        self.centroids = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+
+    def train(self):
+        """Fit the partition centroids on the indexed genomes and assign every row"""
+        vectors = self.matrix.vectors
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(vectors))))
+        kmeans = MiniBatchKMeans(
+            n_clusters=min(n_lists, len(vectors)), random_state=self.random_state,
+            batch_size=4096, n_init=3
+        )
+        kmeans.fit(vectors)
+        self.centroids = kmeans.cluster_centers_.astype(np.float32)
+        self._trained_size = len(vectors)
+        self._assignments = np.zeros(self.matrix.capacity, dtype=np.int32)
+        self._assignments[:len(vectors)] = self._assign(vectors)
+        logger.info(f"Trained genome IVF index with {len(self.centroids)} partitions over {len(vectors)} clients")
+
+    def _candidate_rows(self, query: np.ndarray, metric: str) -> Optional[np.ndarray]:
+        if len(self.matrix) < self.min_train_size:
+            return None
+        if self.centroids is None or len(self.matrix) >= 2 * self._trained_size:
+            self.train()
+
+        centroid_scores = genome_similarities(self.centroids, query, metric)
+        probed = np.zeros(len(self.centroids), dtype=bool)
+        probed[self._top_positions(centroid_scores, self.n_probe)] = True
+        return np.flatnonzero(probed[self._assignments[:len(self.matrix)]])
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest centroid for each genome"""
+        distances = (
+            np.sum(vectors ** 2, axis=1, keepdims=True)
+            - 2 * vectors @ self.centroids.T
+            + np.sum(self.centroids ** 2, axis=1)
+        )
+        return np.argmin(distances, axis=1).astype(np.int32)
+
+    def _on_rows_written(self, rows: np.ndarray):
+        if self.centroids is None or len(rows) == 0:
+            return
+        if len(self._assignments) < self.matrix.capacity:
+            assignments = np.zeros(self.matrix.capacity, dtype=np.int32)
+            assignments[:len(self._assignments)] = self._assignments
+            self._assignments = assignments
+        self._assignments[rows] = self._assign(self.matrix.vectors[rows])
+
+    def _on_row_moved(self, row: int, moved_from: int):
+        if self.centroids is not None:
+            self._assignments[row] = self._assignments[moved_from]
+
+    def _on_cleared(self):
+        self.centroids = None
+        self._trained_size = 0
+
+
+GENOME_INDEX_TYPES = {
+    'exact': GenomeIndex,
+    'ivf': IVFGenomeIndex,
+}
+
+
+def create_genome_index(index_type: str = 'exact', **kwargs) -> GenomeIndex:
+    """
+    Create a genome index by name
+
+    Args:
+        index_type: 'exact' for brute-force BLAS search or 'ivf' for approximate partitioned search
+        **kwargs: Additional arguments for the index class
+
+    Returns:
+        GenomeIndex: Empty genome index
+    """
+    if index_type not in GENOME_INDEX_TYPES:
+        raise ValueError(f"Unknown genome index type: {index_type}")
+    return GENOME_INDEX_TYPES[index_type](**kwargs)
@@ -13,21 +13,105 @@ from .genome_creator import GenomeCreator
 from .similarity_calculator import SimilarityCalculator
 from .clustering_engine import ClientClusteringEngine, perform_client_clustering
 from .comparison_tools import GenomeComparisonTools
+from .genome_index import GenomeIndex, create_genome_index
 
 logger = logging.getLogger(__name__)
 
 
+class GenomeDatabase(dict):
+    """Client ID -> genome dictionary that records which clients were written since the last index sync"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dirty = set(self.keys())
+    
+    def __setitem__(self, client_id, genome):
+        super().__setitem__(client_id, genome)
+        self.dirty.add(client_id)
+    
+    def __delitem__(self, client_id):
+        super().__delitem__(client_id)
+        self.dirty.add(client_id)
+    
+    def update(self, *args, **kwargs):
+        for client_id, genome in dict(*args, **kwargs).items():
+            self[client_id] = genome
+    
+    def setdefault(self, client_id, default=None):
+        if client_id not in self:
+            self[client_id] = default
+        return self[client_id]
+    
+    def pop(self, client_id, *default):
+        if client_id in self:
+            self.dirty.add(client_id)
+        return super().pop(client_id, *default)
+    
+    def popitem(self):
+        client_id, genome = super().popitem()
+        self.dirty.add(client_id)
+        return client_id, genome
+    
+    def clear(self):
+        self.dirty.update(self.keys())
+        super().clear()
+
+
 class GenomeOrchestrator:
     """Orchestrates all components of the Client Profitability Genome system"""
     
-    def __init__(self):
-        """Initialize the Genome Orchestrator"""
+    def __init__(self, index_type: str = 'exact'):
+        """
+        Initialize the Genome Orchestrator
+        
+        Args:
+            index_type: Nearest-neighbour index for similarity search ('exact' or 'ivf')
+        """
         self.genome_creator = GenomeCreator()
         self.similarity_calculator = SimilarityCalculator()
         self.clustering_engine = ClientClusteringEngine()
         self.comparison_tools = GenomeComparisonTools()
+        self.genome_index: GenomeIndex = create_genome_index(index_type)
         self.genome_database = {}
         self.processing_history = []
+    
+    @property
+    def genome_database(self) -> Dict[str, np.ndarray]:
+        """Dictionary mapping client IDs to genome vectors"""
+        return self._genome_database
+    
+    @genome_database.setter
+    def genome_database(self, client_genomes: Dict[str, np.ndarray]):
+        self._genome_database = GenomeDatabase(client_genomes)
+        self.genome_index.rebuild(self._genome_database)
+        self._genome_database.dirty.clear()
+    
+    def remove_clients(self, client_ids: List[str]):
+        """
+        Remove clients from the genome database and similarity index
+        
+        Args:
+            client_ids: Client identifiers to remove
+        """
+        for client_id in client_ids:
+            self._genome_database.pop(client_id, None)
+        self._sync_genome_index()
+    
+    def _sync_genome_index(self):
+        """Apply genome database writes made since the last sync (including direct edits) to the index"""
+        dirty = self._genome_database.dirty
+        if not dirty:
+            return
+        written = {
+            client_id: self._genome_database[client_id]
+            for client_id in dirty if client_id in self._genome_database
+        }
+        removed = [client_id for client_id in dirty if client_id not in self._genome_database]
+        if written:
+            self.genome_index.add(written)
+        if removed:
+            self.genome_index.remove(removed)
+        dirty.clear()
         
     def process_client_data(self, clients_data: pd.DataFrame) -> Dict[str, np.ndarray]:
         """
@@ -46,8 +130,9 @@ class GenomeOrchestrator:
             # Step 1: Create genome vectors
             client_genomes = self.genome_creator.create_genomes_for_clients(clients_data)
             
-            # Store in database
-            self.genome_database.update(client_genomes)
+            # Store in database and update the similarity index incrementally
+            self._genome_database.update(client_genomes)
+            self._sync_genome_index()
             
             # Record processing
             processing_record = {
@@ -207,10 +292,9 @@ class GenomeOrchestrator:
             # Get target genome
             target_genome = self.genome_database[target_client_id]
             
-            # Find similar clients
-            similar_clients = self.similarity_calculator.find_most_similar_clients(
-                target_genome, self.genome_database, top_k, metric
-            )
+            # Find similar clients with the genome index
+            self._sync_genome_index()
+            similar_clients = self.genome_index.search(target_genome, top_k, metric)
             
             return similar_clients
             
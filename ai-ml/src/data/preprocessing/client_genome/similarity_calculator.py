@@ -10,6 +10,8 @@ from scipy.spatial.distance import cosine, euclidean, cityblock
 from scipy.spatial import distance
 from sklearn.metrics.pairwise import cosine_similarity
 
+from .genome_index import genome_similarities
+
 logger = logging.getLogger(__name__)
 
 
@@ -253,26 +255,18 @@ class SimilarityCalculator:
             List[Tuple[str, float]]: List of (client_id, similarity_score) tuples, sorted by similarity
         """
         try:
-            similarities = []
+            if not client_genomes or top_k <= 0:
+                return []
             
-            for client_id, genome in client_genomes.items():
-                if metric == 'cosine':
-                    similarity = self.calculate_cosine_similarity(target_genome, genome)
-                elif metric == 'euclidean':
-                    similarity = self.calculate_euclidean_similarity(target_genome, genome)
-                elif metric == 'manhattan':
-                    similarity = self.calculate_manhattan_similarity(target_genome, genome)
-                else:
-                    # Default to cosine similarity
-                    similarity = self.calculate_cosine_similarity(target_genome, genome)
-                
-                similarities.append((client_id, similarity))
+            # Score every client in one vectorized pass over the stacked genomes
+            client_ids = list(client_genomes.keys())
+            similarities = genome_similarities(np.array(list(client_genomes.values())), target_genome, metric)
             
-            # Sort by similarity (descending order)
-            similarities.sort(key=lambda x: x[1], reverse=True)
+            # Sort by similarity (descending order), keeping input order for ties
+            order = np.lexsort((np.arange(len(client_ids)), -similarities))[:top_k]
             
             # Return top K results
-            return similarities[:top_k]
+            return [(client_ids[i], float(similarities[i])) for i in order]
         except Exception as e:
             logger.error(f"Error finding most similar clients: {e}")
             return []
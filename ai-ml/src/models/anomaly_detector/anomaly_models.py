@@ -13,6 +13,8 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.utils.lazy_imports import lazy_import
+
 # Conditional imports for ML libraries
 try:
     from sklearn.svm import OneClassSVM
@@ -27,9 +29,12 @@ except ImportError:
 
 try:
     from sklearn.cluster import DBSCAN
+    from sklearn.neighbors import KDTree, BallTree
     SKLEARN_CLUSTER_AVAILABLE = True
 except ImportError:
     DBSCAN = None
+    KDTree = None
+    BallTree = None
     SKLEARN_CLUSTER_AVAILABLE = False
 
 try:
@@ -40,9 +45,9 @@ except ImportError:
     SKLEARN_ENSEMBLE_AVAILABLE = False
 
 try:
-    import tensorflow as tf
-    from tensorflow import keras
-    from tensorflow.keras import layers
+    tf = lazy_import("tensorflow")
+    keras = lazy_import("tensorflow.keras")
+    layers = lazy_import("tensorflow.keras.layers")
     TENSORFLOW_AVAILABLE = True
 except ImportError:
     tf = None
@@ -52,6 +57,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Above this many features DBSCAN core samples are indexed with a ball tree instead of a KD-tree
+KD_TREE_MAX_DIMENSIONS = 20
+
 
 class OneClassSVMModel:
     """One-Class SVM implementation for anomaly detection"""
@@ -173,6 +181,36 @@ class OneClassSVMModel:
             logger.error(f"Error getting anomaly scores from One-Class SVM model: {e}")
             return np.zeros(len(X)) if len(X) > 0 else np.array([])
 
+    def score(self, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get predictions and anomaly scores from a single decision function pass
+
+        Args:
+            X: Data to score
+
+        Returns:
+            Tuple of (predictions, anomaly scores) as returned by predict and anomaly_scores
+        """
+        try:
+            if not self.is_trained or self.model is None:
+                logger.warning("Model not trained, returning mock predictions")
+                return np.ones(len(X)), np.zeros(len(X))
+
+            # Scale features
+            if self.scaler is not None:
+                X_scaled = self.scaler.transform(X)
+            else:
+                X_scaled = X.values if hasattr(X, 'values') else X
+
+            # libsvm labels a sample an inlier when its decision value is positive
+            scores = self.model.decision_function(X_scaled)
+            predictions = np.where(scores > 0, 1, -1)
+            return predictions, scores
+
+        except Exception as e:
+            logger.error(f"Error scoring with One-Class SVM model: {e}")
+            return np.ones(len(X)), np.zeros(len(X))
+
     def save(self, path: str) -> bool:
         try:
             data = {
@@ -219,6 +257,8 @@ class DBSCANModel:
         self.scaler = StandardScaler() if StandardScaler else None
         self.feature_names = None
         self.is_trained = False
+        self._core_tree = None
+        self._core_labels = np.array([], dtype=int)
         self.available = SKLEARN_CLUSTER_AVAILABLE and DBSCAN is not None
         logger.info("DBSCAN Model initialized")
     
@@ -253,6 +293,7 @@ class DBSCANModel:
             # Initialize and train model
             self.model = DBSCAN(eps=self.eps, min_samples=self.min_samples)
             cluster_labels = self.model.fit_predict(X_scaled)
+            self._build_core_index()
             
             self.is_trained = True
             logger.info(f"DBSCAN model trained successfully with {len(set(cluster_labels)) - (1 if -1 in cluster_labels else 0)} clusters")
@@ -262,6 +303,43 @@ class DBSCANModel:
             logger.error(f"Error training DBSCAN model: {e}")
             return False
     
+    def _build_core_index(self):
+        """Index the fitted core samples so new points are labelled without refitting"""
+        components = getattr(self.model, 'components_', None)
+        if components is None or len(components) == 0:
+            self._core_tree = None
+            self._core_labels = np.array([], dtype=int)
+            return
+        
+        # KD-trees degrade in high dimensions, where a ball tree prunes better
+        tree_class = KDTree if components.shape[1] <= KD_TREE_MAX_DIMENSIONS else BallTree
+        self._core_tree = tree_class(components)
+        self._core_labels = self.model.labels_[self.model.core_sample_indices_]
+    
+    def _nearest_core(self, X_scaled: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the nearest fitted core sample for each point
+        
+        A point joins the cluster of its nearest core sample when that sample lies
+        within eps, and is noise otherwise, matching how DBSCAN labels border points.
+        
+        Args:
+            X_scaled: Scaled data
+            
+        Returns:
+            Tuple of (distance to nearest core sample, cluster label or -1 for noise)
+        """
+        if getattr(self, '_core_tree', None) is None:
+            # Also covers models pickled before the index existed
+            self._build_core_index()
+        if self._core_tree is None:
+            return np.full(len(X_scaled), np.inf), np.full(len(X_scaled), -1)
+        
+        distances, indices = self._core_tree.query(X_scaled, k=1)
+        distances = distances[:, 0]
+        cluster_labels = np.where(distances <= self.eps, self._core_labels[indices[:, 0]], -1)
+        return distances, cluster_labels
+    
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         """
         Predict anomalies using the trained model
@@ -283,8 +361,8 @@ class DBSCANModel:
             else:
                 X_scaled = X.values if hasattr(X, 'values') else X
             
-            # Predict cluster labels
-            cluster_labels = self.model.fit_predict(X_scaled)
+            # Label against the fitted core samples instead of re-clustering the batch
+            _, cluster_labels = self._nearest_core(X_scaled)
             
             # Anomalies are points labeled as noise (-1)
             predictions = np.where(cluster_labels == -1, -1, 1)
@@ -315,25 +393,43 @@ class DBSCANModel:
             else:
                 X_scaled = X.values if hasattr(X, 'values') else X
             
-            # For DBSCAN, we'll use the distance to the nearest core point as anomaly score
-            # This is a simplified approach
-            try:
-                if hasattr(self.model, 'components_') and len(self.model.components_) > 0:
-                    # Calculate distances to core points
-                    from sklearn.metrics.pairwise import euclidean_distances
-                    distances = euclidean_distances(X_scaled, self.model.components_)
-                    min_distances = np.min(distances, axis=1)
-                    return min_distances
-                else:
-                    return np.zeros(len(X))
-            except Exception as e:
-                logger.warning(f"Error calculating DBSCAN distances: {e}")
-                return np.zeros(len(X))
+            # Distance to the nearest fitted core sample is the anomaly score
+            distances, _ = self._nearest_core(X_scaled)
+            return np.where(np.isfinite(distances), distances, 0.0)
             
         except Exception as e:
             logger.error(f"Error getting anomaly scores from DBSCAN model: {e}")
             return np.zeros(len(X)) if len(X) > 0 else np.array([])
 
+    def score(self, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get predictions and anomaly scores from a single core sample lookup
+
+        Args:
+            X: Data to score
+
+        Returns:
+            Tuple of (predictions, anomaly scores) as returned by predict and anomaly_scores
+        """
+        try:
+            if not self.is_trained or self.model is None:
+                logger.warning("Model not trained, returning mock predictions")
+                return np.ones(len(X)), np.zeros(len(X))
+
+            # Scale features
+            if self.scaler is not None:
+                X_scaled = self.scaler.transform(X)
+            else:
+                X_scaled = X.values if hasattr(X, 'values') else X
+
+            distances, cluster_labels = self._nearest_core(X_scaled)
+            predictions = np.where(cluster_labels == -1, -1, 1)
+            return predictions, np.where(np.isfinite(distances), distances, 0.0)
+
+        except Exception as e:
+            logger.error(f"Error scoring with DBSCAN model: {e}")
+            return np.ones(len(X)), np.zeros(len(X))
+
     def save(self, path: str) -> bool:
         try:
             data = {
@@ -356,6 +452,7 @@ class DBSCANModel:
             self.eps = data['eps']; self.min_samples = data['min_samples']
             self.model = data['model']; self.scaler = data['scaler']
             self.feature_names = data['feature_names']; self.is_trained = data['is_trained']
+            self._build_core_index()
             logger.info(f"DBSCAN loaded from {path}")
             return True
         except Exception as e:
@@ -539,6 +636,19 @@ class StatisticalAnomalyDetector:
         except Exception as e:
             logger.error(f"Error getting statistical anomaly scores: {e}")
             return np.zeros(len(X)) if len(X) > 0 else np.array([])
+
+    def score(self, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get predictions and anomaly scores in one call
+
+        Args:
+            X: Data to score
+
+        Returns:
+            Tuple of (predictions, anomaly scores) as returned by predict and anomaly_scores
+        """
+        # Both are column-wise comparisons against the fitted statistics, so no model pass is shared
+        return self.predict(X), self.anomaly_scores(X)
     
     def _zscore_scores(self, X: pd.DataFrame) -> np.ndarray:
         """Calculate Z-score based anomaly scores"""
@@ -923,6 +1033,37 @@ class MachineLearningAnomalyDetector:
             logger.error(f"Error getting Autoencoder scores: {e}")
             return np.zeros(len(X))
 
+    def score(self, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get predictions and anomaly scores from a single model pass
+
+        Args:
+            X: Data to score
+
+        Returns:
+            Tuple of (predictions, anomaly scores) as returned by predict and anomaly_scores
+        """
+        try:
+            if not self.is_trained or self.model is None:
+                logger.warning("Model not trained, returning mock predictions")
+                return np.ones(len(X)), np.zeros(len(X))
+
+            if self.model_type == 'isolation_forest':
+                # IsolationForest.predict flags negative decision values as anomalies
+                scores = self._scores_isolation_forest(X)
+                return np.where(scores < 0, -1, 1), scores
+            elif self.model_type == 'autoencoder':
+                # Reconstruction error, with the top 10% flagged as in _predict_autoencoder
+                scores = self._scores_autoencoder(X)
+                threshold = np.percentile(scores, 90) if len(scores) > 0 else 0.0
+                return np.where(scores > threshold, -1, 1), scores
+            else:
+                return np.ones(len(X)), np.zeros(len(X))
+
+        except Exception as e:
+            logger.error(f"Error scoring with {self.model_type} model: {e}")
+            return np.ones(len(X)), np.zeros(len(X))
+
     def save(self, path: str) -> bool:
         try:
             if self.model_type == 'autoencoder' and self.model is not None:
@@ -1023,6 +1164,76 @@ class EnsembleAnomalyDetector:
             logger.error(f"Error training ensemble model: {e}")
             return False
     
+    def score_members(self, X: pd.DataFrame) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Run every ensemble member exactly once on the data
+
+        Args:
+            X: Data to score
+
+        Returns:
+            Dictionary mapping model name to its 'predictions' and raw 'scores'
+        """
+        results = {}
+        for model_name, model in self.models.items():
+            try:
+                predictions, scores = model.score(X)
+            except Exception as e:
+                logger.warning(f"Error scoring with {model_name} model: {e}")
+                predictions, scores = np.ones(len(X)), np.zeros(len(X))
+            results[model_name] = {'predictions': predictions, 'scores': scores}
+        return results
+    
+    def combine(self, member_results: Dict[str, Dict[str, np.ndarray]]) -> np.ndarray:
+        """
+        Combine precomputed member results based on the voting method
+        
+        Args:
+            member_results: Output of score_members
+            
+        Returns:
+            Array of anomaly predictions (-1 for anomaly, 1 for normal)
+        """
+        predictions = {name: result['predictions'] for name, result in member_results.items()}
+        if self.voting_method == 'majority':
+            return self._majority_voting(predictions)
+        elif self.voting_method == 'weighted':
+            return self._weighted_voting(predictions)
+        elif self.voting_method == 'average':
+            return self._average_scores({name: result['scores'] for name, result in member_results.items()})
+        else:
+            # Default to majority voting
+            return self._majority_voting(predictions)
+    
+    def detect(self, X: pd.DataFrame,
+               member_results: Optional[Dict[str, Dict[str, np.ndarray]]] = None) -> Dict[str, Any]:
+        """
+        Score every member once and derive the ensemble decision and contributions from it
+        
+        Args:
+            X: Data to detect anomalies in
+            member_results: score_members output already computed for X by these same members
+            
+        Returns:
+            Dictionary with per-model 'members' results, ensemble 'predictions' and 'contributions'
+        """
+        members = member_results if member_results is not None else self.score_members(X)
+        if not self.is_trained:
+            logger.warning("Ensemble model not trained, returning mock predictions")
+            return {'members': members, 'predictions': np.ones(len(X)), 'contributions': {}}
+        
+        try:
+            predictions = self.combine(members)
+        except Exception as e:
+            logger.error(f"Error predicting with ensemble model: {e}")
+            predictions = np.ones(len(X))
+        
+        return {
+            'members': members,
+            'predictions': predictions,
+            'contributions': self._model_contributions(members)
+        }
+    
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         """
         Predict anomalies using ensemble of models
@@ -1038,47 +1249,7 @@ class EnsembleAnomalyDetector:
                 logger.warning("Ensemble model not trained, returning mock predictions")
                 return np.ones(len(X)) if len(X) > 0 else np.array([])
             
-            # Get predictions from all models
-            predictions = {}
-            
-            # One-Class SVM predictions
-            try:
-                predictions['one_class_svm'] = self.models['one_class_svm'].predict(X)
-            except Exception as e:
-                logger.warning(f"Error getting One-Class SVM predictions: {e}")
-                predictions['one_class_svm'] = np.ones(len(X)) if len(X) > 0 else np.array([])
-            
-            # DBSCAN predictions
-            try:
-                predictions['dbscan'] = self.models['dbscan'].predict(X)
-            except Exception as e:
-                logger.warning(f"Error getting DBSCAN predictions: {e}")
-                predictions['dbscan'] = np.ones(len(X)) if len(X) > 0 else np.array([])
-            
-            # Statistical detector predictions
-            try:
-                predictions['statistical'] = self.models['statistical'].predict(X)
-            except Exception as e:
-                logger.warning(f"Error getting statistical predictions: {e}")
-                predictions['statistical'] = np.ones(len(X)) if len(X) > 0 else np.array([])
-            
-            # ML detector predictions
-            try:
-                predictions['ml'] = self.models['ml'].predict(X)
-            except Exception as e:
-                logger.warning(f"Error getting ML predictions: {e}")
-                predictions['ml'] = np.ones(len(X)) if len(X) > 0 else np.array([])
-            
-            # Combine predictions based on voting method
-            if self.voting_method == 'majority':
-                return self._majority_voting(predictions)
-            elif self.voting_method == 'weighted':
-                return self._weighted_voting(predictions)
-            elif self.voting_method == 'average':
-                return self._average_scores(predictions)
-            else:
-                # Default to majority voting
-                return self._majority_voting(predictions)
+            return self.combine(self.score_members(X))
                 
         except Exception as e:
             logger.error(f"Error predicting with ensemble model: {e}")
@@ -1128,64 +1299,38 @@ class EnsembleAnomalyDetector:
             logger.error(f"Error in weighted voting: {e}")
             return np.ones(len(predictions[list(predictions.keys())[0]])) if predictions else np.array([])
     
-    def _average_scores(self, predictions: Dict[str, np.ndarray]) -> np.ndarray:
-        """Combine predictions by averaging anomaly scores"""
+    def _average_scores(self, scores: Dict[str, np.ndarray]) -> np.ndarray:
+        """Combine predictions by averaging normalized member anomaly scores"""
         try:
-            # Get scores from all models
-            scores = {}
-            
-            # One-Class SVM scores
-            try:
-                svm_scores = self.models['one_class_svm'].anomaly_scores(predictions[list(predictions.keys())[0]])
-                # Normalize SVM scores to [0,1] where higher means more anomalous
-                scores['one_class_svm'] = (svm_scores - np.min(svm_scores)) / (np.max(svm_scores) - np.min(svm_scores) + 1e-8)
-            except Exception as e:
-                logger.warning(f"Error getting One-Class SVM scores: {e}")
-                scores['one_class_svm'] = np.zeros(len(predictions[list(predictions.keys())[0]])) if predictions else np.array([])
-            
-            # DBSCAN scores
-            try:
-                dbscan_scores = self.models['dbscan'].anomaly_scores(predictions[list(predictions.keys())[0]])
-                # DBSCAN scores are already distances (higher means more anomalous)
-                scores['dbscan'] = dbscan_scores
-                # Normalize if not all zeros
-                if len(dbscan_scores) > 0 and np.max(dbscan_scores) > 0:
-                    scores['dbscan'] = dbscan_scores / np.max(dbscan_scores)
-            except Exception as e:
-                logger.warning(f"Error getting DBSCAN scores: {e}")
-                scores['dbscan'] = np.zeros(len(predictions[list(predictions.keys())[0]])) if predictions else np.array([])
-            
-            # Statistical scores
-            try:
-                statistical_scores = self.models['statistical'].anomaly_scores(predictions[list(predictions.keys())[0]])
-                # Statistical scores are already normalized
-                scores['statistical'] = statistical_scores
-            except Exception as e:
-                logger.warning(f"Error getting statistical scores: {e}")
-                scores['statistical'] = np.zeros(len(predictions[list(predictions.keys())[0]])) if predictions else np.array([])
-            
-            # ML scores
-            try:
-                ml_scores = self.models['ml'].anomaly_scores(predictions[list(predictions.keys())[0]])
-                # Normalize ML scores to [0,1]
-                if len(ml_scores) > 0 and np.max(ml_scores) > np.min(ml_scores):
-                    scores['ml'] = (ml_scores - np.min(ml_scores)) / (np.max(ml_scores) - np.min(ml_scores) + 1e-8)
+            # Inlier-positive decision functions are flipped so higher means more anomalous
+            inverted = {'one_class_svm'}
+            if getattr(self.models.get('ml'), 'model_type', None) == 'isolation_forest':
+                inverted.add('ml')
+            
+            normalized = []
+            for model_name, model_scores in scores.items():
+                model_scores = np.asarray(model_scores, dtype=float)
+                if model_name in inverted:
+                    model_scores = -model_scores
+                if model_name == 'statistical':
+                    # Statistical scores are already normalized
+                    normalized.append(model_scores)
+                    continue
+                score_range = np.max(model_scores) - np.min(model_scores) if len(model_scores) > 0 else 0.0
+                if score_range > 0:
+                    normalized.append((model_scores - np.min(model_scores)) / (score_range + 1e-8))
                 else:
-                    scores['ml'] = np.zeros(len(ml_scores))
-            except Exception as e:
-                logger.warning(f"Error getting ML scores: {e}")
-                scores['ml'] = np.zeros(len(predictions[list(predictions.keys())[0]])) if predictions else np.array([])
+                    normalized.append(np.zeros(len(model_scores)))
             
             # Average scores
-            score_matrix = np.array([scores[key] for key in scores.keys()])
-            average_scores = np.mean(score_matrix, axis=0)
+            average_scores = np.mean(np.array(normalized), axis=0)
             
             # Threshold at 0.5 for anomaly classification
             ensemble_predictions = np.where(average_scores > 0.5, -1, 1)
             return ensemble_predictions
         except Exception as e:
             logger.error(f"Error in average scores: {e}")
-            return np.ones(len(predictions[list(predictions.keys())[0]])) if predictions else np.array([])
+            return np.ones(len(scores[list(scores.keys())[0]])) if scores else np.array([])
     
     def get_model_contributions(self, X: pd.DataFrame) -> Dict[str, float]:
         """
@@ -1201,19 +1346,21 @@ class EnsembleAnomalyDetector:
             if not self.is_trained:
                 return {}
             
-            # Get predictions from all models
-            predictions = {}
-            predictions['one_class_svm'] = self.models['one_class_svm'].predict(X)
-            predictions['dbscan'] = self.models['dbscan'].predict(X)
-            predictions['statistical'] = self.models['statistical'].predict(X)
-            predictions['ml'] = self.models['ml'].predict(X)
+            return self._model_contributions(self.score_members(X))
             
+        except Exception as e:
+            logger.error(f"Error getting model contributions: {e}")
+            return {}
+    
+    def _model_contributions(self, member_results: Dict[str, Dict[str, np.ndarray]]) -> Dict[str, float]:
+        """Share of all member anomaly flags raised by each model, in percent"""
+        try:
             # Count anomalies detected by each model
             contributions = {}
             total_anomalies = 0
             
-            for model_name, preds in predictions.items():
-                anomaly_count = np.sum(preds == -1)
+            for model_name, result in member_results.items():
+                anomaly_count = np.sum(result['predictions'] == -1)
                 contributions[model_name] = int(anomaly_count)
                 total_anomalies += anomaly_count
             
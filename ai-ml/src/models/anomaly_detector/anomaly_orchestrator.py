@@ -41,14 +41,16 @@ logger = logging.getLogger(__name__)
 class AnomalyDetectorOrchestrator:
     """Main orchestrator for the anomaly detection system"""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None, inference_only: bool = False):
         """
         Initialize the anomaly detector orchestrator
         
         Args:
             config: Configuration dictionary with system parameters
+            inference_only: Refuse to detect unless models were loaded via load_models
         """
         self.config = config or {}
+        self.inference_only = inference_only
         self.is_running = False
         
         # Initialize components
@@ -239,6 +241,15 @@ class AnomalyDetectorOrchestrator:
         except Exception as e:
             logger.error(f"Error stopping real-time detection: {e}")
     
+    def _detectors(self) -> Dict[str, Any]:
+        """Individual detectors reported alongside the ensemble, keyed by result name"""
+        return {
+            'one_class_svm': self.one_class_svm,
+            'dbscan': self.dbscan,
+            'statistical': self.statistical_detector,
+            'ml': self.ml_detector
+        }
+    
     def detect_anomalies(self, data: pd.DataFrame) -> Dict[str, Any]:
         """
         Detect anomalies in the provided data using all models
@@ -254,69 +265,36 @@ class AnomalyDetectorOrchestrator:
                 logger.warning("Empty data provided for anomaly detection")
                 return {}
             
-            # Get predictions from all models
-            results = {}
-            
-            # One-Class SVM
-            try:
-                svm_predictions = self.one_class_svm.predict(data)
-                svm_scores = self.one_class_svm.anomaly_scores(data)
-                results['one_class_svm'] = {
-                    'predictions': svm_predictions,
-                    'scores': svm_scores
+            if self.inference_only and not self.ensemble_detector.is_trained:
+                logger.error("Anomaly models not loaded and training is disabled in inference-only mode")
+                return {
+                    'status': 'model_not_loaded',
+                    'message': 'Anomaly models not loaded; training is disabled in inference-only mode'
                 }
-            except Exception as e:
-                logger.warning(f"Error in One-Class SVM detection: {e}")
-                results['one_class_svm'] = {'predictions': np.ones(len(data)), 'scores': np.zeros(len(data))}
             
-            # DBSCAN
-            try:
-                dbscan_predictions = self.dbscan.predict(data)
-                dbscan_scores = self.dbscan.anomaly_scores(data)
-                results['dbscan'] = {
-                    'predictions': dbscan_predictions,
-                    'scores': dbscan_scores
-                }
-            except Exception as e:
-                logger.warning(f"Error in DBSCAN detection: {e}")
-                results['dbscan'] = {'predictions': np.ones(len(data)), 'scores': np.zeros(len(data))}
-            
-            # Statistical detector
-            try:
-                statistical_predictions = self.statistical_detector.predict(data)
-                statistical_scores = self.statistical_detector.anomaly_scores(data)
-                results['statistical'] = {
-                    'predictions': statistical_predictions,
-                    'scores': statistical_scores
-                }
-            except Exception as e:
-                logger.warning(f"Error in statistical detection: {e}")
-                results['statistical'] = {'predictions': np.ones(len(data)), 'scores': np.zeros(len(data))}
-            
-            # ML detector
-            try:
-                ml_predictions = self.ml_detector.predict(data)
-                ml_scores = self.ml_detector.anomaly_scores(data)
-                results['ml'] = {
-                    'predictions': ml_predictions,
-                    'scores': ml_scores
-                }
-            except Exception as e:
-                logger.warning(f"Error in ML detection: {e}")
-                results['ml'] = {'predictions': np.ones(len(data)), 'scores': np.zeros(len(data))}
-            
-            # Ensemble detector
+            # Score each of the orchestrator's detectors once (predictions and scores from one pass)
+            detectors = self._detectors()
+            results = {}
+            for model_name, detector in detectors.items():
+                try:
+                    predictions, scores = detector.score(data)
+                except Exception as e:
+                    logger.warning(f"Error in {model_name} detection: {e}")
+                    predictions, scores = np.ones(len(data)), np.zeros(len(data))
+                results[model_name] = {'predictions': predictions, 'scores': scores}
+            
+            # The ensemble votes on those results when its members are the same detectors,
+            # otherwise it scores its own members once
+            shared = all(
+                self.ensemble_detector.models.get(model_name) is detector
+                for model_name, detector in detectors.items()
+            )
             try:
-                ensemble_predictions = self.ensemble_detector.predict(data)
-                results['ensemble'] = {
-                    'predictions': ensemble_predictions
-                }
-                
-                # Get model contributions (not stored in results due to type conflicts)
-                contributions = self.ensemble_detector.get_model_contributions(data)
+                detection = self.ensemble_detector.detect(data, member_results=dict(results) if shared else None)
+                results['ensemble'] = {'predictions': detection['predictions']}
             except Exception as e:
                 logger.warning(f"Error in ensemble detection: {e}")
-                results['ensemble'] = {'predictions': np.ones(len(data)), 'contributions': {}}
+                results['ensemble'] = {'predictions': np.ones(len(data))}
             
             # Combine results
             combined_results = self._combine_detection_results(results, data)
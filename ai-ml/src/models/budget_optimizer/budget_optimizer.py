@@ -242,22 +242,17 @@ class BudgetOptimizer:
         try:
             await self.initialize_optimization_algorithms()
             
-            # Define objective function (maximize weighted ROI)
-            def objective_function(allocation):
-                total_value = 0
-                for i, alloc in enumerate(allocation):
-                    if i < len(service_costs):
-                        service = service_costs.iloc[i]
-                        # ROI calculation
-                        roi = (service['market_rate'] - service['unit_cost']) / service['unit_cost']
-                        # Weight by allocation
-                        total_value += roi * alloc
-                return total_value
-            
-            # Define constraint function (budget constraint)
-            def constraint_function(allocation):
-                total_spent = sum(allocation)
-                return total_spent <= total_budget
+            # ROI per service, computed once for the whole run
+            unit_cost = service_costs['unit_cost'].to_numpy(dtype=float)
+            roi = (service_costs['market_rate'].to_numpy(dtype=float) - unit_cost) / unit_cost
+            
+            # Define objective function (maximize weighted ROI) over the whole population
+            def objective_function(population):
+                return population @ roi
+            
+            # Define constraint function (budget constraint) over the whole population
+            def constraint_function(population):
+                return population.sum(axis=1) <= total_budget
             
             # Variable bounds
             variable_bounds = [(0.0, float(total_budget))] * len(service_costs)
@@ -265,7 +260,7 @@ class BudgetOptimizer:
             # Optimize using Genetic Algorithm
             if self.ga_optimizer is not None:
                 ga_results = self.ga_optimizer.optimize_budget_allocation(
-                    objective_function, variable_bounds, constraint_function
+                    objective_function, variable_bounds, constraint_function, vectorized=True
                 )
             else:
                 ga_results = {
@@ -19,6 +19,8 @@ except ImportError:
     SCIPY_AVAILABLE = False
     logging.warning("SciPy not available, some optimization features will be limited")
 
+from .population_engine import PopulationEngine, PopulationEvaluator
+
 logger = logging.getLogger(__name__)
 
 
@@ -115,7 +117,8 @@ class GeneticAlgorithmOptimizer:
     """Genetic Algorithm optimizer for complex budget optimization"""
     
     def __init__(self, population_size: int = 50, generations: int = 100, 
-                 mutation_rate: float = 0.1, crossover_rate: float = 0.8):
+                 mutation_rate: float = 0.1, crossover_rate: float = 0.8,
+                 n_jobs: int = 1, random_state: Optional[int] = None):
         """
         Initialize Genetic Algorithm optimizer
         
@@ -124,16 +127,22 @@ class GeneticAlgorithmOptimizer:
             generations: Number of generations to evolve
             mutation_rate: Probability of mutation
             crossover_rate: Probability of crossover
+            n_jobs: Worker processes for per-individual fitness evaluation (-1 uses all CPUs)
+            random_state: Seed for the random generator
         """
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
+        self.n_jobs = n_jobs
+        self.random_state = random_state
         logger.info("Genetic Algorithm Optimizer initialized")
     
     def optimize_budget_allocation(self, objective_function, 
                                  variable_bounds: List[Tuple[float, float]],
-                                 constraint_function=None) -> Dict[str, Any]:
+                                 constraint_function=None,
+                                 penalty_function=None,
+                                 vectorized: bool = False) -> Dict[str, Any]:
         """
         Optimize budget allocation using Genetic Algorithm
         
@@ -141,6 +150,9 @@ class GeneticAlgorithmOptimizer:
             objective_function: Function to maximize (takes allocation vector, returns fitness)
             variable_bounds: Bounds for each variable (min, max)
             constraint_function: Optional constraint function (takes allocation vector, returns bool)
+            penalty_function: Optional constraint violation subtracted from the fitness
+            vectorized: Whether the functions take the whole (population_size, num_variables)
+                population and return one value per individual
             
         Returns:
             Dictionary with optimization results
@@ -148,46 +160,36 @@ class GeneticAlgorithmOptimizer:
         try:
             # Initialize population
             num_variables = len(variable_bounds)
-            population = self._initialize_population(variable_bounds)
+            engine = PopulationEngine(variable_bounds, self.random_state)
+            population = engine.initialize(self.population_size)
             
             best_fitness = -np.inf
             best_solution = None
             fitness_history = []
             
-            # Evolution loop
-            for generation in range(self.generations):
-                # Evaluate fitness
-                fitness_scores = []
-                for individual in population:
-                    # Check constraints if provided
-                    if constraint_function and not constraint_function(individual):
-                        fitness_scores.append(-np.inf)  # Invalid solution
-                    else:
-                        fitness_scores.append(objective_function(individual))
-                
-                # Track best solution
-                max_fitness_idx = np.argmax(fitness_scores)
-                if fitness_scores[max_fitness_idx] > best_fitness:
-                    best_fitness = fitness_scores[max_fitness_idx]
-                    best_solution = population[max_fitness_idx].copy()
-                
-                fitness_history.append(best_fitness)
-                
-                # Selection (tournament selection)
-                selected_population = self._tournament_selection(population, fitness_scores)
-                
-                # Crossover
-                offspring_population = self._crossover(selected_population)
-                
-                # Mutation
-                mutated_population = self._mutate(offspring_population, variable_bounds)
-                
-                # Replace population
-                population = mutated_population
-                
-                # Log progress
-                if (generation + 1) % 20 == 0:
-                    logger.info(f"Generation {generation + 1}/{self.generations}, Best Fitness: {best_fitness:.2f}")
+            with PopulationEvaluator(objective_function, constraint_function, penalty_function,
+                                     vectorized=vectorized, n_jobs=self.n_jobs) as evaluator:
+                # Evolution loop
+                for generation in range(self.generations):
+                    # Evaluate fitness
+                    fitness_scores = evaluator.evaluate(population)
+                    
+                    # Track best solution
+                    max_fitness_idx = int(np.argmax(fitness_scores))
+                    if fitness_scores[max_fitness_idx] > best_fitness:
+                        best_fitness = float(fitness_scores[max_fitness_idx])
+                        best_solution = population[max_fitness_idx].copy()
+                    
+                    fitness_history.append(best_fitness)
+                    
+                    # Selection, crossover and mutation over the whole population
+                    selected_population = engine.tournament_selection(population, fitness_scores)
+                    offspring_population = engine.uniform_crossover(selected_population, self.crossover_rate)
+                    population = engine.gaussian_mutation(offspring_population, self.mutation_rate)
+                    
+                    # Log progress
+                    if (generation + 1) % 20 == 0:
+                        logger.info(f"Generation {generation + 1}/{self.generations}, Best Fitness: {best_fitness:.2f}")
             
             logger.info(f"Genetic Algorithm optimization completed, best fitness: {best_fitness:.2f}")
             return {
@@ -207,72 +209,6 @@ class GeneticAlgorithmOptimizer:
                 'optimal_allocation': [0.0] * len(variable_bounds),
                 'optimal_value': 0.0
             }
-    
-    def _initialize_population(self, variable_bounds: List[Tuple[float, float]]) -> np.ndarray:
-        """Initialize random population"""
-        population = []
-        for _ in range(self.population_size):
-            individual = []
-            for min_val, max_val in variable_bounds:
-                individual.append(np.random.uniform(min_val, max_val))
-            population.append(individual)
-        return np.array(population)
-    
-    def _tournament_selection(self, population: np.ndarray, 
-                            fitness_scores: List[float], 
-                            tournament_size: int = 3) -> np.ndarray:
-        """Tournament selection"""
-        selected = []
-        for _ in range(len(population)):
-            # Select random individuals for tournament
-            tournament_indices = np.random.choice(len(population), tournament_size, replace=False)
-            tournament_fitness = [fitness_scores[i] for i in tournament_indices]
-            
-            # Select winner (highest fitness)
-            winner_idx = tournament_indices[np.argmax(tournament_fitness)]
-            selected.append(population[winner_idx])
-        
-        return np.array(selected)
-    
-    def _crossover(self, population: np.ndarray) -> np.ndarray:
-        """Uniform crossover"""
-        offspring = []
-        for i in range(0, len(population), 2):
-            parent1 = population[i]
-            if i + 1 < len(population):
-                parent2 = population[i + 1]
-                
-                # Crossover with given probability
-                if np.random.random() < self.crossover_rate:
-                    # Uniform crossover
-                    child1, child2 = parent1.copy(), parent2.copy()
-                    for j in range(len(parent1)):
-                        if np.random.random() < 0.5:
-                            child1[j], child2[j] = child2[j], child1[j]
-                    offspring.extend([child1, child2])
-                else:
-                    offspring.extend([parent1, parent2])
-            else:
-                offspring.append(parent1)
-        
-        return np.array(offspring)
-    
-    def _mutate(self, population: np.ndarray, 
-                variable_bounds: List[Tuple[float, float]]) -> np.ndarray:
-        """Gaussian mutation"""
-        mutated = []
-        for individual in population:
-            mutated_individual = individual.copy()
-            for i, (min_val, max_val) in enumerate(variable_bounds):
-                if np.random.random() < self.mutation_rate:
-                    # Gaussian mutation
-                    mutation_strength = (max_val - min_val) * 0.1
-                    mutated_individual[i] += np.random.normal(0, mutation_strength)
-                    # Ensure bounds
-                    mutated_individual[i] = np.clip(mutated_individual[i], min_val, max_val)
-            mutated.append(mutated_individual)
-        
-        return np.array(mutated)
 
 
 class SimulatedAnnealingOptimizer:
@@ -404,7 +340,8 @@ class ParticleSwarmOptimizer:
     
     def __init__(self, num_particles: int = 30, max_iterations: int = 100,
                  inertia_weight: float = 0.7, cognitive_coeff: float = 1.5,
-                 social_coeff: float = 1.5):
+                 social_coeff: float = 1.5, n_jobs: int = 1,
+                 random_state: Optional[int] = None):
         """
         Initialize Particle Swarm Optimizer
         
@@ -414,17 +351,23 @@ class ParticleSwarmOptimizer:
             inertia_weight: Inertia weight (w)
             cognitive_coeff: Cognitive coefficient (c1)
             social_coeff: Social coefficient (c2)
+            n_jobs: Worker processes for per-particle fitness evaluation (-1 uses all CPUs)
+            random_state: Seed for the random generator
         """
         self.num_particles = num_particles
         self.max_iterations = max_iterations
         self.inertia_weight = inertia_weight
         self.cognitive_coeff = cognitive_coeff
         self.social_coeff = social_coeff
+        self.n_jobs = n_jobs
+        self.random_state = random_state
         logger.info("Particle Swarm Optimizer initialized")
     
     def optimize_budget_allocation(self, objective_function,
                                  variable_bounds: List[Tuple[float, float]],
-                                 constraint_function=None) -> Dict[str, Any]:
+                                 constraint_function=None,
+                                 penalty_function=None,
+                                 vectorized: bool = False) -> Dict[str, Any]:
         """
         Optimize budget allocation using Particle Swarm Optimization
         
@@ -432,105 +375,62 @@ class ParticleSwarmOptimizer:
             objective_function: Function to maximize (takes allocation vector, returns fitness)
             variable_bounds: Bounds for each variable (min, max)
             constraint_function: Optional constraint function (takes allocation vector, returns bool)
+            penalty_function: Optional constraint violation subtracted from the fitness
+            vectorized: Whether the functions take the whole (num_particles, num_variables)
+                swarm and return one value per particle
             
         Returns:
             Dictionary with optimization results
         """
         try:
-            num_dimensions = len(variable_bounds)
+            # Initialize swarm as (num_particles, num_dimensions) arrays
+            engine = PopulationEngine(variable_bounds, self.random_state)
+            particles = engine.initialize(self.num_particles)
+            velocities = engine.initialize_velocities(self.num_particles)
             
-            # Initialize swarm
-            particles = []
-            velocities = []
-            personal_best_positions = []
-            personal_best_fitness = []
-            
-            # Global best
-            global_best_position = None
-            global_best_fitness = -np.inf
-            
-            # Initialize particles
-            for _ in range(self.num_particles):
-                # Random position within bounds
-                position = []
-                velocity = []
-                for min_val, max_val in variable_bounds:
-                    position.append(np.random.uniform(min_val, max_val))
-                    velocity.append(np.random.uniform(-0.1 * (max_val - min_val), 0.1 * (max_val - min_val)))
+            with PopulationEvaluator(objective_function, constraint_function, penalty_function,
+                                     vectorized=vectorized, n_jobs=self.n_jobs) as evaluator:
+                personal_best_positions = particles.copy()
+                personal_best_fitness = evaluator.evaluate(particles)
                 
-                particles.append(np.array(position))
-                velocities.append(np.array(velocity))
+                # Global best
+                best_idx = int(np.argmax(personal_best_fitness))
+                global_best_position = personal_best_positions[best_idx].copy()
+                global_best_fitness = float(personal_best_fitness[best_idx])
                 
-                # Evaluate fitness
-                if constraint_function and not constraint_function(position):
-                    fitness = -np.inf
-                else:
-                    fitness = objective_function(position)
+                fitness_history = []
                 
-                personal_best_positions.append(np.array(position))
-                personal_best_fitness.append(fitness)
-                
-                # Update global best
-                if fitness > global_best_fitness:
-                    global_best_fitness = fitness
-                    global_best_position = np.array(position)
-            
-            fitness_history = []
-            
-            # Main loop
-            for iteration in range(self.max_iterations):
-                for i in range(self.num_particles):
-                    # Update velocity
-                    r1, r2 = np.random.random(), np.random.random()
-                    
-                    cognitive_velocity = self.cognitive_coeff * r1 * (
-                        personal_best_positions[i] - particles[i]
+                # Main loop
+                for iteration in range(self.max_iterations):
+                    # Move every particle, then evaluate the swarm in one call
+                    particles, velocities = engine.update_swarm(
+                        particles, velocities, personal_best_positions, global_best_position,
+                        self.inertia_weight, self.cognitive_coeff, self.social_coeff
                     )
+                    fitness = evaluator.evaluate(particles)
                     
-                    social_velocity = self.social_coeff * r2 * (
-                        global_best_position - particles[i]
-                    )
-                    
-                    velocities[i] = (
-                        self.inertia_weight * velocities[i] +
-                        cognitive_velocity +
-                        social_velocity
-                    )
+                    # Update personal bests
+                    improved = fitness > personal_best_fitness
+                    personal_best_positions[improved] = particles[improved]
+                    personal_best_fitness[improved] = fitness[improved]
                     
-                    # Update position
-                    particles[i] += velocities[i]
+                    # Update global best
+                    best_idx = int(np.argmax(personal_best_fitness))
+                    if personal_best_fitness[best_idx] > global_best_fitness:
+                        global_best_fitness = float(personal_best_fitness[best_idx])
+                        global_best_position = personal_best_positions[best_idx].copy()
                     
-                    # Enforce bounds
-                    for j, (min_val, max_val) in enumerate(variable_bounds):
-                        particles[i][j] = np.clip(particles[i][j], min_val, max_val)
+                    fitness_history.append(global_best_fitness)
                     
-                    # Evaluate fitness
-                    if constraint_function and not constraint_function(particles[i]):
-                        fitness = -np.inf
-                    else:
-                        fitness = objective_function(particles[i])
-                    
-                    # Update personal best
-                    if fitness > personal_best_fitness[i]:
-                        personal_best_fitness[i] = fitness
-                        personal_best_positions[i] = particles[i].copy()
-                        
-                        # Update global best
-                        if fitness > global_best_fitness:
-                            global_best_fitness = fitness
-                            global_best_position = particles[i].copy()
-                
-                fitness_history.append(global_best_fitness)
-                
-                # Log progress
-                if (iteration + 1) % 20 == 0:
-                    logger.info(f"Iteration {iteration + 1}/{self.max_iterations}, Best Fitness: {global_best_fitness:.2f}")
+                    # Log progress
+                    if (iteration + 1) % 20 == 0:
+                        logger.info(f"Iteration {iteration + 1}/{self.max_iterations}, Best Fitness: {global_best_fitness:.2f}")
             
             logger.info(f"Particle Swarm Optimization completed, best fitness: {global_best_fitness:.2f}")
             return {
                 'success': True,
                 'message': 'Optimization completed',
-                'optimal_allocation': global_best_position.tolist() if global_best_position is not None else [0.0] * num_dimensions,
+                'optimal_allocation': global_best_position.tolist(),
                 'optimal_value': float(global_best_fitness),
                 'iterations': self.max_iterations,
                 'fitness_history': fitness_history
@@ -645,11 +545,13 @@ def get_linear_programming_optimizer() -> LinearProgrammingOptimizer:
 
 
 def get_genetic_algorithm_optimizer(population_size: int = 50, generations: int = 100,
-                                  mutation_rate: float = 0.1, crossover_rate: float = 0.8) -> GeneticAlgorithmOptimizer:
+                                  mutation_rate: float = 0.1, crossover_rate: float = 0.8,
+                                  n_jobs: int = 1) -> GeneticAlgorithmOptimizer:
     """Get singleton Genetic Algorithm optimizer instance"""
     global ga_optimizer_instance
     if ga_optimizer_instance is None:
-        ga_optimizer_instance = GeneticAlgorithmOptimizer(population_size, generations, mutation_rate, crossover_rate)
+        ga_optimizer_instance = GeneticAlgorithmOptimizer(population_size, generations, mutation_rate, crossover_rate,
+                                                          n_jobs=n_jobs)
     return ga_optimizer_instance
 
 
@@ -664,11 +566,12 @@ def get_simulated_annealing_optimizer(initial_temperature: float = 1000,
 
 def get_particle_swarm_optimizer(num_particles: int = 30, max_iterations: int = 100,
                                inertia_weight: float = 0.7, cognitive_coeff: float = 1.5,
-                               social_coeff: float = 1.5) -> ParticleSwarmOptimizer:
+                               social_coeff: float = 1.5, n_jobs: int = 1) -> ParticleSwarmOptimizer:
     """Get singleton Particle Swarm optimizer instance"""
     global pso_optimizer_instance
     if pso_optimizer_instance is None:
-        pso_optimizer_instance = ParticleSwarmOptimizer(num_particles, max_iterations, inertia_weight, cognitive_coeff, social_coeff)
+        pso_optimizer_instance = ParticleSwarmOptimizer(num_particles, max_iterations, inertia_weight, cognitive_coeff, social_coeff,
+                                                        n_jobs=n_jobs)
     return pso_optimizer_instance
 
 
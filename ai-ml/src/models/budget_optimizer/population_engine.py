@@ -0,0 +1,229 @@
+"""
+Population Engine for Budget Optimization Algorithms
+Represents a whole GA population or PSO swarm as numpy arrays and applies
+fitness evaluation, constraint penalties, selection, crossover, mutation and
+velocity updates as array operations
+"""
+
+import logging
+import os
+import pickle
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Objective/constraint/penalty functions installed in each worker process
+_worker_functions = None
+
+
+def _initialize_worker(objective_function, constraint_function, penalty_function):
+    """Install the evaluation functions once per worker process"""
+    global _worker_functions
+    _worker_functions = (objective_function, constraint_function, penalty_function)
+
+
+def _evaluate_individuals(population: np.ndarray, objective_function,
+                          constraint_function=None, penalty_function=None) -> np.ndarray:
+    """Evaluate individuals one at a time with per-individual functions"""
+    fitness = np.empty(len(population))
+    for i, individual in enumerate(population):
+        if constraint_function and not constraint_function(individual):
+            fitness[i] = -np.inf  # Invalid solution
+        else:
+            fitness[i] = objective_function(individual)
+            if penalty_function is not None:
+                fitness[i] -= penalty_function(individual)
+    return fitness
+
+
+def _evaluate_chunk(chunk: np.ndarray) -> np.ndarray:
+    """Evaluate a slice of the population inside a worker process"""
+    return _evaluate_individuals(chunk, *_worker_functions)
+
+
+class PopulationEvaluator:
+    """Evaluates the fitness of a whole population in one call"""
+
+    def __init__(self, objective_function: Callable,
+                 constraint_function: Optional[Callable] = None,
+                 penalty_function: Optional[Callable] = None,
+                 vectorized: bool = False, n_jobs: int = 1):
+        """
+        Initialize population evaluator
+
+        Args:
+            objective_function: Function to maximize. Takes an allocation vector, or the
+                (population_size, num_variables) population when vectorized
+            constraint_function: Optional feasibility check returning a bool per individual
+                (a boolean array when vectorized); infeasible individuals score -inf
+            penalty_function: Optional constraint violation subtracted from the objective,
+                returning a float per individual (an array when vectorized)
+            vectorized: Whether the functions operate on the whole population array
+            n_jobs: Worker processes for per-individual evaluation (-1 uses all CPUs)
+        """
+        self.objective_function = objective_function
+        self.constraint_function = constraint_function
+        self.penalty_function = penalty_function
+        self.vectorized = vectorized
+        self.n_jobs = self._resolve_n_jobs(n_jobs)
+        self._executor = None
+
+        if self.n_jobs > 1 and not self._functions_picklable():
+            logger.warning("Objective or constraint functions cannot be sent to worker processes, "
+                           "evaluating in a single process")
+            self.n_jobs = 1
+
+    def _resolve_n_jobs(self, n_jobs: int) -> int:
+        """Resolve the requested number of worker processes"""
+        if self.vectorized:
+            # Array objectives are already evaluated in one call
+            return 1
+        if n_jobs is None or n_jobs == 0:
+            return 1
+        if n_jobs < 0:
+            return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+        return n_jobs
+
+    def _functions_picklable(self) -> bool:
+        """Check whether the functions can be shipped to worker processes"""
+        try:
+            pickle.dumps((self.objective_function, self.constraint_function, self.penalty_function))
+            return True
+        except Exception:
+            return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Shut down worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def evaluate(self, population: np.ndarray) -> np.ndarray:
+        """
+        Evaluate fitness of every individual
+
+        Args:
+            population: Population array of shape (population_size, num_variables)
+
+        Returns:
+            Fitness array of shape (population_size,)
+        """
+        if self.vectorized:
+            return self._evaluate_vectorized(population)
+        if self.n_jobs > 1 and len(population) > self.n_jobs:
+            return self._evaluate_parallel(population)
+        return _evaluate_individuals(population, self.objective_function,
+                                     self.constraint_function, self.penalty_function)
+
+    def _evaluate_vectorized(self, population: np.ndarray) -> np.ndarray:
+        """Evaluate the population with array objective, constraint and penalty functions"""
+        fitness = np.asarray(self.objective_function(population), dtype=float).reshape(len(population))
+        if self.penalty_function is not None:
+            fitness = fitness - np.asarray(self.penalty_function(population), dtype=float)
+        if self.constraint_function is not None:
+            feasible = np.asarray(self.constraint_function(population), dtype=bool)
+            fitness = np.where(feasible, fitness, -np.inf)
+        return fitness
+
+    def _evaluate_parallel(self, population: np.ndarray) -> np.ndarray:
+        """Evaluate population chunks across worker processes"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                initializer=_initialize_worker,
+                initargs=(self.objective_function, self.constraint_function, self.penalty_function)
+            )
+        chunks = np.array_split(population, self.n_jobs * 4)
+        return np.concatenate(list(self._executor.map(_evaluate_chunk, chunks)))
+
+
+class PopulationEngine:
+    """Array operators for a population of allocation vectors within variable bounds"""
+
+    def __init__(self, variable_bounds: List[Tuple[float, float]],
+                 random_state: Optional[int] = None):
+        """
+        Initialize population engine
+
+        Args:
+            variable_bounds: Bounds for each variable (min, max)
+            random_state: Seed for the random generator
+        """
+        bounds = np.asarray(variable_bounds, dtype=float).reshape(-1, 2)
+        self.lower = bounds[:, 0]
+        self.upper = bounds[:, 1]
+        self.span = self.upper - self.lower
+        self.num_variables = len(bounds)
+        self.rng = np.random.default_rng(random_state)
+
+    def initialize(self, population_size: int) -> np.ndarray:
+        """Draw a uniformly random population within bounds"""
+        return self.rng.uniform(self.lower, self.upper, size=(population_size, self.num_variables))
+
+    def initialize_velocities(self, population_size: int, scale: float = 0.1) -> np.ndarray:
+        """Draw random velocities within a fraction of each variable's range"""
+        limit = scale * self.span
+        return self.rng.uniform(-limit, limit, size=(population_size, self.num_variables))
+
+    def clip(self, population: np.ndarray) -> np.ndarray:
+        """Enforce variable bounds in place"""
+        return np.clip(population, self.lower, self.upper, out=population)
+
+    def tournament_selection(self, population: np.ndarray, fitness: np.ndarray,
+                             tournament_size: int = 3) -> np.ndarray:
+        """Select one tournament winner per slot in the population"""
+        population_size = len(population)
+        tournament_size = min(tournament_size, population_size)
+        contenders = self.rng.integers(0, population_size, size=(population_size, tournament_size))
+        winners = contenders[np.arange(population_size), np.argmax(fitness[contenders], axis=1)]
+        return population[winners]
+
+    def uniform_crossover(self, population: np.ndarray, crossover_rate: float) -> np.ndarray:
+        """Uniform crossover between consecutive pairs of parents"""
+        offspring = population.copy()
+        num_pairs = len(population) // 2
+        if num_pairs == 0:
+            return offspring
+
+        parents1 = population[0:2 * num_pairs:2]
+        parents2 = population[1:2 * num_pairs:2]
+        crossed = self.rng.random(num_pairs) < crossover_rate
+        swap = (self.rng.random((num_pairs, self.num_variables)) < 0.5) & crossed[:, None]
+        offspring[0:2 * num_pairs:2] = np.where(swap, parents2, parents1)
+        offspring[1:2 * num_pairs:2] = np.where(swap, parents1, parents2)
+        return offspring
+
+    def gaussian_mutation(self, population: np.ndarray, mutation_rate: float,
+                          strength: float = 0.1) -> np.ndarray:
+        """Gaussian mutation scaled to each variable's range, clipped to bounds"""
+        mutate = self.rng.random(population.shape) < mutation_rate
+        noise = self.rng.normal(0.0, 1.0, size=population.shape) * (strength * self.span)
+        return self.clip(population + np.where(mutate, noise, 0.0))
+
+    def update_swarm(self, positions: np.ndarray, velocities: np.ndarray,
+                     personal_best_positions: np.ndarray, global_best_position: np.ndarray,
+                     inertia_weight: float, cognitive_coeff: float,
+                     social_coeff: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply one PSO velocity and position update to the whole swarm
+
+        Returns:
+            Tuple of (positions, velocities)
+        """
+        r1 = self.rng.random((len(positions), 1))
+        r2 = self.rng.random((len(positions), 1))
+        velocities = (
+            inertia_weight * velocities +
+            cognitive_coeff * r1 * (personal_best_positions - positions) +
+            social_coeff * r2 * (global_best_position - positions)
+        )
+        positions = self.clip(positions + velocities)
+        return positions, velocities
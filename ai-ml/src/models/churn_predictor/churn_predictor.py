@@ -22,7 +22,8 @@ from .models import (
     ChurnLogisticRegression, ChurnNeuralNetwork, 
     ChurnGradientBoosting, ChurnEnsembleModel,
     get_logistic_regression_model, get_neural_network_model,
-    get_xgboost_model, get_random_forest_model, get_ensemble_model
+    get_xgboost_model, get_random_forest_model, get_ensemble_model,
+    train_base_models
 )
 from .training_pipeline import (
     ChurnTrainingPipeline, ChurnModelOptimizer,
@@ -42,15 +43,20 @@ logger = logging.getLogger(__name__)
 class ChurnPredictor:
     """Main orchestrator for client churn prediction system"""
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, inference_only: bool = False,
+                 n_jobs: int = 1):
         """
         Initialize the Churn Predictor
         
         Args:
             db_path: Path to database
+            inference_only: Never train; require models loaded via load_models
+            n_jobs: CPU budget for training the base models (1 trains serially, -1 uses all CPUs)
         """
         self.logger = logging.getLogger(f"{__name__}.ChurnPredictor")
         self.db_path = db_path or str(Path(__file__).resolve().parent.parent.parent.parent / "database" / "superhack.db")
+        self.inference_only = inference_only
+        self.n_jobs = n_jobs
         self.is_trained = False
         self.models = {}
         self.feature_columns = []
@@ -186,22 +192,22 @@ class ChurnPredictor:
             )
             
             # Initialize models
-            models = {
+            base_models = {
                 'logistic_regression': get_logistic_regression_model(),
                 'neural_network': get_neural_network_model(),
                 'xgboost': get_xgboost_model(),
-                'random_forest': get_random_forest_model(),
-                'ensemble': get_ensemble_model()
+                'random_forest': get_random_forest_model()
             }
             
-            # Train all models
-            training_results = {}
+            # Train the independent base models concurrently, then build the
+            # ensemble from them instead of fitting all four a second time
+            training_results = train_base_models(base_models, X_train, y_train, self.n_jobs)
+            ensemble = get_ensemble_model()
+            training_results['ensemble'] = ensemble.use_fitted_models(base_models)
+            models = dict(base_models, ensemble=ensemble)
+            
             for name, model in models.items():
-                logger.info(f"Training {name}...")
-                result = model.train(X_train, y_train)
-                training_results[name] = result
-                
-                if result:
+                if training_results[name]:
                     # Evaluate model
                     y_pred = model.predict(X_test)
                     y_proba = model.predict_proba(X_test)
@@ -314,8 +320,7 @@ class ChurnPredictor:
             # Use ensemble model for predictions (or any trained model)
             ensemble_model = self.models.get('ensemble')
             if ensemble_model and ensemble_model.is_trained:
-                predictions = ensemble_model.predict(X)
-                probabilities = ensemble_model.predict_proba(X)
+                predictions, probabilities = ensemble_model.predict_with_proba(X)
             else:
                 # Fallback to first available trained model
                 for model in self.models.values():
@@ -338,7 +343,63 @@ class ChurnPredictor:
         except Exception as e:
             logger.error(f"Error predicting churn: {e}")
             return pd.DataFrame()
-    
+
+    def get_model_feature_names(self) -> List[str]:
+        """
+        Get the feature columns the fitted models expect
+
+        Returns:
+            List of model input feature names
+        """
+        ensemble_model = self.models.get('ensemble')
+        if ensemble_model is not None and getattr(ensemble_model, 'feature_names', None):
+            return list(ensemble_model.feature_names)
+        for model in self.models.values():
+            if getattr(model, 'feature_names', None):
+                return list(model.feature_names)
+        return [col for col in self.feature_columns if col not in ('client_id', 'churn')]
+
+    def align_features(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Align a feature frame to the columns the fitted models expect
+
+        Args:
+            frame: DataFrame with client features (extra columns are dropped)
+
+        Returns:
+            Numeric feature DataFrame, prefixed with client_id when present
+        """
+        features = frame.reindex(columns=self.get_model_feature_names())
+        features = features.apply(pd.to_numeric, errors='coerce').fillna(0.0)
+        if 'client_id' in frame.columns:
+            features.insert(0, 'client_id', frame['client_id'].values)
+        return features
+
+    def predict_records(self, records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Score client feature records with the fitted models (inference only)
+
+        Unlike run_full_pipeline, this never collects training data or fits
+        models; it aligns the records to the fitted feature columns and
+        predicts with the already-loaded estimators.
+
+        Args:
+            records: List of client feature dictionaries
+
+        Returns:
+            DataFrame with churn_prediction and churn_probability per record
+        """
+        try:
+            if not records:
+                return pd.DataFrame()
+
+            features = self.align_features(pd.DataFrame.from_records(records))
+            return self.predict_churn(features)
+
+        except Exception as e:
+            logger.error(f"Error predicting churn for records: {e}")
+            return pd.DataFrame()
+
     def generate_risk_scores(self, predictions: pd.DataFrame) -> pd.DataFrame:
         """
         Generate risk scores for clients
@@ -455,6 +516,13 @@ class ChurnPredictor:
         try:
             logger.info("Running full churn prediction pipeline...")
             
+            if self.inference_only and not self.is_trained:
+                logger.error("Churn models not loaded and training is disabled in inference-only mode")
+                return {
+                    'status': 'model_not_loaded',
+                    'message': 'Churn models not loaded; training is disabled in inference-only mode'
+                }
+            
             # Step 1: Prepare data
             data = await self.prepare_data(start_date, end_date)
             if not data:
@@ -468,7 +536,9 @@ class ChurnPredictor:
                 return {}
             
             # Step 3: Train models (if not already trained)
-            if not self.is_trained:
+            if self.inference_only:
+                features = self.align_features(features)
+            elif not self.is_trained:
                 training_success = self.train_models(features)
                 if not training_success:
                     logger.warning("Model training failed, continuing with prediction using default models")
@@ -26,6 +26,13 @@ except ImportError:
     QUICKBOOKS_AVAILABLE = False
     SUPEROPS_AVAILABLE = False
 
+try:
+    from ...data.ingestion.columnar_store import ColumnarDataStore
+    COLUMNAR_CACHE_AVAILABLE = True
+except ImportError:
+    ColumnarDataStore = None
+    COLUMNAR_CACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,8 +68,20 @@ class ChurnDataPreparator:
             
         # Path to CSV data files
         self.data_dir = "../../data/churn_predictor"
+        # Parquet copies of the CSVs, rebuilt only when a CSV changes
+        self.columnar_cache = ColumnarDataStore(os.path.join(self.data_dir, "columnar_cache")) \
+            if COLUMNAR_CACHE_AVAILABLE else None
         logger.info("Churn Data Preparator initialized")
     
+    def _read_csv(self, csv_path: str, parse_dates: List[str]) -> pd.DataFrame:
+        """Read a CSV data file through the columnar cache when it is available"""
+        if self.columnar_cache is not None:
+            try:
+                return self.columnar_cache.read_csv_cached(csv_path, parse_dates=parse_dates)
+            except Exception as e:
+                logger.warning(f"Columnar cache read failed for {csv_path}: {e}")
+        return pd.read_csv(csv_path, parse_dates=parse_dates)
+    
     async def collect_client_history_data(self, start_date: Optional[datetime] = None, 
                                         end_date: Optional[datetime] = None) -> pd.DataFrame:
         """
@@ -88,7 +107,7 @@ class ChurnDataPreparator:
                 logger.info("Using CSV data for client history")
                 csv_path = f"{self.data_dir}/client_history_data.csv"
                 if os.path.exists(csv_path):
-                    return pd.read_csv(csv_path, parse_dates=['contract_start_date', 'contract_end_date', 'last_interaction_date'])
+                    return self._read_csv(csv_path, parse_dates=['contract_start_date', 'contract_end_date', 'last_interaction_date'])
                 else:
                     # Fallback to mock data
                     logger.warning("CSV files not found, returning mock data")
@@ -98,7 +117,7 @@ class ChurnDataPreparator:
                 logger.info("Reading client history data from CSV files")
                 csv_path = f"{self.data_dir}/client_history_data.csv"
                 if os.path.exists(csv_path):
-                    return pd.read_csv(csv_path, parse_dates=['contract_start_date', 'contract_end_date', 'last_interaction_date'])
+                    return self._read_csv(csv_path, parse_dates=['contract_start_date', 'contract_end_date', 'last_interaction_date'])
                 else:
                     # Fallback to mock data
                     logger.warning("CSV files not found, returning mock data")
@@ -130,7 +149,7 @@ class ChurnDataPreparator:
             logger.info("Reading client interaction data from CSV files")
             csv_path = f"{self.data_dir}/client_interactions.csv"
             if os.path.exists(csv_path):
-                return pd.read_csv(csv_path, parse_dates=['interaction_date'])
+                return self._read_csv(csv_path, parse_dates=['interaction_date'])
             else:
                 # Fallback to mock data
                 logger.warning("CSV files not found, returning mock data")
@@ -162,7 +181,7 @@ class ChurnDataPreparator:
             logger.info("Reading financial metrics data from CSV files")
             csv_path = f"{self.data_dir}/financial_metrics.csv"
             if os.path.exists(csv_path):
-                return pd.read_csv(csv_path, parse_dates=['payment_date'])
+                return self._read_csv(csv_path, parse_dates=['payment_date'])
             else:
                 # Fallback to mock data
                 logger.warning("CSV files not found, returning mock data")
@@ -194,7 +213,7 @@ class ChurnDataPreparator:
             logger.info("Reading service usage data from CSV files")
             csv_path = f"{self.data_dir}/service_usage.csv"
             if os.path.exists(csv_path):
-                return pd.read_csv(csv_path, parse_dates=['usage_date'])
+                return self._read_csv(csv_path, parse_dates=['usage_date'])
             else:
                 # Fallback to mock data
                 logger.warning("CSV files not found, returning mock data")
@@ -4,13 +4,19 @@ Implements various machine learning models for client churn prediction
 """
 
 import logging
+import multiprocessing
+import os
+import time
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.utils.lazy_imports import lazy_import
+
 # Conditional imports for machine learning libraries
 try:
     from sklearn.linear_model import LogisticRegression
@@ -27,9 +33,9 @@ except ImportError:
     SKLEARN_AVAILABLE = False
 
 try:
-    import tensorflow as tf
-    from tensorflow import keras
-    from tensorflow.keras import layers
+    tf = lazy_import("tensorflow")
+    keras = lazy_import("tensorflow.keras")
+    layers = lazy_import("tensorflow.keras.layers")
     TENSORFLOW_AVAILABLE = True
 except ImportError:
     tf = None
@@ -38,7 +44,7 @@ except ImportError:
     TENSORFLOW_AVAILABLE = False
 
 try:
-    import xgboost as xgb
+    xgb = lazy_import("xgboost")
     XGBOOST_AVAILABLE = True
 except ImportError:
     xgb = None
@@ -167,6 +173,9 @@ class ChurnLogisticRegression:
 class ChurnNeuralNetwork:
     """Neural Network model for churn prediction"""
     
+    # TensorFlow runs its own thread pools and does not survive a trip through a worker process
+    process_pool_safe = False
+    
     def __init__(self, hidden_layers: Tuple[int, ...] = (64, 32), 
                  epochs: int = 100, batch_size: int = 32, **kwargs):
         """
@@ -345,6 +354,8 @@ class ChurnGradientBoosting:
         self.feature_names = None
         self.is_trained = False
         self.kwargs = kwargs
+        # Threads per fit, set by train_base_models when sharing a CPU budget
+        self.n_jobs = None
         logger.info(f"Churn Gradient Boosting Model ({model_type}) initialized")
     
     def train(self, X: pd.DataFrame, y: pd.Series) -> bool:
@@ -369,7 +380,7 @@ class ChurnGradientBoosting:
                 
                 # Train XGBoost model
                 if xgb is not None:
-                    self.model = xgb.XGBClassifier(**self.kwargs)
+                    self.model = xgb.XGBClassifier(**self._model_params())
                     self.model.fit(X, y)
                     self.is_trained = True
                 else:
@@ -383,7 +394,7 @@ class ChurnGradientBoosting:
                 
                 # Train Random Forest model
                 if RandomForestClassifier is not None:
-                    self.model = RandomForestClassifier(**self.kwargs)
+                    self.model = RandomForestClassifier(**self._model_params())
                     self.model.fit(X, y)
                     self.is_trained = True
                 else:
@@ -400,6 +411,13 @@ class ChurnGradientBoosting:
             logger.error(f"Error training {self.model_type} model: {e}")
             return False
     
+    def _model_params(self) -> Dict[str, Any]:
+        """Estimator arguments, with the thread budget unless n_jobs was given explicitly"""
+        params = dict(self.kwargs)
+        if self.n_jobs is not None:
+            params.setdefault('n_jobs', self.n_jobs)
+        return params
+    
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         """
         Predict churn using the trained model
@@ -447,17 +465,96 @@ class ChurnGradientBoosting:
             return np.zeros(len(X))
 
 
+def _resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """Resolve a CPU budget (-1 uses all CPUs, -2 all but one, ...)"""
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def _fit_base_model(model, X: pd.DataFrame, y: pd.Series) -> Tuple[Any, bool, float]:
+    """Train one base model, in a worker process or in-process"""
+    start = time.perf_counter()
+    result = model.train(X, y)
+    return model, result, time.perf_counter() - start
+
+
+def train_base_models(models: Dict[str, Any], X: pd.DataFrame, y: pd.Series,
+                      n_jobs: int = 1) -> Dict[str, bool]:
+    """
+    Train independent base models concurrently within a CPU budget
+    
+    Models train in worker processes, except those marked process_pool_safe = False,
+    which train in this process meanwhile. Cores left over after one per worker go to
+    the tree ensembles as threads. Models are updated in place.
+    
+    Args:
+        models: Base models by name
+        X: Training features
+        y: Training labels
+        n_jobs: CPU budget (1 trains serially in this process, -1 uses all CPUs)
+        
+    Returns:
+        Dictionary of training success by model name
+    """
+    budget = _resolve_n_jobs(n_jobs)
+    pooled = [name for name, model in models.items() if getattr(model, 'process_pool_safe', True)]
+    local = [name for name in models if name not in pooled]
+    
+    # Leave a core for each model training in this process
+    pool_budget = max(1, budget - len(local))
+    workers = min(pool_budget, len(pooled))
+    for name in pooled:
+        if hasattr(models[name], 'n_jobs'):
+            models[name].n_jobs = max(1, pool_budget // max(workers, 1))
+    if workers <= 1:
+        local, pooled = pooled + local, []
+    
+    results = {}
+    futures = {}
+    executor = None
+    try:
+        if pooled:
+            # Spawned workers never inherit a half-initialized TensorFlow from this process
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            futures = {name: executor.submit(_fit_base_model, models[name], X, y) for name in pooled}
+        
+        for name in local:
+            _, results[name], seconds = _fit_base_model(models[name], X, y)
+            logger.info(f"{name} training {'successful' if results[name] else 'failed'} in {seconds:.1f}s")
+        
+        for name, future in futures.items():
+            try:
+                fitted, results[name], seconds = future.result()
+                # Copy the fitted state back so existing references to the model stay valid
+                models[name].__dict__.update(fitted.__dict__)
+                logger.info(f"{name} training {'successful' if results[name] else 'failed'} "
+                            f"in {seconds:.1f}s (worker process)")
+            except Exception as e:
+                logger.warning(f"Training {name} in a worker process failed ({e}), training in-process")
+                _, results[name], _ = _fit_base_model(models[name], X, y)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    return {name: results[name] for name in models}
+
+
 class ChurnEnsembleModel:
     """Ensemble of churn prediction models"""
     
-    def __init__(self, voting_method: str = 'average'):
+    def __init__(self, voting_method: str = 'average', n_jobs: int = 1):
         """
         Initialize Ensemble Model
         
         Args:
             voting_method: Voting method ('average', 'majority')
+            n_jobs: CPU budget for training the base models (1 trains serially, -1 uses all CPUs)
         """
         self.voting_method = voting_method
+        self.n_jobs = n_jobs
         self.models = {
             'logistic_regression': ChurnLogisticRegression(),
             'neural_network': ChurnNeuralNetwork(),
@@ -484,14 +581,8 @@ class ChurnEnsembleModel:
             self.feature_names = list(X.columns) if hasattr(X, 'columns') else [f"feature_{i}" for i in range(X.shape[1])]
             
             # Train all models
-            training_results = []
-            for model_name, model in self.models.items():
-                logger.info(f"Training {model_name}...")
-                result = model.train(X, y)
-                training_results.append(result)
-                logger.info(f"{model_name} training {'successful' if result else 'failed'}")
-            
-            self.is_trained = all(training_results)
+            training_results = train_base_models(self.models, X, y, self.n_jobs)
+            self.is_trained = all(training_results.values())
             
             if self.is_trained:
                 logger.info("All ensemble models trained successfully")
@@ -504,6 +595,32 @@ class ChurnEnsembleModel:
             logger.error(f"Error training ensemble models: {e}")
             return False
     
+    def use_fitted_models(self, models: Dict[str, Any]) -> bool:
+        """
+        Build the ensemble from base models that are already trained, without refitting
+        
+        Args:
+            models: Base models by name; untrained ones are left out of the ensemble
+            
+        Returns:
+            Boolean indicating whether any trained model was adopted
+        """
+        fitted = {name: model for name, model in models.items() if getattr(model, 'is_trained', False)}
+        skipped = sorted(set(models) - set(fitted))
+        if skipped:
+            logger.warning(f"Ensemble built without untrained models: {', '.join(skipped)}")
+        if not fitted:
+            self.is_trained = False
+            return False
+        
+        self.models = fitted
+        self.feature_names = next(
+            (model.feature_names for model in fitted.values() if getattr(model, 'feature_names', None)), None
+        )
+        self.is_trained = True
+        logger.info(f"Ensemble built from fitted models: {', '.join(fitted)}")
+        return True
+    
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         """
         Predict churn using ensemble of models
@@ -570,6 +687,43 @@ class ChurnEnsembleModel:
             logger.error(f"Error getting ensemble probabilities: {e}")
             return np.zeros(len(X))
     
+    def predict_with_proba(self, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get predictions and probabilities in a single pass over the ensemble
+        
+        Each member's predict_proba is called exactly once on the whole batch
+        and its class votes are derived from those probabilities, instead of
+        running every member again through predict.
+        
+        Args:
+            X: Data to predict churn for
+            
+        Returns:
+            Tuple of (churn predictions, churn probabilities)
+        """
+        try:
+            if not self.is_trained:
+                logger.warning("Ensemble not trained, returning mock predictions")
+                return np.zeros(len(X)), np.zeros(len(X))
+            
+            probabilities = {}
+            for model_name, model in self.models.items():
+                probabilities[model_name] = np.asarray(model.predict_proba(X), dtype=float)
+            
+            # Member votes follow the same 0.5 decision threshold as predict
+            predictions = {name: (prob > 0.5).astype(int) for name, prob in probabilities.items()}
+            
+            if self.voting_method == 'majority':
+                ensemble_predictions = self._majority_voting(predictions)
+            else:
+                ensemble_predictions = self._average_voting(predictions)
+            
+            return ensemble_predictions, self._average_probabilities(probabilities)
+            
+        except Exception as e:
+            logger.error(f"Error predicting with ensemble models: {e}")
+            return np.zeros(len(X)), np.zeros(len(X))
+    
     def _majority_voting(self, predictions: Dict[str, np.ndarray]) -> np.ndarray:
         """Combine predictions using majority voting"""
         # Sum predictions across models
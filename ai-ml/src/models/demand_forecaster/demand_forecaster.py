@@ -9,6 +9,7 @@ import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import asyncio
+import copy
 import os
 import pickle
 import warnings
@@ -34,16 +35,28 @@ from .capacity_planner import (
     get_model_drift_detector,
     get_alert_system
 )
+from .forecaster_cache import ForecasterCache, CACHE_HIT, CACHE_APPEND
 
 logger = logging.getLogger(__name__)
 
+# Series identity of the aggregate ticket volume used by the analysis pipeline
+TICKET_SERIES_ID = 'ticket_count'
+
 
 class DemandForecaster:
     """Main orchestrator for the service demand forecasting engine"""
     
-    def __init__(self):
-        """Initialize the demand forecaster"""
+    def __init__(self, inference_only: bool = False, cache_dir: Optional[str] = None):
+        """
+        Initialize the demand forecaster
+        
+        Args:
+            inference_only: Never fit forecasters; forecast with models loaded via load_models
+            cache_dir: Directory to persist fitted forecasters between runs (memory only if None)
+        """
         logger.info("Demand Forecaster initialized")
+        self.inference_only = inference_only
+        self.forecaster_cache = ForecasterCache(cache_dir)
         
         # Initialize all components
         self._initialize_components()
@@ -189,7 +202,7 @@ class DemandForecaster:
                 
                 # Train LSTM model
                 if self.lstm_forecaster is not None:
-                    lstm_results = self.lstm_forecaster.train(pd.Series(ticket_series.astype(float)))
+                    lstm_results = self._fit_lstm_cached(pd.Series(ticket_series.astype(float)), TICKET_SERIES_ID)
                 else:
                     lstm_results = {
                         'success': False,
@@ -214,6 +227,92 @@ class DemandForecaster:
                 'model': None
             }
     
+    def _fit_lstm_cached(self, series: pd.Series, series_id: str) -> Dict[str, Any]:
+        """
+        Fit the LSTM forecaster for a series, reusing a cached fit when the data allows
+        
+        The LSTM forecasts from the latest window it is given, so new observations
+        without drift only advance the cache entry; a refit happens on a miss or drift.
+        
+        Args:
+            series: Time series data
+            series_id: Series identity used as the cache key
+            
+        Returns:
+            Dictionary with training results and the cache outcome
+        """
+        config = {
+            'sequence_length': self.lstm_forecaster.sequence_length,
+            'epochs': self.lstm_forecaster.epochs,
+            'batch_size': self.lstm_forecaster.batch_size
+        }
+        values = series.to_numpy(dtype=float)
+        status, entry = self.forecaster_cache.lookup('lstm', series_id, config, values)
+        
+        if status in (CACHE_HIT, CACHE_APPEND):
+            model, scaler = entry.state
+            self.lstm_forecaster.model = model
+            # Training refits the scaler in place, so the cached scaler is never handed out
+            self.lstm_forecaster.scaler = copy.deepcopy(scaler)
+            if status == CACHE_APPEND:
+                self.forecaster_cache.advance(entry, values, entry.state)
+            return {
+                'success': True,
+                'message': 'Reused cached model',
+                'model': model,
+                'cache_status': status
+            }
+        
+        results = self.lstm_forecaster.train(series)
+        if results.get('success', False):
+            self.forecaster_cache.store(
+                'lstm', series_id, config, values,
+                (self.lstm_forecaster.model, copy.deepcopy(self.lstm_forecaster.scaler))
+            )
+        results['cache_status'] = status
+        return results
+    
+    def _fit_arima_cached(self, series: pd.Series, series_id: str) -> Dict[str, Any]:
+        """
+        Fit the ARIMA forecaster for a series, reusing a cached fit when the data allows
+        
+        New observations without drift are appended to the cached state-space model
+        with its estimated parameters; a full refit happens on a miss or drift.
+        
+        Args:
+            series: Time series data
+            series_id: Series identity used as the cache key
+            
+        Returns:
+            Dictionary with training results and the cache outcome
+        """
+        config = {'order': list(self.arima_forecaster.order)}
+        values = series.to_numpy(dtype=float)
+        status, entry = self.forecaster_cache.lookup('arima', series_id, config, values)
+        
+        if status == CACHE_HIT:
+            self.arima_forecaster.model = entry.state
+            return {
+                'success': True,
+                'message': 'Reused cached model',
+                'model': entry.state,
+                'cache_status': status
+            }
+        
+        if status == CACHE_APPEND:
+            self.arima_forecaster.model = entry.state
+            update_results = self.arima_forecaster.update(series.iloc[entry.n_obs:])
+            if update_results.get('success', False):
+                self.forecaster_cache.advance(entry, values, self.arima_forecaster.model)
+                update_results['cache_status'] = status
+                return update_results
+        
+        results = self.arima_forecaster.train(series)
+        if results.get('success', False) and self.arima_forecaster.model is not None:
+            self.forecaster_cache.store('arima', series_id, config, values, self.arima_forecaster.model)
+        results['cache_status'] = status
+        return results
+    
     async def train_arima_model(self, ticket_data: pd.DataFrame) -> Dict[str, Any]:
         """
         Train ARIMA model on ticket data
@@ -233,7 +332,7 @@ class DemandForecaster:
                 
                 # Train ARIMA model
                 if self.arima_forecaster is not None:
-                    arima_results = self.arima_forecaster.train(pd.Series(ticket_series.astype(float)))
+                    arima_results = self._fit_arima_cached(pd.Series(ticket_series.astype(float)), TICKET_SERIES_ID)
                 else:
                     arima_results = {
                         'success': False,
@@ -336,7 +435,10 @@ class DemandForecaster:
                 
                 # LSTM forecast
                 if self.lstm_forecaster is not None:
-                    lstm_train_result = self.lstm_forecaster.train(pd.Series(ticket_series.astype(float)))
+                    if self.inference_only:
+                        lstm_train_result = {'success': self.lstm_forecaster.model is not None}
+                    else:
+                        lstm_train_result = self._fit_lstm_cached(pd.Series(ticket_series.astype(float)), TICKET_SERIES_ID)
                     if lstm_train_result.get('success', False):
                         lstm_pred_result = self.lstm_forecaster.predict(pd.Series(ticket_series.astype(float)), forecast_horizon)
                         if lstm_pred_result.get('success', False):
@@ -344,7 +446,10 @@ class DemandForecaster:
                 
                 # ARIMA forecast
                 if self.arima_forecaster is not None:
-                    arima_train_result = self.arima_forecaster.train(pd.Series(ticket_series.astype(float)))
+                    if self.inference_only:
+                        arima_train_result = {'success': self.arima_forecaster.model is not None}
+                    else:
+                        arima_train_result = self._fit_arima_cached(pd.Series(ticket_series.astype(float)), TICKET_SERIES_ID)
                     if arima_train_result.get('success', False):
                         arima_pred_result = self.arima_forecaster.predict(forecast_horizon)
                         if arima_pred_result.get('success', False):
@@ -494,6 +599,17 @@ class DemandForecaster:
                 'metrics': {}
             }
     
+    def has_fitted_models(self) -> bool:
+        """
+        Check whether at least one fitted forecaster is available
+        
+        Returns:
+            Boolean indicating whether LSTM or ARIMA has a fitted model
+        """
+        lstm_ready = self.lstm_forecaster is not None and self.lstm_forecaster.model is not None
+        arima_ready = self.arima_forecaster is not None and self.arima_forecaster.model is not None
+        return lstm_ready or arima_ready
+    
     async def run_complete_demand_analysis(self, forecast_horizon: int = 30,
                                         start_date: Optional[datetime] = None,
                                         end_date: Optional[datetime] = None) -> Dict[str, Any]:
@@ -511,6 +627,13 @@ class DemandForecaster:
         try:
             logger.info("Starting complete demand analysis pipeline")
             
+            if self.inference_only and not self.has_fitted_models():
+                logger.error("Demand forecasting models not loaded and training is disabled in inference-only mode")
+                return {
+                    'status': 'model_not_loaded',
+                    'message': 'Demand forecasting models not loaded; training is disabled in inference-only mode'
+                }
+            
             # 1. Prepare data
             logger.info("Step 1: Preparing data")
             data = await self.prepare_data(start_date, end_date)
@@ -523,10 +646,15 @@ class DemandForecaster:
             logger.info("Step 2: Performing seasonal decomposition")
             decomposition_results = await self.perform_seasonal_decomposition(data['ticket_data'])
             
-            # 3. Train forecasting models
-            logger.info("Step 3: Training forecasting models")
-            lstm_results = await self.train_lstm_model(data['ticket_data'])
-            arima_results = await self.train_arima_model(data['ticket_data'])
+            # 3. Train forecasting models (skipped when serving persisted models)
+            if self.inference_only:
+                logger.info("Step 3: Using persisted forecasting models")
+                lstm_results = {'success': self.lstm_forecaster.model is not None, 'message': 'Loaded from disk'}
+                arima_results = {'success': self.arima_forecaster.model is not None, 'message': 'Loaded from disk'}
+            else:
+                logger.info("Step 3: Training forecasting models")
+                lstm_results = await self.train_lstm_model(data['ticket_data'])
+                arima_results = await self.train_arima_model(data['ticket_data'])
             
             # 4. Generate demand forecast
             logger.info("Step 4: Generating demand forecast")
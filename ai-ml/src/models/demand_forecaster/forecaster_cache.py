@@ -0,0 +1,246 @@
+"""
+Forecaster Cache for Service Demand Forecaster
+Reuses fitted forecasters across calls, keyed by series identity and data fingerprint
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Lookup outcomes
+CACHE_HIT = 'hit'          # Same observations the cached model was fitted on
+CACHE_APPEND = 'append'    # Only new observations at the end, no drift
+CACHE_DRIFT = 'drift'      # New observations have drifted away from the fitted data
+CACHE_MISS = 'miss'        # Nothing cached, config changed or history rewritten
+
+
+@dataclass
+class CachedForecaster:
+    """A fitted forecaster plus the fingerprint of the observations it has seen"""
+    kind: str
+    series_id: str
+    config: Dict[str, Any]
+    fingerprint: str
+    n_obs: int
+    reference_mean: float
+    reference_std: float
+    fitted_at: str
+    updated_at: str
+    state: Any = None
+
+    def metadata(self) -> Dict[str, Any]:
+        """Serializable entry fields (without the fitted state)"""
+        meta = asdict(self)
+        meta.pop('state')
+        return meta
+
+
+class ForecasterCache:
+    """Cache of fitted forecasters that only refits on rewritten history or drift"""
+
+    def __init__(self, cache_dir: Optional[str] = None, drift_threshold: float = 1.0):
+        """
+        Initialize forecaster cache
+
+        Args:
+            cache_dir: Directory to persist fitted forecasters in (memory only if None)
+            drift_threshold: Shift of the new observations' mean, in standard deviations
+                of the fitted data, beyond which a refit is required
+        """
+        self.cache_dir = cache_dir
+        self.drift_threshold = drift_threshold
+        self._entries: Dict[Tuple[str, str], CachedForecaster] = {}
+        self.stats = {CACHE_HIT: 0, CACHE_APPEND: 0, CACHE_DRIFT: 0, CACHE_MISS: 0}
+        logger.info("Forecaster Cache initialized")
+
+    @staticmethod
+    def fingerprint(values: np.ndarray) -> str:
+        """
+        Fingerprint a series of observations
+
+        Args:
+            values: Observations
+
+        Returns:
+            Hex digest of the observations as float64
+        """
+        return hashlib.sha1(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+    @staticmethod
+    def _normalize_config(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Round-trip a config through JSON so tuples and lists compare equal after reload"""
+        return json.loads(json.dumps(config))
+
+    def lookup(self, kind: str, series_id: str, config: Dict[str, Any],
+               values: np.ndarray) -> Tuple[str, Optional[CachedForecaster]]:
+        """
+        Find the cached forecaster for a series and classify the new observations
+
+        Args:
+            kind: Forecaster kind (e.g. 'arima', 'lstm')
+            series_id: Series identity
+            config: Forecaster configuration the model must have been fitted with
+            values: All current observations of the series
+
+        Returns:
+            Tuple of (lookup outcome, cached entry or None on a miss)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        entry = self._entries.get((kind, series_id)) or self._load(kind, series_id)
+
+        if entry is None or entry.config != self._normalize_config(config):
+            status = CACHE_MISS
+        elif len(values) < entry.n_obs or self.fingerprint(values[:entry.n_obs]) != entry.fingerprint:
+            status = CACHE_MISS
+        elif len(values) == entry.n_obs:
+            status = CACHE_HIT
+        elif self._has_drifted(entry, values[entry.n_obs:]):
+            status = CACHE_DRIFT
+        else:
+            status = CACHE_APPEND
+
+        self.stats[status] += 1
+        logger.info(f"Forecaster cache {status} for {kind}:{series_id}")
+        return status, (None if status == CACHE_MISS else entry)
+
+    def _has_drifted(self, entry: CachedForecaster, new_values: np.ndarray) -> bool:
+        """Check whether new observations shifted away from the data the model was fitted on"""
+        scale = max(entry.reference_std, 1e-8)
+        return abs(float(np.mean(new_values)) - entry.reference_mean) > self.drift_threshold * scale
+
+    def store(self, kind: str, series_id: str, config: Dict[str, Any],
+              values: np.ndarray, state: Any) -> CachedForecaster:
+        """
+        Cache a freshly fitted forecaster
+
+        Args:
+            kind: Forecaster kind
+            series_id: Series identity
+            config: Forecaster configuration used for fitting
+            values: Observations the forecaster was fitted on
+            state: Fitted state to reuse (must not be mutated by later fits)
+
+        Returns:
+            The cached entry
+        """
+        values = np.asarray(values, dtype=np.float64)
+        now = datetime.now().isoformat()
+        entry = CachedForecaster(
+            kind=kind,
+            series_id=series_id,
+            config=self._normalize_config(config),
+            fingerprint=self.fingerprint(values),
+            n_obs=len(values),
+            reference_mean=float(np.mean(values)) if len(values) else 0.0,
+            reference_std=float(np.std(values)) if len(values) else 0.0,
+            fitted_at=now,
+            updated_at=now,
+            state=state
+        )
+        self._entries[(kind, series_id)] = entry
+        self._save(entry)
+        return entry
+
+    def advance(self, entry: CachedForecaster, values: np.ndarray, state: Any) -> CachedForecaster:
+        """
+        Record that a cached forecaster has absorbed new observations without a refit
+
+        Args:
+            entry: Cached entry returned by lookup
+            values: All observations the forecaster has now seen
+            state: Updated fitted state
+
+        Returns:
+            The updated entry
+        """
+        values = np.asarray(values, dtype=np.float64)
+        entry.fingerprint = self.fingerprint(values)
+        entry.n_obs = len(values)
+        entry.updated_at = datetime.now().isoformat()
+        entry.state = state
+        self._entries[(entry.kind, entry.series_id)] = entry
+        self._save(entry)
+        return entry
+
+    def invalidate(self, kind: Optional[str] = None, series_id: Optional[str] = None):
+        """
+        Drop cached forecasters so the next lookup refits them
+
+        Args:
+            kind: Only drop this forecaster kind
+            series_id: Only drop this series
+        """
+        for key in list(self._entries):
+            if (kind is None or key[0] == kind) and (series_id is None or key[1] == series_id):
+                del self._entries[key]
+                if self.cache_dir is not None:
+                    meta_path = os.path.join(self._entry_dir(*key), 'meta.json')
+                    if os.path.exists(meta_path):
+                        os.remove(meta_path)
+
+    def _entry_dir(self, kind: str, series_id: str) -> str:
+        """Directory holding one persisted entry"""
+        safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', series_id)
+        return os.path.join(self.cache_dir, kind, safe_id)
+
+    def _save(self, entry: CachedForecaster):
+        """Persist an entry when a cache directory is configured"""
+        if self.cache_dir is None:
+            return
+        try:
+            entry_dir = self._entry_dir(entry.kind, entry.series_id)
+            os.makedirs(entry_dir, exist_ok=True)
+
+            if entry.kind == 'lstm':
+                model, scaler = entry.state
+                model.save(os.path.join(entry_dir, 'model.keras'))
+                with open(os.path.join(entry_dir, 'scaler.pkl'), 'wb') as f:
+                    pickle.dump(scaler, f)
+            else:
+                with open(os.path.join(entry_dir, 'model.pkl'), 'wb') as f:
+                    pickle.dump(entry.state, f)
+
+            # Metadata last, so a partially written entry is never picked up
+            with open(os.path.join(entry_dir, 'meta.json'), 'w') as f:
+                json.dump(entry.metadata(), f, indent=2)
+        except Exception as e:
+            logger.error(f"Error persisting cached {entry.kind} forecaster for {entry.series_id}: {e}")
+
+    def _load(self, kind: str, series_id: str) -> Optional[CachedForecaster]:
+        """Load a persisted entry, if any"""
+        if self.cache_dir is None:
+            return None
+        entry_dir = self._entry_dir(kind, series_id)
+        meta_path = os.path.join(entry_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+
+        try:
+            with open(meta_path, 'r') as f:
+                entry = CachedForecaster(**json.load(f))
+
+            if kind == 'lstm':
+                import tensorflow as tf
+                with open(os.path.join(entry_dir, 'scaler.pkl'), 'rb') as f:
+                    scaler = pickle.load(f)
+                entry.state = (tf.keras.models.load_model(os.path.join(entry_dir, 'model.keras')), scaler)
+            else:
+                with open(os.path.join(entry_dir, 'model.pkl'), 'rb') as f:
+                    entry.state = pickle.load(f)
+
+            self._entries[(kind, series_id)] = entry
+            logger.info(f"Cached {kind} forecaster for {series_id} loaded from {entry_dir}")
+            return entry
+        except Exception as e:
+            logger.error(f"Error loading cached {kind} forecaster for {series_id}: {e}")
+            return None
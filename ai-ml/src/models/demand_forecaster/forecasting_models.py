@@ -21,29 +21,30 @@ except ImportError:
     MinMaxScaler = None
     logging.warning("Scikit-learn not available, some features will be limited")
 
-# Try to import deep learning libraries
+from src.utils.lazy_imports import lazy_import
+
+# Try to import deep learning libraries (imported on first model build or load)
 try:
-    import tensorflow as tf
-    from tensorflow.keras.models import Sequential
-    from tensorflow.keras.layers import LSTM, Dense, Dropout
+    tf = lazy_import("tensorflow")
+    keras_models = lazy_import("tensorflow.keras.models")
+    keras_layers = lazy_import("tensorflow.keras.layers")
     TENSORFLOW_AVAILABLE = True
 except ImportError:
     TENSORFLOW_AVAILABLE = False
-    Sequential = None
-    LSTM = None
-    Dense = None
-    Dropout = None
+    tf = None
+    keras_models = None
+    keras_layers = None
     logging.warning("TensorFlow not available, LSTM features will be limited")
 
-# Try to import statistical libraries
+# Try to import statistical libraries (imported on first fit)
 try:
-    from statsmodels.tsa.arima.model import ARIMA as StatsARIMA
-    from statsmodels.tsa.seasonal import seasonal_decompose
+    statsmodels_arima = lazy_import("statsmodels.tsa.arima.model")
+    statsmodels_seasonal = lazy_import("statsmodels.tsa.seasonal")
     STATSMODELS_AVAILABLE = True
 except ImportError:
     STATSMODELS_AVAILABLE = False
-    StatsARIMA = None
-    seasonal_decompose = None
+    statsmodels_arima = None
+    statsmodels_seasonal = None
     logging.warning("Statsmodels not available, ARIMA and seasonal decomposition features will be limited")
 
 logger = logging.getLogger(__name__)
@@ -67,6 +68,10 @@ class LSTMForecaster:
         self.model = None
         self.scaler = MinMaxScaler(feature_range=(0, 1)) if SKLEARN_AVAILABLE and MinMaxScaler else None
         self.available = TENSORFLOW_AVAILABLE and SKLEARN_AVAILABLE
+        
+        # Compiled single-step forward pass, rebuilt whenever the model is replaced
+        self._step_function = None
+        self._step_model = None
         logger.info("LSTM Forecaster initialized")
     
     def prepare_data(self, data: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
@@ -89,13 +94,15 @@ class LSTMForecaster:
         else:
             scaled_data = data.values.astype(float).reshape(-1, 1)
         
-        # Create sequences
-        X, y = [], []
-        for i in range(self.sequence_length, len(scaled_data)):
-            X.append(scaled_data[i-self.sequence_length:i, 0])
-            y.append(scaled_data[i, 0])
+        if len(scaled_data) <= self.sequence_length:
+            return np.array([]), np.array([])
+        
+        # Create sequences as strided views: each window holds sequence_length inputs and its target
+        windows = np.lib.stride_tricks.sliding_window_view(scaled_data[:, 0], self.sequence_length + 1)
+        X = np.ascontiguousarray(windows[:, :-1])
+        y = windows[:, -1].copy()
         
-        return np.array(X), np.array(y)
+        return X, y
     
     def build_model(self, input_shape: Tuple[int, int]) -> Any:
         """
@@ -111,14 +118,14 @@ class LSTMForecaster:
             logger.warning("TensorFlow not available for LSTM model building")
             return None
         
-        if Sequential and LSTM and Dropout and Dense:
-            model = Sequential([
-                LSTM(50, return_sequences=True, input_shape=input_shape),
-                Dropout(0.2),
-                LSTM(50, return_sequences=False),
-                Dropout(0.2),
-                Dense(25),
-                Dense(1)
+        if keras_models is not None and keras_layers is not None:
+            model = keras_models.Sequential([
+                keras_layers.LSTM(50, return_sequences=True, input_shape=input_shape),
+                keras_layers.Dropout(0.2),
+                keras_layers.LSTM(50, return_sequences=False),
+                keras_layers.Dropout(0.2),
+                keras_layers.Dense(25),
+                keras_layers.Dense(1)
             ])
         else:
             model = None
@@ -186,67 +193,151 @@ class LSTMForecaster:
                 'model': None
             }
     
-    def predict(self, data: pd.Series, steps: int = 30) -> Dict[str, Any]:
+    def _get_step_function(self) -> Any:
         """
-        Make predictions using trained LSTM model
+        Get the compiled forward pass used for each recursive forecasting step
+        
+        Returns:
+            tf.function mapping a (batch, sequence_length, 1) tensor to (batch, 1) predictions
+        """
+        if self._step_function is None or self._step_model is not self.model:
+            model = self.model
+            
+            # A fixed input signature traces once for any batch size instead of per call shape
+            @tf.function(input_signature=[
+                tf.TensorSpec(shape=(None, self.sequence_length, 1), dtype=tf.float32)
+            ])
+            def step(sequences):
+                return model(sequences, training=False)
+            
+            self._step_function = step
+            self._step_model = model
+        return self._step_function
+    
+    def _recursive_forecast(self, windows: np.ndarray, steps: int) -> np.ndarray:
+        """
+        Roll every window forward together, feeding predictions back in as inputs
         
         Args:
-            data: Time series data for prediction
+            windows: Scaled input windows of shape (n_series, sequence_length)
             steps: Number of steps to predict
             
         Returns:
-            Dictionary with predictions
+            Scaled predictions of shape (n_series, steps)
+        """
+        step = self._get_step_function()
+        current = tf.constant(windows[:, :, np.newaxis], dtype=tf.float32)
+        
+        outputs = []
+        for _ in range(steps):
+            # One batched call advances all series by one step
+            next_values = step(current)
+            outputs.append(next_values)
+            current = tf.concat([current[:, 1:, :], next_values[:, :, tf.newaxis]], axis=1)
+        
+        return tf.concat(outputs, axis=1).numpy()
+    
+    def predict_batch(self, series: Dict[str, pd.Series], steps: int = 30) -> Dict[str, Any]:
+        """
+        Make predictions for many time series at once using trained LSTM model
+        
+        Args:
+            series: Dictionary mapping series identifiers to time series data
+            steps: Number of steps to predict
+            
+        Returns:
+            Dictionary with predictions per series and the identifiers that were too short
         """
         if not self.available or self.model is None:
             logger.warning("LSTM model not available for prediction")
             return {
                 'success': False,
                 'message': 'Model not trained or available',
-                'predictions': []
+                'predictions': {}
             }
         
         try:
-            # Prepare last sequence
-            last_sequence = data.values[-self.sequence_length:]
+            # Prepare last sequence of every series long enough to fill a window
+            series_ids, windows, skipped = [], [], []
+            for series_id, data in series.items():
+                values = np.asarray(data, dtype=float)
+                if len(values) < self.sequence_length:
+                    skipped.append(series_id)
+                    continue
+                series_ids.append(series_id)
+                windows.append(values[-self.sequence_length:])
+            
+            if not series_ids:
+                return {
+                    'success': False,
+                    'message': f'No series with at least {self.sequence_length} observations',
+                    'predictions': {},
+                    'skipped_series': skipped
+                }
+            
+            windows = np.stack(windows)
             if self.scaler is not None:
-                last_sequence_scaled = self.scaler.transform(last_sequence.astype(float).reshape(-1, 1))
-            else:
-                last_sequence_scaled = last_sequence.astype(float).reshape(-1, 1)
+                windows = self.scaler.transform(windows.reshape(-1, 1)).reshape(windows.shape)
             
             # Make predictions
-            predictions = []
-            current_sequence = last_sequence_scaled.reshape(1, -1)
-            
-            for _ in range(steps):
-                # Predict next value
-                next_pred = self.model.predict(current_sequence.reshape(1, self.sequence_length, 1), verbose=0)
-                predictions.append(next_pred[0, 0])
-                
-                # Update sequence
-                current_sequence = np.append(current_sequence[:, 1:], next_pred[0, 0]).reshape(1, -1)
+            predictions = self._recursive_forecast(windows, steps)
             
             # Inverse transform predictions
-            predictions = np.array(predictions).reshape(-1, 1)
             if self.scaler is not None:
-                predictions = self.scaler.inverse_transform(predictions).flatten()
-            else:
-                predictions = predictions.flatten()
+                predictions = self.scaler.inverse_transform(predictions.reshape(-1, 1)).reshape(predictions.shape)
             
-            logger.info(f"LSTM prediction completed for {steps} steps")
+            logger.info(f"LSTM prediction completed for {len(series_ids)} series and {steps} steps")
             return {
                 'success': True,
                 'message': 'Prediction completed',
-                'predictions': predictions.tolist(),
-                'prediction_steps': steps
+                'predictions': {
+                    series_id: forecast.tolist() for series_id, forecast in zip(series_ids, predictions)
+                },
+                'prediction_steps': steps,
+                'skipped_series': skipped
             }
             
         except Exception as e:
-            logger.error(f"Error making LSTM predictions: {e}")
+            logger.error(f"Error making batched LSTM predictions: {e}")
             return {
                 'success': False,
                 'message': f'Prediction error: {str(e)}',
+                'predictions': {}
+            }
+    
+    def predict(self, data: pd.Series, steps: int = 30) -> Dict[str, Any]:
+        """
+        Make predictions using trained LSTM model
+        
+        Args:
+            data: Time series data for prediction
+            steps: Number of steps to predict
+            
+        Returns:
+            Dictionary with predictions
+        """
+        if not self.available or self.model is None:
+            logger.warning("LSTM model not available for prediction")
+            return {
+                'success': False,
+                'message': 'Model not trained or available',
+                'predictions': []
+            }
+        
+        batch_result = self.predict_batch({'series': data}, steps)
+        if not batch_result['success'] or 'series' not in batch_result['predictions']:
+            return {
+                'success': False,
+                'message': batch_result['message'],
                 'predictions': []
             }
+        
+        return {
+            'success': True,
+            'message': 'Prediction completed',
+            'predictions': batch_result['predictions']['series'],
+            'prediction_steps': steps
+        }
 
 
 class ARIMAForecaster:
@@ -283,15 +374,12 @@ class ARIMAForecaster:
             }
         
         try:
-            # Fit ARIMA model
-            if StatsARIMA:
-                self.model = StatsARIMA(data, order=self.order)
-            else:
-                self.model = None
-            if self.model is not None:
-                fitted_model = self.model.fit()
+            # Fit ARIMA model and keep the fitted results, which carry the state-space filter
+            if statsmodels_arima is not None:
+                fitted_model = statsmodels_arima.ARIMA(data, order=self.order).fit()
             else:
                 fitted_model = None
+            self.model = fitted_model
             
             logger.info("ARIMA model training completed")
             return {
@@ -310,6 +398,43 @@ class ARIMAForecaster:
                 'model': None
             }
     
+    def update(self, new_data: pd.Series) -> Dict[str, Any]:
+        """
+        Extend the fitted model with new observations without re-estimating parameters
+        
+        Args:
+            new_data: Observations following the data the model has already seen
+            
+        Returns:
+            Dictionary with update results
+        """
+        if not self.available or self.model is None:
+            logger.warning("ARIMA model not available for update")
+            return {
+                'success': False,
+                'message': 'Model not trained or available',
+                'model': None
+            }
+        
+        try:
+            # Run the Kalman filter over the new observations with the existing parameters
+            self.model = self.model.append(new_data, refit=False)
+            
+            logger.info(f"ARIMA model updated with {len(new_data)} new observations")
+            return {
+                'success': True,
+                'message': 'Update completed',
+                'model': self.model
+            }
+            
+        except Exception as e:
+            logger.error(f"Error updating ARIMA model: {e}")
+            return {
+                'success': False,
+                'message': f'Update error: {str(e)}',
+                'model': None
+            }
+    
     def predict(self, steps: int = 30) -> Dict[str, Any]:
         """
         Make predictions using trained ARIMA model
@@ -500,8 +625,8 @@ class SeasonalDecomposer:
         
         try:
             # Perform seasonal decomposition
-            if seasonal_decompose:
-                decomposition = seasonal_decompose(data, model=self.model, period=self.period)
+            if statsmodels_seasonal is not None:
+                decomposition = statsmodels_seasonal.seasonal_decompose(data, model=self.model, period=self.period)
             else:
                 decomposition = None
             
@@ -39,13 +39,22 @@ from .pricing_predictor import (
 
 logger = logging.getLogger(__name__)
 
+# Price points forming the RL action space (shared by training and artifact loading)
+DEFAULT_PRICE_POINTS: List[float] = [80.0, 90.0, 100.0, 110.0, 120.0, 130.0, 140.0, 150.0]
+
 
 class DynamicPricingEngine:
     """Main orchestrator for the dynamic pricing engine"""
     
-    def __init__(self):
-        """Initialize the dynamic pricing engine"""
+    def __init__(self, inference_only: bool = False):
+        """
+        Initialize the dynamic pricing engine
+        
+        Args:
+            inference_only: Never run RL training; serve the policy loaded via load_models
+        """
         logger.info("Dynamic Pricing Engine initialized")
+        self.inference_only = inference_only
         
         # Initialize all components
         self._initialize_components()
@@ -372,7 +381,7 @@ class DynamicPricingEngine:
         """
         try:
             # Define price points for action space
-            base_prices: List[float] = [80.0, 90.0, 100.0, 110.0, 120.0, 130.0, 140.0, 150.0]
+            base_prices: List[float] = list(DEFAULT_PRICE_POINTS)
             await self.initialize_reinforcement_learning_agents(base_prices)
             
             # Check if all RL components are initialized
@@ -381,66 +390,37 @@ class DynamicPricingEngine:
                 logger.warning("RL components not properly initialized")
                 return {}
             
+            # Client states do not change between episodes, so encode them once
+            states = self.q_learning_agent.encode_states(
+                self._build_rl_state_features(client_data, market_data, competitor_data)
+            )
+            service_usage = self._client_column(client_data, 'service_usage_frequency', 5.0)
+            competitor_avg_price = float(competitor_data['avg_price'].mean() if not competitor_data.empty else 100)
+            
             # Training loop
             total_rewards = []
             
             for episode in range(episodes):
-                episode_reward = 0
+                # Select price points for every client in one pass
+                actions = self.q_learning_agent.get_actions(states, training=True)
                 
-                # Process each client
-                for _, client in client_data.iterrows():
-                    client_id = client['client_id']
-                    
-                    # Get current state
-                    client_value_raw = client.get('revenue_contribution', 10000)
-                    client_value = float(client_value_raw) if client_value_raw is not None else 10000.0
-                    
-                    market_trend_raw = market_data['market_rate'].pct_change().mean() if len(market_data) > 1 else 0
-                    market_trend = float(market_trend_raw) if market_trend_raw is not None else 0.0
-                    
-                    competition_level = float(len(competitor_data))
-                    
-                    state_features = {
-                        'client_value': client_value,
-                        'market_trend': market_trend,
-                        'competition_level': competition_level,
-                        'seasonal_factor': 1.0,  # Simplified
-                        'demand_index': 1.0  # Simplified
-                    }
-                    
-                    if self.q_learning_agent is not None:
-                        state = self.q_learning_agent.get_state(state_features)
-                        
-                        # Select action (price point)
-                        action = self.q_learning_agent.get_action(state, training=True)
-                        
-                        # Calculate reward (simplified)
-                        service_usage_raw = client.get('service_usage_frequency', 5)
-                        service_usage = float(service_usage_raw) if service_usage_raw is not None else 5.0
-                        revenue = action * service_usage
-                        cost = revenue * 0.3  # Assume 30% cost
-                        client_retention = 0.8 if action < 120 else 0.6  # Simplified retention model
-                        market_share = 0.1  # Simplified
-                        competitor_avg_price = float(competitor_data['avg_price'].mean() if not competitor_data.empty else 100)
-                        
-                        if self.reward_function is not None:
-                            reward = self.reward_function.calculate_reward(
-                                revenue, cost, client_retention, market_share, competitor_avg_price
-                            )
-                        else:
-                            reward = 0
-                        
-                        # Update Q-value
-                        # For simplicity, we'll use the same state as next state
-                        self.q_learning_agent.update_q_value(state, action, reward, state, done=True)
-                        
-                        episode_reward += reward
+                # Calculate rewards (simplified)
+                revenue = actions * service_usage
+                cost = revenue * 0.3  # Assume 30% cost
+                client_retention = np.where(actions < 120, 0.8, 0.6)  # Simplified retention model
+                market_share = 0.1  # Simplified
+                rewards = self.reward_function.calculate_rewards(
+                    revenue, cost, client_retention, market_share, competitor_avg_price
+                )
+                
+                # Update Q-values
+                # For simplicity, each client's episode ends after one pricing decision
+                self.q_learning_agent.update_q_values(states, actions, rewards, done=True)
                 
                 # Decay exploration rate
-                if self.q_learning_agent is not None:
-                    self.q_learning_agent.decay_epsilon()
+                self.q_learning_agent.decay_epsilon()
                 
-                total_rewards.append(episode_reward)
+                total_rewards.append(float(rewards.sum()))
                 
                 # Log progress
                 if (episode + 1) % 20 == 0:
@@ -450,7 +430,7 @@ class DynamicPricingEngine:
             # Get final policy
             if self.q_learning_agent is not None:
                 policy = self.q_learning_agent.get_policy()
-                q_table_size = len(self.q_learning_agent.q_table)
+                q_table_size = self.q_learning_agent.num_states
             else:
                 policy = {}
                 q_table_size = 0
@@ -470,6 +450,92 @@ class DynamicPricingEngine:
             logger.error(f"Error optimizing pricing with RL: {e}")
             return {}
     
+    @staticmethod
+    def _client_column(client_data: pd.DataFrame, column: str, default: float) -> np.ndarray:
+        """Numeric client column with missing values replaced by a default"""
+        if column not in client_data:
+            return np.full(len(client_data), default)
+        return pd.to_numeric(client_data[column], errors='coerce').fillna(default).to_numpy(dtype=float)
+    
+    def _build_rl_state_features(self, client_data: pd.DataFrame,
+                                 market_data: pd.DataFrame,
+                                 competitor_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the RL state features for every client
+        
+        Args:
+            client_data: Client value data
+            market_data: Market rate data
+            competitor_data: Competitor pricing data
+            
+        Returns:
+            DataFrame with one row of state features per client
+        """
+        market_trend_raw = market_data['market_rate'].pct_change().mean() if len(market_data) > 1 else 0
+        market_trend = float(market_trend_raw) if market_trend_raw is not None else 0.0
+        
+        return pd.DataFrame({
+            'client_value': self._client_column(client_data, 'revenue_contribution', 10000.0),
+            'market_trend': market_trend,
+            'competition_level': float(len(competitor_data)),
+            'seasonal_factor': 1.0,  # Simplified
+            'demand_index': 1.0  # Simplified
+        }, index=client_data.index)
+    
+    def recommend_prices_with_rl(self, client_data: pd.DataFrame,
+                                 market_data: pd.DataFrame,
+                                 competitor_data: pd.DataFrame) -> Dict[str, float]:
+        """
+        Recommend the learned price point for every client in one batched policy lookup
+        
+        Args:
+            client_data: Client value data
+            market_data: Market rate data
+            competitor_data: Competitor pricing data
+            
+        Returns:
+            Dictionary mapping client IDs to price points
+        """
+        try:
+            if self.q_learning_agent is None or client_data.empty:
+                return {}
+            
+            states = self.q_learning_agent.encode_states(
+                self._build_rl_state_features(client_data, market_data, competitor_data)
+            )
+            prices = self.q_learning_agent.get_actions(states, training=False)
+            return dict(zip(client_data['client_id'].astype(str), prices.tolist()))
+            
+        except Exception as e:
+            logger.error(f"Error recommending prices with RL: {e}")
+            return {}
+    
+    def has_trained_policy(self) -> bool:
+        """
+        Check whether a learned Q-table is available
+        
+        Returns:
+            Boolean indicating whether the Q-learning agent has learned states
+        """
+        return self.q_learning_agent is not None and self.q_learning_agent.num_states > 0
+    
+    def get_rl_policy_summary(self) -> Dict[str, Any]:
+        """
+        Summarize the current RL policy without running any training episodes
+        
+        Returns:
+            Dictionary shaped like optimize_pricing_with_rl results
+        """
+        if self.q_learning_agent is None:
+            return {}
+        return {
+            'total_episodes': 0,
+            'final_policy': self.q_learning_agent.get_policy(),
+            'total_rewards': [],
+            'average_final_reward': 0,
+            'q_table_size': self.q_learning_agent.num_states
+        }
+    
     def save_models(self, output_dir: str):
         """
         Save trained RL models (Q-table and bandit agent) to disk.
@@ -481,13 +547,9 @@ class DynamicPricingEngine:
 
         # Save Q-table
         if self.q_learning_agent is not None:
-            q_table_dict = {}
-            for state, actions in self.q_learning_agent.q_table.items():
-                q_table_dict[state] = {str(k): float(v) for k, v in actions.items()}
-            q_path = os.path.join(output_dir, "q_table.json")
-            with open(q_path, "w") as f:
-                json.dump(q_table_dict, f, indent=2)
-            logger.info(f"Q-table saved ({len(q_table_dict)} states) to {q_path}")
+            q_path = os.path.join(output_dir, "q_table.npz")
+            self.q_learning_agent.save_q_table(q_path)
+            logger.info(f"Q-table saved ({self.q_learning_agent.num_states} states) to {q_path}")
 
         # Save multi-armed bandit agent
         if self.multi_armed_bandit_agent is not None:
@@ -518,16 +580,20 @@ class DynamicPricingEngine:
         """
         loaded_any = False
         try:
-            # Load Q-table
+            # Load Q-table (binary Q-matrix, falling back to the legacy JSON table)
             if self.q_learning_agent is not None:
-                q_path = os.path.join(model_dir, "q_table.json")
+                q_path = os.path.join(model_dir, "q_table.npz")
+                legacy_q_path = os.path.join(model_dir, "q_table.json")
                 if os.path.exists(q_path):
+                    self.q_learning_agent.load_q_table(q_path)
+                elif os.path.exists(legacy_q_path):
+                    q_path = legacy_q_path
                     with open(q_path, "r") as f:
-                        q_table_dict = json.load(f)
-                    for state, actions in q_table_dict.items():
-                        for action_str, q_value in actions.items():
-                            self.q_learning_agent.q_table[state][float(action_str)] = q_value
-                    logger.info(f"Q-table loaded ({len(q_table_dict)} states) from {q_path}")
+                        self.q_learning_agent.load_q_table_dict(json.load(f))
+                else:
+                    q_path = None
+                if q_path is not None:
+                    logger.info(f"Q-table loaded ({self.q_learning_agent.num_states} states) from {q_path}")
                     loaded_any = True
 
             # Load multi-armed bandit agent
@@ -569,6 +635,13 @@ class DynamicPricingEngine:
         try:
             logger.info("Starting complete pricing analysis pipeline")
             
+            if self.inference_only and not self.has_trained_policy():
+                logger.error("Pricing policy not loaded and training is disabled in inference-only mode")
+                return {
+                    'status': 'model_not_loaded',
+                    'message': 'Pricing policy not loaded; training is disabled in inference-only mode'
+                }
+            
             # 1. Prepare data
             logger.info("Step 1: Preparing data")
             data = await self.prepare_data()
@@ -608,9 +681,21 @@ class DynamicPricingEngine:
             )
             
             # 7. Optimize with reinforcement learning (optional)
-            logger.info("Step 7: Optimizing with reinforcement learning")
-            rl_results = await self.optimize_pricing_with_rl(
-                data['client_values'], data['market_rates'], data['competitive_pricing']
+            if self.inference_only:
+                logger.info("Step 7: Using persisted reinforcement learning policy")
+                rl_results = self.get_rl_policy_summary()
+            else:
+                logger.info("Step 7: Optimizing with reinforcement learning")
+                rl_results = await self.optimize_pricing_with_rl(
+                    data['client_values'], data['market_rates'], data['competitive_pricing']
+                )
+            
+            # 8. Learned price point per client in one batched Q-matrix lookup
+            rl_clients = data['client_values']
+            if client_id is not None and 'client_id' in rl_clients:
+                rl_clients = rl_clients[rl_clients['client_id'].astype(str) == str(client_id)]
+            rl_price_recommendations = self.recommend_prices_with_rl(
+                rl_clients, data['market_rates'], data['competitive_pricing']
             )
             
             # Compile complete results
@@ -624,6 +709,7 @@ class DynamicPricingEngine:
                 'roi_metrics': roi_metrics,
                 'validation_results': validation_results,
                 'rl_optimization_results': rl_results,
+                'rl_price_recommendations': rl_price_recommendations,
                 'summary': self._generate_analysis_summary(
                     recommendations, acceptance_probs, roi_metrics, validation_results
                 )
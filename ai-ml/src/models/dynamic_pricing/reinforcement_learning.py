@@ -6,9 +6,8 @@ Implements Q-Learning and Multi-armed bandit algorithms for optimal pricing deci
 import logging
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
-from collections import defaultdict
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -34,12 +33,16 @@ class QLearningPricingAgent:
         self.epsilon = epsilon
         self.epsilon_decay = epsilon_decay
         
-        # Q-table: state-action values
-        self.q_table = defaultdict(lambda: defaultdict(float))
-        
         # State and action spaces
         self.state_space = []
         self.action_space = []
+        self._action_columns: Dict[float, int] = {}
+        
+        # Q-matrix: one row per state index, one column per action; visited marks learned entries
+        self.state_keys: List[str] = []
+        self._state_rows: Dict[str, int] = {}
+        self.q_values = np.zeros((0, 0))
+        self.visited = np.zeros((0, 0), dtype=bool)
         
         # Episode tracking
         self.episode = 0
@@ -64,44 +67,158 @@ class QLearningPricingAgent:
         Args:
             price_points: List of possible price points (actions)
         """
-        self.action_space = price_points
+        previous_columns = self._action_columns
+        self.action_space = [float(price) for price in price_points]
+        self._action_columns = {price: column for column, price in enumerate(self.action_space)}
+        
+        # Carry learned values over for price points that are still available
+        q_values = np.zeros((len(self.q_values), len(self.action_space)))
+        visited = np.zeros(q_values.shape, dtype=bool)
+        for price, column in previous_columns.items():
+            if price in self._action_columns:
+                q_values[:, self._action_columns[price]] = self.q_values[:, column]
+                visited[:, self._action_columns[price]] = self.visited[:, column]
+        self.q_values, self.visited = q_values, visited
+        
         logger.info(f"Action space defined with {len(price_points)} price points")
     
+    @property
+    def num_states(self) -> int:
+        """Number of states with at least one learned Q-value"""
+        return int(self.visited[:len(self.state_keys)].any(axis=1).sum())
+    
+    @property
+    def q_table(self) -> Dict[str, Dict[float, float]]:
+        """Learned Q-values as a nested state -> action -> value dictionary"""
+        rows, columns = np.nonzero(self.visited[:len(self.state_keys)])
+        table: Dict[str, Dict[float, float]] = {}
+        for row, column in zip(rows, columns):
+            table.setdefault(self.state_keys[row], {})[self.action_space[column]] = float(self.q_values[row, column])
+        return table
+    
+    @staticmethod
+    def _discretize_value(value: Any) -> str:
+        """Discretize one feature value into its state label"""
+        if isinstance(value, (int, float, np.number)):
+            if not np.isfinite(value):
+                return "unknown"
+            # Round to nearest 10 for discretization
+            return str(int(round(float(value) / 10) * 10))
+        return str(value)
+    
+    def _discretize_column(self, values: pd.Series) -> Tuple[np.ndarray, List[str]]:
+        """Discretize a feature column into integer codes and their state labels"""
+        if pd.api.types.is_numeric_dtype(values):
+            numeric = values.to_numpy(dtype=float)
+            discretized = np.where(np.isfinite(numeric), np.round(numeric / 10) * 10, np.nan)
+            codes, uniques = pd.factorize(discretized, use_na_sentinel=False)
+            labels = ["unknown" if np.isnan(u) else str(int(u)) for u in uniques]
+        else:
+            codes, uniques = pd.factorize(values, use_na_sentinel=False)
+            labels = [self._discretize_value(u) for u in uniques]
+        return codes, labels
+    
+    def _register_state(self, state: str) -> int:
+        """Return the Q-matrix row for a state key, allocating one if new"""
+        row = self._state_rows.get(state)
+        if row is None:
+            row = len(self.state_keys)
+            if row >= len(self.q_values):
+                # Grow capacity geometrically so registration stays amortized O(1)
+                capacity = max(64, 2 * len(self.q_values))
+                q_values = np.zeros((capacity, len(self.action_space)))
+                visited = np.zeros(q_values.shape, dtype=bool)
+                q_values[:row] = self.q_values[:row]
+                visited[:row] = self.visited[:row]
+                self.q_values, self.visited = q_values, visited
+            self.state_keys.append(state)
+            self._state_rows[state] = row
+        return row
+    
+    def _action_column(self, action: float) -> int:
+        """Return the Q-matrix column for an action, extending the action space if new"""
+        action = float(action)
+        column = self._action_columns.get(action)
+        if column is None:
+            self.define_action_space(self.action_space + [action])
+            column = self._action_columns[action]
+        return column
+    
     def get_state(self, features: Dict[str, Any]) -> str:
         """
         Convert features to a state representation
         
         Args:
             features: Dictionary of feature values
-            
+        
         Returns:
             State representation as string
         """
-        # Simple state representation (can be enhanced with more sophisticated methods)
         state_parts = []
         for feature in self.state_space:
             if feature in features:
-                # Discretize continuous features
-                value = features[feature]
-                if isinstance(value, (int, float)):
-                    # Round to nearest 10 for discretization
-                    discretized = round(value / 10) * 10
-                    state_parts.append(f"{feature}:{discretized}")
-                else:
-                    state_parts.append(f"{feature}:{value}")
+                state_parts.append(f"{feature}:{self._discretize_value(features[feature])}")
             else:
                 state_parts.append(f"{feature}:unknown")
         
         return "|".join(state_parts)
     
-    def get_action(self, state: str, training: bool = True) -> float:
+    def encode_states(self, features: pd.DataFrame) -> np.ndarray:
+        """
+        Convert a frame of feature rows into dense state indices
+        
+        Args:
+            features: DataFrame with one row per client and a column per state feature
+        
+        Returns:
+            Array of Q-matrix row indices, one per feature row
+        """
+        num_rows = len(features)
+        if num_rows == 0:
+            return np.zeros(0, dtype=np.int64)
+        
+        code_columns = []
+        feature_labels = []
+        for feature in self.state_space:
+            if feature in features:
+                codes, labels = self._discretize_column(features[feature])
+            else:
+                codes, labels = np.zeros(num_rows, dtype=np.int64), ["unknown"]
+            code_columns.append(codes)
+            feature_labels.append(labels)
+        
+        # Only distinct feature combinations are turned into state keys
+        combinations, inverse = np.unique(
+            np.column_stack(code_columns) if code_columns else np.zeros((num_rows, 1), dtype=np.int64),
+            axis=0, return_inverse=True
+        )
+        combination_rows = np.array([
+            self._register_state("|".join(
+                f"{feature}:{labels[code]}"
+                for feature, labels, code in zip(self.state_space, feature_labels, combination)
+            ))
+            for combination in combinations
+        ], dtype=np.int64)
+        return combination_rows[inverse.reshape(-1)]
+    
+    def _state_row(self, state: Union[str, int]) -> int:
+        """Resolve a state key or index to a Q-matrix row (-1 if unknown)"""
+        if isinstance(state, (int, np.integer)):
+            return int(state) if 0 <= state < len(self.state_keys) else -1
+        return self._state_rows.get(state, -1)
+    
+    def _masked_q_values(self, rows: np.ndarray) -> np.ndarray:
+        """Q-values of the given rows with unvisited actions masked to -inf"""
+        return np.where(self.visited[rows], self.q_values[rows], -np.inf)
+    
+    def get_action(self, state: Union[str, int], training: bool = True) -> float:
         """
         Select an action (price point) based on the current state
         
         Args:
-            state: Current state representation
+            state: Current state representation or state index
             training: Whether in training mode (allows exploration)
-            
+        
         Returns:
             Selected action (price point)
         """
@@ -109,23 +226,36 @@ class QLearningPricingAgent:
             logger.warning("Action space not defined, returning default price")
             return 100.0
         
-        # Epsilon-greedy policy
-        if training and np.random.random() < self.epsilon:
-            # Exploration: random action
-            action = np.random.choice(self.action_space)
-            logger.debug(f"Exploration: selected random action {action}")
-        else:
-            # Exploitation: best known action
-            if state in self.q_table and self.q_table[state]:
-                # Select action with highest Q-value
-                action = max(self.q_table[state].keys(), key=lambda a: self.q_table[state][a])
-                logger.debug(f"Exploitation: selected best action {action}")
-            else:
-                # No Q-values for this state, select random action
-                action = np.random.choice(self.action_space)
-                logger.debug(f"No Q-values for state, selected random action {action}")
+        return float(self.get_actions(np.array([self._state_row(state)]), training)[0])
+    
+    def get_actions(self, states: np.ndarray, training: bool = True) -> np.ndarray:
+        """
+        Select actions (price points) for a batch of states with one epsilon-greedy pass
         
-        return action
+        Args:
+            states: Array of state indices from encode_states (-1 for unknown states)
+            training: Whether in training mode (allows exploration)
+        
+        Returns:
+            Array of selected price points
+        """
+        states = np.asarray(states, dtype=np.int64)
+        if not self.action_space:
+            logger.warning("Action space not defined, returning default price")
+            return np.full(len(states), 100.0)
+        
+        actions = np.asarray(self.action_space)
+        columns = np.random.randint(len(actions), size=len(states))
+        
+        # Exploit states with learned values unless exploring
+        known = states >= 0
+        known[known] = self.visited[states[known]].any(axis=1)
+        if training:
+            known &= np.random.random(len(states)) >= self.epsilon
+        if known.any():
+            columns[known] = np.argmax(self._masked_q_values(states[known]), axis=1)
+        
+        return actions[columns]
     
     def update_q_value(self, state: str, action: float, reward: float, 
                        next_state: str, done: bool = False):
@@ -139,23 +269,62 @@ class QLearningPricingAgent:
             next_state: Next state
             done: Whether episode is complete
         """
-        if state not in self.q_table:
-            self.q_table[state] = defaultdict(float)
-        
-        # Current Q-value
-        current_q = self.q_table[state][action]
-        
-        # Next Q-value (max Q-value of next state)
-        if done or next_state not in self.q_table:
-            next_q = 0
-        else:
-            next_q = max(self.q_table[next_state].values()) if self.q_table[next_state] else 0
+        self.update_q_values(
+            np.array([self._register_state(state)]), np.array([action], dtype=float),
+            np.array([reward], dtype=float), np.array([self._state_row(next_state)]), done
+        )
+        logger.debug(f"Updated Q-value for state {state}, action {action}")
+    
+    def update_q_values(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                        next_states: Optional[np.ndarray] = None, done: bool = False):
+        """
+        Apply Q-learning updates for a batch of transitions
         
-        # Q-learning update rule
-        new_q = current_q + self.learning_rate * (reward + self.discount_factor * next_q - current_q)
-        self.q_table[state][action] = new_q
+        Targets use the Q-matrix as it was before the batch; repeated (state, action)
+        pairs are folded in order, matching one update_q_value call per transition.
         
-        logger.debug(f"Updated Q-value for state {state}, action {action}: {current_q} -> {new_q}")
+        Args:
+            states: State indices from encode_states
+            actions: Actions (price points) taken
+            rewards: Rewards received
+            next_states: Next state indices (-1 for unknown states)
+            done: Whether the episode is complete for every transition
+        """
+        states = np.asarray(states, dtype=np.int64)
+        if len(states) == 0:
+            return
+        if np.any(states < 0) or np.any(states >= len(self.state_keys)):
+            raise ValueError("States must be registered through encode_states before updating")
+        
+        actions = np.asarray(actions, dtype=float)
+        unique_actions, action_inverse = np.unique(actions, return_inverse=True)
+        columns = np.array([self._action_column(a) for a in unique_actions])[action_inverse]
+        
+        # Next Q-value (max learned Q-value of next state, 0 when unseen)
+        next_q = np.zeros(len(states))
+        if not done and next_states is not None:
+            next_states = np.asarray(next_states, dtype=np.int64)
+            known = next_states >= 0
+            known[known] = self.visited[next_states[known]].any(axis=1)
+            next_q[known] = self._masked_q_values(next_states[known]).max(axis=1)
+        targets = np.asarray(rewards, dtype=float) + self.discount_factor * next_q
+        
+        # Sequential updates q <- q + lr * (target - q) for k transitions on one entry collapse to
+        # (1 - lr)^k * q + sum_j lr * (1 - lr)^(k - 1 - j) * target_j
+        entries = states * len(self.action_space) + columns
+        order = np.argsort(entries, kind='stable')
+        unique_entries, first, inverse, counts = np.unique(
+            entries[order], return_index=True, return_inverse=True, return_counts=True
+        )
+        position = np.arange(len(order)) - first[inverse]
+        decay = 1.0 - self.learning_rate
+        weights = self.learning_rate * decay ** (counts[inverse] - 1 - position)
+        
+        q_flat = self.q_values.reshape(-1)
+        q_flat[unique_entries] = (decay ** counts) * q_flat[unique_entries] + np.bincount(
+            inverse, weights=weights * targets[order], minlength=len(unique_entries)
+        )
+        self.visited.reshape(-1)[unique_entries] = True
     
     def decay_epsilon(self):
         """Decay exploration rate"""
@@ -170,11 +339,11 @@ class QLearningPricingAgent:
         Returns:
             Dictionary mapping states to optimal actions
         """
-        policy = {}
-        for state in self.q_table:
-            if self.q_table[state]:
-                policy[state] = max(self.q_table[state].keys(), key=lambda a: self.q_table[state][a])
-        return policy
+        rows = np.flatnonzero(self.visited[:len(self.state_keys)].any(axis=1))
+        if len(rows) == 0:
+            return {}
+        best_columns = np.argmax(self._masked_q_values(rows), axis=1)
+        return {self.state_keys[row]: self.action_space[column] for row, column in zip(rows, best_columns)}
     
     def get_state_action_values(self, state: str) -> Dict[float, float]:
         """
@@ -182,11 +351,65 @@ class QLearningPricingAgent:
         
         Args:
             state: State to get Q-values for
-            
+        
         Returns:
             Dictionary mapping actions to Q-values
         """
-        return dict(self.q_table.get(state, {}))
+        row = self._state_row(state)
+        if row < 0:
+            return {}
+        return {
+            self.action_space[column]: float(self.q_values[row, column])
+            for column in np.flatnonzero(self.visited[row])
+        }
+    
+    def save_q_table(self, path: str):
+        """
+        Save the Q-matrix in numpy's binary .npz format
+        
+        Args:
+            path: File path to write
+        """
+        num_states = len(self.state_keys)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                q_values=self.q_values[:num_states],
+                visited=self.visited[:num_states],
+                actions=np.asarray(self.action_space, dtype=float),
+                states=np.asarray(self.state_keys, dtype=str)
+            )
+    
+    def load_q_table(self, path: str):
+        """
+        Load a Q-matrix written by save_q_table
+        
+        Args:
+            path: File path to read
+        """
+        with np.load(path, allow_pickle=False) as data:
+            q_values, visited = data['q_values'], data['visited']
+            actions, states = data['actions'], data['states']
+        
+        columns = np.array([self._action_column(a) for a in actions], dtype=np.int64)
+        rows = np.array([self._register_state(str(state)) for state in states], dtype=np.int64)
+        if len(rows) and len(columns):
+            self.q_values[np.ix_(rows, columns)] = q_values
+            self.visited[np.ix_(rows, columns)] = visited
+    
+    def load_q_table_dict(self, q_table: Dict[str, Dict[Any, float]]):
+        """
+        Load Q-values from a nested state -> action -> value dictionary
+        
+        Args:
+            q_table: Q-values keyed by state and action (actions may be strings)
+        """
+        for state, actions in q_table.items():
+            row = self._register_state(state)
+            for action, q_value in actions.items():
+                column = self._action_column(float(action))
+                self.q_values[row, column] = q_value
+                self.visited[row, column] = True
 
 
 class MultiArmedBanditPricingAgent:
@@ -305,29 +528,48 @@ class PricingRewardFunction:
         Returns:
             Reward value
         """
+        total_reward = float(self.calculate_rewards(
+            revenue, cost, client_retention, market_share, competitor_pricing
+        ))
+        
+        logger.debug(f"Reward calculation: total={total_reward:.2f}")
+        
+        return total_reward
+    
+    def calculate_rewards(self, revenue: np.ndarray, cost: np.ndarray, client_retention: np.ndarray,
+                          market_share: np.ndarray, competitor_pricing: np.ndarray) -> np.ndarray:
+        """
+        Calculate rewards for a batch of pricing outcomes
+        
+        Args:
+            revenue: Revenue generated
+            cost: Cost of service delivery
+            client_retention: Client retention rate (0-1)
+            market_share: Market share (0-1)
+            competitor_pricing: Competitor pricing level
+            
+        Returns:
+            Array of reward values (arguments broadcast against each other)
+        """
+        revenue = np.asarray(revenue, dtype=float)
+        competitor_pricing = np.asarray(competitor_pricing, dtype=float)
+        
         # Profit calculation
-        profit = revenue - cost
+        profit = revenue - np.asarray(cost, dtype=float)
         
         # Weighted reward components
         profit_reward = profit * 0.5
-        retention_reward = client_retention * 1000 * 0.3  # Weight retention heavily
-        market_share_reward = market_share * 500 * 0.2  # Weight market share
+        retention_reward = np.asarray(client_retention, dtype=float) * 1000 * 0.3  # Weight retention heavily
+        market_share_reward = np.asarray(market_share, dtype=float) * 500 * 0.2  # Weight market share
         
         # Competitive positioning reward/penalty
-        if revenue > competitor_pricing:
-            competitive_reward = -100  # Penalty for overpricing
-        elif revenue < competitor_pricing * 0.8:
-            competitive_reward = -50  # Penalty for underpricing
-        else:
-            competitive_reward = 100  # Reward for competitive pricing
-        
-        total_reward = profit_reward + retention_reward + market_share_reward + competitive_reward
+        competitive_reward = np.select(
+            [revenue > competitor_pricing, revenue < competitor_pricing * 0.8],
+            [-100.0, -50.0],  # Penalties for overpricing and underpricing
+            default=100.0  # Reward for competitive pricing
+        )
         
-        logger.debug(f"Reward calculation: profit={profit_reward:.2f}, retention={retention_reward:.2f}, "
-                    f"market={market_share_reward:.2f}, competitive={competitive_reward:.2f}, "
-                    f"total={total_reward:.2f}")
-        
-        return total_reward
+        return profit_reward + retention_reward + market_share_reward + competitive_reward
 
 
 # Global instances for easy access
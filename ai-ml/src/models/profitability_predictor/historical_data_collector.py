@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 import sqlite3
 import logging
+from contextlib import closing
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime, timedelta
@@ -14,6 +15,36 @@ from datetime import datetime, timedelta
 logger = logging.getLogger(__name__)
 
 
+# Explicit dtypes for raw reads so no column is inferred as object
+CLIENT_DTYPES = {'contract_value': 'float64', 'is_active': 'Int8'}
+INVOICE_DTYPES = {'client_id': 'category', 'total_amount': 'float64', 'status': 'category'}
+TICKET_DTYPES = {'client_id': 'category', 'time_spent': 'float64',
+                 'billable_hours': 'float64', 'hourly_rate': 'float64'}
+SERVICE_DTYPES = {'client_id': 'category', 'category': 'category',
+                  'custom_price': 'float64', 'quantity': 'Int32'}
+
+# Covering indexes for the pushed-down aggregations: (table, index name, columns)
+AGGREGATION_INDEXES = (
+    ('invoices', 'idx_invoices_client_date_amount', ('client_id', 'invoice_date', 'total_amount')),
+    ('invoices', 'idx_invoices_date_client_amount', ('invoice_date', 'client_id', 'total_amount')),
+    ('tickets', 'idx_tickets_client_cost', ('client_id', 'time_spent', 'hourly_rate')),
+    ('tickets', 'idx_tickets_created_client_cost', ('created_at', 'client_id', 'time_spent', 'hourly_rate')),
+    ('client_services', 'idx_client_services_client_service', ('client_id', 'service_id')),
+)
+
+# Date column used to window each fact table
+WINDOW_COLUMNS = {'invoices': 'invoice_date', 'tickets': 'created_at'}
+
+
+def _as_sql_date(value) -> Optional[str]:
+    """Render a window bound the way SQLite stores DATE / DATETIME text"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, datetime) and value.time() != datetime.min.time():
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value.strftime('%Y-%m-%d')
+
+
 class HistoricalDataCollector:
     """Collects historical financial data from all sources"""
     
@@ -25,7 +56,32 @@ class HistoricalDataCollector:
             db_path: Path to the SQLite database
         """
         self.db_path = db_path or str(Path(__file__).resolve().parent.parent.parent.parent / "database" / "superhack.db")
+        self._indexes_checked = False
+        
+    def ensure_indexes(self) -> List[str]:
+        """
+        Create the covering indexes used by the aggregation queries
         
+        Indexes whose table or columns are missing from this database are skipped.
+        
+        Returns:
+            Names of the indexes that exist after the call
+        """
+        created = []
+        try:
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                for table, name, columns in AGGREGATION_INDEXES:
+                    if not set(columns) <= self._table_columns(conn, table):
+                        continue
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({', '.join(columns)})")
+                    created.append(name)
+                conn.commit()
+        except sqlite3.OperationalError as e:
+            # e.g. a read-only database: queries still work, just without the indexes
+            logger.warning(f"Could not create aggregation indexes: {e}")
+        self._indexes_checked = True
+        return created
+    
     def collect_client_data(self) -> pd.DataFrame:
         """
         Collect client profile data
@@ -36,13 +92,12 @@ class HistoricalDataCollector:
         logger.info("Collecting client data")
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            clients_df = pd.read_sql_query("""
-                SELECT id, name, industry, contract_type, contract_value, 
-                       start_date, end_date, is_active
-                FROM clients
-            """, conn)
-            conn.close()
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                clients_df = self._read_query(conn, """
+                    SELECT id, name, industry, contract_type, contract_value, 
+                           start_date, end_date, is_active
+                    FROM clients
+                """, dtypes=CLIENT_DTYPES)
             
             logger.info(f"Collected data for {len(clients_df)} clients")
             return clients_df
@@ -51,22 +106,27 @@ class HistoricalDataCollector:
             logger.error(f"Error collecting client data: {e}")
             raise
     
-    def collect_invoice_data(self) -> pd.DataFrame:
+    def collect_invoice_data(self, start_date=None, end_date=None) -> pd.DataFrame:
         """
         Collect invoice data
         
+        Args:
+            start_date: Only invoices dated on or after this date (optional)
+            end_date: Only invoices dated before this date (optional)
+        
         Returns:
             DataFrame with invoice data
         """
         logger.info("Collecting invoice data")
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            invoices_df = pd.read_sql_query("""
-                SELECT client_id, invoice_date, total_amount, status
-                FROM invoices
-            """, conn)
-            conn.close()
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                where, params = self._window_clause(conn, 'invoices', start_date, end_date)
+                invoices_df = self._read_query(conn, f"""
+                    SELECT client_id, invoice_date, total_amount, status
+                    FROM invoices
+                    {where}
+                """, params, INVOICE_DTYPES)
             
             logger.info(f"Collected {len(invoices_df)} invoice records")
             return invoices_df
@@ -75,22 +135,27 @@ class HistoricalDataCollector:
             logger.error(f"Error collecting invoice data: {e}")
             raise
     
-    def collect_ticket_data(self) -> pd.DataFrame:
+    def collect_ticket_data(self, start_date=None, end_date=None) -> pd.DataFrame:
         """
         Collect ticket data
         
+        Args:
+            start_date: Only tickets created on or after this date (optional)
+            end_date: Only tickets created before this date (optional)
+        
         Returns:
             DataFrame with ticket data
         """
         logger.info("Collecting ticket data")
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            tickets_df = pd.read_sql_query("""
-                SELECT client_id, time_spent, billable_hours, hourly_rate
-                FROM tickets
-            """, conn)
-            conn.close()
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                where, params = self._window_clause(conn, 'tickets', start_date, end_date)
+                tickets_df = self._read_query(conn, f"""
+                    SELECT client_id, time_spent, billable_hours, hourly_rate
+                    FROM tickets
+                    {where}
+                """, params, TICKET_DTYPES)
             
             logger.info(f"Collected {len(tickets_df)} ticket records")
             return tickets_df
@@ -109,13 +174,12 @@ class HistoricalDataCollector:
         logger.info("Collecting service data")
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            services_df = pd.read_sql_query("""
-                SELECT cs.client_id, s.category, cs.custom_price, cs.quantity
-                FROM client_services cs
-                JOIN services s ON cs.service_id = s.id
-            """, conn)
-            conn.close()
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                services_df = self._read_query(conn, """
+                    SELECT cs.client_id, s.category, cs.custom_price, cs.quantity
+                    FROM client_services cs
+                    JOIN services s ON cs.service_id = s.id
+                """, dtypes=SERVICE_DTYPES)
             
             logger.info(f"Collected {len(services_df)} service records")
             return services_df
@@ -124,37 +188,42 @@ class HistoricalDataCollector:
             logger.error(f"Error collecting service data: {e}")
             raise
     
-    def aggregate_financial_metrics(self) -> pd.DataFrame:
+    def aggregate_financial_metrics(self, start_date=None, end_date=None,
+                                    incremental: bool = False) -> pd.DataFrame:
         """
         Aggregate all financial data into client-level metrics
         
+        Filtering, date windowing and the per-client sums run in SQLite, so only
+        one row per client is loaded whatever the size of the fact tables.
+        
+        Args:
+            start_date: Only count invoices and tickets on or after this date (optional)
+            end_date: Only count invoices and tickets before this date (optional)
+            incremental: Read only invoices and tickets added since the last
+                incremental run and add them to the stored per-client totals
+        
         Returns:
             DataFrame with aggregated financial metrics per client
         """
         logger.info("Aggregating financial metrics")
         
+        if incremental and (start_date is not None or end_date is not None):
+            raise ValueError("Incremental aggregation covers all history and cannot use a date window")
+        
         try:
-            # Collect all data
+            if not self._indexes_checked:
+                self.ensure_indexes()
+            
             clients_df = self.collect_client_data()
-            invoices_df = self.collect_invoice_data()
-            tickets_df = self.collect_ticket_data()
-            services_df = self.collect_service_data()
-            
-            # Calculate total revenue per client
-            client_revenue = invoices_df.groupby('client_id')['total_amount'].sum().reset_index()
-            client_revenue.columns = ['id', 'total_revenue']
-            
-            # Calculate total costs per client (from tickets)
-            tickets_df['ticket_cost'] = tickets_df['time_spent'] * tickets_df['hourly_rate']
-            client_costs = tickets_df.groupby('client_id')['ticket_cost'].sum().reset_index()
-            client_costs.columns = ['id', 'ticket_cost']
-            
-            # Calculate service utilization metrics
-            service_metrics = services_df.groupby('client_id').agg({
-                'custom_price': ['count', 'sum'],
-                'quantity': 'sum'
-            }).reset_index()
-            service_metrics.columns = ['id', 'service_count', 'total_service_value', 'total_quantity']
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                if incremental:
+                    totals = self._update_incremental_totals(conn)
+                    client_revenue = totals[['id', 'total_revenue']].dropna()
+                    client_costs = totals[['id', 'ticket_cost']].dropna()
+                else:
+                    client_revenue = self._aggregate_revenue(conn, start_date, end_date)
+                    client_costs = self._aggregate_ticket_costs(conn, start_date, end_date)
+                service_metrics = self._aggregate_services(conn)
             
             # Merge all data
             merged_df = clients_df.merge(client_revenue, on='id', how='left')
@@ -194,6 +263,131 @@ class HistoricalDataCollector:
         except Exception as e:
             logger.error(f"Error aggregating financial metrics: {e}")
             raise
+    
+    def reset_incremental_state(self):
+        """Forget the watermarks and stored totals so the next incremental run starts over"""
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            conn.execute("DROP TABLE IF EXISTS profitability_collection_watermarks")
+            conn.execute("DROP TABLE IF EXISTS profitability_client_totals")
+            conn.commit()
+        logger.info("Incremental collection state reset")
+    
+    def _aggregate_revenue(self, conn: sqlite3.Connection, start_date=None, end_date=None) -> pd.DataFrame:
+        where, params = self._window_clause(conn, 'invoices', start_date, end_date, "client_id IS NOT NULL")
+        return pd.read_sql_query(f"""
+            SELECT client_id AS id, TOTAL(total_amount) AS total_revenue
+            FROM invoices
+            {where}
+            GROUP BY client_id
+        """, conn, params=params, dtype={'total_revenue': 'float64'})
+    
+    def _aggregate_ticket_costs(self, conn: sqlite3.Connection, start_date=None, end_date=None) -> pd.DataFrame:
+        where, params = self._window_clause(conn, 'tickets', start_date, end_date, "client_id IS NOT NULL")
+        return pd.read_sql_query(f"""
+            SELECT client_id AS id, TOTAL(time_spent * hourly_rate) AS ticket_cost
+            FROM tickets
+            {where}
+            GROUP BY client_id
+        """, conn, params=params, dtype={'ticket_cost': 'float64'})
+    
+    def _aggregate_services(self, conn: sqlite3.Connection) -> pd.DataFrame:
+        return pd.read_sql_query("""
+            SELECT cs.client_id AS id,
+                   COUNT(cs.custom_price) AS service_count,
+                   TOTAL(cs.custom_price) AS total_service_value,
+                   TOTAL(cs.quantity) AS total_quantity
+            FROM client_services cs
+            JOIN services s ON cs.service_id = s.id
+            WHERE cs.client_id IS NOT NULL
+            GROUP BY cs.client_id
+        """, conn, dtype={'service_count': 'int64', 'total_service_value': 'float64',
+                          'total_quantity': 'float64'})
+    
+    def _update_incremental_totals(self, conn: sqlite3.Connection) -> pd.DataFrame:
+        """
+        Fold rows added since the last watermark into the stored per-client totals
+        
+        The watermark is the table's rowid, so late-arriving rows with old dates are
+        still picked up. Edits to already-collected rows need reset_incremental_state().
+        """
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS profitability_collection_watermarks (
+                source TEXT PRIMARY KEY,
+                last_rowid INTEGER NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        # client_id has no declared type so ids keep the storage class of clients.id
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS profitability_client_totals (
+                client_id PRIMARY KEY,
+                total_revenue REAL,
+                ticket_cost REAL
+            )
+        """)
+        
+        sources = (
+            ('invoices', 'total_revenue', 'total_amount'),
+            ('tickets', 'ticket_cost', 'time_spent * hourly_rate'),
+        )
+        with conn:
+            for table, total_column, amount in sources:
+                row = conn.execute(
+                    "SELECT last_rowid FROM profitability_collection_watermarks WHERE source = ?", (table,)
+                ).fetchone()
+                watermark = row[0] if row else 0
+                high_water = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+                if high_water <= watermark:
+                    continue
+                
+                # Bounded by high_water so rows inserted mid-run wait for the next run
+                conn.execute(f"""
+                    INSERT INTO profitability_client_totals (client_id, {total_column})
+                    SELECT client_id, TOTAL({amount})
+                    FROM {table}
+                    WHERE rowid > ? AND rowid <= ? AND client_id IS NOT NULL
+                    GROUP BY client_id
+                    ON CONFLICT(client_id) DO UPDATE SET
+                        {total_column} = COALESCE({total_column}, 0) + excluded.{total_column}
+                """, (watermark, high_water))
+                conn.execute("""
+                    INSERT OR REPLACE INTO profitability_collection_watermarks (source, last_rowid, updated_at)
+                    VALUES (?, ?, ?)
+                """, (table, high_water, datetime.now().isoformat()))
+                logger.info(f"Collected {table} rows {watermark + 1}-{high_water} incrementally")
+        
+        return pd.read_sql_query(
+            "SELECT client_id AS id, total_revenue, ticket_cost FROM profitability_client_totals",
+            conn, dtype={'total_revenue': 'float64', 'ticket_cost': 'float64'}
+        )
+    
+    def _read_query(self, conn: sqlite3.Connection, query: str, params: Tuple = (),
+                    dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Read a query with explicit dtypes"""
+        return pd.read_sql_query(query, conn, params=params, dtype=dtypes)
+    
+    def _window_clause(self, conn: sqlite3.Connection, table: str, start_date=None, end_date=None,
+                       *conditions: str) -> Tuple[str, Tuple]:
+        """WHERE clause restricting a fact table to [start_date, end_date)"""
+        conditions = list(conditions)
+        params = []
+        if start_date is not None or end_date is not None:
+            column = WINDOW_COLUMNS[table]
+            if column not in self._table_columns(conn, table):
+                logger.warning(f"{table} has no {column} column; date window ignored")
+            else:
+                if start_date is not None:
+                    conditions.append(f"{column} >= ?")
+                    params.append(_as_sql_date(start_date))
+                if end_date is not None:
+                    conditions.append(f"{column} < ?")
+                    params.append(_as_sql_date(end_date))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, tuple(params)
+    
+    @staticmethod
+    def _table_columns(conn: sqlite3.Connection, table: str) -> set:
+        return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
 
 
 # Convenience function for easy usage
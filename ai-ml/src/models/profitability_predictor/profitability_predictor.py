@@ -11,13 +11,16 @@ from datetime import datetime
 import json
 import pickle
 import os
+import numpy as np
 import pandas as pd
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.utils.lazy_imports import lazy_import
+
 # Conditional imports for model libraries
 try:
-    import xgboost as xgb
+    xgb = lazy_import("xgboost")
     XGBOOST_AVAILABLE = True
 except ImportError:
     XGBOOST_AVAILABLE = False
@@ -57,16 +60,19 @@ logger = logging.getLogger(__name__)
 class ProfitabilityPredictor:
     """Handles real-time profitability predictions"""
     
-    def __init__(self, model_path: str = "./models", db_path: Optional[str] = None):
+    def __init__(self, model_path: str = "./models", db_path: Optional[str] = None,
+                 inference_only: bool = False):
         """
         Initialize the Profitability Predictor
         
         Args:
             model_path: Path to model directory
             db_path: Path to database
+            inference_only: Fail instead of falling back to mock models when loading fails
         """
         self.logger = logging.getLogger(f"{__name__}.ProfitabilityPredictor")
         self.model_path = model_path
+        self.inference_only = inference_only
         self.db_path = db_path or str(Path(__file__).resolve().parent.parent.parent.parent / "database" / "superhack.db")
         self.xgboost_model = None
         self.random_forest_model = None
@@ -83,6 +89,7 @@ class ProfitabilityPredictor:
         self.shap_explainer = SHAPExplainer()
         self.ci_calculator = ConfidenceIntervalCalculator()
         self.feature_names = []
+        self.model_versions: Dict[str, str] = {}
         self.is_initialized = False
         self.active_model = "xgboost"  # Default to XGBoost
         logger.info("Profitability Predictor initialized")
@@ -113,6 +120,10 @@ class ProfitabilityPredictor:
                     model_data = pickle.load(f)
                     self.xgboost_model = model_data.get('model')
                     self.feature_names = model_data.get('feature_names', [])
+                # Held-out residuals give XGBoost predictions a residual-bootstrap interval
+                if model_data.get('validation_residuals') is not None:
+                    self.ci_calculator.set_residuals(model_data['validation_residuals'])
+                self.model_versions["xgboost"] = self._model_version(model_data, xgboost_model_path)
                 logger.info("XGBoost model loaded successfully")
             
             # Try to load Random Forest model
@@ -123,13 +134,22 @@ class ProfitabilityPredictor:
                     self.random_forest_model = model_data.get('model')
                     if not self.feature_names:  # Use RF feature names if XGBoost not available
                         self.feature_names = model_data.get('feature_names', [])
+                self.model_versions["random_forest"] = self._model_version(model_data, rf_model_path)
                 logger.info("Random Forest model loaded successfully")
                 
         except Exception as e:
             logger.warning(f"Failed to load models: {e}")
+            if self.inference_only:
+                raise
             # Create mock models for demonstration
             await self._create_mock_models()
     
+    @staticmethod
+    def _model_version(model_data: Dict[str, Any], model_file: str) -> str:
+        """Version of a loaded model: the saved version, else the file's modification time"""
+        version = model_data.get('version') if isinstance(model_data, dict) else None
+        return str(version or f"{Path(model_file).name}@{int(os.path.getmtime(model_file))}")
+    
     async def _create_mock_models(self):
         """Create mock models for demonstration when real models aren't available"""
         try:
@@ -149,12 +169,12 @@ class ProfitabilityPredictor:
         except Exception as e:
             logger.error(f"Failed to create mock models: {e}")
     
-    def prepare_features(self, client_data: Dict[str, Any]) -> pd.DataFrame:
+    def prepare_features(self, client_data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> pd.DataFrame:
         """
         Prepare features for prediction
         
         Args:
-            client_data: Dictionary with client data
+            client_data: Dictionary with client data, or a list of them for a batch
             
         Returns:
             DataFrame with prepared features
@@ -177,14 +197,9 @@ class ProfitabilityPredictor:
                 # Create mock features
                 features_df = df.copy()
             
-            # Ensure all required features are present
+            # Ensure all required features are present, in the correct order
             if self.feature_names:
-                for feature in self.feature_names:
-                    if feature not in features_df.columns:
-                        features_df[feature] = 0.0
-                
-                # Select only required features in correct order
-                features_df = features_df[self.feature_names]
+                features_df = features_df.reindex(columns=self.feature_names, fill_value=0.0)
             
             # Ensure we return a DataFrame
             if not isinstance(features_df, pd.DataFrame):
@@ -194,8 +209,9 @@ class ProfitabilityPredictor:
             
         except Exception as e:
             logger.error(f"Error preparing features: {e}")
-            # Return mock features if there's an error
-            mock_features = pd.DataFrame({feature: [0.5] for feature in self.feature_names}) if self.feature_names else pd.DataFrame()
+            # Return mock features if there's an error (one row per client)
+            row_count = 1 if isinstance(client_data, dict) else max(len(client_data), 1)
+            mock_features = pd.DataFrame(0.5, index=range(row_count), columns=self.feature_names) if self.feature_names else pd.DataFrame()
             return mock_features
     
     async def predict(self, client_data: Dict[str, Any], 
@@ -246,13 +262,15 @@ class ProfitabilityPredictor:
             # Add confidence intervals if requested
             if return_confidence:
                 ci_results = self.ci_calculator.calculate_confidence_interval(
-                    model, features, method='bootstrap'
+                    model, features, method='bootstrap',
+                    interval_model=self.random_forest_model
                 )
                 response["confidence_interval"] = ci_results.get("overall_interval", {})
                 response["confidence_level"] = ci_results.get("confidence_level", 0.95)
             
             # Add explanation if requested
             if return_explanation:
+                self._ensure_explainer()
                 explanation = self.shap_explainer.explain_prediction(features)
                 response["explanation"] = explanation
             
@@ -313,6 +331,9 @@ class ProfitabilityPredictor:
         """
         Make batch predictions for multiple clients
         
+        Builds a single feature matrix for all clients and calls the model
+        once, so throughput scales with batch size rather than request count.
+        
         Args:
             clients_data: List of dictionaries with client data
             model_type: Type of model to use
@@ -321,12 +342,43 @@ class ProfitabilityPredictor:
             List of prediction results
         """
         try:
-            predictions = []
-            for client_data in clients_data:
-                prediction = await self.predict(client_data, model_type)
-                predictions.append(prediction)
+            if not clients_data:
+                return []
+            
+            if not self.is_initialized:
+                await self.initialize()
+            
+            # Prepare one feature matrix for the whole batch
+            features = self.prepare_features(clients_data)
+            
+            model = await self._select_model(model_type)
+            if model is None:
+                raise ValueError("No model available for prediction")
+            
+            prediction_start = datetime.now()
+            raw_predictions = model.predict(features) if hasattr(model, 'predict') else np.full(len(features), 0.5)
+            prediction_time = (datetime.now() - prediction_start).total_seconds() * 1000
+            
+            # Ensure predictions are within valid range (0-1 for profit margin)
+            predictions = np.clip(np.asarray(raw_predictions, dtype=float), 0.0, 1.0)
             
-            return predictions
+            await self._monitor_prediction(features, predictions)
+            
+            timestamp = datetime.now().isoformat()
+            per_row_time = prediction_time / len(predictions) if len(predictions) else 0.0
+            features_used = len(self.feature_names) if self.feature_names else 0
+            
+            logger.info(f"Batch profitability prediction completed for {len(predictions)} clients")
+            return [
+                {
+                    "prediction": float(prediction),
+                    "model_type": self.active_model,
+                    "prediction_time_ms": per_row_time,
+                    "timestamp": timestamp,
+                    "features_used": features_used
+                }
+                for prediction in predictions
+            ]
             
         except Exception as e:
             logger.error(f"Batch prediction failed: {e}")
@@ -341,18 +393,18 @@ class ProfitabilityPredictor:
                 for _ in clients_data
             ]
     
-    async def _monitor_prediction(self, features: pd.DataFrame, prediction: float):
+    async def _monitor_prediction(self, features: pd.DataFrame, prediction: Union[float, np.ndarray]):
         """
         Monitor prediction quality and performance
         
         Args:
             features: Input features
-            prediction: Model prediction
+            prediction: Model prediction (or array of predictions for a batch)
         """
         try:
             # Monitor prediction statistics
             quality_report = self.model_monitor.monitor_prediction_quality(
-                np.array([prediction])
+                np.atleast_1d(np.asarray(prediction, dtype=float))
             )
             
             # Log monitoring info
@@ -405,11 +457,8 @@ class ProfitabilityPredictor:
             # Prepare features
             features = self.prepare_features(client_data)
             
-            # Create explainer if not already created
-            if self.xgboost_model is not None:
-                self.shap_explainer.create_explainer(self.xgboost_model, features)
-            elif self.random_forest_model is not None:
-                self.shap_explainer.create_explainer(self.random_forest_model, features)
+            # Reuses the explainer built for the loaded model version
+            self._ensure_explainer()
             
             # Generate explanation
             explanation = self.shap_explainer.explain_prediction(features)
@@ -420,6 +469,43 @@ class ProfitabilityPredictor:
             logger.error(f"Prediction explanation failed: {e}")
             return {"error": str(e), "explanation": "Unable to generate explanation"}
     
+    async def explain_predictions(self, clients_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Explain predictions for many clients with one SHAP call
+        
+        Args:
+            clients_data: List of dictionaries with client data
+            
+        Returns:
+            List with one explanation per client
+        """
+        try:
+            if not clients_data:
+                return []
+            
+            if not self.is_initialized:
+                await self.initialize()
+            
+            features = self.prepare_features(clients_data)
+            self._ensure_explainer()
+            return self.shap_explainer.explain_predictions(features)
+            
+        except Exception as e:
+            logger.error(f"Batch prediction explanation failed: {e}")
+            return [{"error": str(e), "explanation": "Unable to generate explanation"} for _ in clients_data]
+    
+    def _ensure_explainer(self):
+        """Build the SHAP explainer once per loaded model version"""
+        if self.xgboost_model is not None:
+            model, name = self.xgboost_model, "xgboost"
+        elif self.random_forest_model is not None:
+            model, name = self.random_forest_model, "random_forest"
+        else:
+            return
+        # Tree models need no background: path-dependent SHAP uses the trees' own cover
+        self.shap_explainer.create_explainer(model, explainer_type='tree',
+                                             model_version=self.model_versions.get(name))
+    
     async def calculate_confidence_interval(self, client_data: Dict[str, Any], 
                                           method: str = "bootstrap") -> Dict[str, Any]:
         """
@@ -446,7 +532,8 @@ class ProfitabilityPredictor:
             
             # Calculate confidence interval
             ci_results = self.ci_calculator.calculate_confidence_interval(
-                model, features, method=method
+                model, features, method=method,
+                interval_model=self.random_forest_model
             )
             
             return ci_results
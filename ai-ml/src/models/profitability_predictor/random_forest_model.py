@@ -45,6 +45,7 @@ class RandomForestProfitabilityModel:
         self.feature_names = None
         self.is_trained = False
         self.training_timestamp = None
+        self.validation_residuals = None  # y_true - prediction on held-out data, for intervals
         
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
@@ -242,7 +243,8 @@ class RandomForestProfitabilityModel:
                 'model': self.model,
                 'feature_names': self.feature_names,
                 'is_trained': self.is_trained,
-                'training_timestamp': self.training_timestamp
+                'training_timestamp': self.training_timestamp,
+                'validation_residuals': self.validation_residuals
             }
             
             with open(filepath, 'wb') as f:
@@ -271,6 +273,7 @@ class RandomForestProfitabilityModel:
             self.feature_names = model_data['feature_names']
             self.is_trained = model_data['is_trained']
             self.training_timestamp = model_data['training_timestamp']
+            self.validation_residuals = model_data.get('validation_residuals')
             
             logger.info("Model loaded successfully")
             
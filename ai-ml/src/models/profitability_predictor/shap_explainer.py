@@ -2,18 +2,23 @@
 SHAP Explainer for Model Interpretability in Client Profitability Predictor
 """
 
+import hashlib
 import logging
+import threading
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
 import json
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.utils.lazy_imports import lazy_import
+
 # Conditional imports for optional dependencies
 try:
-    import shap
+    shap = lazy_import("shap")
     SHAP_AVAILABLE = True
 except ImportError:
     SHAP_AVAILABLE = False
@@ -25,21 +30,41 @@ logger = logging.getLogger(__name__)
 class SHAPExplainer:
     """SHAP explainer for model interpretability"""
     
-    def __init__(self):
+    def __init__(self, background_size: int = 100, cache_size: int = 4096):
+        """
+        Initialize the SHAP explainer
+        
+        Args:
+            background_size: Rows kept from the background data (k-means centroids for
+                kernel SHAP, a fixed sample otherwise)
+            cache_size: Explanations kept in the LRU cache
+        """
         self.explainer = None
         self.feature_names = None
         self.baseline_values = None
+        self.model_version = None
+        self.explainer_type = None
+        self.background_size = background_size
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
         logger.info("SHAP Explainer initialized")
     
     def create_explainer(self, model, X_background: Optional[pd.DataFrame] = None, 
-                        explainer_type: str = 'tree') -> bool:
+                        explainer_type: str = 'tree', model_version: Optional[str] = None) -> bool:
         """
         Create SHAP explainer for a trained model
         
+        The explainer is built once per model version: calling again with the same
+        version and type reuses it, so the background is summarized only once.
+        
         Args:
             model: Trained model
             X_background: Background dataset for SHAP (optional)
             explainer_type: Type of explainer ('tree', 'linear', 'deep', 'kernel')
+            model_version: Version of the model (defaults to the model object's identity)
             
         Returns:
             Boolean indicating success
@@ -48,28 +73,36 @@ class SHAPExplainer:
             logger.warning("SHAP not available, cannot create explainer")
             return False
         
+        model_version = model_version or f"{type(model).__name__}:{id(model)}"
+        if self.explainer is not None and self.model_version == model_version and self.explainer_type == explainer_type:
+            return True
+        
         try:
             # Store feature names if available
-            if hasattr(X_background, 'columns'):
-                if X_background is not None:
-                    self.feature_names = list(X_background.columns)
+            if X_background is not None and hasattr(X_background, 'columns'):
+                self.feature_names = list(X_background.columns)
+            
+            background = self._summarize_background(X_background, explainer_type)
             
             # Create appropriate explainer based on type
-            if SHAP_AVAILABLE and shap is not None:
-                if SHAP_AVAILABLE and shap is not None:
-                    if explainer_type == 'tree':
-                        self.explainer = shap.TreeExplainer(model, X_background)
-                    elif explainer_type == 'linear':
-                        self.explainer = shap.LinearExplainer(model, X_background)
-                    elif explainer_type == 'deep':
-                        self.explainer = shap.DeepExplainer(model, X_background)
-                    elif explainer_type == 'kernel':
-                        self.explainer = shap.KernelExplainer(model.predict, X_background)
-                    else:
-                        # Default to TreeExplainer for most models
-                        self.explainer = shap.TreeExplainer(model, X_background)
-            
-            logger.info(f"SHAP explainer created with type: {explainer_type}")
+            if explainer_type == 'tree':
+                self.explainer = shap.TreeExplainer(model, background)
+            elif explainer_type == 'linear':
+                self.explainer = shap.LinearExplainer(model, background)
+            elif explainer_type == 'deep':
+                self.explainer = shap.DeepExplainer(model, background)
+            elif explainer_type == 'kernel':
+                self.explainer = shap.KernelExplainer(model.predict, background)
+            else:
+                # Default to TreeExplainer for most models
+                self.explainer = shap.TreeExplainer(model, background)
+            
+            self.model_version = model_version
+            self.explainer_type = explainer_type
+            self.baseline_values = self._base_value()
+            self.clear_cache()
+            
+            logger.info(f"SHAP explainer created with type: {explainer_type} (model version {model_version})")
             return True
             
         except Exception as e:
@@ -90,50 +123,143 @@ class SHAPExplainer:
             logger.warning("SHAP not available or explainer not initialized")
             return self._mock_explanation(X_instance)
         
-        try:
-            # Calculate SHAP values
-            shap_values = self.explainer.shap_values(X_instance)
-            
-            # Handle different SHAP output formats
-            if isinstance(shap_values, list):
-                # For multi-class, take the first class
-                shap_values = shap_values[0]
-            
-            # Convert to 1D array if needed
-            if shap_values.ndim > 1:
-                shap_values = shap_values.flatten()
+        explanations = self.explain_predictions(X_instance)
+        return explanations[0] if explanations else self._mock_explanation(X_instance)
+    
+    def explain_predictions(self, X: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Explain many predictions with one SHAP call
+        
+        Rows already explained for the current model version come from the LRU
+        cache; the rest are explained together in a single batch.
+        
+        Args:
+            X: Instances to explain, one per row
             
-            # Get feature names
+        Returns:
+            List with one explanation dictionary per row
+        """
+        if not SHAP_AVAILABLE or self.explainer is None:
+            logger.warning("SHAP not available or explainer not initialized")
+            return [self._mock_explanation(X.iloc[[i]]) for i in range(len(X))]
+        
+        try:
             feature_names = self.feature_names
-            if feature_names is None and hasattr(X_instance, 'columns'):
-                feature_names = list(X_instance.columns)
-            elif feature_names is None:
-                feature_names = [f"feature_{i}" for i in range(len(shap_values))]
-            
-            # Create explanation dictionary
-            explanation = {}
-            for i, feature_name in enumerate(feature_names):
-                if i < len(shap_values):
-                    explanation[feature_name] = float(shap_values[i])
-            
-            # Sort by absolute SHAP values
-            sorted_explanation = dict(sorted(explanation.items(), 
-                                           key=lambda x: abs(x[1]), reverse=True))
-            
-            result = {
-                'shap_values': explanation,
-                'sorted_shap_values': sorted_explanation,
-                'base_value': float(self.explainer.expected_value) if hasattr(self.explainer, 'expected_value') else 0.0,
-                'prediction': float(np.sum(shap_values)) + (float(self.explainer.expected_value) if hasattr(self.explainer, 'expected_value') else 0.0),
-                'timestamp': datetime.now()
-            }
-            
-            logger.info("Prediction explanation generated")
-            return result
+            if feature_names is None and hasattr(X, 'columns'):
+                feature_names = list(X.columns)
+            values = np.asarray(X, dtype=np.float64)
+            if values.ndim == 1:
+                values = values.reshape(1, -1)
+            
+            keys = [self._cache_key(row) for row in values]
+            explanations: List[Optional[Dict[str, Any]]] = [self._cache_get(key) for key in keys]
+            missing = [i for i, explanation in enumerate(explanations) if explanation is None]
+            
+            if missing:
+                batch = X.iloc[missing] if hasattr(X, 'iloc') else values[missing]
+                shap_values = self._shap_matrix(batch, len(missing))
+                base_value = self.baseline_values if self.baseline_values is not None else 0.0
+                if feature_names is None:
+                    feature_names = [f"feature_{i}" for i in range(shap_values.shape[1])]
+                
+                for row, i in enumerate(missing):
+                    explanation = self._format_explanation(shap_values[row], feature_names, base_value)
+                    self._cache_put(keys[i], explanation)
+                    explanations[i] = dict(explanation, cached=False)
+            
+            logger.info(f"Generated {len(explanations)} explanations ({len(missing)} computed)")
+            return explanations
             
         except Exception as e:
             logger.error(f"Error generating explanation: {e}")
-            return self._mock_explanation(X_instance)
+            return [self._mock_explanation(X.iloc[[i]]) for i in range(len(X))]
+    
+    def clear_cache(self):
+        """Drop every cached explanation"""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get explanation cache statistics
+        
+        Returns:
+            Dictionary with cache size, hits and misses
+        """
+        with self._cache_lock:
+            return {
+                "model_version": self.model_version,
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+                "hits": self._cache_hits,
+                "misses": self._cache_misses
+            }
+    
+    def _summarize_background(self, X_background: Optional[pd.DataFrame], explainer_type: str):
+        """Shrink the background set once, at explainer creation"""
+        if X_background is None or len(X_background) <= self.background_size:
+            return X_background
+        if explainer_type == 'kernel':
+            # Kernel SHAP cost scales with the background, so summarize it with k-means
+            return shap.kmeans(X_background, self.background_size)
+        return shap.sample(X_background, self.background_size, random_state=0)
+    
+    def _base_value(self) -> float:
+        expected_value = getattr(self.explainer, 'expected_value', 0.0)
+        # Multi-output explainers have one expected value per output; use the first
+        return float(np.ravel(expected_value)[0])
+    
+    def _shap_matrix(self, batch, n_rows: int) -> np.ndarray:
+        """SHAP values for a batch as an (n_rows, n_features) array"""
+        shap_values = self.explainer.shap_values(batch)
+        if isinstance(shap_values, list):
+            # For multi-class, take the first class
+            shap_values = shap_values[0]
+        shap_values = np.asarray(shap_values)
+        if shap_values.ndim == 3:
+            shap_values = shap_values[..., 0]
+        return shap_values.reshape(n_rows, -1)
+    
+    def _format_explanation(self, row_values: np.ndarray, feature_names: List[str],
+                            base_value: float) -> Dict[str, Any]:
+        explanation = {
+            feature_name: float(row_values[i])
+            for i, feature_name in enumerate(feature_names) if i < len(row_values)
+        }
+        
+        # Sort by absolute SHAP values
+        sorted_explanation = dict(sorted(explanation.items(), 
+                                       key=lambda x: abs(x[1]), reverse=True))
+        
+        return {
+            'shap_values': explanation,
+            'sorted_shap_values': sorted_explanation,
+            'base_value': base_value,
+            'prediction': float(np.sum(row_values)) + base_value,
+            'model_version': self.model_version,
+            'timestamp': datetime.now()
+        }
+    
+    def _cache_key(self, row: np.ndarray) -> Tuple[str, str]:
+        digest = hashlib.blake2b(np.ascontiguousarray(row).tobytes(), digest_size=16).hexdigest()
+        return self.model_version, digest
+    
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            explanation = self._cache.get(key)
+            if explanation is None:
+                self._cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+        return dict(explanation, cached=True)
+    
+    def _cache_put(self, key: Tuple[str, str], explanation: Dict[str, Any]):
+        with self._cache_lock:
+            self._cache[key] = explanation
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
     
     def explain_global_feature_importance(self, X_sample: pd.DataFrame, 
                                         max_display: int = 20) -> Dict[str, Any]:
@@ -256,14 +382,31 @@ class SHAPExplainer:
 class ConfidenceIntervalCalculator:
     """Calculate confidence intervals for model predictions"""
     
-    def __init__(self):
+    def __init__(self, random_state: Optional[int] = None):
         self.bootstrap_samples = 1000
         self.confidence_level = 0.95
+        self.max_residuals = 1000
+        self.residuals: Optional[np.ndarray] = None
+        self.rng = np.random.default_rng(random_state)
         logger.info("Confidence Interval Calculator initialized")
     
+    def set_residuals(self, residuals: np.ndarray):
+        """
+        Store held-out residuals (y_true - prediction) for the residual bootstrap
+        
+        ProfitabilityPredictor calls this with the validation residuals saved
+        alongside the XGBoost model by the training pipeline.
+        
+        Args:
+            residuals: Residuals of the model on validation data
+        """
+        residuals = np.asarray(residuals, dtype=float).ravel()
+        self.residuals = residuals[np.isfinite(residuals)]
+    
     def calculate_confidence_interval(self, model, X: pd.DataFrame, 
                                    y_true: Optional[np.ndarray] = None,
-                                   method: str = 'bootstrap') -> Dict[str, Any]:
+                                   method: str = 'bootstrap',
+                                   interval_model=None) -> Dict[str, Any]:
         """
         Calculate confidence intervals for predictions
         
@@ -272,6 +415,8 @@ class ConfidenceIntervalCalculator:
             X: Feature data
             y_true: True values (optional, for validation)
             method: Method for calculating CI ('bootstrap', 'residual')
+            interval_model: Bagged tree ensemble whose per-tree spread is used when
+                model itself is not one (optional)
             
         Returns:
             Dictionary with confidence interval results
@@ -284,15 +429,15 @@ class ConfidenceIntervalCalculator:
             
             ci_results = {}
             if method == 'bootstrap':
-                ci_results = self._bootstrap_confidence_interval(model, X, predictions)
+                ci_results = self._bootstrap_confidence_interval(model, X, predictions, y_true, interval_model)
             elif method == 'residual':
                 if y_true is not None:
                     ci_results = self._residual_confidence_interval(predictions, y_true)
                 else:
                     logger.warning("Residual method requires true values, falling back to bootstrap")
-                    ci_results = self._bootstrap_confidence_interval(model, X, predictions)
+                    ci_results = self._bootstrap_confidence_interval(model, X, predictions, y_true, interval_model)
             else:
-                ci_results = self._bootstrap_confidence_interval(model, X, predictions)
+                ci_results = self._bootstrap_confidence_interval(model, X, predictions, y_true, interval_model)
             
             # Add prediction statistics
             ci_results['prediction_stats'] = {
@@ -312,33 +457,66 @@ class ConfidenceIntervalCalculator:
             return self._mock_confidence_intervals(predictions)
     
     def _bootstrap_confidence_interval(self, model, X: pd.DataFrame, 
-                                     predictions: np.ndarray) -> Dict[str, Any]:
-        """Calculate confidence intervals using bootstrap method"""
+                                     predictions: np.ndarray,
+                                     y_true: Optional[np.ndarray] = None,
+                                     interval_model=None) -> Dict[str, Any]:
+        """
+        Calculate confidence intervals using bootstrap method
+        
+        Bagged tree ensembles (random forests) give per-row quantiles of their
+        per-tree predictions, which costs one extra prediction pass. Other models
+        use a residual bootstrap over held-out residuals (or y_true - predictions
+        when y_true is given), subsampled to at most max_residuals so the
+        resampling matrix does not grow with the number of rows.
+        """
         try:
-            # For demonstration, we'll create mock bootstrap samples
-            # In a real implementation, this would involve resampling
-            bootstrap_predictions = []
-            for _ in range(min(self.bootstrap_samples, 100)):  # Limit for performance
-                # Add some noise to simulate bootstrap variation
-                noise = np.random.normal(0, 0.05, len(predictions))
-                bootstrap_predictions.append(predictions + noise)
-            
-            # Calculate percentiles
-            bootstrap_array = np.array(bootstrap_predictions)
+            predictions = np.asarray(predictions, dtype=float).ravel()
             alpha = 1 - self.confidence_level
-            lower_percentile = (alpha / 2) * 100
-            upper_percentile = (1 - alpha / 2) * 100
-            
-            # Calculate confidence intervals for each prediction
-            lower_bounds = np.percentile(bootstrap_array, lower_percentile, axis=0)
-            upper_bounds = np.percentile(bootstrap_array, upper_percentile, axis=0)
+            percentiles = [(alpha / 2) * 100, (1 - alpha / 2) * 100]
+            
+            ensemble = model if self._is_bagged_ensemble(model) else interval_model
+            residuals = self.residuals
+            if y_true is not None:
+                residuals = np.asarray(y_true, dtype=float).ravel() - predictions
+            if residuals is not None and len(residuals) > self.max_residuals:
+                residuals = self.rng.choice(residuals, self.max_residuals, replace=False)
+            
+            if self._is_bagged_ensemble(ensemble):
+                # (n_trees, n_rows) matrix of per-tree predictions
+                # Validate once here rather than once per tree
+                X_values = np.ascontiguousarray(X, dtype=np.float32)
+                tree_predictions = np.stack([
+                    tree.predict(X_values, check_input=False) for tree in ensemble.estimators_
+                ])
+                lower_bounds, upper_bounds = np.percentile(tree_predictions, percentiles, axis=0)
+                # Center the spread on the served prediction when it comes from another model
+                offset = predictions - tree_predictions.mean(axis=0)
+                lower_bounds, upper_bounds = lower_bounds + offset, upper_bounds + offset
+                
+                # Overall interval: resample trees and recompute the batch mean
+                tree_means = tree_predictions.mean(axis=1)
+                draws = self.rng.integers(0, len(tree_means), (self.bootstrap_samples, len(tree_means)))
+                batch_means = tree_means[draws].mean(axis=1) + offset.mean()
+                interval_source = 'tree_quantiles'
+            elif residuals is not None and len(residuals) > 1:
+                # Resample residuals and average the resampled quantiles, in one matrix
+                draws = self.rng.integers(0, len(residuals), (self.bootstrap_samples, len(residuals)))
+                resampled = residuals[draws]
+                lower_offset, upper_offset = np.percentile(resampled, percentiles, axis=1).mean(axis=1)
+                lower_bounds = predictions + lower_offset
+                upper_bounds = predictions + upper_offset
+                batch_means = predictions.mean() + resampled.mean(axis=1)
+                interval_source = 'residual_bootstrap'
+            else:
+                logger.warning("Bootstrap intervals need a bagged tree ensemble or residuals")
+                return self._mock_confidence_intervals(predictions)
             
             # Calculate overall confidence interval
-            overall_lower = np.percentile(bootstrap_array, lower_percentile)
-            overall_upper = np.percentile(bootstrap_array, upper_percentile)
+            overall_lower, overall_upper = np.percentile(batch_means, percentiles)
             
             return {
                 'method': 'bootstrap',
+                'interval_source': interval_source,
                 'confidence_level': self.confidence_level,
                 'individual_intervals': [
                     {
@@ -350,12 +528,14 @@ class ConfidenceIntervalCalculator:
                     }
                     for i in range(min(len(predictions), 10))  # Limit for readability
                 ],
+                'lower_bounds': lower_bounds.tolist(),
+                'upper_bounds': upper_bounds.tolist(),
                 'overall_interval': {
                     'lower_bound': float(overall_lower),
                     'upper_bound': float(overall_upper),
                     'interval_width': float(overall_upper - overall_lower)
                 },
-                'bootstrap_samples': len(bootstrap_predictions),
+                'bootstrap_samples': self.bootstrap_samples,
                 'timestamp': datetime.now()
             }
             
@@ -363,6 +543,11 @@ class ConfidenceIntervalCalculator:
             logger.error(f"Error in bootstrap confidence interval calculation: {e}")
             return self._mock_confidence_intervals(predictions)
     
+    @staticmethod
+    def _is_bagged_ensemble(model) -> bool:
+        """Random forests and extra trees expose independently fitted trees as a list"""
+        return isinstance(getattr(model, 'estimators_', None), list) and not hasattr(model, 'estimators_features_')
+    
     def _residual_confidence_interval(self, predictions: np.ndarray, 
                                     y_true: np.ndarray) -> Dict[str, Any]:
         """Calculate confidence intervals using residual method"""
@@ -140,6 +140,7 @@ class ProfitabilityTrainingPipeline:
             # Evaluate XGBoost model
             xgb_predictions = tuned_xgb.predict(X_val)
             xgb_metrics = self.model_evaluator.calculate_all_metrics(y_val, xgb_predictions)
+            xgb_model.validation_residuals = y_val - xgb_predictions
             
             results['xgboost'] = {
                 'model': xgb_model,
@@ -166,6 +167,7 @@ class ProfitabilityTrainingPipeline:
             # Evaluate Random Forest model
             rf_predictions = tuned_rf.predict(X_val)
             rf_metrics = self.model_evaluator.calculate_all_metrics(y_val, rf_predictions)
+            rf_model.validation_residuals = y_val - rf_predictions
             
             results['random_forest'] = {
                 'model': rf_model,
@@ -11,8 +11,10 @@ import os
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
 
+from src.utils.lazy_imports import lazy_import
+
 try:
-    import xgboost as xgb
+    xgb = lazy_import("xgboost")
     XGBOOST_AVAILABLE = True
 except ImportError:
     XGBOOST_AVAILABLE = False
@@ -48,6 +50,7 @@ class XGBoostProfitabilityModel:
         self.feature_names = None
         self.is_trained = False
         self.training_timestamp = None
+        self.validation_residuals = None  # y_true - prediction on held-out data, for intervals
         
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
@@ -244,7 +247,8 @@ class XGBoostProfitabilityModel:
                 'model': self.model,
                 'feature_names': self.feature_names,
                 'is_trained': self.is_trained,
-                'training_timestamp': self.training_timestamp
+                'training_timestamp': self.training_timestamp,
+                'validation_residuals': self.validation_residuals
             }
             
             with open(filepath, 'wb') as f:
@@ -273,6 +277,7 @@ class XGBoostProfitabilityModel:
             self.feature_names = model_data['feature_names']
             self.is_trained = model_data['is_trained']
             self.training_timestamp = model_data['training_timestamp']
+            self.validation_residuals = model_data.get('validation_residuals')
             
             logger.info("Model loaded successfully")
             
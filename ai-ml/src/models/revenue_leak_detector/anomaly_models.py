@@ -11,6 +11,8 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.utils.lazy_imports import lazy_import
+
 # Conditional imports for ML libraries
 try:
     from sklearn.ensemble import IsolationForest
@@ -28,9 +30,12 @@ except ImportError:
 
 try:
     from sklearn.cluster import DBSCAN
+    from sklearn.neighbors import KDTree, BallTree
     SKLEARN_CLUSTER_AVAILABLE = True
 except ImportError:
     DBSCAN = None
+    KDTree = None
+    BallTree = None
     SKLEARN_CLUSTER_AVAILABLE = False
 
 try:
@@ -48,9 +53,9 @@ except ImportError:
     SKLEARN_METRICS_AVAILABLE = False
 
 try:
-    import tensorflow as tf
-    from tensorflow import keras
-    from tensorflow.keras import layers
+    tf = lazy_import("tensorflow")
+    keras = lazy_import("tensorflow.keras")
+    layers = lazy_import("tensorflow.keras.layers")
     TENSORFLOW_AVAILABLE = True
 except ImportError:
     tf = None
@@ -60,6 +65,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Above this many features DBSCAN core samples are indexed with a ball tree instead of a KD-tree
+KD_TREE_MAX_DIMENSIONS = 20
+
 
 class IsolationForestModel:
     """Isolation Forest implementation for anomaly detection"""
@@ -373,6 +381,8 @@ class DBSCANModel:
         self.scaler = StandardScaler() if StandardScaler else None
         self.feature_names = None
         self.is_trained = False
+        self._core_tree = None
+        self._core_labels = np.array([], dtype=int)
         logger.info("DBSCAN Model initialized")
     
     def train(self, X: pd.DataFrame) -> bool:
@@ -403,6 +413,7 @@ class DBSCANModel:
             if DBSCAN is not None:
                 self.model = DBSCAN(eps=self.eps, min_samples=self.min_samples)
                 self.model.fit(X_scaled)
+                self._build_core_index()
                 self.is_trained = True
             else:
                 logger.warning("DBSCAN not available")
@@ -415,6 +426,43 @@ class DBSCANModel:
             logger.error(f"Error training DBSCAN model: {e}")
             return False
     
+    def _build_core_index(self):
+        """Index the fitted core samples so new points are labelled without refitting"""
+        components = getattr(self.model, 'components_', None)
+        if components is None or len(components) == 0:
+            self._core_tree = None
+            self._core_labels = np.array([], dtype=int)
+            return
+        
+        # KD-trees degrade in high dimensions, where a ball tree prunes better
+        tree_class = KDTree if components.shape[1] <= KD_TREE_MAX_DIMENSIONS else BallTree
+        self._core_tree = tree_class(components)
+        self._core_labels = self.model.labels_[self.model.core_sample_indices_]
+    
+    def _nearest_core(self, X_scaled: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the nearest fitted core sample for each point
+        
+        A point joins the cluster of its nearest core sample when that sample lies
+        within eps, and is noise otherwise, matching how DBSCAN labels border points.
+        
+        Args:
+            X_scaled: Scaled data
+            
+        Returns:
+            Tuple of (distance to nearest core sample, cluster label or -1 for noise)
+        """
+        if getattr(self, '_core_tree', None) is None:
+            # Also covers models pickled before the index existed
+            self._build_core_index()
+        if self._core_tree is None:
+            return np.full(len(X_scaled), np.inf), np.full(len(X_scaled), -1)
+        
+        distances, indices = self._core_tree.query(X_scaled, k=1)
+        distances = distances[:, 0]
+        cluster_labels = np.where(distances <= self.eps, self._core_labels[indices[:, 0]], -1)
+        return distances, cluster_labels
+    
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         """
         Predict anomalies using the trained model
@@ -436,8 +484,8 @@ class DBSCANModel:
             else:
                 X_scaled = X.values if hasattr(X, 'values') else X
             
-            # Predict clusters
-            cluster_labels = self.model.fit_predict(X_scaled)
+            # Label against the fitted core samples instead of re-clustering the batch
+            _, cluster_labels = self._nearest_core(X_scaled)
             
             # Anomalies are points labeled as noise (-1)
             predictions = np.where(cluster_labels == -1, -1, 1)
@@ -468,20 +516,9 @@ class DBSCANModel:
             else:
                 X_scaled = X.values if hasattr(X, 'values') else X
             
-            # For DBSCAN, we'll use the distance to the nearest core point as anomaly score
-            # This is a simplified approach
-            try:
-                if hasattr(self.model, 'components_') and len(self.model.components_) > 0:
-                    # Calculate distances to core points
-                    from sklearn.metrics.pairwise import euclidean_distances
-                    distances = euclidean_distances(X_scaled, self.model.components_)
-                    min_distances = np.min(distances, axis=1)
-                    return min_distances
-                else:
-                    return np.zeros(len(X))
-            except Exception as e:
-                logger.warning(f"Error calculating DBSCAN distances: {e}")
-                return np.zeros(len(X))
+            # Distance to the nearest fitted core sample is the anomaly score
+            distances, _ = self._nearest_core(X_scaled)
+            return np.where(np.isfinite(distances), distances, 0.0)
             
         except Exception as e:
             logger.error(f"Error getting anomaly scores from DBSCAN model: {e}")
@@ -28,6 +28,15 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Client-level features produced by prepare_features, in output order
+CLIENT_FEATURE_COLUMNS = [
+    'total_invoiced', 'total_paid', 'unpaid_amount', 'unpaid_invoice_count', 'overdue_invoice_count',
+    'total_hours_logged', 'unbilled_hours', 'excessive_hours_count',
+    'total_service_hours_billed', 'total_service_hours_actual', 'underbilled_hours', 'sla_violation_count',
+    'payment_ratio', 'billing_efficiency', 'revenue_leak_score'
+]
+CLIENT_COUNT_FEATURES = ['unpaid_invoice_count', 'overdue_invoice_count', 'excessive_hours_count', 'sla_violation_count']
+
 
 class RevenueLeakDataPreparator:
     """Prepares data for revenue leak detection"""
@@ -320,27 +329,25 @@ class RevenueLeakDataPreparator:
         
         # Unpaid invoices
         unpaid_invoices = invoice_data[invoice_data['status'] == 'unpaid']
-        for _, invoice in unpaid_invoices.iterrows():
-            anomalies.append({
-                'anomaly_type': 'unpaid_invoice',
-                'client_id': invoice['client_id'],
-                'amount': invoice['amount'],
-                'description': f"Unpaid invoice {invoice['invoice_id']}",
-                'severity': 'medium',
-                'potential_loss': invoice['amount'] - invoice['paid_amount']
-            })
+        anomalies.extend(self._anomaly_records(
+            unpaid_invoices,
+            anomaly_type='unpaid_invoice',
+            amount=unpaid_invoices['amount'],
+            description='Unpaid invoice ' + unpaid_invoices['invoice_id'].astype(str),
+            severity='medium',
+            potential_loss=unpaid_invoices['amount'] - unpaid_invoices['paid_amount']
+        ))
         
         # Overdue invoices
         overdue_invoices = invoice_data[invoice_data['status'] == 'overdue']
-        for _, invoice in overdue_invoices.iterrows():
-            anomalies.append({
-                'anomaly_type': 'overdue_invoice',
-                'client_id': invoice['client_id'],
-                'amount': invoice['amount'],
-                'description': f"Overdue invoice {invoice['invoice_id']}",
-                'severity': 'high',
-                'potential_loss': invoice['amount'] - invoice['paid_amount']
-            })
+        anomalies.extend(self._anomaly_records(
+            overdue_invoices,
+            anomaly_type='overdue_invoice',
+            amount=overdue_invoices['amount'],
+            description='Overdue invoice ' + overdue_invoices['invoice_id'].astype(str),
+            severity='high',
+            potential_loss=overdue_invoices['amount'] - overdue_invoices['paid_amount']
+        ))
         
         return anomalies
     
@@ -349,49 +356,55 @@ class RevenueLeakDataPreparator:
         anomalies = []
         
         # Unbilled time logs
-        unbilled_logs = time_log_data[~time_log_data['billable']]
-        for _, log in unbilled_logs.iterrows():
-            anomalies.append({
-                'anomaly_type': 'unbilled_time',
-                'client_id': log['client_id'],
-                'amount': log['hours_logged'] * 100,  # Assuming $100/hour rate
-                'description': f"Unbilled time log {log['time_log_id']}",
-                'severity': 'medium',
-                'potential_loss': log['hours_logged'] * 100
-            })
+        unbilled_logs = time_log_data[~time_log_data['billable'].astype(bool)]
+        anomalies.extend(self._anomaly_records(
+            unbilled_logs,
+            anomaly_type='unbilled_time',
+            amount=unbilled_logs['hours_logged'] * 100,  # Assuming $100/hour rate
+            description='Unbilled time log ' + unbilled_logs['time_log_id'].astype(str),
+            severity='medium',
+            potential_loss=unbilled_logs['hours_logged'] * 100
+        ))
         
         # Excessive hours
         excessive_hours = time_log_data[time_log_data['hours_logged'] > 8]
-        for _, log in excessive_hours.iterrows():
-            anomalies.append({
-                'anomaly_type': 'excessive_hours',
-                'client_id': log['client_id'],
-                'amount': log['hours_logged'] * 100,
-                'description': f"Excessive hours in time log {log['time_log_id']}",
-                'severity': 'low',
-                'potential_loss': 0  # Not necessarily a loss
-            })
+        anomalies.extend(self._anomaly_records(
+            excessive_hours,
+            anomaly_type='excessive_hours',
+            amount=excessive_hours['hours_logged'] * 100,
+            description='Excessive hours in time log ' + excessive_hours['time_log_id'].astype(str),
+            severity='low',
+            potential_loss=0  # Not necessarily a loss
+        ))
         
         return anomalies
     
     def _find_service_anomalies(self, service_data: pd.DataFrame) -> List[Dict]:
         """Find anomalies in service delivery data"""
-        anomalies = []
-        
         # Underbilled services (actual hours > billed hours)
         underbilled = service_data[service_data['hours_actual'] > service_data['hours_billed']]
-        for _, service in underbilled.iterrows():
-            unbilled_hours = service['hours_actual'] - service['hours_billed']
-            anomalies.append({
-                'anomaly_type': 'underbilled_service',
-                'client_id': service['client_id'],
-                'amount': unbilled_hours * service['rate'],
-                'description': f"Underbilled service {service['service_id']}",
-                'severity': 'medium',
-                'potential_loss': unbilled_hours * service['rate']
-            })
-        
-        return anomalies
+        unbilled_value = (underbilled['hours_actual'] - underbilled['hours_billed']) * underbilled['rate']
+        return self._anomaly_records(
+            underbilled,
+            anomaly_type='underbilled_service',
+            amount=unbilled_value,
+            description='Underbilled service ' + underbilled['service_id'].astype(str),
+            severity='medium',
+            potential_loss=unbilled_value
+        )
+    
+    @staticmethod
+    def _anomaly_records(rows: pd.DataFrame, anomaly_type: str, amount: Any, description: Any,
+                         severity: str, potential_loss: Any) -> List[Dict]:
+        """Build anomaly records for every row of a filtered frame in one pass"""
+        return pd.DataFrame({
+            'anomaly_type': anomaly_type,
+            'client_id': rows['client_id'],
+            'amount': amount,
+            'description': description,
+            'severity': severity,
+            'potential_loss': potential_loss
+        }, index=rows.index).to_dict('records')
     
     def prepare_features(self, invoice_data: pd.DataFrame, 
                         time_log_data: pd.DataFrame,
@@ -408,70 +421,103 @@ class RevenueLeakDataPreparator:
             DataFrame with prepared features
         """
         try:
-            # Create client-level features
-            features = []
+            # One groupby pass per source frame, outer-joined on client_id
+            per_source = [
+                self._aggregate_invoice_features(invoice_data),
+                self._aggregate_time_log_features(time_log_data),
+                self._aggregate_service_features(service_data)
+            ]
+            per_source = [frame for frame in per_source if not frame.empty]
+            if not per_source:
+                return pd.DataFrame()
             
-            # Get unique clients
-            clients = set()
-            clients.update(invoice_data['client_id'].unique() if 'client_id' in invoice_data.columns else [])
-            clients.update(time_log_data['client_id'].unique() if 'client_id' in time_log_data.columns else [])
-            clients.update(service_data['client_id'].unique() if 'client_id' in service_data.columns else [])
+            features = pd.concat(per_source, axis=1).astype(float)
+            features = features.reindex(columns=CLIENT_FEATURE_COLUMNS, fill_value=0.0).fillna(0.0)
+            features[CLIENT_COUNT_FEATURES] = features[CLIENT_COUNT_FEATURES].astype(int)
             
-            for client_id in clients:
-                client_features = self._extract_client_features(
-                    client_id, invoice_data, time_log_data, service_data
-                )
-                features.append(client_features)
+            # Derived features
+            features['unpaid_amount'] = features['total_invoiced'] - features['total_paid']
+            features['underbilled_hours'] = features['total_service_hours_actual'] - features['total_service_hours_billed']
+            features['payment_ratio'] = self._safe_ratio(features['total_paid'], features['total_invoiced'])
+            features['billing_efficiency'] = self._safe_ratio(
+                features['total_service_hours_billed'], features['total_hours_logged']
+            )
+            features['revenue_leak_score'] = (
+                features['unpaid_amount'] +
+                features['unbilled_hours'] * 100 +  # Assuming $100/hour
+                features['underbilled_hours'] * 100  # Assuming $100/hour
+            )
             
-            return pd.DataFrame(features)
+            features.index.name = 'client_id'
+            return features.reset_index()
             
         except Exception as e:
             logger.error(f"Error preparing features: {e}")
             return pd.DataFrame()
     
-    def _extract_client_features(self, client_id: str, 
-                               invoice_data: pd.DataFrame,
-                               time_log_data: pd.DataFrame,
-                               service_data: pd.DataFrame) -> Dict[str, Any]:
-        """Extract features for a specific client"""
-        features = {'client_id': client_id}
-        
-        # Invoice features
-        client_invoices = invoice_data[invoice_data['client_id'] == client_id] if 'client_id' in invoice_data.columns else pd.DataFrame()
-        features['total_invoiced'] = client_invoices['amount'].sum() if 'amount' in client_invoices.columns else 0  # type: ignore
-        features['total_paid'] = client_invoices['paid_amount'].sum() if 'paid_amount' in client_invoices.columns else 0  # type: ignore
-        features['unpaid_amount'] = features['total_invoiced'] - features['total_paid']  # type: ignore
-        features['unpaid_invoice_count'] = len(client_invoices[client_invoices['status'] == 'unpaid']) if 'status' in client_invoices.columns else 0  # type: ignore
-        features['overdue_invoice_count'] = len(client_invoices[client_invoices['status'] == 'overdue']) if 'status' in client_invoices.columns else 0  # type: ignore
+    def _aggregate_invoice_features(self, invoice_data: pd.DataFrame) -> pd.DataFrame:
+        """Per-client invoice totals and unpaid/overdue counts"""
+        if 'client_id' not in invoice_data.columns:
+            return pd.DataFrame()
         
-        # Time log features
-        client_time_logs = time_log_data[time_log_data['client_id'] == client_id] if 'client_id' in time_log_data.columns else pd.DataFrame()
-        features['total_hours_logged'] = client_time_logs['hours_logged'].sum() if 'hours_logged' in client_time_logs.columns else 0  # type: ignore
-        features['unbilled_hours'] = client_time_logs[~client_time_logs['billable']]['hours_logged'].sum() if 'billable' in client_time_logs.columns and 'hours_logged' in client_time_logs.columns else 0  # type: ignore
-        features['excessive_hours_count'] = len(client_time_logs[client_time_logs['hours_logged'] > 8]) if 'hours_logged' in client_time_logs.columns else 0  # type: ignore
+        status = self._column_or_zero(invoice_data, 'status')
+        return pd.DataFrame({
+            'client_id': invoice_data['client_id'],
+            'total_invoiced': self._column_or_zero(invoice_data, 'amount'),
+            'total_paid': self._column_or_zero(invoice_data, 'paid_amount'),
+            'unpaid_invoice_count': (status == 'unpaid').astype(int),
+            'overdue_invoice_count': (status == 'overdue').astype(int)
+        }).groupby('client_id', sort=False).sum()
+    
+    def _aggregate_time_log_features(self, time_log_data: pd.DataFrame) -> pd.DataFrame:
+        """Per-client logged, unbilled and excessive hours"""
+        if 'client_id' not in time_log_data.columns:
+            return pd.DataFrame()
         
-        # Service delivery features
-        client_services = service_data[service_data['client_id'] == client_id] if 'client_id' in service_data.columns else pd.DataFrame()
-        features['total_service_hours_billed'] = client_services['hours_billed'].sum() if 'hours_billed' in client_services.columns else 0  # type: ignore
-        features['total_service_hours_actual'] = client_services['hours_actual'].sum() if 'hours_actual' in client_services.columns else 0  # type: ignore
-        features['underbilled_hours'] = features['total_service_hours_actual'] - features['total_service_hours_billed']  # type: ignore
-        features['sla_violation_count'] = len(client_services[~client_services['sla_met']]) if 'sla_met' in client_services.columns else 0  # type: ignore
+        hours = self._column_or_zero(time_log_data, 'hours_logged')
+        if 'billable' in time_log_data.columns:
+            unbilled_hours = hours.where(~time_log_data['billable'].astype(bool), 0.0)
+        else:
+            unbilled_hours = pd.Series(0.0, index=time_log_data.index)
         
-        # Derived features
-        total_invoiced = float(features['total_invoiced'])
-        total_paid = float(features['total_paid'])
-        total_hours_logged = float(features['total_hours_logged'])
-        total_service_hours_billed = float(features['total_service_hours_billed'])
+        return pd.DataFrame({
+            'client_id': time_log_data['client_id'],
+            'total_hours_logged': hours,
+            'unbilled_hours': unbilled_hours,
+            'excessive_hours_count': (hours > 8).astype(int)
+        }).groupby('client_id', sort=False).sum()
+    
+    def _aggregate_service_features(self, service_data: pd.DataFrame) -> pd.DataFrame:
+        """Per-client billed vs actual service hours and SLA violations"""
+        if 'client_id' not in service_data.columns:
+            return pd.DataFrame()
         
-        features['payment_ratio'] = total_paid / total_invoiced if total_invoiced > 0 else 0  # type: ignore
-        features['billing_efficiency'] = total_service_hours_billed / total_hours_logged if total_hours_logged > 0 else 0  # type: ignore
-        features['revenue_leak_score'] = (
-            float(features['unpaid_amount']) + 
-            float(features['unbilled_hours']) * 100 +  # Assuming $100/hour
-            float(features['underbilled_hours']) * 100  # Assuming $100/hour
-        )  # type: ignore
+        if 'sla_met' in service_data.columns:
+            sla_violations = (~service_data['sla_met'].astype(bool)).astype(int)
+        else:
+            sla_violations = pd.Series(0, index=service_data.index)
         
-        return features
+        return pd.DataFrame({
+            'client_id': service_data['client_id'],
+            'total_service_hours_billed': self._column_or_zero(service_data, 'hours_billed'),
+            'total_service_hours_actual': self._column_or_zero(service_data, 'hours_actual'),
+            'sla_violation_count': sla_violations
+        }).groupby('client_id', sort=False).sum()
+    
+    @staticmethod
+    def _column_or_zero(frame: pd.DataFrame, column: str) -> pd.Series:
+        """Return a column, or zeros when the source does not provide it"""
+        if column in frame.columns:
+            return frame[column]
+        return pd.Series(0.0, index=frame.index)
+    
+    @staticmethod
+    def _safe_ratio(numerator: pd.Series, denominator: pd.Series) -> np.ndarray:
+        """Element-wise ratio that is 0 where the denominator is not positive"""
+        return np.divide(
+            numerator.to_numpy(dtype=float), denominator.to_numpy(dtype=float),
+            out=np.zeros(len(numerator)), where=denominator.to_numpy() > 0
+        )
 
 
 # Global instance for easy access
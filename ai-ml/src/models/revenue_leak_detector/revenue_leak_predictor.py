@@ -10,6 +10,8 @@ from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import warnings
 import asyncio
+import numpy as np
+import pandas as pd
 warnings.filterwarnings('ignore')
 
 # Import all the components we've created
@@ -39,15 +41,17 @@ logger = logging.getLogger(__name__)
 class RevenueLeakPredictor:
     """Main orchestrator for revenue leak detection"""
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, inference_only: bool = False):
         """
         Initialize the Revenue Leak Predictor
         
         Args:
             db_path: Path to database
+            inference_only: Never train; score with models loaded via load_models
         """
         self.logger = logging.getLogger(f"{__name__}.RevenueLeakPredictor")
         self.db_path = db_path or str(Path(__file__).resolve().parent.parent.parent.parent / "database" / "superhack.db")
+        self.inference_only = inference_only
         self.data_preparator = None
         self.anomaly_models = {}
         self.training_pipeline = None
@@ -168,6 +172,57 @@ class RevenueLeakPredictor:
             self.logger.error(f"Error loading models: {e}")
             return False
 
+    def has_trained_ensemble(self) -> bool:
+        """
+        Check whether a fitted ensemble is available for scoring
+
+        Returns:
+            Boolean indicating whether the ensemble is trained
+        """
+        ensemble_model = self.anomaly_models.get('ensemble')
+        return ensemble_model is not None and getattr(ensemble_model, 'is_trained', False)
+
+    def score_records(self, records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Score feature records with the fitted ensemble (inference only)
+        
+        The records are aligned to the ensemble's feature columns once and
+        scored as a single matrix.
+        
+        Args:
+            records: List of per-record feature dictionaries
+            
+        Returns:
+            DataFrame with anomaly_prediction and anomaly_score per record
+        """
+        try:
+            if not records:
+                return pd.DataFrame()
+            
+            if not self.has_trained_ensemble():
+                logger.warning("Ensemble not trained, returning empty scores")
+                return pd.DataFrame()
+            
+            ensemble_model = self.anomaly_models['ensemble']
+            frame = pd.DataFrame.from_records(records)
+            feature_names = getattr(ensemble_model, 'feature_names', None)
+            if feature_names:
+                X = frame.reindex(columns=feature_names)
+            else:
+                X = frame.select_dtypes(include=[np.number])
+            X = X.apply(pd.to_numeric, errors='coerce').fillna(0)
+            
+            results = pd.DataFrame(index=frame.index)
+            if 'client_id' in frame.columns:
+                results['client_id'] = frame['client_id']
+            results['anomaly_prediction'] = ensemble_model.predict(X)
+            results['anomaly_score'] = ensemble_model.anomaly_scores(X)
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error scoring revenue leak records: {e}")
+            return pd.DataFrame()
+
     async def detect_revenue_leaks(self, start_date: Optional[datetime] = None, 
                                  end_date: Optional[datetime] = None,
                                  client_ids: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -186,6 +241,14 @@ class RevenueLeakPredictor:
             if not self.is_initialized:
                 await self.initialize()
             
+            if self.inference_only and not self.has_trained_ensemble():
+                logger.error("Revenue leak models not loaded and training is disabled in inference-only mode")
+                return {
+                    'status': 'model_not_loaded',
+                    'message': 'Revenue leak models not loaded; training is disabled in inference-only mode',
+                    'timestamp': datetime.now()
+                }
+            
             if start_date is None:
                 start_date = datetime.now() - timedelta(days=90)
             if end_date is None:
@@ -227,31 +290,37 @@ class RevenueLeakPredictor:
                     'timestamp': datetime.now()
                 }
             
-            # Step 3: Train anomaly detection models
-            logger.info("Training anomaly detection models...")
-            if self.training_pipeline is not None and not features.empty:
-                if isinstance(features, pd.DataFrame):
-                    X_train, X_test = self.training_pipeline.prepare_data(features)
-                else:
-                    X_train, X_test = pd.DataFrame(), pd.DataFrame()
-            else:
-                X_train, X_test = pd.DataFrame(), pd.DataFrame()
-            
-            # Train ensemble model (which trains all individual models)
-            ensemble_model = None
-            if 'ensemble' in self.anomaly_models and not X_train.empty:
+            if self.inference_only:
+                # Step 3: Score every record with the persisted ensemble
                 ensemble_model = self.anomaly_models['ensemble']
-                training_success = ensemble_model.train(X_train)
+                feature_names = getattr(ensemble_model, 'feature_names', None)
+                X_test = features[feature_names] if feature_names else features
             else:
-                training_success = False
+                # Step 3: Train anomaly detection models
+                logger.info("Training anomaly detection models...")
+                if self.training_pipeline is not None and not features.empty:
+                    if isinstance(features, pd.DataFrame):
+                        X_train, X_test = self.training_pipeline.prepare_data(features)
+                    else:
+                        X_train, X_test = pd.DataFrame(), pd.DataFrame()
+                else:
+                    X_train, X_test = pd.DataFrame(), pd.DataFrame()
             
-            if not training_success:
-                logger.warning("Failed to train ensemble model")
-                return {
-                    'status': 'training_failed',
-                    'message': 'Failed to train anomaly detection models',
-                    'timestamp': datetime.now()
-                }
+                # Train ensemble model (which trains all individual models)
+                ensemble_model = None
+                if 'ensemble' in self.anomaly_models and not X_train.empty:
+                    ensemble_model = self.anomaly_models['ensemble']
+                    training_success = ensemble_model.train(X_train)
+                else:
+                    training_success = False
+            
+                if not training_success:
+                    logger.warning("Failed to train ensemble model")
+                    return {
+                        'status': 'training_failed',
+                        'message': 'Failed to train anomaly detection models',
+                        'timestamp': datetime.now()
+                    }
             
             # Step 4: Detect anomalies
             logger.info("Detecting anomalies...")
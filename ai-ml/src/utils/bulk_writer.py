@@ -0,0 +1,243 @@
+"""
+Buffered Bulk Writer
+Write-behind buffer that persists prediction and performance records in batches
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+from src.utils.database import (
+    DatabaseManager,
+    INSERT_HISTORICAL_PREDICTION_SQL,
+    INSERT_MODEL_PERFORMANCE_SQL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedBulkWriter:
+    """Buffers historical_predictions and model_performance rows and flushes them with executemany"""
+
+    def __init__(self, db_path: Optional[str] = None, batch_size: Optional[int] = None,
+                 flush_interval_ms: Optional[int] = None, max_pending: Optional[int] = None,
+                 max_retries: Optional[int] = None):
+        """
+        Initialize the bulk writer
+
+        Args:
+            db_path: Path to the SQLite database (defaults to the configured database)
+            batch_size: Pending rows that trigger an immediate flush
+            flush_interval_ms: Maximum time a row waits in the buffer
+            max_pending: Buffer capacity; producers wait for a flush beyond it
+            max_retries: Failed flushes of a batch before its rows are dropped
+        """
+        self.db = DatabaseManager(db_path)
+        self.batch_size = batch_size or settings.database.write_batch_size
+        self.flush_interval = (flush_interval_ms or settings.database.write_flush_interval_ms) / 1000
+        self.max_pending = max(max_pending or settings.database.write_max_pending, self.batch_size)
+        self.max_retries = settings.database.write_max_retries if max_retries is None else max_retries
+
+        self._buffers: Dict[str, List[Tuple]] = {
+            INSERT_HISTORICAL_PREDICTION_SQL: [],
+            INSERT_MODEL_PERFORMANCE_SQL: [],
+        }
+        self._pending = 0
+        self._space: Optional[asyncio.Condition] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._failures: Dict[str, int] = {statement: 0 for statement in self._buffers}
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._closed = False
+
+        self._rows_written = 0
+        self._rows_failed = 0
+        self._rows_dropped = 0
+        self._flush_count = 0
+        self._last_flush_ms = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background flusher is active"""
+        return self._task is not None and not self._task.done()
+
+    async def initialize(self):
+        """Create the tables if needed and start the background flusher"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.db.initialize_tables)
+        self._closed = False
+        self._start()
+        logger.info(
+            f"Bulk writer started (batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval * 1000:.0f}ms, max_pending={self.max_pending})"
+        )
+
+    async def cleanup(self):
+        """Stop the background flusher and write everything still buffered; later writes are rejected"""
+        self._closed = True
+        self._closing = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        # Failed batches are requeued, so keep flushing until they are written or dropped
+        while self._pending:
+            await self.flush()
+        self._closing = False
+        logger.info(
+            f"Bulk writer stopped after writing {self._rows_written} rows "
+            f"({self._rows_dropped} dropped)"
+        )
+
+    async def log_predictions(self, predictions: List[Dict[str, Any]]):
+        """
+        Buffer historical prediction records
+
+        Args:
+            predictions: Records with at least model_name and prediction
+        """
+        rows = [
+            DatabaseManager._historical_prediction_row(data.get("id") or f"pred_{uuid.uuid4().hex}", data)
+            for data in predictions
+        ]
+        await self._enqueue(INSERT_HISTORICAL_PREDICTION_SQL, rows)
+
+    async def log_prediction(self, prediction: Dict[str, Any]):
+        """Buffer a single historical prediction record"""
+        await self.log_predictions([prediction])
+
+    async def log_performance(self, records: List[Dict[str, Any]]):
+        """
+        Buffer model performance records
+
+        Args:
+            records: Records with at least model_name
+        """
+        rows = [
+            DatabaseManager._model_performance_row(data.get("id") or f"perf_{uuid.uuid4().hex}", data)
+            for data in records
+        ]
+        await self._enqueue(INSERT_MODEL_PERFORMANCE_SQL, rows)
+
+    async def flush(self) -> int:
+        """
+        Write all buffered rows now
+
+        A batch that fails to write is put back at the head of its buffer and
+        retried on the next flush; after max_retries consecutive failures its
+        rows are dropped and counted in rows_dropped.
+
+        Returns:
+            Number of rows written
+        """
+        self._ensure_primitives()
+        async with self._flush_lock:
+            batches = {statement: rows for statement, rows in self._buffers.items() if rows}
+            if not batches:
+                return 0
+            for statement in batches:
+                self._buffers[statement] = []
+
+            start_time = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            written = 0
+            settled = 0
+            for statement, rows in batches.items():
+                try:
+                    written += await loop.run_in_executor(None, self.db.insert_rows, statement, rows)
+                    self._failures[statement] = 0
+                    settled += len(rows)
+                except Exception as e:
+                    self._rows_failed += len(rows)
+                    self._failures[statement] += 1
+                    if self._failures[statement] > self.max_retries:
+                        self._failures[statement] = 0
+                        self._rows_dropped += len(rows)
+                        settled += len(rows)
+                        logger.error(
+                            f"Dropped {len(rows)} buffered rows after "
+                            f"{self.max_retries + 1} failed flush attempts: {e}"
+                        )
+                    else:
+                        self._buffers[statement][:0] = rows
+                        logger.error(
+                            f"Failed to flush {len(rows)} buffered rows "
+                            f"(attempt {self._failures[statement]}), requeued: {e}"
+                        )
+
+            self._last_flush_ms = (time.perf_counter() - start_time) * 1000
+            self._rows_written += written
+            self._flush_count += 1
+
+            async with self._space:
+                self._pending -= settled
+                self._space.notify_all()
+            return written
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get buffer statistics
+
+        Returns:
+            Dictionary with bulk writer statistics
+        """
+        return {
+            "running": self.is_running,
+            "pending_rows": self._pending,
+            "rows_written": self._rows_written,
+            "rows_failed": self._rows_failed,
+            "rows_dropped": self._rows_dropped,
+            "flush_count": self._flush_count,
+            "last_flush_ms": round(self._last_flush_ms, 2),
+            "batch_size": self.batch_size,
+            "flush_interval_ms": self.flush_interval * 1000,
+            "max_pending": self.max_pending,
+            "max_retries": self.max_retries,
+        }
+
+    def _ensure_primitives(self):
+        """Create asyncio primitives lazily inside the running loop"""
+        if self._space is None:
+            self._space = asyncio.Condition()
+            self._wakeup = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+
+    def _start(self):
+        self._ensure_primitives()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _enqueue(self, statement: str, rows: List[Tuple]):
+        """Append rows to the buffer, waiting for a flush when it is full (back-pressure)"""
+        if not rows:
+            return
+        if self._closed:
+            raise RuntimeError("Bulk writer is closed; call initialize() before writing")
+        self._start()
+
+        async with self._space:
+            while self._pending and self._pending + len(rows) > self.max_pending:
+                self._wakeup.set()
+                await self._space.wait()
+            self._buffers[statement].extend(rows)
+            self._pending += len(rows)
+
+        if self._pending >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self):
+        """Flush whenever the batch size is reached or the flush interval elapses"""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Bulk writer flush failed: {e}")
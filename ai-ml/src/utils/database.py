@@ -3,27 +3,346 @@ Database utilities for the AI/ML system
 Provides database operations for scheduled runs, performance metrics, and other features.
 """
 
+import os
+import json
+import queue
 import sqlite3
 import logging
 import asyncio
-import aiosqlite
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Iterator
 from pathlib import Path
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 
+SCHEMA_STATEMENTS: List[str] = [
+    # Create scheduled_runs table
+    """
+    CREATE TABLE IF NOT EXISTS scheduled_runs (
+        id TEXT PRIMARY KEY,
+        model_name TEXT NOT NULL,
+        schedule TEXT NOT NULL,
+        enabled BOOLEAN DEFAULT TRUE,
+        parameters TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_run TIMESTAMP,
+        next_run TIMESTAMP
+    )
+    """,
+    # Create indexes for better performance
+    """
+    CREATE INDEX IF NOT EXISTS idx_scheduled_runs_model_name
+    ON scheduled_runs (model_name)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_scheduled_runs_next_run
+    ON scheduled_runs (next_run)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_scheduled_runs_enabled
+    ON scheduled_runs (enabled)
+    """,
+    # Create model_performance table for performance reporting
+    """
+    CREATE TABLE IF NOT EXISTS model_performance (
+        id TEXT PRIMARY KEY,
+        model_name TEXT NOT NULL,
+        model_version TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        accuracy REAL,
+        precision REAL,
+        recall REAL,
+        f1_score REAL,
+        rmse REAL,
+        mae REAL,
+        r_squared REAL,
+        prediction_count INTEGER,
+        error_count INTEGER,
+        average_prediction_time_ms REAL
+    )
+    """,
+    # Create indexes for model_performance
+    """
+    CREATE INDEX IF NOT EXISTS idx_model_performance_model_name
+    ON model_performance (model_name)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_model_performance_timestamp
+    ON model_performance (timestamp)
+    """,
+    # Create data_drift_reports table
+    """
+    CREATE TABLE IF NOT EXISTS data_drift_reports (
+        id TEXT PRIMARY KEY,
+        model_name TEXT NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        drift_score REAL,
+        drifted_features TEXT,
+        drift_detection_method TEXT,
+        severity TEXT,
+        report_data TEXT
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_data_drift_reports_model_timestamp
+    ON data_drift_reports (model_name, timestamp)
+    """,
+    # Create concept_drift_reports table
+    """
+    CREATE TABLE IF NOT EXISTS concept_drift_reports (
+        id TEXT PRIMARY KEY,
+        model_name TEXT NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        drift_score REAL,
+        performance_degradation REAL,
+        drift_detection_method TEXT,
+        severity TEXT,
+        report_data TEXT
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_concept_drift_reports_model_timestamp
+    ON concept_drift_reports (model_name, timestamp)
+    """,
+    # Create historical_predictions table
+    """
+    CREATE TABLE IF NOT EXISTS historical_predictions (
+        id TEXT PRIMARY KEY,
+        model_name TEXT NOT NULL,
+        prediction REAL,
+        actual_value REAL,
+        confidence REAL,
+        features TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        client_id TEXT,
+        model_version TEXT,
+        prediction_time_ms REAL,
+        status TEXT DEFAULT 'completed'
+    )
+    """,
+    # Create indexes for historical_predictions
+    """
+    CREATE INDEX IF NOT EXISTS idx_historical_predictions_model_name
+    ON historical_predictions (model_name)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_historical_predictions_timestamp
+    ON historical_predictions (timestamp)
+    """,
+    # Create retraining_jobs table
+    """
+    CREATE TABLE IF NOT EXISTS retraining_jobs (
+        id TEXT PRIMARY KEY,
+        model_name TEXT NOT NULL,
+        status TEXT DEFAULT 'pending',
+        triggered_by TEXT,
+        trigger_type TEXT,
+        parameters TEXT,
+        started_at TIMESTAMP,
+        completed_at TIMESTAMP,
+        error_message TEXT,
+        model_version_before TEXT,
+        model_version_after TEXT
+    )
+    """,
+    # Create retraining_triggers table
+    """
+    CREATE TABLE IF NOT EXISTS retraining_triggers (
+        id TEXT PRIMARY KEY,
+        model_name TEXT NOT NULL,
+        trigger_type TEXT NOT NULL,
+        trigger_condition TEXT,
+        enabled BOOLEAN DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+# Statements reused on every call so each pooled connection prepares them once
+INSERT_HISTORICAL_PREDICTION_SQL = """
+    INSERT INTO historical_predictions
+    (id, model_name, prediction, actual_value, confidence, features, timestamp,
+     client_id, model_version, prediction_time_ms, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_MODEL_PERFORMANCE_SQL = """
+    INSERT INTO model_performance
+    (id, model_name, model_version, timestamp, accuracy, precision, recall,
+     f1_score, rmse, mae, r_squared, prediction_count, error_count, average_prediction_time_ms)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class SQLiteConnectionPool:
+    """Pool of persistent, WAL-mode SQLite connections shared by all database managers"""
+    
+    def __init__(self, db_path: str, pool_size: Optional[int] = None,
+                 busy_timeout_ms: Optional[int] = None, cache_size_kb: Optional[int] = None,
+                 statement_cache_size: int = 128):
+        """
+        Initialize the connection pool
+        
+        Args:
+            db_path: Path to the SQLite database file
+            pool_size: Maximum number of open connections
+            busy_timeout_ms: How long a connection waits on a locked database
+            cache_size_kb: Page cache size per connection
+            statement_cache_size: Prepared statements cached per connection
+        """
+        self.db_path = db_path
+        self.in_memory = db_path == ":memory:"
+        # Every in-memory connection is a separate database, so share a single one
+        self.pool_size = 1 if self.in_memory else (pool_size or settings.database.pool_size)
+        self.busy_timeout_ms = busy_timeout_ms or settings.database.busy_timeout_ms
+        self.cache_size_kb = cache_size_kb or settings.database.cache_size_kb
+        self.statement_cache_size = statement_cache_size
+        
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=self.pool_size)
+        self._created = 0
+        self._create_lock = threading.Lock()
+        # SQLite allows one writer at a time; queue writers here instead of on the file lock
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self.journal_mode: Optional[str] = None
+    
+    def _create_connection(self) -> sqlite3.Connection:
+        """Open a connection and apply the tuned pragmas"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.statement_cache_size
+        )
+        conn.row_factory = sqlite3.Row
+        
+        if not self.in_memory:
+            self.journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        return conn
+    
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one while under the pool size"""
+        if self._closed:
+            raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+        
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._create_lock:
+            if self._created < self.pool_size:
+                self._created += 1
+                try:
+                    return self._create_connection()
+                except Exception:
+                    self._created -= 1
+                    raise
+        
+        return self._idle.get(timeout=self.busy_timeout_ms / 1000)
+    
+    def _release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool"""
+        if self._closed:
+            conn.close()
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put_nowait(conn)
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection for reads"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection for a write transaction, committed on success"""
+        with self._write_lock:
+            with self.connection() as conn:
+                try:
+                    yield conn
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+    
+    def close(self):
+        """Close all idle connections; busy ones are closed when released"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics
+        
+        Returns:
+            Dictionary with pool statistics
+        """
+        return {
+            "db_path": self.db_path,
+            "pool_size": self.pool_size,
+            "open_connections": self._created,
+            "idle_connections": self._idle.qsize(),
+            "journal_mode": self.journal_mode,
+            "closed": self._closed
+        }
+
+
+_connection_pools: Dict[str, SQLiteConnectionPool] = {}
+_connection_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: str) -> SQLiteConnectionPool:
+    """Get the process-wide connection pool for a database file"""
+    key = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+    with _connection_pools_lock:
+        pool = _connection_pools.get(key)
+        if pool is None or pool._closed:
+            pool = SQLiteConnectionPool(db_path)
+            _connection_pools[key] = pool
+        return pool
+
+
+def close_connection_pools():
+    """Close every pooled connection (called on application shutdown)"""
+    with _connection_pools_lock:
+        for pool in _connection_pools.values():
+            pool.close()
+        _connection_pools.clear()
+
+
 class DatabaseManager:
     """Database manager for AI/ML system"""
     
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or settings.database.url.replace("sqlite:///", "")
         self._ensure_database_exists()
+        self._pool = get_connection_pool(self.db_path)
     
     def _ensure_database_exists(self):
         """Ensure database file exists"""
+        if self.db_path == ":memory:":
+            return
         db_path = Path(self.db_path)
         db_path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -35,156 +354,9 @@ class DatabaseManager:
     def initialize_tables(self):
         """Initialize all required tables"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Create scheduled_runs table
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS scheduled_runs (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        schedule TEXT NOT NULL,
-                        enabled BOOLEAN DEFAULT TRUE,
-                        parameters TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        last_run TIMESTAMP,
-                        next_run TIMESTAMP
-                    )
-                """)
-                
-                # Create indexes for better performance
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_scheduled_runs_model_name 
-                    ON scheduled_runs (model_name)
-                """)
-                
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_scheduled_runs_next_run 
-                    ON scheduled_runs (next_run)
-                """)
-                
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_scheduled_runs_enabled 
-                    ON scheduled_runs (enabled)
-                """)
-                
-                # Create model_performance table for performance reporting
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS model_performance (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        model_version TEXT,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        accuracy REAL,
-                        precision REAL,
-                        recall REAL,
-                        f1_score REAL,
-                        rmse REAL,
-                        mae REAL,
-                        r_squared REAL,
-                        prediction_count INTEGER,
-                        error_count INTEGER,
-                        average_prediction_time_ms REAL
-                    )
-                """)
-                
-                # Create indexes for model_performance
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_model_performance_model_name 
-                    ON model_performance (model_name)
-                """)
-                
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_model_performance_timestamp 
-                    ON model_performance (timestamp)
-                """)
-                
-                # Create data_drift_reports table
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS data_drift_reports (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        drift_score REAL,
-                        drifted_features TEXT,
-                        drift_detection_method TEXT,
-                        severity TEXT,
-                        report_data TEXT
-                    )
-                """)
-                
-                # Create concept_drift_reports table
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS concept_drift_reports (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        drift_score REAL,
-                        performance_degradation REAL,
-                        drift_detection_method TEXT,
-                        severity TEXT,
-                        report_data TEXT
-                    )
-                """)
-                
-                # Create historical_predictions table
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS historical_predictions (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        prediction REAL,
-                        actual_value REAL,
-                        confidence REAL,
-                        features TEXT,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        client_id TEXT,
-                        model_version TEXT,
-                        prediction_time_ms REAL,
-                        status TEXT DEFAULT 'completed'
-                    )
-                """)
-                
-                # Create indexes for historical_predictions
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_historical_predictions_model_name 
-                    ON historical_predictions (model_name)
-                """)
-                
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_historical_predictions_timestamp 
-                    ON historical_predictions (timestamp)
-                """)
-                
-                # Create retraining_jobs table
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS retraining_jobs (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        status TEXT DEFAULT 'pending',
-                        triggered_by TEXT,
-                        trigger_type TEXT,
-                        parameters TEXT,
-                        started_at TIMESTAMP,
-                        completed_at TIMESTAMP,
-                        error_message TEXT,
-                        model_version_before TEXT,
-                        model_version_after TEXT
-                    )
-                """)
-                
-                # Create retraining_triggers table
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS retraining_triggers (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        trigger_type TEXT NOT NULL,
-                        trigger_condition TEXT,
-                        enabled BOOLEAN DEFAULT TRUE,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                conn.commit()
+            with self._pool.transaction() as conn:
+                for statement in SCHEMA_STATEMENTS:
+                    conn.execute(statement)
                 logger.info("Database tables initialized successfully")
                 
         except Exception as e:
@@ -195,7 +367,7 @@ class DatabaseManager:
     def create_scheduled_run(self, run_data: Dict[str, Any]) -> str:
         """Create a new scheduled run"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 run_id = run_data.get("id", f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(str(run_data)) % 10000}")
                 
                 conn.execute("""
@@ -213,7 +385,6 @@ class DatabaseManager:
                     run_data.get("next_run")
                 ))
                 
-                conn.commit()
                 logger.info(f"Created scheduled run: {run_id}")
                 return run_id
                 
@@ -224,8 +395,7 @@ class DatabaseManager:
     def get_scheduled_runs(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """Get all scheduled runs"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT * FROM scheduled_runs
                     ORDER BY created_at DESC
@@ -242,8 +412,7 @@ class DatabaseManager:
     def get_scheduled_run(self, run_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific scheduled run"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT * FROM scheduled_runs WHERE id = ?
                 """, (run_id,))
@@ -263,19 +432,18 @@ class DatabaseManager:
             if not filtered:
                 logger.warning(f"No valid columns to update for scheduled run: {run_id}")
                 return False
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 # Build dynamic update query
                 set_clause = ", ".join([f"{key} = ?" for key in filtered.keys()])
                 values = list(filtered.values())
                 
-                conn.execute(f"""
+                cursor = conn.execute(f"""
                     UPDATE scheduled_runs 
                     SET {set_clause}, updated_at = ?
                     WHERE id = ?
                 """, values + [datetime.now().isoformat(), run_id])
                 
-                conn.commit()
-                updated = conn.total_changes > 0
+                updated = cursor.rowcount > 0
                 if updated:
                     logger.info(f"Updated scheduled run: {run_id}")
                 return updated
@@ -287,13 +455,12 @@ class DatabaseManager:
     def delete_scheduled_run(self, run_id: str) -> bool:
         """Delete a scheduled run"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
+            with self._pool.transaction() as conn:
+                cursor = conn.execute("""
                     DELETE FROM scheduled_runs WHERE id = ?
                 """, (run_id,))
                 
-                conn.commit()
-                deleted = conn.total_changes > 0
+                deleted = cursor.rowcount > 0
                 if deleted:
                     logger.info(f"Deleted scheduled run: {run_id}")
                 return deleted
@@ -302,16 +469,15 @@ class DatabaseManager:
             logger.error(f"Failed to delete scheduled run {run_id}: {e}")
             raise
     
-    def get_due_scheduled_runs(self) -> List[Dict[str, Any]]:
+    def get_due_scheduled_runs(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Get all enabled scheduled runs that are due to run"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT * FROM scheduled_runs 
                     WHERE enabled = TRUE AND next_run <= ?
                     ORDER BY next_run ASC
-                """, (datetime.now().isoformat(),))
+                """, ((now or datetime.now()).isoformat(),))
                 
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
@@ -320,36 +486,56 @@ class DatabaseManager:
             logger.error(f"Failed to get due scheduled runs: {e}")
             raise
     
+    def get_enabled_scheduled_runs(self) -> List[Dict[str, Any]]:
+        """Get the id and next run time of every enabled scheduled run"""
+        try:
+            with self._pool.connection() as conn:
+                cursor = conn.execute("""
+                    SELECT id, model_name, next_run FROM scheduled_runs
+                    WHERE enabled = TRUE AND next_run IS NOT NULL
+                """)
+                
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+                
+        except Exception as e:
+            logger.error(f"Failed to get enabled scheduled runs: {e}")
+            raise
+    
+    def claim_scheduled_run(self, run_id: str, expected_next_run: str,
+                            next_run: Optional[str], last_run: str) -> bool:
+        """
+        Atomically claim a due run by advancing its next_run
+        
+        The update only applies while next_run still holds the value the caller
+        read, so when several workers see the same due row exactly one wins.
+        
+        Returns:
+            True if this caller claimed the run
+        """
+        try:
+            with self._pool.transaction() as conn:
+                cursor = conn.execute("""
+                    UPDATE scheduled_runs
+                    SET next_run = ?, last_run = ?, updated_at = ?
+                    WHERE id = ? AND enabled = TRUE AND next_run = ?
+                """, (next_run, last_run, datetime.now().isoformat(), run_id, expected_next_run))
+                
+                return cursor.rowcount > 0
+                
+        except Exception as e:
+            logger.error(f"Failed to claim scheduled run {run_id}: {e}")
+            raise
+    
     # Performance Metrics Methods
     def save_model_performance(self, performance_data: Dict[str, Any]) -> str:
         """Save model performance metrics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 perf_id = performance_data.get("id", f"perf_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(str(performance_data)) % 10000}")
                 
-                conn.execute("""
-                    INSERT INTO model_performance 
-                    (id, model_name, model_version, timestamp, accuracy, precision, recall, 
-                     f1_score, rmse, mae, r_squared, prediction_count, error_count, average_prediction_time_ms)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    perf_id,
-                    performance_data["model_name"],
-                    performance_data.get("model_version"),
-                    performance_data.get("timestamp", datetime.now().isoformat()),
-                    performance_data.get("accuracy"),
-                    performance_data.get("precision"),
-                    performance_data.get("recall"),
-                    performance_data.get("f1_score"),
-                    performance_data.get("rmse"),
-                    performance_data.get("mae"),
-                    performance_data.get("r_squared"),
-                    performance_data.get("prediction_count", 0),
-                    performance_data.get("error_count", 0),
-                    performance_data.get("average_prediction_time_ms", 0.0)
-                ))
+                conn.execute(INSERT_MODEL_PERFORMANCE_SQL, self._model_performance_row(perf_id, performance_data))
                 
-                conn.commit()
                 logger.info(f"Saved model performance: {perf_id}")
                 return perf_id
                 
@@ -361,29 +547,11 @@ class DatabaseManager:
     def save_historical_prediction(self, prediction_data: Dict[str, Any]) -> str:
         """Save historical prediction data"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 pred_id = prediction_data.get("id", f"pred_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(str(prediction_data)) % 10000}")
                 
-                conn.execute("""
-                    INSERT INTO historical_predictions 
-                    (id, model_name, prediction, actual_value, confidence, features, timestamp, 
-                     client_id, model_version, prediction_time_ms, status)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    pred_id,
-                    prediction_data["model_name"],
-                    prediction_data["prediction"],
-                    prediction_data.get("actual_value"),
-                    prediction_data.get("confidence"),
-                    prediction_data.get("features", "{}"),
-                    prediction_data.get("timestamp", datetime.now().isoformat()),
-                    prediction_data.get("client_id"),
-                    prediction_data.get("model_version"),
-                    prediction_data.get("prediction_time_ms", 0.0),
-                    prediction_data.get("status", "completed")
-                ))
+                conn.execute(INSERT_HISTORICAL_PREDICTION_SQL, self._historical_prediction_row(pred_id, prediction_data))
                 
-                conn.commit()
                 logger.info(f"Saved historical prediction: {pred_id}")
                 return pred_id
                 
@@ -391,14 +559,84 @@ class DatabaseManager:
             logger.error(f"Failed to save historical prediction: {e}")
             raise
     
+    def save_historical_predictions(self, predictions: List[Dict[str, Any]]) -> int:
+        """Save many historical predictions in a single transaction"""
+        try:
+            rows = [
+                self._historical_prediction_row(data.get("id") or f"pred_{uuid.uuid4().hex}", data)
+                for data in predictions
+            ]
+            return self.insert_rows(INSERT_HISTORICAL_PREDICTION_SQL, rows)
+                
+        except Exception as e:
+            logger.error(f"Failed to save historical predictions: {e}")
+            raise
+    
+    def save_model_performance_records(self, records: List[Dict[str, Any]]) -> int:
+        """Save many model performance records in a single transaction"""
+        try:
+            rows = [
+                self._model_performance_row(data.get("id") or f"perf_{uuid.uuid4().hex}", data)
+                for data in records
+            ]
+            return self.insert_rows(INSERT_MODEL_PERFORMANCE_SQL, rows)
+                
+        except Exception as e:
+            logger.error(f"Failed to save model performance records: {e}")
+            raise
+    
+    def insert_rows(self, statement: str, rows: List[tuple]) -> int:
+        """Insert pre-built parameter rows with executemany in one transaction"""
+        if not rows:
+            return 0
+        with self._pool.transaction() as conn:
+            conn.executemany(statement, rows)
+        return len(rows)
+    
+    @staticmethod
+    def _historical_prediction_row(pred_id: str, prediction_data: Dict[str, Any]) -> tuple:
+        """Build the INSERT parameters for a historical prediction"""
+        return (
+            pred_id,
+            prediction_data["model_name"],
+            prediction_data["prediction"],
+            prediction_data.get("actual_value"),
+            prediction_data.get("confidence"),
+            prediction_data.get("features", "{}"),
+            prediction_data.get("timestamp", datetime.now().isoformat()),
+            prediction_data.get("client_id"),
+            prediction_data.get("model_version"),
+            prediction_data.get("prediction_time_ms", 0.0),
+            prediction_data.get("status", "completed")
+        )
+    
+    @staticmethod
+    def _model_performance_row(perf_id: str, performance_data: Dict[str, Any]) -> tuple:
+        """Build the INSERT parameters for a model performance record"""
+        return (
+            perf_id,
+            performance_data["model_name"],
+            performance_data.get("model_version"),
+            performance_data.get("timestamp", datetime.now().isoformat()),
+            performance_data.get("accuracy"),
+            performance_data.get("precision"),
+            performance_data.get("recall"),
+            performance_data.get("f1_score"),
+            performance_data.get("rmse"),
+            performance_data.get("mae"),
+            performance_data.get("r_squared"),
+            performance_data.get("prediction_count", 0),
+            performance_data.get("error_count", 0),
+            performance_data.get("average_prediction_time_ms", 0.0)
+        )
+    
     def get_historical_predictions(self, model_name: str, days: int = 30, limit: int = 1000) -> List[Dict[str, Any]]:
         """Get historical predictions for a model"""
         try:
             from datetime import datetime, timedelta
             cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT * FROM historical_predictions 
                     WHERE model_name = ? AND timestamp >= ?
@@ -419,8 +657,7 @@ class DatabaseManager:
             from datetime import datetime, timedelta
             cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT 
                         COUNT(*) as total_predictions,
@@ -442,14 +679,79 @@ class DatabaseManager:
             logger.error(f"Failed to get prediction statistics for {model_name}: {e}")
             raise
     
+    def save_drift_report(self, drift_analysis: Dict[str, Any]) -> str:
+        """Save a drift analysis to data_drift_reports and concept_drift_reports"""
+        try:
+            report_id = f"drift_{uuid.uuid4().hex}"
+            timestamp = drift_analysis.get("analyzed_at", datetime.now().isoformat())
+            report_data = json.dumps(drift_analysis, default=str)
+            method = drift_analysis.get("method", "psi_ks_js_histogram")
+            
+            with self._pool.transaction() as conn:
+                conn.execute("""
+                    INSERT INTO data_drift_reports
+                    (id, model_name, timestamp, drift_score, drifted_features, drift_detection_method, severity, report_data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    report_id,
+                    drift_analysis["model_name"],
+                    timestamp,
+                    drift_analysis.get("drift_score"),
+                    json.dumps(drift_analysis.get("drifted_features", [])),
+                    method,
+                    drift_analysis.get("severity"),
+                    report_data
+                ))
+                conn.execute("""
+                    INSERT INTO concept_drift_reports
+                    (id, model_name, timestamp, drift_score, performance_degradation, drift_detection_method, severity, report_data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    report_id,
+                    drift_analysis["model_name"],
+                    timestamp,
+                    drift_analysis.get("concept_drift_score"),
+                    drift_analysis.get("performance_degradation"),
+                    method,
+                    drift_analysis.get("severity"),
+                    report_data
+                ))
+                
+                logger.info(f"Saved drift report: {report_id}")
+                return report_id
+                
+        except Exception as e:
+            logger.error(f"Failed to save drift report for {drift_analysis.get('model_name')}: {e}")
+            raise
+    
+    def get_drift_reports(self, model_name: str, days: int = 30, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get recent data drift reports for a model (without the full report payload)"""
+        try:
+            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+            
+            with self._pool.connection() as conn:
+                cursor = conn.execute("""
+                    SELECT id, timestamp, drift_score, drifted_features, severity
+                    FROM data_drift_reports
+                    WHERE model_name = ? AND timestamp >= ?
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                """, (model_name, cutoff_date, limit))
+                
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+                
+        except Exception as e:
+            logger.error(f"Failed to get drift reports for {model_name}: {e}")
+            raise
+    
     def get_model_performance_reports(self, model_name: str, days: int = 30, limit: int = 100) -> List[Dict[str, Any]]:
         """Get model performance reports"""
         try:
             from datetime import datetime, timedelta
             cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT * FROM model_performance 
                     WHERE model_name = ? AND timestamp >= ?
@@ -468,7 +770,7 @@ class DatabaseManager:
         """Create a new retraining trigger"""
         try:
             from datetime import datetime
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 trigger_id = trigger_data.get("id", f"trigger_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(str(trigger_data)) % 10000}")
                 
                 conn.execute("""
@@ -485,7 +787,6 @@ class DatabaseManager:
                     datetime.now().isoformat()
                 ))
                 
-                conn.commit()
                 logger.info(f"Created retraining trigger: {trigger_id}")
                 return trigger_id
                 
@@ -496,8 +797,7 @@ class DatabaseManager:
     def get_retraining_triggers(self, model_name: str) -> List[Dict[str, Any]]:
         """Get all retraining triggers for a model"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT * FROM retraining_triggers WHERE model_name = ?
                     ORDER BY created_at DESC
@@ -519,19 +819,18 @@ class DatabaseManager:
             if not filtered:
                 logger.warning(f"No valid columns to update for retraining trigger: {trigger_id}")
                 return False
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 # Build dynamic update query
                 set_clause = ", ".join([f"{key} = ?" for key in filtered.keys()])
                 values = list(filtered.values())
                 
-                conn.execute(f"""
+                cursor = conn.execute(f"""
                     UPDATE retraining_triggers 
                     SET {set_clause}, updated_at = ?
                     WHERE id = ?
                 """, values + [datetime.now().isoformat(), trigger_id])
                 
-                conn.commit()
-                updated = conn.total_changes > 0
+                updated = cursor.rowcount > 0
                 if updated:
                     logger.info(f"Updated retraining trigger: {trigger_id}")
                 return updated
@@ -543,13 +842,12 @@ class DatabaseManager:
     def delete_retraining_trigger(self, trigger_id: str) -> bool:
         """Delete a retraining trigger"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
+            with self._pool.transaction() as conn:
+                cursor = conn.execute("""
                     DELETE FROM retraining_triggers WHERE id = ?
                 """, (trigger_id,))
                 
-                conn.commit()
-                deleted = conn.total_changes > 0
+                deleted = cursor.rowcount > 0
                 if deleted:
                     logger.info(f"Deleted retraining trigger: {trigger_id}")
                 return deleted
@@ -562,7 +860,7 @@ class DatabaseManager:
         """Create a new retraining job"""
         try:
             from datetime import datetime
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 job_id = job_data.get("id", f"job_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(str(job_data)) % 10000}")
                 
                 conn.execute("""
@@ -579,7 +877,6 @@ class DatabaseManager:
                     datetime.now().isoformat()
                 ))
                 
-                conn.commit()
                 logger.info(f"Created retraining job: {job_id}")
                 return job_id
                 
@@ -596,19 +893,18 @@ class DatabaseManager:
             if not filtered:
                 logger.warning(f"No valid columns to update for retraining job: {job_id}")
                 return False
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 # Build dynamic update query
                 set_clause = ", ".join([f"{key} = ?" for key in filtered.keys()])
                 values = list(filtered.values())
                 
-                conn.execute(f"""
+                cursor = conn.execute(f"""
                     UPDATE retraining_jobs 
                     SET {set_clause}
                     WHERE id = ?
                 """, values + [job_id])
                 
-                conn.commit()
-                updated = conn.total_changes > 0
+                updated = cursor.rowcount > 0
                 if updated:
                     logger.info(f"Updated retraining job: {job_id}")
                 return updated
@@ -620,8 +916,7 @@ class DatabaseManager:
     def get_retraining_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific retraining job"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT * FROM retraining_jobs WHERE id = ?
                 """, (job_id,))
@@ -636,8 +931,7 @@ class DatabaseManager:
     def get_retraining_history(self, model_name: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get retraining history for a model"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT * FROM retraining_jobs 
                     WHERE model_name = ?
@@ -660,9 +954,14 @@ class AsyncDatabaseManager:
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or settings.database.url.replace("sqlite:///", "")
         self._ensure_database_exists()
+        # Shares the same pooled connections as the sync manager
+        self._sync = DatabaseManager(self.db_path)
+        self._pool = self._sync._pool
     
     def _ensure_database_exists(self):
         """Ensure database file exists"""
+        if self.db_path == ":memory:":
+            return
         db_path = Path(self.db_path)
         db_path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -674,161 +973,16 @@ class AsyncDatabaseManager:
     async def initialize_tables(self):
         """Initialize all required tables"""
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
-                # Create scheduled_runs table
-                await conn.execute("""
-                    CREATE TABLE IF NOT EXISTS scheduled_runs (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        schedule TEXT NOT NULL,
-                        enabled BOOLEAN DEFAULT TRUE,
-                        parameters TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        last_run TIMESTAMP,
-                        next_run TIMESTAMP
-                    )
-                """)
-                
-                # Create indexes for better performance
-                await conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_scheduled_runs_model_name 
-                    ON scheduled_runs (model_name)
-                """)
-                
-                await conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_scheduled_runs_next_run 
-                    ON scheduled_runs (next_run)
-                """)
-                
-                await conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_scheduled_runs_enabled 
-                    ON scheduled_runs (enabled)
-                """)
-                
-                # Create model_performance table for performance reporting
-                await conn.execute("""
-                    CREATE TABLE IF NOT EXISTS model_performance (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        model_version TEXT,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        accuracy REAL,
-                        precision REAL,
-                        recall REAL,
-                        f1_score REAL,
-                        rmse REAL,
-                        mae REAL,
-                        r_squared REAL,
-                        prediction_count INTEGER,
-                        error_count INTEGER,
-                        average_prediction_time_ms REAL
-                    )
-                """)
-                
-                # Create indexes for model_performance
-                await conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_model_performance_model_name 
-                    ON model_performance (model_name)
-                """)
-                
-                await conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_model_performance_timestamp 
-                    ON model_performance (timestamp)
-                """)
-                
-                # Create data_drift_reports table
-                await conn.execute("""
-                    CREATE TABLE IF NOT EXISTS data_drift_reports (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        drift_score REAL,
-                        drifted_features TEXT,
-                        drift_detection_method TEXT,
-                        severity TEXT,
-                        report_data TEXT
-                    )
-                """)
-                
-                # Create concept_drift_reports table
-                await conn.execute("""
-                    CREATE TABLE IF NOT EXISTS concept_drift_reports (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        drift_score REAL,
-                        performance_degradation REAL,
-                        drift_detection_method TEXT,
-                        severity TEXT,
-                        report_data TEXT
-                    )
-                """)
-                
-                # Create historical_predictions table
-                await conn.execute("""
-                    CREATE TABLE IF NOT EXISTS historical_predictions (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        prediction REAL,
-                        actual_value REAL,
-                        confidence REAL,
-                        features TEXT,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        client_id TEXT,
-                        model_version TEXT,
-                        prediction_time_ms REAL,
-                        status TEXT DEFAULT 'completed'
-                    )
-                """)
-                
-                # Create indexes for historical_predictions
-                await conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_historical_predictions_model_name 
-                    ON historical_predictions (model_name)
-                """)
-                
-                await conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_historical_predictions_timestamp 
-                    ON historical_predictions (timestamp)
-                """)
-                
-                # Create retraining_jobs table
-                await conn.execute("""
-                    CREATE TABLE IF NOT EXISTS retraining_jobs (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        status TEXT DEFAULT 'pending',
-                        triggered_by TEXT,
-                        trigger_type TEXT,
-                        parameters TEXT,
-                        started_at TIMESTAMP,
-                        completed_at TIMESTAMP,
-                        error_message TEXT,
-                        model_version_before TEXT,
-                        model_version_after TEXT
-                    )
-                """)
-                
-                # Create retraining_triggers table
-                await conn.execute("""
-                    CREATE TABLE IF NOT EXISTS retraining_triggers (
-                        id TEXT PRIMARY KEY,
-                        model_name TEXT NOT NULL,
-                        trigger_type TEXT NOT NULL,
-                        trigger_condition TEXT,
-                        enabled BOOLEAN DEFAULT TRUE,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                await conn.commit()
-                logger.info("Database tables initialized successfully")
+            await self._run(self._sync.initialize_tables)
                 
         except Exception as e:
             logger.error(f"Failed to initialize database tables: {e}")
             raise
+    
+    async def _run(self, func, *args):
+        """Run a blocking storage call on the shared pool off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
 
 
 # Factory function
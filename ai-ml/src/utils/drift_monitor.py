@@ -0,0 +1,350 @@
+"""
+Drift Monitor
+Streaming per-feature sketches for data and concept drift, updated as predictions are logged
+"""
+
+import logging
+import math
+import threading
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Smoothing for empty bins so PSI and JS stay finite
+EPSILON = 1e-6
+
+# Sketch name for the model output (concept drift proxy)
+PREDICTION_FEATURE = "__prediction__"
+
+# PSI rules of thumb: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 significant shift
+PSI_SEVERITY = ((0.25, "high"), (0.1, "medium"), (0.05, "low"))
+
+
+class Moments:
+    """Count, sum and sum of squares, so a window can be subtracted as well as added"""
+
+    __slots__ = ("count", "total", "total_sq")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+
+    def merge(self, other: "Moments", sign: int = 1):
+        self.count += sign * other.count
+        self.total += sign * other.total
+        self.total_sq += sign * other.total_sq
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        if self.count < 2:
+            return 0.0
+        variance = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class FeatureSketch:
+    """
+    Reference and current-window histograms of one feature over shared bin edges
+
+    The first reference_size values fix the bin edges (at their quantiles) and form
+    the reference distribution. Later values go to a sliding current window of about
+    window_size values, kept as a ring of segments so the oldest segment can be
+    subtracted in O(bins). Every drift score is then O(bins), independent of volume.
+    """
+
+    def __init__(self, reference_size: int, window_size: int, n_bins: int, n_segments: int = 10):
+        self.reference_size = reference_size
+        self.n_bins = n_bins
+        self.n_segments = n_segments
+        self.segment_size = max(1, window_size // n_segments)
+
+        self.edges: Optional[List[float]] = None
+        self._warmup: List[float] = []
+        self.reference_counts: List[int] = []
+        self.reference_moments = Moments()
+        self.current_counts: List[int] = []
+        self.current_moments = Moments()
+        self._segments: deque = deque()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the reference is fixed and the current window has data"""
+        return self.edges is not None and self.current_moments.count > 0
+
+    def add(self, value: float):
+        """Record one observation"""
+        if self.edges is None:
+            self._warmup.append(value)
+            if len(self._warmup) >= self.reference_size:
+                self._fix_reference()
+            return
+
+        if not self._segments or self._segments[-1][1].count >= self.segment_size:
+            self._segments.append(([0] * (len(self.edges) + 1), Moments()))
+            if len(self._segments) > self.n_segments:
+                old_counts, old_moments = self._segments.popleft()
+                for i, count in enumerate(old_counts):
+                    self.current_counts[i] -= count
+                self.current_moments.merge(old_moments, sign=-1)
+
+        index = bisect_right(self.edges, value)
+        counts, moments = self._segments[-1]
+        counts[index] += 1
+        moments.add(value)
+        self.current_counts[index] += 1
+        self.current_moments.add(value)
+
+    def reset_reference(self) -> bool:
+        """
+        Make the current window the new reference, e.g. after retraining on recent data
+
+        Returns:
+            False if there is no current window to promote
+        """
+        if not self.ready:
+            return False
+        self.reference_counts = list(self.current_counts)
+        self.reference_moments = Moments()
+        self.reference_moments.merge(self.current_moments)
+        self._clear_current()
+        return True
+
+    def scores(self) -> Dict[str, Any]:
+        """PSI, KS and Jensen-Shannon scores of the current window against the reference"""
+        reference = _normalize(self.reference_counts)
+        current = _normalize(self.current_counts)
+
+        psi = 0.0
+        js = 0.0
+        ks = 0.0
+        reference_cdf = current_cdf = 0.0
+        for r, c in zip(reference, current):
+            psi += (c - r) * math.log(c / r)
+            m = (r + c) / 2
+            js += 0.5 * (r * math.log2(r / m) + c * math.log2(c / m))
+            reference_cdf += r
+            current_cdf += c
+            ks = max(ks, abs(reference_cdf - current_cdf))
+
+        reference_std = self.reference_moments.std
+        mean_shift = self.current_moments.mean - self.reference_moments.mean
+        return {
+            "psi": round(psi, 6),
+            "ks_statistic": round(ks, 6),
+            "js_divergence": round(max(js, 0.0), 6),
+            "reference_mean": self.reference_moments.mean,
+            "current_mean": self.current_moments.mean,
+            "mean_shift_std": round(mean_shift / reference_std, 6) if reference_std else None,
+            "reference_count": self.reference_moments.count,
+            "current_count": self.current_moments.count,
+        }
+
+    def _fix_reference(self):
+        values = sorted(self._warmup)
+        self._warmup = []
+        edges = []
+        for i in range(1, self.n_bins):
+            edge = values[min(len(values) - 1, (i * len(values)) // self.n_bins)]
+            if not edges or edge > edges[-1]:
+                edges.append(edge)
+        if values[0] == values[-1]:
+            # Constant feature: give the value its own bin so a move either way shows
+            edges = [values[0], math.nextafter(values[0], math.inf)]
+        self.edges = edges
+
+        self.reference_counts = [0] * (len(self.edges) + 1)
+        self.reference_moments = Moments()
+        for value in values:
+            self.reference_counts[bisect_right(self.edges, value)] += 1
+            self.reference_moments.add(value)
+        self._clear_current()
+
+    def _clear_current(self):
+        self.current_counts = [0] * (len(self.edges) + 1)
+        self.current_moments = Moments()
+        self._segments.clear()
+
+
+def _normalize(counts: List[int]) -> List[float]:
+    total = sum(counts) + EPSILON * len(counts)
+    return [(count + EPSILON) / total for count in counts]
+
+
+def _severity(psi: float) -> str:
+    for threshold, label in PSI_SEVERITY:
+        if psi >= threshold:
+            return label
+    return "none"
+
+
+def _numeric(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return float(value)
+    return None
+
+
+class DriftMonitor:
+    """Keeps a FeatureSketch per model feature (plus the model output) and scores drift on demand"""
+
+    def __init__(self, reference_size: Optional[int] = None, window_size: Optional[int] = None,
+                 n_bins: Optional[int] = None, psi_threshold: Optional[float] = None,
+                 ks_threshold: Optional[float] = None, max_features: int = 100):
+        """
+        Initialize the drift monitor
+
+        Args:
+            reference_size: Observations that form each feature's reference distribution
+            window_size: Approximate size of the sliding current window
+            n_bins: Histogram bins per feature
+            psi_threshold: PSI at or above which a feature counts as drifted
+            ks_threshold: KS statistic at or above which a feature counts as drifted
+            max_features: Cap on tracked features per model
+        """
+        self.reference_size = reference_size or settings.monitoring.drift_reference_size
+        self.window_size = window_size or settings.monitoring.drift_window_size
+        self.n_bins = n_bins or settings.monitoring.drift_bins
+        self.psi_threshold = psi_threshold or settings.monitoring.drift_psi_threshold
+        self.ks_threshold = ks_threshold or settings.monitoring.drift_ks_threshold
+        self.max_features = max_features
+
+        self._sketches: Dict[str, Dict[str, FeatureSketch]] = {}
+        self._observations: Dict[str, int] = {}
+        # Predictions are logged from the event loop and from worker threads
+        self._lock = threading.Lock()
+
+    def observe(self, model_name: str, features: Dict[str, Any], prediction: Any = None):
+        """
+        Fold one served prediction into the model's sketches
+
+        Args:
+            model_name: Model that served the prediction
+            features: Input record; non-numeric values are ignored
+            prediction: Model output, tracked for concept drift when numeric
+        """
+        values = {name: _numeric(value) for name, value in features.items()}
+        values[PREDICTION_FEATURE] = _numeric(prediction)
+
+        with self._lock:
+            sketches = self._sketches.setdefault(model_name, {})
+            for name, value in values.items():
+                if value is None:
+                    continue
+                sketch = sketches.get(name)
+                if sketch is None:
+                    if len(sketches) >= self.max_features:
+                        continue
+                    sketch = sketches[name] = FeatureSketch(self.reference_size, self.window_size, self.n_bins)
+                sketch.add(value)
+            self._observations[model_name] = self._observations.get(model_name, 0) + 1
+
+    def observe_batch(self, model_name: str, records: List[Dict[str, Any]], predictions: List[Any]):
+        """Fold a batch of served predictions into the model's sketches"""
+        for record, prediction in zip(records, predictions):
+            self.observe(model_name, record, prediction)
+
+    def reset_reference(self, model_name: str) -> int:
+        """
+        Promote every current window of a model to its reference
+
+        Returns:
+            Number of sketches whose reference was replaced
+        """
+        with self._lock:
+            return sum(sketch.reset_reference() for sketch in self._sketches.get(model_name, {}).values())
+
+    def get_drift(self, model_name: str) -> Dict[str, Any]:
+        """
+        Score data and concept drift for a model from its sketches
+
+        Returns:
+            Dictionary with per-feature scores, drifted features and overall verdicts
+        """
+        with self._lock:
+            sketches = self._sketches.get(model_name, {})
+            scores = {name: sketch.scores() for name, sketch in sketches.items() if sketch.ready}
+            warming_up = [name for name, sketch in sketches.items() if sketch.edges is None]
+            observations = self._observations.get(model_name, 0)
+
+        output_scores = scores.pop(PREDICTION_FEATURE, None)
+        drifted = sorted(
+            name for name, score in scores.items()
+            if score["psi"] >= self.psi_threshold or score["ks_statistic"] >= self.ks_threshold
+        )
+        data_drift_score = max((score["psi"] for score in scores.values()), default=0.0)
+        concept_drift_score = output_scores["psi"] if output_scores else 0.0
+
+        if scores or output_scores:
+            status = "analyzed"
+        elif observations:
+            status = "collecting_reference"
+        else:
+            status = "no_data"
+
+        return {
+            "model_name": model_name,
+            "status": status,
+            "observations": observations,
+            "data_drift_detected": bool(drifted),
+            "concept_drift_detected": bool(output_scores) and (
+                output_scores["psi"] >= self.psi_threshold or output_scores["ks_statistic"] >= self.ks_threshold
+            ),
+            "drift_score": data_drift_score,
+            "concept_drift_score": concept_drift_score,
+            "severity": _severity(max(data_drift_score, concept_drift_score)),
+            "drifted_features": drifted,
+            "feature_scores": scores,
+            "prediction_scores": output_scores,
+            "features_warming_up": sorted(name for name in warming_up if name != PREDICTION_FEATURE),
+            "thresholds": {"psi": self.psi_threshold, "ks": self.ks_threshold},
+            "window": {"reference_size": self.reference_size, "window_size": self.window_size, "bins": self.n_bins},
+            "analyzed_at": datetime.now().isoformat(),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get drift monitor statistics
+
+        Returns:
+            Dictionary with tracked models, features and observation counts
+        """
+        with self._lock:
+            return {
+                "models": {
+                    model_name: {
+                        "features": len(sketches),
+                        "observations": self._observations.get(model_name, 0),
+                    }
+                    for model_name, sketches in self._sketches.items()
+                },
+                "reference_size": self.reference_size,
+                "window_size": self.window_size,
+                "bins": self.n_bins,
+            }
+
+
+_drift_monitor: Optional[DriftMonitor] = None
+
+
+def get_drift_monitor() -> DriftMonitor:
+    """Get the process-wide drift monitor"""
+    global _drift_monitor
+    if _drift_monitor is None:
+        _drift_monitor = DriftMonitor()
+    return _drift_monitor
@@ -0,0 +1,66 @@
+"""
+Lazy Imports
+Defers importing heavy ML libraries (TensorFlow, XGBoost, statsmodels, SHAP)
+until a model first touches them, so the API starts without paying for them
+"""
+
+import importlib
+import importlib.util
+import logging
+import time
+import types
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_module"] = module
+            logger.info(f"Imported {self.__name__} on first use in {time.perf_counter() - start:.2f}s")
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def module_available(name: str) -> bool:
+    """Check whether a module's top-level package is installed, without importing it"""
+    try:
+        return importlib.util.find_spec(name.split(".")[0]) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Get a module that is only imported when first used
+
+    Args:
+        name: Dotted module name (e.g. "tensorflow.keras.layers")
+
+    Returns:
+        LazyModule standing in for the module
+
+    Raises:
+        ModuleNotFoundError: If the module's package is not installed, like a plain import
+    """
+    if not module_available(name):
+        raise ModuleNotFoundError(f"No module named '{name.split('.')[0]}'", name=name)
+    return LazyModule(name)
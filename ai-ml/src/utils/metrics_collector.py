@@ -11,6 +11,8 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 import json
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,11 +24,217 @@ class MetricPoint:
     tags: Dict[str, str] = None
 
 
+# Rollup resolutions: name -> (bucket width in seconds, buckets retained)
+ROLLUP_RESOLUTIONS = {
+    "1m": (60, 1440),     # 24 hours
+    "5m": (300, 2016),    # 7 days
+    "1h": (3600, 720),    # 30 days
+}
+
+
+class RingBuffer:
+    """Preallocated, time-ordered ring of rows with O(1) appends and binary-searched ranges"""
+    
+    def __init__(self, capacity: int, columns: Dict[str, Any]):
+        """
+        Args:
+            capacity: Maximum rows kept; the oldest row is overwritten when full
+            columns: Column name -> numpy dtype, stored alongside the timestamps
+        """
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in columns.items()}
+        self.head = 0
+        self.size = 0
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def append(self, timestamp: float, **values):
+        """Append a row; timestamps must not decrease"""
+        self.times[self.head] = timestamp
+        for name, value in values.items():
+            self.columns[name][self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+    
+    def _segments(self):
+        """Oldest-first contiguous segments of the timestamp array"""
+        start = (self.head - self.size) % self.capacity
+        first = self.times[start:start + min(self.size, self.capacity - start)]
+        second = self.times[:self.size - len(first)]
+        return start, first, second
+    
+    def _search(self, timestamp: float, side: str) -> int:
+        """Logical position of a timestamp, as np.searchsorted over the ordered rows"""
+        _, first, second = self._segments()
+        position = int(np.searchsorted(first, timestamp, side=side))
+        if position < len(first):
+            return position
+        return len(first) + int(np.searchsorted(second, timestamp, side=side))
+    
+    def indices(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Physical indices of the rows with start <= timestamp <= end, oldest first"""
+        lo = 0 if start is None else self._search(start, "left")
+        hi = self.size if end is None else self._search(end, "right")
+        oldest = (self.head - self.size) % self.capacity
+        return (oldest + np.arange(lo, max(lo, hi))) % self.capacity
+    
+    def latest(self) -> Optional[int]:
+        """Physical index of the newest row"""
+        return (self.head - 1) % self.capacity if self.size else None
+
+
+class RollupSeries:
+    """Fixed-width min/max/avg/p95 buckets of one metric at one resolution"""
+    
+    def __init__(self, resolution: int, capacity: int, reservoir_size: int = 256,
+                 random_state: Optional[int] = None):
+        """
+        Args:
+            resolution: Bucket width in seconds
+            capacity: Closed buckets retained
+            reservoir_size: Values sampled per bucket for its p95 (exact up to this many)
+            random_state: Seed for the reservoir sampling
+        """
+        self.resolution = resolution
+        self.buckets = RingBuffer(capacity, {
+            "count": np.int64, "sum": np.float64, "min": np.float64, "max": np.float64, "p95": np.float64
+        })
+        self.reservoir = np.empty(reservoir_size, dtype=np.float64)
+        self._rng = np.random.default_rng(random_state)
+        self._open_start: Optional[float] = None
+        self._open_count = 0
+        self._open_sum = 0.0
+        self._open_min = np.inf
+        self._open_max = -np.inf
+    
+    def add(self, timestamp: float, value: float):
+        """Fold a value into its bucket, closing the open bucket when a new one starts"""
+        bucket_start = timestamp - timestamp % self.resolution
+        if self._open_start is not None and bucket_start > self._open_start:
+            self.buckets.append(self._open_start, **self._open_stats())
+            self._open_start = None
+        if self._open_start is None:
+            self._open_start = bucket_start
+            self._open_count = 0
+            self._open_sum = 0.0
+            self._open_min = np.inf
+            self._open_max = -np.inf
+        
+        # Reservoir sampling keeps the p95 estimate O(1) per value
+        if self._open_count < len(self.reservoir):
+            self.reservoir[self._open_count] = value
+        else:
+            slot = self._rng.integers(0, self._open_count + 1)
+            if slot < len(self.reservoir):
+                self.reservoir[slot] = value
+        self._open_count += 1
+        self._open_sum += value
+        self._open_min = min(self._open_min, value)
+        self._open_max = max(self._open_max, value)
+    
+    def _open_stats(self) -> Dict[str, float]:
+        """Statistics of the bucket still being filled"""
+        sample = self.reservoir[:min(self._open_count, len(self.reservoir))]
+        return {
+            "count": self._open_count,
+            "sum": self._open_sum,
+            "min": self._open_min,
+            "max": self._open_max,
+            "p95": float(np.percentile(sample, 95)),
+        }
+    
+    def query(self, start: Optional[float] = None, end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Buckets starting within [start, end], including the open one"""
+        bucket_floor = None if start is None else start - start % self.resolution
+        idx = self.buckets.indices(bucket_floor, end)
+        columns = {name: column[idx] for name, column in self.buckets.columns.items()}
+        rows = [
+            {
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "count": int(count),
+                "min": float(low),
+                "max": float(high),
+                "avg": float(total / count),
+                "p95": float(p95),
+            }
+            for timestamp, count, total, low, high, p95 in zip(
+                self.buckets.times[idx], columns["count"], columns["sum"],
+                columns["min"], columns["max"], columns["p95"]
+            )
+        ]
+        
+        if self._open_start is not None and (bucket_floor is None or self._open_start >= bucket_floor) \
+                and (end is None or self._open_start <= end):
+            stats = self._open_stats()
+            rows.append({
+                "timestamp": datetime.fromtimestamp(self._open_start).isoformat(),
+                "count": stats["count"],
+                "min": stats["min"],
+                "max": stats["max"],
+                "avg": stats["sum"] / stats["count"],
+                "p95": stats["p95"],
+            })
+        return rows
+
+
+class MetricSeries:
+    """Raw points of one metric in a ring buffer, plus its rollups"""
+    
+    def __init__(self, max_points: int = 1000):
+        self.points = RingBuffer(max_points, {"value": np.float64, "tags": object})
+        self.rollups = {
+            name: RollupSeries(resolution, capacity)
+            for name, (resolution, capacity) in ROLLUP_RESOLUTIONS.items()
+        }
+        self._last_timestamp = -np.inf
+        self.rejected_points = 0
+    
+    def record(self, timestamp: float, value: float, tags: Dict[str, str]) -> bool:
+        """
+        Record a point
+        
+        The raw buffer and the rollups are append-only, so a point older than the
+        newest recorded one is rejected rather than stored under a wrong time.
+        
+        Returns:
+            False if the point was rejected as out of order
+        """
+        if timestamp < self._last_timestamp:
+            self.rejected_points += 1
+            return False
+        self._last_timestamp = timestamp
+        self.points.append(timestamp, value=value, tags=tags)
+        for rollup in self.rollups.values():
+            rollup.add(timestamp, value)
+        return True
+    
+    def to_dicts(self, start: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Raw points since start as serializable dictionaries"""
+        idx = self.points.indices(start)
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "value": float(value),
+                "tags": tags
+            }
+            for timestamp, value, tags in zip(
+                self.points.times[idx], self.points.columns["value"][idx], self.points.columns["tags"][idx]
+            )
+        ]
+
+
 class MetricsCollector:
     """Collects and stores system and model metrics"""
     
-    def __init__(self):
-        self.metrics_store: Dict[str, List[MetricPoint]] = {}
+    def __init__(self, max_points: int = 1000):
+        """
+        Args:
+            max_points: Raw points kept per metric; older history lives on in the rollups
+        """
+        self.max_points = max_points
+        self.metrics_store: Dict[str, MetricSeries] = {}
         self._initialized = False
         self._collection_task = None
     
@@ -83,23 +291,20 @@ class MetricsCollector:
         except Exception as e:
             logger.error(f"Failed to collect system metrics: {e}")
     
-    async def record_metric(self, metric_name: str, value: float, tags: Dict[str, str] = None):
+    async def record_metric(self, metric_name: str, value: float, tags: Dict[str, str] = None,
+                            timestamp: Optional[datetime] = None):
         """Record a metric value"""
         try:
-            if metric_name not in self.metrics_store:
-                self.metrics_store[metric_name] = []
-            
-            metric_point = MetricPoint(
-                timestamp=datetime.now(),
-                value=value,
-                tags=tags or {}
-            )
+            series = self.metrics_store.get(metric_name)
+            if series is None:
+                series = self.metrics_store[metric_name] = MetricSeries(self.max_points)
             
-            self.metrics_store[metric_name].append(metric_point)
-            
-            # Keep only last 1000 points per metric
-            if len(self.metrics_store[metric_name]) > 1000:
-                self.metrics_store[metric_name] = self.metrics_store[metric_name][-1000:]
+            recorded_at = timestamp or datetime.now()
+            if not series.record(recorded_at.timestamp(), float(value), tags or {}):
+                logger.warning(
+                    f"Dropped out-of-order point for {metric_name} at {recorded_at.isoformat()}; "
+                    f"{series.rejected_points} rejected so far"
+                )
             
         except Exception as e:
             logger.error(f"Failed to record metric {metric_name}: {e}")
@@ -110,50 +315,28 @@ class MetricsCollector:
         try:
             # Parse time range
             time_delta = self._parse_time_range(time_range)
-            cutoff_time = datetime.now() - time_delta
+            cutoff = (datetime.now() - time_delta).timestamp()
             
             if metric_name:
                 # Get specific metric
                 if metric_name not in self.metrics_store:
                     return {}
                 
-                points = [
-                    point for point in self.metrics_store[metric_name]
-                    if point.timestamp >= cutoff_time
-                ]
-                
+                points = self.metrics_store[metric_name].to_dicts(cutoff)
                 return {
                     "metric_name": metric_name,
-                    "points": [
-                        {
-                            "timestamp": point.timestamp.isoformat(),
-                            "value": point.value,
-                            "tags": point.tags
-                        }
-                        for point in points
-                    ],
+                    "points": points,
                     "count": len(points)
                 }
             else:
                 # Get all metrics
                 all_metrics = {}
-                for name, points in self.metrics_store.items():
-                    filtered_points = [
-                        point for point in points
-                        if point.timestamp >= cutoff_time
-                    ]
-                    
-                    if filtered_points:
+                for name, series in self.metrics_store.items():
+                    points = series.to_dicts(cutoff)
+                    if points:
                         all_metrics[name] = {
-                            "points": [
-                                {
-                                    "timestamp": point.timestamp.isoformat(),
-                                    "value": point.value,
-                                    "tags": point.tags
-                                }
-                                for point in filtered_points
-                            ],
-                            "count": len(filtered_points)
+                            "points": points,
+                            "count": len(points)
                         }
                 
                 return all_metrics
@@ -162,34 +345,44 @@ class MetricsCollector:
             logger.error(f"Failed to get metrics: {e}")
             return {}
     
+    async def get_rollups(self, metric_name: str, resolution: str = "1m",
+                          time_range: str = "1h") -> Dict[str, Any]:
+        """Get pre-computed min/max/avg/p95 buckets of a metric"""
+        try:
+            series = self.metrics_store.get(metric_name)
+            if series is None or resolution not in series.rollups:
+                return {}
+            
+            cutoff = (datetime.now() - self._parse_time_range(time_range)).timestamp()
+            buckets = series.rollups[resolution].query(cutoff)
+            return {
+                "metric_name": metric_name,
+                "resolution": resolution,
+                "buckets": buckets,
+                "count": len(buckets)
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get rollups for {metric_name}: {e}")
+            return {}
+    
     async def get_model_metrics(self, model_name: str, 
                                time_range: str = "24h") -> Dict[str, Any]:
         """Get metrics for a specific model"""
         try:
             time_delta = self._parse_time_range(time_range)
-            cutoff_time = datetime.now() - time_delta
+            cutoff = (datetime.now() - time_delta).timestamp()
             
             model_metrics = {}
             
             # Get model-specific metrics
-            for metric_name, points in self.metrics_store.items():
+            for metric_name, series in self.metrics_store.items():
                 if f"model.{model_name}" in metric_name:
-                    filtered_points = [
-                        point for point in points
-                        if point.timestamp >= cutoff_time
-                    ]
-                    
-                    if filtered_points:
+                    points = series.to_dicts(cutoff)
+                    if points:
                         model_metrics[metric_name] = {
-                            "points": [
-                                {
-                                    "timestamp": point.timestamp.isoformat(),
-                                    "value": point.value,
-                                    "tags": point.tags
-                                }
-                                for point in filtered_points
-                            ],
-                            "count": len(filtered_points)
+                            "points": points,
+                            "count": len(points)
                         }
             
             return model_metrics
@@ -199,10 +392,11 @@ class MetricsCollector:
             return {}
     
     async def record_model_metric(self, model_name: str, metric_name: str, 
-                                 value: float, tags: Dict[str, str] = None):
-        """Record a model-specific metric"""
+                                 value: float, tags: Dict[str, str] = None,
+                                 timestamp: Optional[datetime] = None):
+        """Record a model-specific metric; timestamps must not go back in time per metric"""
         full_metric_name = f"model.{model_name}.{metric_name}"
-        await self.record_metric(full_metric_name, value, tags)
+        await self.record_metric(full_metric_name, value, tags, timestamp=timestamp)
     
     def _parse_time_range(self, time_range: str) -> timedelta:
         """Parse time range string to timedelta"""
@@ -219,18 +413,19 @@ class MetricsCollector:
         try:
             summary = {}
             
-            for metric_name, points in self.metrics_store.items():
-                if not points:
+            for metric_name, series in self.metrics_store.items():
+                if not len(series.points):
                     continue
                 
-                values = [point.value for point in points]
+                values = series.points.columns["value"][:len(series.points)]
+                latest = series.points.latest()
                 summary[metric_name] = {
                     "count": len(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "avg": sum(values) / len(values),
-                    "latest": values[-1] if values else None,
-                    "latest_timestamp": points[-1].timestamp.isoformat() if points else None
+                    "min": float(values.min()),
+                    "max": float(values.max()),
+                    "avg": float(values.mean()),
+                    "latest": float(series.points.columns["value"][latest]),
+                    "latest_timestamp": datetime.fromtimestamp(series.points.times[latest]).isoformat()
                 }
             
             return summary
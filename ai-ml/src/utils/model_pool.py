@@ -0,0 +1,317 @@
+"""
+Model Serving Pool
+Process-wide pool of warm model engines shared across API requests
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Serving name -> artifact sub-directory under the model registry path
+MODEL_ARTIFACT_DIRS: Dict[str, Optional[str]] = {
+    "client_churn": "churn",
+    "client_profitability": "profitability",
+    "revenue_leak_detector": "revenue_leak",
+    "dynamic_pricing": "dynamic_pricing",
+    "demand_forecaster": "demand_forecaster",
+    "anomaly_detector": "anomaly_detector",
+    "budget_optimizer": None,
+}
+
+
+async def run_blocking(func, *args):
+    """Run blocking model work (artifact I/O, inference) in the default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, func, *args)
+
+
+class ModelNotLoadedError(Exception):
+    """Raised when a model's persisted artifacts are missing in inference-only mode"""
+    pass
+
+
+@dataclass
+class PooledModel:
+    """A loaded engine plus its load statistics"""
+    name: str
+    engine: Any
+    artifact_dir: Optional[str]
+    artifacts_loaded: bool
+    load_time_ms: float
+    memory_delta_mb: float
+    loaded_at: datetime = field(default_factory=datetime.now)
+    request_count: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize load statistics (without the engine itself)"""
+        return {
+            "name": self.name,
+            "engine_type": type(self.engine).__name__,
+            "artifact_dir": self.artifact_dir,
+            "artifacts_loaded": self.artifacts_loaded,
+            "load_time_ms": round(self.load_time_ms, 2),
+            "memory_delta_mb": round(self.memory_delta_mb, 2),
+            "loaded_at": self.loaded_at.isoformat(),
+            "request_count": self.request_count,
+        }
+
+
+class ModelServingPool:
+    """Loads each model engine once and hands the same fitted instance to every request"""
+
+    def __init__(self, models_dir: Optional[str] = None, inference_only: Optional[bool] = None,
+                 load_retry_interval: Optional[float] = None):
+        """
+        Initialize the serving pool
+
+        Args:
+            models_dir: Root directory holding the per-model artifact folders
+            inference_only: Never train on the request path and fail fast when
+                artifacts are missing (defaults to settings.models.inference_only)
+            load_retry_interval: Seconds a failed load is remembered before the next
+                request retries it (defaults to settings.models.load_retry_interval)
+        """
+        self.models_dir = Path(models_dir or settings.models.registry_path)
+        self.inference_only = settings.models.inference_only if inference_only is None else inference_only
+        self.load_retry_interval = (
+            settings.models.load_retry_interval if load_retry_interval is None else load_retry_interval
+        )
+        self._entries: Dict[str, PooledModel] = {}
+        self._load_errors: Dict[str, str] = {}
+        # Monotonic time of each model's last failed load
+        self._failed_at: Dict[str, float] = {}
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self._loaders = {
+            "client_churn": self._load_churn,
+            "client_profitability": self._load_profitability,
+            "revenue_leak_detector": self._load_revenue_leak,
+            "dynamic_pricing": self._load_dynamic_pricing,
+            "demand_forecaster": self._load_demand_forecaster,
+            "anomaly_detector": self._load_anomaly_detector,
+            "budget_optimizer": self._load_budget_optimizer,
+        }
+
+    @property
+    def model_names(self) -> List[str]:
+        """Names of all models the pool can serve"""
+        return list(self._loaders.keys())
+
+    async def initialize(self, model_names: Optional[List[str]] = None):
+        """
+        Warm the pool by loading engines up front
+
+        Args:
+            model_names: Models to load (all models if None)
+        """
+        for name in model_names or self.model_names:
+            try:
+                if not self.is_loaded(name):
+                    await self._load(name)
+            except ModelNotLoadedError as e:
+                logger.warning(str(e))
+            except Exception as e:
+                logger.error(f"Failed to warm model {name}: {e}")
+        logger.info(f"Model serving pool warmed: {len(self._entries)}/{len(self._loaders)} models loaded")
+
+    async def cleanup(self):
+        """Release all pooled engines"""
+        self._entries.clear()
+        logger.info("Model serving pool cleaned up")
+
+    def is_loaded(self, model_name: str) -> bool:
+        """Check whether a model is already resident in the pool"""
+        return model_name in self._entries
+
+    async def get_engine(self, model_name: str) -> Any:
+        """
+        Get the shared engine for a model, loading it on first use
+
+        Args:
+            model_name: Serving name of the model
+
+        Returns:
+            Loaded engine instance
+
+        Raises:
+            KeyError: If the model name is unknown
+            ModelNotLoadedError: If artifacts are missing in inference-only mode, or the
+                model failed to load less than load_retry_interval seconds ago
+        """
+        entry = self._entries.get(model_name)
+        if entry is None:
+            entry = await self._load(model_name)
+        entry.request_count += 1
+        return entry.engine
+
+    async def reload(self, model_name: str) -> Any:
+        """
+        Reload a model, e.g. after retraining
+
+        The current engine keeps serving until the new one has loaded, and stays in
+        place if the reload fails. A reload also retries a recently failed load.
+
+        Args:
+            model_name: Serving name of the model
+
+        Returns:
+            Freshly loaded engine instance
+        """
+        entry = await self._load(model_name, force=True)
+        entry.request_count += 1
+        return entry.engine
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-model load time and resident memory statistics
+
+        Returns:
+            Dictionary with pool statistics
+        """
+        process_rss_mb = psutil.Process().memory_info().rss / (1024 ** 2)
+        return {
+            "models_dir": str(self.models_dir),
+            "inference_only": self.inference_only,
+            "loaded_models": len(self._entries),
+            "available_models": self.model_names,
+            "process_rss_mb": round(process_rss_mb, 2),
+            "models": {name: entry.to_dict() for name, entry in self._entries.items()},
+            "load_errors": dict(self._load_errors),
+        }
+
+    def _check_recent_failure(self, model_name: str):
+        """Fail fast while a previous load failure is within the retry interval"""
+        failed_at = self._failed_at.get(model_name)
+        if failed_at is not None and time.monotonic() - failed_at < self.load_retry_interval:
+            raise ModelNotLoadedError(self._load_errors[model_name])
+
+    def _record_failure(self, model_name: str, message: str):
+        self._load_errors[model_name] = message
+        self._failed_at[model_name] = time.monotonic()
+
+    async def _load(self, model_name: str, force: bool = False) -> PooledModel:
+        """
+        Load a model under its own lock so concurrent requests share one load
+
+        Args:
+            model_name: Serving name of the model
+            force: Load a fresh engine even if one is resident or a load just failed
+        """
+        loader = self._loaders.get(model_name)
+        if loader is None:
+            raise KeyError(f"Unknown model: {model_name}")
+        if not force:
+            self._check_recent_failure(model_name)
+
+        lock = self._load_locks.setdefault(model_name, asyncio.Lock())
+        async with lock:
+            if not force:
+                entry = self._entries.get(model_name)
+                if entry is not None:
+                    return entry
+                # Another request may have failed this load while we waited
+                self._check_recent_failure(model_name)
+
+            sub_dir = MODEL_ARTIFACT_DIRS.get(model_name)
+            artifact_dir = self.models_dir / sub_dir if sub_dir else None
+
+            process = psutil.Process()
+            rss_before = process.memory_info().rss
+            start_time = time.perf_counter()
+            try:
+                engine, artifacts_loaded = await loader(artifact_dir)
+            except Exception as e:
+                self._record_failure(model_name, f"Model '{model_name}' failed to load: {e}")
+                raise
+            load_time_ms = (time.perf_counter() - start_time) * 1000
+            memory_delta_mb = (process.memory_info().rss - rss_before) / (1024 ** 2)
+
+            if self.inference_only and artifact_dir is not None and not artifacts_loaded:
+                message = (
+                    f"Model '{model_name}' is not available: no persisted artifacts in {artifact_dir} "
+                    f"and training is disabled in inference-only mode"
+                )
+                self._record_failure(model_name, message)
+                raise ModelNotLoadedError(message)
+            self._load_errors.pop(model_name, None)
+            self._failed_at.pop(model_name, None)
+
+            entry = PooledModel(
+                name=model_name,
+                engine=engine,
+                artifact_dir=str(artifact_dir) if artifact_dir else None,
+                artifacts_loaded=artifacts_loaded,
+                load_time_ms=load_time_ms,
+                memory_delta_mb=memory_delta_mb,
+            )
+            # Swap in only after a successful load, so a failed reload keeps the old engine
+            self._entries[model_name] = entry
+            logger.info(
+                f"Loaded {model_name} in {load_time_ms:.1f}ms "
+                f"(+{memory_delta_mb:.1f}MB RSS, artifacts_loaded={artifacts_loaded})"
+            )
+            return entry
+
+    async def _load_churn(self, artifact_dir: Path):
+        from src.models.churn_predictor.churn_predictor import ChurnPredictor
+
+        engine = ChurnPredictor(inference_only=self.inference_only)
+        loaded = await run_blocking(engine.load_models, str(artifact_dir))
+        return engine, bool(loaded)
+
+    async def _load_profitability(self, artifact_dir: Path):
+        from src.models.profitability_predictor.profitability_predictor import ProfitabilityPredictor
+
+        engine = ProfitabilityPredictor(model_path=str(artifact_dir), inference_only=self.inference_only)
+        try:
+            await engine.initialize()
+        except Exception as e:
+            logger.error(f"Failed to load profitability models: {e}")
+            return engine, False
+        loaded = engine.xgboost_model is not None or engine.random_forest_model is not None
+        return engine, loaded
+
+    async def _load_revenue_leak(self, artifact_dir: Path):
+        from src.models.revenue_leak_detector.revenue_leak_predictor import RevenueLeakPredictor
+
+        engine = RevenueLeakPredictor(inference_only=self.inference_only)
+        await engine.initialize()
+        loaded = await run_blocking(engine.load_models, str(artifact_dir))
+        return engine, bool(loaded)
+
+    async def _load_dynamic_pricing(self, artifact_dir: Path):
+        from src.models.dynamic_pricing.dynamic_pricing_engine import DynamicPricingEngine, DEFAULT_PRICE_POINTS
+
+        engine = DynamicPricingEngine(inference_only=self.inference_only)
+        await engine.initialize_reinforcement_learning_agents(list(DEFAULT_PRICE_POINTS))
+        loaded = await run_blocking(engine.load_models, str(artifact_dir))
+        return engine, bool(loaded)
+
+    async def _load_demand_forecaster(self, artifact_dir: Path):
+        from src.models.demand_forecaster.demand_forecaster import DemandForecaster
+
+        engine = DemandForecaster(inference_only=self.inference_only, cache_dir=str(artifact_dir / "cache"))
+        loaded = await run_blocking(engine.load_models, str(artifact_dir))
+        return engine, bool(loaded)
+
+    async def _load_anomaly_detector(self, artifact_dir: Path):
+        from src.models.anomaly_detector.anomaly_orchestrator import AnomalyDetectorOrchestrator
+
+        engine = AnomalyDetectorOrchestrator(inference_only=self.inference_only)
+        loaded = await run_blocking(engine.load_models, str(artifact_dir))
+        return engine, bool(loaded)
+
+    async def _load_budget_optimizer(self, artifact_dir: Optional[Path]):
+        from src.models.budget_optimizer.budget_optimizer import BudgetOptimizer
+
+        # Budget optimizer is search-based and has no persisted artifacts
+        return BudgetOptimizer(), False
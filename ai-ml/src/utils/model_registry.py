@@ -4,10 +4,6 @@ MLflow-based model registry for versioning and deployment management
 """
 
 import logging
-import mlflow
-import mlflow.sklearn
-import mlflow.tensorflow
-import mlflow.xgboost
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
@@ -16,6 +12,10 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
 from config import settings
+from .lazy_imports import lazy_import
+
+# MLflow (and its model flavors) load on first use, off the API's import path
+mlflow = lazy_import("mlflow")
 
 logger = logging.getLogger(__name__)
 
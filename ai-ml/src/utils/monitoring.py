@@ -10,6 +10,8 @@ from typing import Dict, List, Any, Optional
 import json
 import uuid
 
+from .drift_monitor import get_drift_monitor
+
 logger = logging.getLogger(__name__)
 
 
@@ -349,30 +351,32 @@ class MonitoringService:
             return {}
     
     async def get_model_drift(self, model_name: str, days: int = 30) -> Dict[str, Any]:
-        """Get model drift analysis"""
+        """Get model drift analysis from the streaming drift sketches"""
         try:
-            # Generate mock drift analysis
+            drift = get_drift_monitor().get_drift(model_name)
+            prediction_scores = drift["prediction_scores"] or {}
+            
             drift_analysis = {
                 "model_name": model_name,
                 "analysis_period_days": days,
-                "drift_detected": True,
-                "drift_score": 0.15,
+                "status": drift["status"],
+                "drift_detected": drift["data_drift_detected"] or drift["concept_drift_detected"],
+                "drift_score": drift["drift_score"],
+                "severity": drift["severity"],
                 "feature_drift": {
-                    "contract_value": 0.12,
-                    "hours_logged": 0.08,
-                    "billing_amount": 0.18
+                    feature: scores["psi"] for feature, scores in drift["feature_scores"].items()
                 },
+                "drifted_features": drift["drifted_features"],
                 "performance_drift": {
-                    "accuracy_change": -0.03,
-                    "precision_change": -0.02,
-                    "recall_change": -0.01
+                    "prediction_psi": prediction_scores.get("psi"),
+                    "prediction_mean_shift_std": prediction_scores.get("mean_shift_std")
                 },
-                "recommendations": [
-                    "Consider retraining the model",
-                    "Review feature engineering pipeline",
-                    "Monitor data quality"
-                ],
-                "last_analyzed": datetime.now().isoformat()
+                "recommendations": (
+                    ["Consider retraining the model", "Review feature engineering pipeline", "Monitor data quality"]
+                    if drift["data_drift_detected"] or drift["concept_drift_detected"]
+                    else ["Continue monitoring input data distributions"]
+                ),
+                "last_analyzed": drift["analyzed_at"]
             }
             
             return drift_analysis
@@ -0,0 +1,394 @@
+"""
+Scheduled Run Executor
+In-process cron executor that runs due scheduled_runs rows on a bounded worker pool
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from croniter import croniter
+
+from config import settings
+from src.utils.database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Training entry points per serving model name (see scripts/)
+TRAINING_SCRIPTS = {
+    "client_churn": "train_churn.py",
+    "client_profitability": "train_profitability.py",
+    "revenue_leak_detector": "train_revenue_leak.py",
+    "dynamic_pricing": "train_dynamic_pricing.py",
+    "demand_forecaster": "train_demand_forecaster.py",
+    "anomaly_detector": "train_anomaly_detector.py",
+}
+
+# Upper bound when counting fire times missed while the server was down
+MAX_COALESCED_RUNS = 1000
+
+TaskHandler = Callable[[str, Dict[str, Any]], Dict[str, Any]]
+
+
+def next_fire_time(schedule: str, after: datetime) -> datetime:
+    """First fire time of a cron expression strictly after the given time"""
+    return croniter(schedule, after).get_next(datetime)
+
+
+def count_missed_runs(schedule: str, first_due: datetime, now: datetime) -> int:
+    """
+    Count the fire times between a run's due time and now
+
+    Args:
+        schedule: Cron expression
+        first_due: The next_run the row was waiting for
+        now: Current time
+
+    Returns:
+        Number of fire times that elapsed (at least 1), capped at MAX_COALESCED_RUNS
+    """
+    cron = croniter(schedule, first_due)
+    count = 1
+    while count < MAX_COALESCED_RUNS and cron.get_next(datetime) <= now:
+        count += 1
+    return count
+
+
+def _parse_parameters(raw: Any) -> Dict[str, Any]:
+    if isinstance(raw, dict):
+        return raw
+    try:
+        return json.loads(raw) if raw else {}
+    except (TypeError, ValueError):
+        return {}
+
+
+class ScheduledRunExecutor:
+    """Wakes on the nearest scheduled_runs deadline, claims due rows and runs them on a bounded pool"""
+
+    def __init__(self, db_path: Optional[str] = None, max_workers: Optional[int] = None,
+                 model_concurrency: Optional[int] = None, resync_interval: Optional[int] = None,
+                 job_timeout: Optional[int] = None, model_pool: Any = None,
+                 clock: Callable[[], datetime] = datetime.now):
+        """
+        Initialize the executor
+
+        Args:
+            db_path: Path to the SQLite database (defaults to the configured database)
+            max_workers: Runs executing at once across all models
+            model_concurrency: Runs executing at once for a single model
+            resync_interval: Seconds between reloads of the schedule table, which picks
+                up rows changed by other workers
+            job_timeout: Default timeout in seconds for a training run
+            model_pool: Serving pool to reload after a successful retrain
+            clock: Source of the current time (injectable for tests)
+        """
+        self.db = DatabaseManager(db_path)
+        self.max_workers = max_workers or settings.models.scheduler_max_workers
+        self.model_concurrency = model_concurrency or settings.models.scheduler_model_concurrency
+        self.resync_interval = resync_interval or settings.models.scheduler_resync_interval
+        self.job_timeout = job_timeout or settings.models.scheduler_job_timeout
+        self.model_pool = model_pool
+        self._clock = clock
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scheduled-run")
+        self._tasks: Dict[str, TaskHandler] = {"retrain": self._retrain}
+        self._heap: List[Tuple[datetime, str]] = []
+        self._model_slots: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._resync_requested = True
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self._runs_started = 0
+        self._runs_succeeded = 0
+        self._runs_failed = 0
+        self._runs_coalesced = 0
+        self._claims_lost = 0
+        self._recent_runs: deque = deque(maxlen=50)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the scheduler loop is active"""
+        return self._task is not None and not self._task.done()
+
+    async def initialize(self):
+        """Create the tables if needed and start the scheduler loop"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.db.initialize_tables)
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Scheduled run executor started (max_workers={self.max_workers}, "
+            f"model_concurrency={self.model_concurrency})"
+        )
+
+    async def cleanup(self):
+        """Stop the scheduler loop and cancel runs still waiting or executing"""
+        self._closing = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+        in_flight = list(self._in_flight.values())
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._closing = False
+        logger.info(f"Scheduled run executor stopped after {self._runs_started} runs")
+
+    def register_task(self, name: str, handler: TaskHandler):
+        """
+        Register a task a scheduled run can execute (selected by parameters["task"])
+
+        Args:
+            name: Task name
+            handler: Blocking callable taking (model_name, parameters) and returning a
+                dict with at least "success"; it runs on the worker pool
+        """
+        self._tasks[name] = handler
+
+    def notify(self):
+        """Reload the schedule table, e.g. after a run was created, updated or deleted"""
+        self._resync_requested = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def trigger(self, run: Dict[str, Any]) -> bool:
+        """
+        Execute a scheduled run now, outside its schedule
+
+        Args:
+            run: scheduled_runs row
+
+        Returns:
+            False if the run is already executing (the trigger is coalesced into it)
+        """
+        return self._dispatch(run, missed_runs=1, trigger="manual")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get executor statistics
+
+        Returns:
+            Dictionary with scheduler statistics
+        """
+        return {
+            "running": self.is_running,
+            "scheduled": len(self._heap),
+            "next_deadline": self._heap[0][0].isoformat() if self._heap else None,
+            "in_flight": sorted(self._in_flight.keys()),
+            "runs_started": self._runs_started,
+            "runs_succeeded": self._runs_succeeded,
+            "runs_failed": self._runs_failed,
+            "runs_coalesced": self._runs_coalesced,
+            "claims_lost": self._claims_lost,
+            "max_workers": self.max_workers,
+            "model_concurrency": self.model_concurrency,
+            "recent_runs": list(self._recent_runs),
+        }
+
+    async def _run(self):
+        """Sleep until the nearest deadline (or a notify), then dispatch whatever is due"""
+        last_resync = float("-inf")
+        while not self._closing:
+            if self._resync_requested or time.monotonic() - last_resync >= self.resync_interval:
+                last_resync = time.monotonic()
+                try:
+                    await self._resync()
+                except Exception as e:
+                    logger.error(f"Failed to load scheduled runs: {e}")
+
+            try:
+                await self._dispatch_due()
+            except Exception as e:
+                logger.error(f"Failed to dispatch scheduled runs: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_delay())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _next_delay(self) -> float:
+        """Seconds until the nearest deadline, never longer than the resync interval"""
+        if not self._heap:
+            return self.resync_interval
+        delay = (self._heap[0][0] - self._clock()).total_seconds()
+        return min(max(delay, 0.0), self.resync_interval)
+
+    async def _resync(self):
+        """Rebuild the deadline heap from the enabled rows"""
+        self._resync_requested = False
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(None, self.db.get_enabled_scheduled_runs)
+
+        heap = []
+        for row in rows:
+            try:
+                heap.append((datetime.fromisoformat(row["next_run"]), row["id"]))
+            except (TypeError, ValueError):
+                logger.warning(f"Scheduled run {row['id']} has an invalid next_run: {row['next_run']}")
+        heapq.heapify(heap)
+        self._heap = heap
+
+    async def _dispatch_due(self):
+        """Claim and start every run whose deadline has passed"""
+        now = self._clock()
+        if not self._heap or self._heap[0][0] > now:
+            return
+        while self._heap and self._heap[0][0] <= now:
+            heapq.heappop(self._heap)
+
+        # The table, not the heap, is authoritative for what is due
+        loop = asyncio.get_running_loop()
+        due_runs = await loop.run_in_executor(None, self.db.get_due_scheduled_runs, now)
+        for run in due_runs:
+            await self._claim_and_dispatch(run, now)
+
+    async def _claim_and_dispatch(self, run: Dict[str, Any], now: datetime):
+        """Advance a due row to its next fire time and start it if this worker won the claim"""
+        run_id = run["id"]
+        try:
+            next_run = next_fire_time(run["schedule"], now)
+            missed_runs = count_missed_runs(run["schedule"], datetime.fromisoformat(run["next_run"]), now)
+        except Exception as e:
+            # Park rows with a bad schedule instead of re-reading them on every wake-up
+            logger.error(f"Scheduled run {run_id} has an invalid schedule '{run['schedule']}': {e}")
+            next_run, missed_runs = None, 0
+
+        loop = asyncio.get_running_loop()
+        claimed = await loop.run_in_executor(
+            None, self.db.claim_scheduled_run, run_id, run["next_run"],
+            next_run.isoformat() if next_run else None, now.isoformat()
+        )
+        if not claimed:
+            # Another worker took it (or it was edited); pick up its new deadline
+            self._claims_lost += 1
+            self._resync_requested = True
+            return
+
+        if next_run is not None:
+            heapq.heappush(self._heap, (next_run, run_id))
+        if missed_runs:
+            self._dispatch(run, missed_runs, trigger="schedule")
+
+    def _dispatch(self, run: Dict[str, Any], missed_runs: int, trigger: str) -> bool:
+        """Start a run unless the same schedule is still executing"""
+        run_id = run["id"]
+        if run_id in self._in_flight:
+            self._runs_coalesced += missed_runs
+            logger.info(f"Scheduled run {run_id} is still executing; coalesced {missed_runs} run(s) into it")
+            return False
+
+        if missed_runs > 1:
+            self._runs_coalesced += missed_runs - 1
+            logger.info(f"Scheduled run {run_id} missed {missed_runs} fire times; running once")
+
+        task = asyncio.create_task(self._execute(run, missed_runs, trigger))
+        self._in_flight[run_id] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(run_id, None))
+        return True
+
+    async def _execute(self, run: Dict[str, Any], missed_runs: int, trigger: str):
+        """Run the row's task on the worker pool, at most model_concurrency per model"""
+        model_name = run["model_name"]
+        parameters = _parse_parameters(run.get("parameters"))
+        task_name = parameters.get("task", "retrain")
+        handler = self._tasks.get(task_name)
+
+        slots = self._model_slots.get(model_name)
+        if slots is None:
+            slots = self._model_slots[model_name] = asyncio.Semaphore(self.model_concurrency)
+
+        async with slots:
+            self._runs_started += 1
+            started_at = self._clock()
+            start_time = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            try:
+                if handler is None:
+                    result = {"success": False, "message": f"Unknown task: {task_name}"}
+                else:
+                    result = await loop.run_in_executor(self._executor, handler, model_name, parameters)
+            except Exception as e:
+                result = {"success": False, "message": str(e)}
+
+            if result.get("success") and task_name == "retrain" and self.model_pool is not None:
+                try:
+                    await self.model_pool.reload(model_name)
+                except Exception as e:
+                    logger.error(f"Failed to reload {model_name} after scheduled retraining: {e}")
+
+        success = bool(result.get("success"))
+        if success:
+            self._runs_succeeded += 1
+            logger.info(f"Scheduled run {run['id']} ({task_name} {model_name}) completed")
+        else:
+            self._runs_failed += 1
+            logger.error(f"Scheduled run {run['id']} ({task_name} {model_name}) failed: {result.get('message')}")
+
+        self._recent_runs.append({
+            "run_id": run["id"],
+            "model_name": model_name,
+            "task": task_name,
+            "trigger": trigger,
+            "missed_runs": missed_runs,
+            "started_at": started_at.isoformat(),
+            "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            "success": success,
+            "message": result.get("message"),
+        })
+
+    def _retrain(self, model_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the model's training script in a child process and record it as a retraining job"""
+        script = TRAINING_SCRIPTS.get(model_name)
+        if script is None:
+            return {"success": False, "message": f"No training script for {model_name}"}
+
+        job_id = self.db.create_retraining_job({
+            "model_name": model_name,
+            "status": "running",
+            "triggered_by": "scheduler",
+            "trigger_type": "scheduled",
+            "parameters": json.dumps(parameters),
+        })
+
+        timeout = parameters.get("timeout", self.job_timeout)
+        try:
+            completed = subprocess.run(
+                [sys.executable, str(PROJECT_ROOT / "scripts" / script)],
+                cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=timeout
+            )
+            success = completed.returncode == 0
+            stderr_lines = completed.stderr.strip().splitlines()
+            error = None if success else (stderr_lines[-1] if stderr_lines else f"exit code {completed.returncode}")
+        except subprocess.TimeoutExpired:
+            success, error = False, f"Training timed out after {timeout}s"
+
+        self.db.update_retraining_job(job_id, {
+            "status": "completed" if success else "failed",
+            "completed_at": datetime.now().isoformat(),
+            "error_message": error,
+        })
+        return {
+            "success": success,
+            "message": "Retraining completed" if success else error,
+            "job_id": job_id,
+        }
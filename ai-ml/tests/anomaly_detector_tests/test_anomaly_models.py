@@ -3,6 +3,8 @@ Unit tests for anomaly detection models
 """
 
 import unittest
+from contextlib import ExitStack
+from unittest import mock
 import numpy as np
 import pandas as pd
 from sklearn.datasets import make_classification
@@ -127,6 +129,35 @@ class TestDBSCANModel(unittest.TestCase):
         for pred in unique_predictions:
             self.assertIn(pred, [-1, 1])
 
+    def test_predict_does_not_refit(self):
+        """Test that scoring reuses the fitted core samples"""
+        self.model.train(self.X_train)
+        fitted_model = self.model.model
+        core_count = len(fitted_model.components_)
+
+        self.model.predict(self.X_test)
+        self.assertIs(self.model.model, fitted_model)
+        self.assertEqual(len(fitted_model.components_), core_count)
+
+        # Training points keep the noise/cluster split found while fitting
+        training_predictions = np.where(fitted_model.labels_ == -1, -1, 1)
+        np.testing.assert_array_equal(self.model.predict(self.X_train), training_predictions)
+
+    def test_predict_independent_of_batch_composition(self):
+        """Test that each point gets the same result alone or in a batch"""
+        self.model.train(self.X_train)
+        batch_predictions = self.model.predict(self.X_test)
+        batch_scores = self.model.anomaly_scores(self.X_test)
+
+        for i in range(len(self.X_test)):
+            row = self.X_test.iloc[[i]]
+            self.assertEqual(self.model.predict(row)[0], batch_predictions[i])
+            self.assertAlmostEqual(self.model.anomaly_scores(row)[0], batch_scores[i])
+
+        # A point far from every cluster is noise
+        outlier = pd.DataFrame({'feature1': [50.0], 'feature2': [-50.0]})
+        self.assertEqual(self.model.predict(outlier)[0], -1)
+
 
 class TestStatisticalAnomalyDetector(unittest.TestCase):
     """Test cases for StatisticalAnomalyDetector"""
@@ -290,6 +321,37 @@ class TestEnsembleAnomalyDetector(unittest.TestCase):
             for pred in unique_predictions:
                 self.assertIn(pred, [-1, 1])
 
+    def test_member_score_matches_predict_and_scores(self):
+        """Test that each member's single-pass score agrees with predict and anomaly_scores"""
+        self.model.train(self.X_train)
+        for model_name, member in self.model.models.items():
+            predictions, scores = member.score(self.X_test)
+            np.testing.assert_array_equal(predictions, member.predict(self.X_test), err_msg=model_name)
+            np.testing.assert_allclose(scores, member.anomaly_scores(self.X_test), err_msg=model_name)
+
+    def test_detect_scores_each_member_once(self):
+        """Test that detect runs every member exactly once and reuses the result"""
+        if not self.model.train(self.X_train):
+            self.skipTest("Ensemble dependencies not available")
+
+        with ExitStack() as stack:
+            score_members = stack.enter_context(
+                mock.patch.object(self.model, 'score_members', wraps=self.model.score_members)
+            )
+            member_mocks = [
+                stack.enter_context(mock.patch.object(member, 'score', wraps=member.score))
+                for member in self.model.models.values()
+            ]
+            detection = self.model.detect(self.X_test)
+
+        self.assertEqual(score_members.call_count, 1)
+        for member_mock in member_mocks:
+            self.assertEqual(member_mock.call_count, 1)
+
+        self.assertEqual(set(detection['members']), set(self.model.models))
+        np.testing.assert_array_equal(detection['predictions'], self.model.predict(self.X_test))
+        self.assertEqual(detection['contributions'], self.model.get_model_contributions(self.X_test))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
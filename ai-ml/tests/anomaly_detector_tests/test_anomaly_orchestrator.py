@@ -83,6 +83,47 @@ class TestAnomalyDetectorOrchestrator(unittest.TestCase):
         self.assertIn('impacts', results)
         self.assertIn('timestamp', results)
     
+    def test_detect_anomalies_reports_orchestrator_detectors(self):
+        """Per-model results come from the orchestrator's own detectors, each scored once"""
+        self.orchestrator.train_models(self.sample_training_data)
+        calls = []
+        score = self.orchestrator.one_class_svm.score
+        
+        def counting_score(data):
+            calls.append(len(data))
+            return score(data)
+        
+        self.orchestrator.one_class_svm.score = counting_score
+        results = self.orchestrator.detect_anomalies(self.sample_test_data)
+        
+        expected_predictions, expected_scores = score(self.sample_test_data)
+        self.assertEqual(calls, [len(self.sample_test_data)])
+        np.testing.assert_array_equal(results['results']['one_class_svm']['predictions'], expected_predictions)
+        np.testing.assert_array_equal(results['results']['one_class_svm']['scores'], expected_scores)
+    
+    def test_detect_anomalies_with_separate_ensemble_members(self):
+        """A detector that is not an ensemble member is still the one reported"""
+        self.orchestrator.train_models(self.sample_training_data)
+        predictions = -np.ones(len(self.sample_test_data))
+        scores = np.full(len(self.sample_test_data), 0.75)
+        
+        class FixedDetector:
+            is_trained = True
+            
+            def score(self, data):
+                return predictions, scores
+        
+        original = self.orchestrator.one_class_svm
+        self.orchestrator.one_class_svm = FixedDetector()
+        try:
+            results = self.orchestrator.detect_anomalies(self.sample_test_data)
+        finally:
+            self.orchestrator.one_class_svm = original
+        
+        np.testing.assert_array_equal(results['results']['one_class_svm']['predictions'], predictions)
+        np.testing.assert_array_equal(results['results']['one_class_svm']['scores'], scores)
+        self.assertEqual(len(results['results']['ensemble']['predictions']), len(self.sample_test_data))
+    
     def test_get_system_status(self):
         """Test system status retrieval"""
         status = self.orchestrator.get_system_status()
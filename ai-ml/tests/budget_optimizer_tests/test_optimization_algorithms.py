@@ -19,6 +19,17 @@ from src.models.budget_optimizer.optimization_algorithms import (
     ParticleSwarmOptimizer,
     MultiObjectiveOptimizer
 )
+from src.models.budget_optimizer.population_engine import PopulationEngine, PopulationEvaluator
+
+
+def quadratic_objective(x):
+    """Maximum at x = 2 in every dimension"""
+    return -np.sum((np.asarray(x) - 2) ** 2)
+
+
+def budget_constraint(x):
+    """Total allocation must stay within 10"""
+    return np.sum(x) <= 10
 
 
 class TestOptimizationAlgorithms(unittest.TestCase):
@@ -90,6 +101,96 @@ class TestOptimizationAlgorithms(unittest.TestCase):
         self.assertIn('success', result)
         self.assertTrue(result['success'])
 
+    
+    def test_genetic_algorithm_vectorized_matches_per_individual(self):
+        """Test that array objectives give the same run as per-individual objectives"""
+        variable_bounds = [(0.0, 5.0)] * 4
+        per_individual = GeneticAlgorithmOptimizer(population_size=40, generations=30, random_state=0)
+        vectorized = GeneticAlgorithmOptimizer(population_size=40, generations=30, random_state=0)
+        
+        expected = per_individual.optimize_budget_allocation(
+            quadratic_objective, variable_bounds, budget_constraint
+        )
+        result = vectorized.optimize_budget_allocation(
+            lambda population: -np.sum((population - 2) ** 2, axis=1),
+            variable_bounds,
+            lambda population: population.sum(axis=1) <= 10,
+            vectorized=True
+        )
+        
+        self.assertTrue(result['success'])
+        np.testing.assert_allclose(result['optimal_allocation'], expected['optimal_allocation'])
+        np.testing.assert_allclose(result['fitness_history'], expected['fitness_history'])
+        self.assertLessEqual(sum(result['optimal_allocation']), 10)
+    
+    def test_genetic_algorithm_parallel_evaluation(self):
+        """Test that multi-process evaluation gives the same run as a single process"""
+        variable_bounds = [(0.0, 5.0)] * 3
+        serial = GeneticAlgorithmOptimizer(population_size=40, generations=10, random_state=1)
+        parallel = GeneticAlgorithmOptimizer(population_size=40, generations=10, n_jobs=2, random_state=1)
+        
+        expected = serial.optimize_budget_allocation(quadratic_objective, variable_bounds, budget_constraint)
+        result = parallel.optimize_budget_allocation(quadratic_objective, variable_bounds, budget_constraint)
+        
+        self.assertTrue(result['success'])
+        np.testing.assert_allclose(result['fitness_history'], expected['fitness_history'])
+    
+    def test_particle_swarm_vectorized_optimization(self):
+        """Test that the swarm converges with a vectorized objective and penalty"""
+        optimizer = ParticleSwarmOptimizer(num_particles=30, max_iterations=60, random_state=0)
+        
+        result = optimizer.optimize_budget_allocation(
+            lambda population: -np.sum((population - 2) ** 2, axis=1),
+            [(0.0, 5.0)] * 3,
+            penalty_function=lambda population: 100 * np.maximum(population.sum(axis=1) - 4.5, 0),
+            vectorized=True
+        )
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(len(result['fitness_history']), 60)
+        self.assertLessEqual(sum(result['optimal_allocation']), 4.6)
+        np.testing.assert_allclose(result['optimal_allocation'], [1.5, 1.5, 1.5], atol=0.1)
+    
+    def test_particle_swarm_infeasible_start(self):
+        """Test that a swarm with no feasible particles still returns an allocation"""
+        optimizer = ParticleSwarmOptimizer(num_particles=10, max_iterations=5, random_state=0)
+        
+        result = optimizer.optimize_budget_allocation(
+            quadratic_objective, [(0.0, 5.0)] * 2, lambda x: False
+        )
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(len(result['optimal_allocation']), 2)
+    
+    def test_population_engine_operators(self):
+        """Test that array operators keep genes and bounds intact"""
+        engine = PopulationEngine([(0.0, 1.0), (10.0, 20.0)], random_state=0)
+        population = engine.initialize(20)
+        self.assertEqual(population.shape, (20, 2))
+        
+        # Crossover only swaps genes between the two parents of each pair
+        offspring = engine.uniform_crossover(population, crossover_rate=1.0)
+        np.testing.assert_allclose(
+            np.sort(offspring.reshape(10, 2, 2), axis=1), np.sort(population.reshape(10, 2, 2), axis=1)
+        )
+        
+        mutated = engine.gaussian_mutation(offspring, mutation_rate=1.0, strength=5.0)
+        self.assertTrue(np.all(mutated >= engine.lower) and np.all(mutated <= engine.upper))
+        
+        # Selection draws existing individuals and favours the fitter ones
+        fitness = np.arange(20, dtype=float)
+        selected = engine.tournament_selection(population, fitness)
+        selected_idx = [int(np.flatnonzero((population == row).all(axis=1))[0]) for row in selected]
+        self.assertEqual(len(selected_idx), 20)
+        self.assertGreater(np.mean(fitness[selected_idx]), np.mean(fitness))
+    
+    def test_population_evaluator_falls_back_for_local_functions(self):
+        """Test that unpicklable functions are evaluated in a single process"""
+        evaluator = PopulationEvaluator(lambda x: float(np.sum(x)), n_jobs=2)
+        
+        self.assertEqual(evaluator.n_jobs, 1)
+        np.testing.assert_allclose(evaluator.evaluate(np.ones((3, 2))), [2.0, 2.0, 2.0])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Tests for parallel base model training and the churn ensemble
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.models.churn_predictor.models import (
+    SKLEARN_AVAILABLE, ChurnEnsembleModel, ChurnGradientBoosting,
+    ChurnLogisticRegression, train_base_models
+)
+
+pytestmark = pytest.mark.skipif(not SKLEARN_AVAILABLE, reason="scikit-learn not available")
+
+
+def _training_data(n=300):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=['tenure', 'tickets', 'spend', 'nps'])
+    y = pd.Series((X['tickets'] - X['nps'] + rng.normal(0, 0.5, n) > 0).astype(int))
+    return X, y
+
+
+def _base_models():
+    return {
+        'logistic_regression': ChurnLogisticRegression(),
+        'random_forest': ChurnGradientBoosting(model_type='random_forest', n_estimators=20, random_state=0),
+    }
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_base_models_train_in_place(n_jobs):
+    """Test that base models are trained, in worker processes or not, on the caller's objects"""
+    X, y = _training_data()
+    models = _base_models()
+    random_forest = models['random_forest']
+    
+    results = train_base_models(models, X, y, n_jobs=n_jobs)
+    
+    assert results == {'logistic_regression': True, 'random_forest': True}
+    assert models['random_forest'] is random_forest and random_forest.is_trained
+    assert random_forest.model.n_jobs == 1
+    assert random_forest.predict_proba(X).shape == (len(X),)
+
+
+def test_default_budget_trains_without_a_process_pool(monkeypatch):
+    """Test that training is serial unless a caller opts in to parallelism"""
+    import src.models.churn_predictor.models as models_module
+    
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started with the default CPU budget")
+    
+    monkeypatch.setattr(models_module, 'ProcessPoolExecutor', no_pool)
+    X, y = _training_data()
+    models = _base_models()
+    
+    assert train_base_models(models, X, y) == {'logistic_regression': True, 'random_forest': True}
+    assert ChurnEnsembleModel().n_jobs == 1
+
+
+def test_ensemble_reuses_fitted_models():
+    """Test that the ensemble adopts fitted base models without refitting them"""
+    X, y = _training_data()
+    models = _base_models()
+    train_base_models(models, X, y, n_jobs=1)
+    fitted_forest = models['random_forest'].model
+    
+    ensemble = ChurnEnsembleModel()
+    assert ensemble.use_fitted_models(dict(models, untrained=ChurnLogisticRegression()))
+    
+    assert set(ensemble.models) == {'logistic_regression', 'random_forest'}
+    assert ensemble.models['random_forest'].model is fitted_forest
+    assert ensemble.feature_names == list(X.columns)
+    predictions, probabilities = ensemble.predict_with_proba(X)
+    expected = (models['logistic_regression'].predict_proba(X) + models['random_forest'].predict_proba(X)) / 2
+    np.testing.assert_allclose(probabilities, expected)
+    assert ((predictions == y).mean()) > 0.8
+
+
+def test_ensemble_without_fitted_models_is_untrained():
+    """Test that an ensemble of untrained models reports it is not trained"""
+    ensemble = ChurnEnsembleModel()
+    assert not ensemble.use_fitted_models({'logistic_regression': ChurnLogisticRegression()})
+    assert not ensemble.is_trained
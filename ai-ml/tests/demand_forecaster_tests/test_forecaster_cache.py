@@ -0,0 +1,109 @@
+"""
+Tests for Forecaster Cache Module
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+import pandas as pd
+import numpy as np
+
+# Add the src directory to the path
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(0, src_path)
+
+from src.models.demand_forecaster.forecaster_cache import (
+    ForecasterCache,
+    CACHE_HIT,
+    CACHE_APPEND,
+    CACHE_DRIFT,
+    CACHE_MISS
+)
+from src.models.demand_forecaster.demand_forecaster import DemandForecaster, TICKET_SERIES_ID
+
+
+class TestForecasterCache(unittest.TestCase):
+    """Tests for ForecasterCache class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.cache = ForecasterCache(drift_threshold=1.0)
+        self.config = {'order': (1, 1, 1)}
+        self.values = np.random.default_rng(0).normal(20, 2, 50)
+    
+    def test_lookup_outcomes(self):
+        """Test classification of unchanged, extended, drifted and rewritten series"""
+        status, entry = self.cache.lookup('arima', 'tickets', self.config, self.values)
+        self.assertEqual(status, CACHE_MISS)
+        self.assertIsNone(entry)
+        
+        self.cache.store('arima', 'tickets', self.config, self.values, {'fitted': True})
+        
+        status, entry = self.cache.lookup('arima', 'tickets', self.config, self.values)
+        self.assertEqual(status, CACHE_HIT)
+        self.assertEqual(entry.state, {'fitted': True})
+        
+        extended = np.append(self.values, [21.0, 19.5])
+        self.assertEqual(self.cache.lookup('arima', 'tickets', self.config, extended)[0], CACHE_APPEND)
+        
+        drifted = np.append(self.values, [60.0, 65.0])
+        self.assertEqual(self.cache.lookup('arima', 'tickets', self.config, drifted)[0], CACHE_DRIFT)
+        
+        rewritten = self.values.copy()
+        rewritten[3] += 1
+        self.assertEqual(self.cache.lookup('arima', 'tickets', self.config, rewritten)[0], CACHE_MISS)
+        
+        # A different forecaster configuration never reuses the fit
+        self.assertEqual(self.cache.lookup('arima', 'tickets', {'order': (2, 1, 1)}, self.values)[0], CACHE_MISS)
+        self.assertEqual(self.cache.stats[CACHE_HIT], 1)
+    
+    def test_advance_moves_fingerprint(self):
+        """Test that absorbed observations turn into cache hits"""
+        entry = self.cache.store('arima', 'tickets', self.config, self.values, 'v1')
+        extended = np.append(self.values, [20.5])
+        self.cache.advance(entry, extended, 'v2')
+        
+        status, entry = self.cache.lookup('arima', 'tickets', self.config, extended)
+        self.assertEqual(status, CACHE_HIT)
+        self.assertEqual(entry.state, 'v2')
+        self.assertEqual(entry.n_obs, 51)
+    
+    def test_persisted_entries_survive_restart(self):
+        """Test that a new cache instance picks up persisted fits"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            ForecasterCache(cache_dir).store('arima', 'line/1', self.config, self.values, {'params': [0.5]})
+            
+            restarted = ForecasterCache(cache_dir)
+            status, entry = restarted.lookup('arima', 'line/1', self.config, self.values)
+            self.assertEqual(status, CACHE_HIT)
+            self.assertEqual(entry.state, {'params': [0.5]})
+            
+            restarted.invalidate('arima')
+            self.assertEqual(ForecasterCache(cache_dir).lookup('arima', 'line/1', self.config, self.values)[0],
+                             CACHE_MISS)
+    
+    def test_demand_forecaster_reuses_arima_fit(self):
+        """Test that repeated ARIMA fits hit the cache and new observations are appended"""
+        forecaster = DemandForecaster()
+        if not forecaster.arima_forecaster.available:
+            self.skipTest("Statsmodels not available")
+        
+        series = pd.Series(self.values)
+        first = forecaster._fit_arima_cached(series, TICKET_SERIES_ID)
+        self.assertEqual(first['cache_status'], CACHE_MISS)
+        self.assertTrue(first['success'])
+        
+        second = forecaster._fit_arima_cached(series, TICKET_SERIES_ID)
+        self.assertEqual(second['cache_status'], CACHE_HIT)
+        self.assertIs(second['model'], first['model'])
+        
+        extended = pd.Series(np.append(self.values, [20.2, 19.8, 20.7]))
+        third = forecaster._fit_arima_cached(extended, TICKET_SERIES_ID)
+        self.assertEqual(third['cache_status'], CACHE_APPEND)
+        self.assertEqual(forecaster.arima_forecaster.model.nobs, 53)
+        np.testing.assert_allclose(forecaster.arima_forecaster.model.params, first['model'].params)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -79,6 +79,44 @@ class TestForecastingModels(unittest.TestCase):
         result = forecaster.train(data)
         self.assertTrue(isinstance(result, dict))
         self.assertIn('success', result)
+    
+    def test_lstm_prepare_data_windows(self):
+        """Test that strided windows match explicit look-back slices"""
+        forecaster = LSTMForecaster(sequence_length=3)
+        if not forecaster.available:
+            self.skipTest("TensorFlow or scikit-learn not available")
+        
+        data = pd.Series(np.arange(10, dtype=float))
+        X, y = forecaster.prepare_data(data)
+        scaled = forecaster.scaler.transform(data.values.reshape(-1, 1))[:, 0]
+        
+        self.assertEqual(X.shape, (7, 3))
+        np.testing.assert_allclose(X[2], scaled[2:5])
+        np.testing.assert_allclose(y, scaled[3:])
+        
+        # Too few observations to fill a window yields no training pairs
+        X, y = forecaster.prepare_data(pd.Series([1.0, 2.0, 3.0]))
+        self.assertEqual(len(X), 0)
+    
+    def test_lstm_batch_prediction(self):
+        """Test that batched forecasting matches single-series forecasting"""
+        forecaster = LSTMForecaster(sequence_length=5, epochs=1)
+        self.assertFalse(forecaster.predict_batch({'a': pd.Series(range(10))})['success'])
+        if not forecaster.available:
+            self.skipTest("TensorFlow or scikit-learn not available")
+        
+        rng = np.random.default_rng(0)
+        series = {f'line_{i}': pd.Series(rng.random(30) * 10) for i in range(4)}
+        series['short'] = pd.Series([1.0, 2.0])
+        self.assertTrue(forecaster.train(series['line_0'])['success'])
+        
+        result = forecaster.predict_batch(series, steps=7)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['skipped_series'], ['short'])
+        self.assertEqual(len(result['predictions']['line_2']), 7)
+        
+        single = forecaster.predict(series['line_2'], steps=7)
+        np.testing.assert_allclose(single['predictions'], result['predictions']['line_2'], rtol=1e-4)
 
 
 if __name__ == '__main__':
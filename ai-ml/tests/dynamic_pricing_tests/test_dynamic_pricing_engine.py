@@ -45,6 +45,34 @@ class TestDynamicPricingEngine(unittest.TestCase):
             self.assertIsNotNone(engine.client_acceptance_predictor)
         except ImportError:
             self.skipTest("Dynamic Pricing Engine not available")
+    
+    def test_complete_analysis_includes_rl_price_per_client(self):
+        """Test that the pipeline returns one learned RL price per client from a batched lookup"""
+        import pandas as pd
+        from dynamic_pricing.dynamic_pricing_engine import DynamicPricingEngine, DEFAULT_PRICE_POINTS
+        engine = DynamicPricingEngine()
+        
+        async def prepare_data(start_date=None, end_date=None):
+            return {
+                'market_rates': pd.DataFrame({'market_rate': [100.0, 102.0, 105.0]}),
+                'client_values': pd.DataFrame({
+                    'client_id': ['C1', 'C2', 'C3'],
+                    'revenue_contribution': [5000.0, 20000.0, 80000.0],
+                    'service_usage_frequency': [2.0, 5.0, 9.0]
+                }),
+                'service_complexity': pd.DataFrame(),
+                'competitive_pricing': pd.DataFrame({'avg_price': [95.0, 110.0]}),
+                'pricing_history': pd.DataFrame()
+            }
+        
+        engine.prepare_data = prepare_data
+        result = asyncio.run(engine.run_complete_pricing_analysis())
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(set(result['rl_price_recommendations']), {'C1', 'C2', 'C3'})
+        self.assertTrue(set(result['rl_price_recommendations'].values()) <= set(DEFAULT_PRICE_POINTS))
+        
+        single = asyncio.run(engine.run_complete_pricing_analysis(client_id='C2'))
+        self.assertEqual(list(single['rl_price_recommendations']), ['C2'])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -44,6 +44,71 @@ class TestReinforcementLearning(unittest.TestCase):
         self.assertIsInstance(arm, int)
         self.assertGreaterEqual(arm, 0)
         self.assertLess(arm, self.bandit_agent.n_arms)
+    
+    def test_batched_actions_use_learned_q_values(self):
+        """Test batched action selection against the Q-matrix"""
+        import pandas as pd
+        self.q_agent.define_state_space(['client_value', 'segment'])
+        self.q_agent.define_action_space([80.0, 100.0, 120.0])
+        
+        features = pd.DataFrame({
+            'client_value': [1000.0, 1004.0, 5000.0, np.nan],
+            'segment': ['smb', 'smb', 'enterprise', 'smb']
+        })
+        states = self.q_agent.encode_states(features)
+        
+        # Rows that discretize identically share a state index
+        self.assertEqual(states[0], states[1])
+        self.assertEqual(len(set(states.tolist())), 3)
+        self.assertEqual(self.q_agent.state_keys[states[0]],
+                         self.q_agent.get_state({'client_value': 1004.0, 'segment': 'smb'}))
+        self.assertTrue(self.q_agent.state_keys[states[3]].startswith('client_value:unknown'))
+        
+        self.q_agent.update_q_values(states[:3], np.array([120.0, 120.0, 80.0]),
+                                     np.array([10.0, 10.0, 5.0]), done=True)
+        actions = self.q_agent.get_actions(states[:3], training=False)
+        np.testing.assert_array_equal(actions, [120.0, 120.0, 80.0])
+        self.assertEqual(self.q_agent.num_states, 2)
+    
+    def test_batched_update_matches_sequential_updates(self):
+        """Test that repeated transitions in one batch fold like sequential updates"""
+        from dynamic_pricing.reinforcement_learning import QLearningPricingAgent
+        sequential = QLearningPricingAgent(learning_rate=0.3)
+        sequential.define_action_space([100.0, 120.0])
+        for reward in [10.0, 20.0, 30.0]:
+            sequential.update_q_value('s', 100.0, reward, 's', done=True)
+        
+        batched = QLearningPricingAgent(learning_rate=0.3)
+        batched.define_action_space([100.0, 120.0])
+        state = np.array([batched._register_state('s')] * 3)
+        batched.update_q_values(state, np.array([100.0] * 3), np.array([10.0, 20.0, 30.0]), done=True)
+        
+        self.assertAlmostEqual(batched.get_state_action_values('s')[100.0],
+                               sequential.get_state_action_values('s')[100.0])
+        self.assertEqual(batched.get_state_action_values('s').keys(), {100.0})
+    
+    def test_q_table_binary_round_trip(self):
+        """Test saving and loading the Q-matrix in binary form"""
+        import tempfile
+        from dynamic_pricing.reinforcement_learning import QLearningPricingAgent
+        self.q_agent.define_action_space([100.0, 120.0])
+        self.q_agent.update_q_value('a', 120.0, 5.0, 'a', done=True)
+        self.q_agent.update_q_value('b', 100.0, 2.0, 'b', done=True)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'q_table.npz')
+            self.q_agent.save_q_table(path)
+            loaded = QLearningPricingAgent()
+            loaded.load_q_table(path)
+        
+        self.assertEqual(loaded.q_table, self.q_agent.q_table)
+        self.assertEqual(loaded.get_policy(), {'a': 120.0, 'b': 100.0})
+    
+    def test_legacy_q_table_dict_loading(self):
+        """Test loading a JSON-style nested Q-table"""
+        self.q_agent.load_q_table_dict({'a': {'100.0': 1.5, '120.0': 2.5}})
+        self.assertEqual(self.q_agent.get_state_action_values('a'), {100.0: 1.5, 120.0: 2.5})
+        self.assertEqual(self.q_agent.get_action('a', training=False), 120.0)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
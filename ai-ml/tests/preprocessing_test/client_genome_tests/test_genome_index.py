@@ -0,0 +1,133 @@
+"""
+Test suite for Genome Index module
+"""
+
+import pytest
+import numpy as np
+
+from src.data.preprocessing.client_genome.genome_index import (
+    GenomeMatrix, GenomeIndex, IVFGenomeIndex, create_genome_index, genome_similarities
+)
+from src.data.preprocessing.client_genome.similarity_calculator import SimilarityCalculator
+
+
+def make_genomes(n_clients, seed=0):
+    """Random genomes in [0, 1]"""
+    rng = np.random.default_rng(seed)
+    return {f'client_{i}': rng.random(50) for i in range(n_clients)}
+
+
+def per_pair_ranking(target, client_genomes, top_k, metric):
+    """Reference ranking from one SimilarityCalculator call per client"""
+    calculator = SimilarityCalculator()
+    score = {
+        'cosine': calculator.calculate_cosine_similarity,
+        'euclidean': calculator.calculate_euclidean_similarity,
+        'manhattan': calculator.calculate_manhattan_similarity
+    }[metric]
+    similarities = [(client_id, score(target, genome)) for client_id, genome in client_genomes.items()]
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:top_k]
+
+
+def test_genome_matrix_upsert_and_remove():
+    """Test contiguous storage, in-place updates and swap removal"""
+    matrix = GenomeMatrix(initial_capacity=2)
+    genomes = make_genomes(5)
+    matrix.upsert(genomes)
+
+    assert len(matrix) == 5
+    assert matrix.vectors.dtype == np.float32
+    assert matrix.capacity >= 5
+    np.testing.assert_allclose(matrix.vectors[matrix.row('client_3')], genomes['client_3'], rtol=1e-6)
+
+    # Updating an existing client rewrites its row
+    matrix.upsert({'client_3': np.zeros(50)})
+    assert len(matrix) == 5
+    assert matrix.norms[matrix.row('client_3')] == 0
+
+    # Removing moves the last row into the vacated slot
+    matrix.remove('client_1')
+    assert 'client_1' not in matrix
+    assert matrix.row('client_4') == 1
+    np.testing.assert_allclose(matrix.vectors[1], genomes['client_4'], rtol=1e-6)
+
+    with pytest.raises(ValueError):
+        matrix.upsert({'bad': np.zeros(10)})
+
+
+@pytest.mark.parametrize('metric', ['cosine', 'euclidean', 'manhattan'])
+def test_exact_index_matches_per_pair_search(metric):
+    """Test that exact index results match pairwise similarity calculation"""
+    genomes = make_genomes(500)
+    index = create_genome_index('exact')
+    index.add(genomes)
+
+    for target_id in ['client_0', 'client_250']:
+        expected = per_pair_ranking(genomes[target_id], genomes, 10, metric)
+        results = index.search(genomes[target_id], top_k=10, metric=metric)
+        assert [client_id for client_id, _ in results] == [client_id for client_id, _ in expected]
+        np.testing.assert_allclose(
+            [score for _, score in results], [score for _, score in expected], atol=1e-6
+        )
+
+
+def test_genome_similarities_matches_calculator():
+    """Test vectorized similarities against the per-pair calculator"""
+    genomes = make_genomes(20)
+    vectors = np.array(list(genomes.values()))
+    calculator = SimilarityCalculator()
+
+    similarities = genome_similarities(vectors, vectors[0], 'cosine')
+    expected = [calculator.calculate_cosine_similarity(vectors[0], genome) for genome in vectors]
+    np.testing.assert_allclose(similarities, expected, atol=1e-9)
+
+
+def test_index_incremental_updates():
+    """Test that added, updated and removed genomes are reflected in search"""
+    genomes = make_genomes(50)
+    index = GenomeIndex()
+    index.add(genomes)
+
+    target = genomes['client_10']
+    index.add({'client_new': target.copy()})
+    top_ids = [client_id for client_id, _ in index.search(target, top_k=2)]
+    assert set(top_ids) == {'client_10', 'client_new'}
+
+    index.remove(['client_10', 'unknown'])
+    assert len(index) == 50
+    assert index.search(target, top_k=1)[0][0] == 'client_new'
+
+
+def test_ivf_index_recall():
+    """Test that the approximate index trains and finds the exact neighbours on clustered data"""
+    rng = np.random.default_rng(1)
+    centers = rng.random((10, 50))
+    genomes = {
+        f'client_{i}': np.clip(centers[i % 10] + rng.normal(0, 0.02, 50), 0, 1)
+        for i in range(2000)
+    }
+    exact = create_genome_index('exact')
+    exact.add(genomes)
+    approximate = IVFGenomeIndex(n_lists=10, n_probe=2, min_train_size=500)
+    approximate.add(genomes)
+
+    target = genomes['client_7']
+    expected = {client_id for client_id, _ in exact.search(target, top_k=10)}
+    results = {client_id for client_id, _ in approximate.search(target, top_k=10)}
+    assert approximate.centroids is not None
+    assert len(results & expected) >= 9
+
+    # Genomes added after training are assigned to a partition
+    approximate.add({'client_late': target.copy()})
+    assert 'client_late' in {client_id for client_id, _ in approximate.search(target, top_k=3)}
+
+
+def test_unknown_index_type():
+    """Test that unknown index types are rejected"""
+    with pytest.raises(ValueError):
+        create_genome_index('unknown')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -229,6 +229,36 @@ def test_find_similar_clients():
     assert 'target_client' in client_ids or 'similar_client' in client_ids
 
 
+def test_genome_index_tracks_database():
+    """Test that the similarity index follows database replacement, direct edits and removals"""
+    orchestrator = GenomeOrchestrator()
+    rng = np.random.default_rng(0)
+    orchestrator.genome_database = {f'client_{i}': rng.random(50) for i in range(20)}
+    assert len(orchestrator.genome_index) == 20
+    
+    # Direct dictionary edits are picked up on the next search
+    orchestrator.genome_database['copy_of_3'] = orchestrator.genome_database['client_3'].copy()
+    similar_clients = orchestrator.find_similar_clients('client_3', top_k=2)
+    assert {client_id for client_id, _ in similar_clients} == {'client_3', 'copy_of_3'}
+    
+    orchestrator.remove_clients(['copy_of_3'])
+    assert 'copy_of_3' not in orchestrator.genome_database
+    assert 'copy_of_3' not in orchestrator.genome_index
+
+
+def test_genome_index_tracks_updated_client():
+    """Test that overwriting an existing client's genome is reflected in similarity search"""
+    orchestrator = GenomeOrchestrator()
+    rng = np.random.default_rng(1)
+    orchestrator.genome_database = {f'client_{i}': rng.random(50) for i in range(20)}
+    
+    # Same number of clients, so only write tracking can reveal the change
+    orchestrator.genome_database['client_5'] = orchestrator.genome_database['client_7'].copy()
+    similar = orchestrator.find_similar_clients('client_7', top_k=1)
+    assert similar[0][0] == 'client_5'
+    assert similar[0][1] == pytest.approx(1.0)
+
+
 def test_generate_client_profile():
     """Test generating client profile"""
     orchestrator = GenomeOrchestrator()
@@ -197,5 +197,148 @@ def test_residual_confidence_intervals():
     assert 'prediction_stats' in ci_results
 
 
+
+@pytest.mark.skipif(not SHAP_AVAILABLE, reason="SHAP explainer module not available")
+def test_bootstrap_intervals_from_forest_tree_spread():
+    """Test per-tree quantile intervals from a random forest"""
+    ensemble = pytest.importorskip("sklearn.ensemble")
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.uniform(0, 1, (300, 3)), columns=['feature1', 'feature2', 'feature3'])
+    y = X['feature1'] + rng.normal(0, 0.1, len(X))
+    forest = ensemble.RandomForestRegressor(n_estimators=30, random_state=0).fit(X, y)
+    
+    calculator = ConfidenceIntervalCalculator(random_state=0)
+    ci_results = calculator.calculate_confidence_interval(forest, X.iloc[:50], method='bootstrap')
+    
+    assert ci_results['method'] == 'bootstrap'
+    assert ci_results['interval_source'] == 'tree_quantiles'
+    lower = np.array(ci_results['lower_bounds'])
+    upper = np.array(ci_results['upper_bounds'])
+    point = forest.predict(X.iloc[:50])
+    assert len(lower) == 50
+    assert np.all(lower <= point) and np.all(point <= upper)
+    assert np.all(upper - lower > 0)
+
+
+@pytest.mark.skipif(not SHAP_AVAILABLE, reason="SHAP explainer module not available")
+def test_bootstrap_intervals_from_residuals():
+    """Test the residual bootstrap for models without per-tree predictions"""
+    class MockModel:
+        def predict(self, X):
+            return np.full(len(X), 0.5)
+    
+    calculator = ConfidenceIntervalCalculator(random_state=0)
+    calculator.set_residuals(np.random.default_rng(1).normal(0, 0.1, 500))
+    X = pd.DataFrame({'feature1': np.zeros(1000)})
+    
+    ci_results = calculator.calculate_confidence_interval(MockModel(), X, method='bootstrap')
+    
+    assert ci_results['interval_source'] == 'residual_bootstrap'
+    widths = np.array(ci_results['upper_bounds']) - np.array(ci_results['lower_bounds'])
+    # 95% interval of N(0, 0.1) residuals is about +/- 0.196
+    assert np.allclose(widths, widths[0]) and 0.3 < widths[0] < 0.5
+    overall = ci_results['overall_interval']
+    assert overall['lower_bound'] < 0.5 < overall['upper_bound']
+
+
+@pytest.mark.skipif(not SHAP_AVAILABLE, reason="SHAP explainer module not available")
+def test_residual_bootstrap_cost_bounded_by_max_residuals():
+    """Test that the resampling matrix does not grow with the rows scored against y_true"""
+    class MockModel:
+        def predict(self, X):
+            return np.full(len(X), 0.5)
+    
+    class SpyRng:
+        def __init__(self, rng):
+            self.rng = rng
+            self.shapes = []
+        
+        def integers(self, low, high, size):
+            self.shapes.append(size)
+            return self.rng.integers(low, high, size)
+        
+        def choice(self, *args, **kwargs):
+            return self.rng.choice(*args, **kwargs)
+    
+    calculator = ConfidenceIntervalCalculator(random_state=0)
+    calculator.rng = SpyRng(calculator.rng)
+    X = pd.DataFrame({'feature1': np.zeros(20000)})
+    y_true = 0.5 + np.random.default_rng(1).normal(0, 0.1, len(X))
+    
+    ci_results = calculator.calculate_confidence_interval(MockModel(), X, y_true=y_true, method='bootstrap')
+    
+    assert ci_results['interval_source'] == 'residual_bootstrap'
+    assert calculator.rng.shapes == [(calculator.bootstrap_samples, calculator.max_residuals)]
+    assert len(ci_results['lower_bounds']) == len(X)
+
+
+
+class _StubTreeExplainer:
+    """Stands in for a fitted shap explainer: SHAP value of a feature is its value"""
+    expected_value = np.array([0.25])
+    
+    def __init__(self):
+        self.calls = []
+    
+    def shap_values(self, X):
+        self.calls.append(len(X))
+        return np.asarray(X, dtype=float)
+
+
+def _explainer_with_stub(monkeypatch, cache_size=4096):
+    import src.models.profitability_predictor.shap_explainer as shap_module
+    monkeypatch.setattr(shap_module, "SHAP_AVAILABLE", True)
+    explainer = SHAPExplainer(cache_size=cache_size)
+    explainer.explainer = _StubTreeExplainer()
+    explainer.model_version = "v1"
+    explainer.baseline_values = explainer._base_value()
+    return explainer
+
+
+@pytest.mark.skipif(not SHAP_AVAILABLE, reason="SHAP explainer module not available")
+def test_batched_explanations_use_one_shap_call(monkeypatch):
+    """Test that many rows are explained with a single SHAP call"""
+    explainer = _explainer_with_stub(monkeypatch)
+    X = pd.DataFrame({'feature1': [0.1, 0.2, 0.3], 'feature2': [0.4, 0.5, 0.6]})
+    
+    explanations = explainer.explain_predictions(X)
+    
+    assert explainer.explainer.calls == [3]
+    assert len(explanations) == 3
+    assert explanations[1]['shap_values'] == {'feature1': 0.2, 'feature2': 0.5}
+    assert explanations[1]['base_value'] == 0.25
+    assert explanations[1]['model_version'] == "v1"
+
+
+@pytest.mark.skipif(not SHAP_AVAILABLE, reason="SHAP explainer module not available")
+def test_explanations_are_cached_per_row(monkeypatch):
+    """Test that repeated rows are served from the explanation cache"""
+    explainer = _explainer_with_stub(monkeypatch)
+    X = pd.DataFrame({'feature1': [0.1, 0.2], 'feature2': [0.4, 0.5]})
+    explainer.explain_predictions(X)
+    
+    X_next = pd.DataFrame({'feature1': [0.2, 0.9], 'feature2': [0.5, 0.9]})
+    explanations = explainer.explain_predictions(X_next)
+    
+    # Only the unseen row is sent to SHAP
+    assert explainer.explainer.calls == [2, 1]
+    assert explanations[0]['cached'] is True
+    assert explanations[1]['cached'] is False
+    stats = explainer.get_cache_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 3 and stats['size'] == 3
+
+
+@pytest.mark.skipif(not SHAP_AVAILABLE, reason="SHAP explainer module not available")
+def test_explanation_cache_is_bounded_and_keyed_by_version(monkeypatch):
+    """Test LRU eviction and that a new model version does not reuse old explanations"""
+    explainer = _explainer_with_stub(monkeypatch, cache_size=2)
+    explainer.explain_predictions(pd.DataFrame({'feature1': [0.1, 0.2, 0.3]}))
+    assert explainer.get_cache_stats()['size'] == 2
+    
+    explainer.model_version = "v2"
+    explainer.explain_predictions(pd.DataFrame({'feature1': [0.3]}))
+    assert explainer.explainer.calls == [3, 1]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
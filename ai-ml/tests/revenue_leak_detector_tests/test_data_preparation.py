@@ -84,6 +84,91 @@ class TestDataPreparation:
         assert 'client_id' in features.columns
         assert 'total_invoiced' in features.columns
         assert 'revenue_leak_score' in features.columns
+    
+    def test_feature_aggregation_values(self):
+        """Test that grouped features match hand-computed per-client totals"""
+        preparator = RevenueLeakDataPreparator()
+        invoice_data = pd.DataFrame({
+            'client_id': ['A', 'A', 'B'],
+            'amount': [100.0, 200.0, 50.0],
+            'paid_amount': [100.0, 50.0, 0.0],
+            'status': ['paid', 'unpaid', 'overdue']
+        })
+        time_log_data = pd.DataFrame({
+            'client_id': ['A', 'C', 'C'],
+            'hours_logged': [2.0, 9.0, 1.0],
+            'billable': [True, False, True]
+        })
+        service_data = pd.DataFrame({
+            'client_id': ['A', 'B'],
+            'hours_billed': [1.0, 4.0],
+            'hours_actual': [3.0, 4.0],
+            'sla_met': [True, False]
+        })
+        
+        features = preparator.prepare_features(invoice_data, time_log_data, service_data)
+        features = features.set_index('client_id')
+        
+        assert sorted(features.index) == ['A', 'B', 'C']
+        assert features.loc['A', 'total_invoiced'] == 300.0
+        assert features.loc['A', 'unpaid_amount'] == 150.0
+        assert features.loc['A', 'unpaid_invoice_count'] == 1
+        assert features.loc['B', 'overdue_invoice_count'] == 1
+        assert features.loc['A', 'payment_ratio'] == 0.5
+        assert features.loc['A', 'billing_efficiency'] == 0.5
+        assert features.loc['A', 'revenue_leak_score'] == 150.0 + 2.0 * 100
+        assert features.loc['B', 'sla_violation_count'] == 1
+        assert features.loc['B', 'total_hours_logged'] == 0.0
+        # Client C only appears in time logs
+        assert features.loc['C', 'unbilled_hours'] == 9.0
+        assert features.loc['C', 'excessive_hours_count'] == 1
+        assert features.loc['C', 'total_invoiced'] == 0.0
+        assert features.loc['C', 'payment_ratio'] == 0.0
+    
+    def test_feature_preparation_with_missing_sources(self):
+        """Test that absent sources and columns contribute zeros"""
+        preparator = RevenueLeakDataPreparator()
+        invoice_data = pd.DataFrame({'client_id': ['A', 'B'], 'amount': [10.0, 20.0]})
+        
+        features = preparator.prepare_features(invoice_data, pd.DataFrame(), pd.DataFrame())
+        assert list(features['client_id']) == ['A', 'B']
+        assert list(features['total_paid']) == [0.0, 0.0]
+        assert list(features['unpaid_amount']) == [10.0, 20.0]
+        assert preparator.prepare_features(pd.DataFrame(), pd.DataFrame(), pd.DataFrame()).empty
+    
+    def test_historical_anomalies(self):
+        """Test anomaly records built from filtered frames"""
+        preparator = RevenueLeakDataPreparator()
+        invoice_data = pd.DataFrame({
+            'invoice_id': ['INV-1', 'INV-2', 'INV-3'],
+            'client_id': ['A', 'B', 'C'],
+            'amount': [100.0, 200.0, 300.0],
+            'paid_amount': [100.0, 50.0, 0.0],
+            'status': ['paid', 'unpaid', 'overdue']
+        })
+        time_log_data = pd.DataFrame({
+            'time_log_id': ['TL-1', 'TL-2'],
+            'client_id': ['A', 'B'],
+            'hours_logged': [10.0, 1.0],
+            'billable': [True, False]
+        })
+        service_data = pd.DataFrame({
+            'service_id': ['SVC-1'],
+            'client_id': ['C'],
+            'hours_billed': [1.0],
+            'hours_actual': [3.0],
+            'rate': [50.0]
+        })
+        
+        anomalies = preparator.identify_historical_anomalies(invoice_data, time_log_data, service_data)
+        assert list(anomalies['anomaly_type']) == [
+            'unpaid_invoice', 'overdue_invoice', 'unbilled_time', 'excessive_hours', 'underbilled_service'
+        ]
+        assert list(anomalies['description']) == [
+            'Unpaid invoice INV-2', 'Overdue invoice INV-3', 'Unbilled time log TL-2',
+            'Excessive hours in time log TL-1', 'Underbilled service SVC-1'
+        ]
+        assert list(anomalies['potential_loss']) == [150.0, 300.0, 100.0, 0, 100.0]
 
 
 if __name__ == "__main__":
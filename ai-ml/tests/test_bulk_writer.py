@@ -0,0 +1,141 @@
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.utils.bulk_writer import BufferedBulkWriter
+from src.utils.database import DatabaseManager, close_connection_pools
+
+
+def _predictions(count, model_name="client_churn"):
+    return [{"model_name": model_name, "prediction": i / count, "client_id": f"c{i}"} for i in range(count)]
+
+
+class TestBufferedBulkWriter:
+    def teardown_method(self):
+        close_connection_pools()
+
+    def test_cleanup_flushes_buffered_rows(self, tmp_path):
+        db_path = str(tmp_path / "writer.db")
+        # Large batch size and interval: nothing is flushed until shutdown
+        writer = BufferedBulkWriter(db_path, batch_size=100000, flush_interval_ms=60000)
+
+        async def run():
+            await writer.initialize()
+            await writer.log_predictions(_predictions(500))
+            await writer.log_performance([{"model_name": "client_churn", "accuracy": 0.9}])
+            assert writer.get_stats()["pending_rows"] == 501
+            await writer.cleanup()
+
+        asyncio.run(run())
+        manager = DatabaseManager(db_path)
+        assert len(manager.get_historical_predictions("client_churn", limit=10000)) == 500
+        assert len(manager.get_model_performance_reports("client_churn")) == 1
+        assert writer.get_stats()["pending_rows"] == 0
+
+    def test_flushes_when_batch_size_reached(self, tmp_path):
+        writer = BufferedBulkWriter(str(tmp_path / "writer.db"), batch_size=100, flush_interval_ms=60000)
+
+        async def run():
+            await writer.initialize()
+            await writer.log_predictions(_predictions(250))
+            for _ in range(50):
+                if writer.get_stats()["rows_written"] >= 250:
+                    break
+                await asyncio.sleep(0.01)
+            stats = writer.get_stats()
+            await writer.cleanup()
+            return stats
+
+        stats = asyncio.run(run())
+        assert stats["rows_written"] == 250
+        assert stats["flush_count"] >= 1
+
+    def test_back_pressure_bounds_pending_rows(self, tmp_path):
+        db_path = str(tmp_path / "writer.db")
+        writer = BufferedBulkWriter(db_path, batch_size=50, flush_interval_ms=60000, max_pending=100)
+        peak = 0
+
+        async def run():
+            nonlocal peak
+            await writer.initialize()
+            for _ in range(40):
+                await writer.log_predictions(_predictions(25))
+                peak = max(peak, writer.get_stats()["pending_rows"])
+            await writer.cleanup()
+
+        asyncio.run(run())
+        assert peak <= 100
+        assert len(DatabaseManager(db_path).get_historical_predictions("client_churn", limit=10000)) == 1000
+
+    def test_bulk_insert_methods(self, tmp_path):
+        manager = DatabaseManager(str(tmp_path / "bulk.db"))
+        manager.initialize_tables()
+        assert manager.save_historical_predictions(_predictions(10)) == 10
+        assert manager.save_model_performance_records([{"model_name": "m", "rmse": 1.0}] * 3) == 3
+        assert manager.save_historical_predictions([]) == 0
+
+    def test_failed_flush_is_requeued_and_retried(self, tmp_path):
+        db_path = str(tmp_path / "writer.db")
+        writer = BufferedBulkWriter(db_path, batch_size=100000, flush_interval_ms=60000, max_retries=2)
+        insert_rows = writer.db.insert_rows
+        failures = iter([True])
+
+        def flaky_insert(statement, rows):
+            if next(failures, False):
+                raise RuntimeError("database is locked")
+            return insert_rows(statement, rows)
+
+        writer.db.insert_rows = flaky_insert
+
+        async def run():
+            await writer.initialize()
+            await writer.log_predictions(_predictions(10))
+            assert await writer.flush() == 0
+            assert writer.get_stats()["pending_rows"] == 10
+            assert await writer.flush() == 10
+            await writer.cleanup()
+
+        asyncio.run(run())
+        stats = writer.get_stats()
+        assert stats["rows_written"] == 10
+        assert stats["rows_dropped"] == 0
+        assert len(DatabaseManager(db_path).get_historical_predictions("client_churn", limit=100)) == 10
+
+    def test_rows_dropped_after_max_retries(self, tmp_path):
+        writer = BufferedBulkWriter(str(tmp_path / "writer.db"), batch_size=100000,
+                                    flush_interval_ms=60000, max_retries=2)
+        attempts = []
+
+        def failing_insert(statement, rows):
+            attempts.append(len(rows))
+            raise RuntimeError("disk I/O error")
+
+        writer.db.insert_rows = failing_insert
+
+        async def run():
+            await writer.initialize()
+            await writer.log_predictions(_predictions(10))
+            await writer.cleanup()
+
+        asyncio.run(run())
+        stats = writer.get_stats()
+        assert attempts == [10, 10, 10]
+        assert stats["rows_dropped"] == 10
+        assert stats["pending_rows"] == 0
+
+    def test_writes_rejected_after_cleanup(self, tmp_path):
+        writer = BufferedBulkWriter(str(tmp_path / "writer.db"), batch_size=100000, flush_interval_ms=60000)
+
+        async def run():
+            await writer.initialize()
+            await writer.cleanup()
+            with pytest.raises(RuntimeError):
+                await writer.log_predictions(_predictions(5))
+            assert not writer.is_running
+            assert writer.get_stats()["pending_rows"] == 0
+
+        asyncio.run(run())
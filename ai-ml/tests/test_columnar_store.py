@@ -0,0 +1,117 @@
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.ingestion.columnar_store import ColumnarDataStore, PYARROW_AVAILABLE, PARTITION_COLUMN
+
+pytestmark = pytest.mark.skipif(not PYARROW_AVAILABLE, reason="PyArrow not available")
+
+
+def _ticket(i, client_id, created_at, tags=None):
+    return {"id": f"T-{i}", "client_id": client_id, "created_at": created_at,
+            "status": "open", "tags": tags or []}
+
+
+class TestColumnarDataStore:
+    def test_upserts_by_key(self, tmp_path):
+        store = ColumnarDataStore(str(tmp_path))
+        store.write("superops_tickets", [_ticket(1, "C-1", "2026-01-05"), _ticket(2, "C-1", "2026-02-05")])
+        store.write("superops_tickets", [{**_ticket(1, "C-1", "2026-01-05"), "status": "closed"}])
+
+        df = store.read("superops_tickets").set_index("id")
+        assert len(df) == 2
+        assert df.loc["T-1", "status"] == "closed"
+        assert PARTITION_COLUMN not in df.columns
+
+    def test_filters_by_client_and_date(self, tmp_path):
+        store = ColumnarDataStore(str(tmp_path))
+        store.write("superops_tickets", [
+            _ticket(1, "C-1", "2026-01-05"),
+            _ticket(2, "C-1", "2026-03-20"),
+            _ticket(3, "C-2", "2026-01-10"),
+        ])
+        assert sorted(os.listdir(tmp_path / "superops_tickets")) == [
+            "_table.json", f"{PARTITION_COLUMN}=2026-01", f"{PARTITION_COLUMN}=2026-03"]
+
+        df = store.read("superops_tickets", client_id="C-1",
+                        start_date=datetime(2026, 1, 1), end_date=datetime(2026, 2, 28))
+        assert df["id"].tolist() == ["T-1"]
+
+    def test_round_trips_nested_values(self, tmp_path):
+        store = ColumnarDataStore(str(tmp_path))
+        store.write("superops_tickets", [_ticket(1, "C-1", "2026-01-05", tags=["vip", "network"])])
+        assert store.read("superops_tickets")["tags"].iloc[0] == ["vip", "network"]
+
+    def test_ingest_skips_unknown_and_empty_tables(self, tmp_path):
+        store = ColumnarDataStore(str(tmp_path))
+        written = store.ingest({"superops_tickets": [_ticket(1, "C-1", "2026-01-05")],
+                                "quickbooks_invoices": [], "metrics": {"total": 1}})
+        assert written == {"superops_tickets": 1}
+        assert not store.has_table("quickbooks_invoices")
+
+    def test_read_csv_cached_rebuilds_on_change(self, tmp_path):
+        csv_path = tmp_path / "usage.csv"
+        pd.DataFrame({"client_id": [1, 2], "usage_date": ["2026-01-01", "2026-01-02"]}).to_csv(csv_path, index=False)
+        store = ColumnarDataStore(str(tmp_path / "cache"))
+
+        first = store.read_csv_cached(str(csv_path), parse_dates=["usage_date"])
+        assert (tmp_path / "cache" / "csv" / "usage.parquet").exists()
+        assert pd.api.types.is_datetime64_any_dtype(first["usage_date"])
+        pd.testing.assert_frame_equal(store.read_csv_cached(str(csv_path), parse_dates=["usage_date"]), first)
+
+        pd.DataFrame({"client_id": [1, 2, 3], "usage_date": ["2026-01-01", "2026-01-02", "2026-01-03"]}).to_csv(
+            csv_path, index=False)
+        assert len(store.read_csv_cached(str(csv_path), parse_dates=["usage_date"])) == 3
+
+    def test_records_ingested_windows(self, tmp_path):
+        store = ColumnarDataStore(str(tmp_path))
+        store.ingest({"superops_tickets": [_ticket(1, "C-1", "2026-01-05")]},
+                     window=(datetime(2026, 1, 1), datetime(2026, 2, 28)))
+        assert store.covers("superops_tickets", datetime(2026, 1, 10), datetime(2026, 2, 10))
+        assert not store.covers("superops_tickets", datetime(2025, 12, 1), datetime(2026, 2, 10))
+        assert not store.covers("superops_clients", datetime(2026, 1, 10), datetime(2026, 2, 10))
+
+        # Overlapping windows merge; a plain write keeps the recorded coverage
+        store.write("superops_tickets", [_ticket(2, "C-1", "2026-03-05")],
+                    window=(datetime(2026, 2, 15), datetime(2026, 4, 30)))
+        store.write("superops_tickets", [_ticket(3, "C-2", "2026-03-06")])
+        assert store.covers("superops_tickets", datetime(2026, 1, 10), datetime(2026, 4, 1))
+
+
+class TestExtractorColumnarCache:
+    def _extractor(self, tmp_path, start_date, end_date):
+        extractor_module = pytest.importorskip("src.data.ingestion.comprehensive_extractor")
+
+        return extractor_module.ComprehensiveDataExtractor(extractor_module.ExtractionConfig(
+            start_date=start_date, end_date=end_date, include_quickbooks=False,
+            include_internal=False, columnar_cache_path=str(tmp_path)
+        ))
+
+    def _ingest(self, store):
+        store.ingest({
+            "superops_tickets": [_ticket(1, "C-1", "2026-01-05"), _ticket(2, "C-2", "2026-01-07")],
+            "superops_clients": [{"id": "C-1", "name": "Acme"}, {"id": "C-2", "name": "Globex"}],
+        }, window=(datetime(2026, 1, 1), datetime(2026, 3, 31)))
+
+    def test_serves_covered_client_with_string_dates(self, tmp_path):
+        extractor = self._extractor(tmp_path, datetime(2026, 1, 1), datetime(2026, 2, 1))
+        self._ingest(extractor.store)
+
+        cached = extractor._read_client_data_from_cache("C-1")
+        assert [t["id"] for t in cached["superops_tickets"]] == ["T-1"]
+        assert cached["superops_tickets"][0]["created_at"] == "2026-01-05T00:00:00"
+        assert cached["superops_client"]["name"] == "Acme"
+
+    def test_falls_back_for_new_client_or_wider_window(self, tmp_path):
+        extractor = self._extractor(tmp_path, datetime(2026, 1, 1), datetime(2026, 2, 1))
+        self._ingest(extractor.store)
+        assert extractor._read_client_data_from_cache("C-9") == {}
+
+        wider = self._extractor(tmp_path, datetime(2025, 6, 1), datetime(2026, 2, 1))
+        assert wider._read_client_data_from_cache("C-1") == {}
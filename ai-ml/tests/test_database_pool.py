@@ -0,0 +1,98 @@
+import sys
+import asyncio
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import (
+    DatabaseManager,
+    AsyncDatabaseManager,
+    SQLiteConnectionPool,
+    get_connection_pool,
+    close_connection_pools,
+)
+
+
+class TestSQLiteConnectionPool:
+    def teardown_method(self):
+        close_connection_pools()
+
+    def test_wal_mode_and_pragmas(self, tmp_path):
+        pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), pool_size=2)
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert pool.get_stats()["journal_mode"] == "wal"
+        pool.close()
+
+    def test_connections_are_reused(self, tmp_path):
+        pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), pool_size=3)
+        for _ in range(20):
+            with pool.connection() as conn:
+                conn.execute("SELECT 1")
+        stats = pool.get_stats()
+        assert stats["open_connections"] == 1
+        assert stats["idle_connections"] == 1
+        pool.close()
+
+    def test_transaction_rolls_back_on_error(self, tmp_path):
+        pool = SQLiteConnectionPool(str(tmp_path / "pool.db"))
+        with pool.transaction() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+        try:
+            with pool.transaction() as conn:
+                conn.execute("INSERT INTO t VALUES (1)")
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        pool.close()
+
+    def test_managers_share_pool_per_file(self, tmp_path):
+        db_path = str(tmp_path / "shared.db")
+        sync_manager = DatabaseManager(db_path)
+        async_manager = AsyncDatabaseManager(db_path)
+        assert sync_manager._pool is async_manager._pool
+        assert get_connection_pool(db_path) is sync_manager._pool
+
+
+class TestPooledDatabaseManager:
+    def teardown_method(self):
+        close_connection_pools()
+
+    def test_concurrent_writes(self, tmp_path):
+        manager = DatabaseManager(str(tmp_path / "concurrent.db"))
+        manager.initialize_tables()
+
+        def write(i):
+            return manager.save_historical_prediction({
+                "id": f"pred_{i}",
+                "model_name": "client_churn",
+                "prediction": i / 100,
+            })
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(executor.map(write, range(100)))
+
+        assert len(set(ids)) == 100
+        assert len(manager.get_historical_predictions("client_churn", limit=1000)) == 100
+        assert manager._pool.get_stats()["open_connections"] <= manager._pool.pool_size
+
+    def test_update_missing_row_reports_no_change(self, tmp_path):
+        manager = DatabaseManager(str(tmp_path / "updates.db"))
+        manager.initialize_tables()
+        run_id = manager.create_scheduled_run({"model_name": "m", "schedule": "0 * * * *"})
+
+        assert manager.update_scheduled_run(run_id, {"model_name": "renamed"}) is True
+        # Persistent connections must not report changes from earlier statements
+        assert manager.update_scheduled_run("missing", {"model_name": "x"}) is False
+        assert manager.delete_scheduled_run("missing") is False
+        assert manager.delete_scheduled_run(run_id) is True
+
+    def test_async_initialize_tables(self, tmp_path):
+        db_path = str(tmp_path / "async.db")
+        asyncio.run(AsyncDatabaseManager(db_path).initialize_tables())
+        manager = DatabaseManager(db_path)
+        assert manager.get_scheduled_runs() == []
@@ -0,0 +1,102 @@
+import sys
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import DatabaseManager
+from src.utils.drift_monitor import DriftMonitor, FeatureSketch
+
+
+def _monitor():
+    return DriftMonitor(reference_size=500, window_size=500, n_bins=10, psi_threshold=0.2, ks_threshold=0.2)
+
+
+def _feed(monitor, n, mean, rng, model_name="client_churn"):
+    for _ in range(n):
+        value = rng.gauss(mean, 1.0)
+        monitor.observe(model_name, {"contract_value": value, "client_id": "C-1"}, prediction=value / 10)
+
+
+class TestFeatureSketch:
+    def test_reference_fixed_after_warmup(self):
+        sketch = FeatureSketch(reference_size=100, window_size=100, n_bins=10)
+        for i in range(99):
+            sketch.add(float(i))
+        assert sketch.edges is None
+        sketch.add(99.0)
+        assert len(sketch.edges) == 9
+        assert sum(sketch.reference_counts) == 100
+
+    def test_current_window_slides(self):
+        sketch = FeatureSketch(reference_size=10, window_size=100, n_bins=5, n_segments=10)
+        for i in range(10):
+            sketch.add(float(i))
+        for i in range(1000):
+            sketch.add(float(i % 10))
+        assert 100 <= sketch.current_moments.count <= 110
+        assert sum(sketch.current_counts) == sketch.current_moments.count
+
+    def test_constant_feature_detects_change(self):
+        sketch = FeatureSketch(reference_size=50, window_size=50, n_bins=10)
+        for _ in range(100):
+            sketch.add(1.0)
+        assert sketch.scores()["psi"] < 0.01
+        for _ in range(60):
+            sketch.add(5.0)
+        assert sketch.scores()["ks_statistic"] > 0.9
+
+
+class TestDriftMonitor:
+    def test_no_data_and_reference_collection(self):
+        monitor = _monitor()
+        assert monitor.get_drift("client_churn")["status"] == "no_data"
+        _feed(monitor, 100, 0.0, random.Random(1))
+        drift = monitor.get_drift("client_churn")
+        assert drift["status"] == "collecting_reference"
+        assert drift["features_warming_up"] == ["contract_value"]
+
+    def test_stable_distribution_has_no_drift(self):
+        monitor = _monitor()
+        rng = random.Random(2)
+        _feed(monitor, 1500, 0.0, rng)
+        drift = monitor.get_drift("client_churn")
+        assert drift["status"] == "analyzed"
+        assert not drift["data_drift_detected"]
+        assert drift["feature_scores"]["contract_value"]["psi"] < 0.1
+        assert "client_id" not in drift["feature_scores"]
+
+    def test_shifted_distribution_is_detected(self):
+        monitor = _monitor()
+        rng = random.Random(3)
+        _feed(monitor, 500, 0.0, rng)
+        _feed(monitor, 500, 1.5, rng)
+        drift = monitor.get_drift("client_churn")
+        assert drift["data_drift_detected"]
+        assert drift["concept_drift_detected"]
+        assert drift["drifted_features"] == ["contract_value"]
+        scores = drift["feature_scores"]["contract_value"]
+        assert scores["psi"] > 0.25 and scores["ks_statistic"] > 0.4 and scores["js_divergence"] > 0.05
+        assert drift["severity"] == "high"
+
+    def test_reset_reference_accepts_new_distribution(self):
+        monitor = _monitor()
+        rng = random.Random(4)
+        _feed(monitor, 500, 0.0, rng)
+        _feed(monitor, 500, 1.5, rng)
+        assert monitor.reset_reference("client_churn") == 2
+        _feed(monitor, 500, 1.5, rng)
+        assert not monitor.get_drift("client_churn")["data_drift_detected"]
+
+    def test_drift_report_round_trip(self, tmp_path):
+        db = DatabaseManager(str(tmp_path / "drift.db"))
+        db.initialize_tables()
+        monitor = _monitor()
+        rng = random.Random(5)
+        _feed(monitor, 500, 0.0, rng)
+        _feed(monitor, 500, 2.0, rng)
+
+        report_id = db.save_drift_report(monitor.get_drift("client_churn"))
+        reports = db.get_drift_reports("client_churn", days=1)
+        assert [r["id"] for r in reports] == [report_id]
+        assert reports[0]["severity"] == "high"
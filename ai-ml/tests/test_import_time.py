@@ -0,0 +1,47 @@
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.lazy_imports import LazyModule, lazy_import, module_available
+from scripts.report_import_time import HEAVY_MODULES
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def _modules_loaded_by(statement):
+    """Run a statement in a fresh interpreter and return the top-level packages it loaded."""
+    code = f"{statement}\nimport sys, json\nprint(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.environ.get("PYTHONPATH")]))),
+    )
+    assert result.returncode == 0, result.stderr
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+class TestLazyImports:
+    def test_api_import_does_not_load_heavy_ml_libraries(self):
+        loaded = _modules_loaded_by("import src.api.main")
+        assert not loaded & set(HEAVY_MODULES)
+
+    def test_model_module_defers_tensorflow(self):
+        loaded = _modules_loaded_by("import src.models.anomaly_detector.anomaly_models")
+        assert "tensorflow" not in loaded
+
+    def test_lazy_module_imports_on_first_attribute(self):
+        module = lazy_import("json")
+        assert isinstance(module, LazyModule)
+        assert "not loaded" in repr(module)
+        assert module.dumps({"a": 1}) == '{"a": 1}'
+        assert "not loaded" not in repr(module)
+
+    def test_missing_package_raises_like_import(self):
+        assert not module_available("definitely_not_installed_pkg")
+        with pytest.raises(ModuleNotFoundError):
+            lazy_import("definitely_not_installed_pkg.sub")
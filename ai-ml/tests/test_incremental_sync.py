@@ -0,0 +1,137 @@
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.ingestion.superops_client import SuperOpsClient, SuperOpsConfig, AdaptiveRateLimiter
+from src.data.ingestion.incremental_sync import IncrementalSyncEngine
+
+
+def _ticket(i, updated_at):
+    return {"id": f"T-{i}", "title": f"Ticket {i}", "created_date": "2026-01-01T00:00:00",
+            "updated_at": updated_at, "client": {"id": "C-1", "name": "Client 1"}}
+
+
+class FakeTicketApi:
+    """Serves limit/offset pages of an in-memory ticket list, filtered by updated_after"""
+
+    def __init__(self, tickets, report_total=True):
+        self.tickets = tickets
+        self.report_total = report_total
+        self.requests = []
+
+    async def __call__(self, method, endpoint, params=None, **kwargs):
+        self.requests.append(dict(params))
+        matching = [t for t in self.tickets
+                    if "updated_after" not in params or t["updated_at"] > params["updated_after"]]
+        page = matching[params["offset"]:params["offset"] + params["limit"]]
+        data = {"tickets": page}
+        if self.report_total:
+            data["total"] = len(matching)
+        return data
+
+
+def _client(api, page_size=10):
+    client = SuperOpsClient(SuperOpsConfig(base_url="http://superops.test", api_key="key",
+                                           tenant_id="tenant", page_size=page_size))
+    client._make_request = api
+    return client
+
+
+class TestPagination:
+    def test_fetches_every_page_with_total(self):
+        api = FakeTicketApi([_ticket(i, "2026-01-01T00:00:00+00:00") for i in range(95)])
+        records = asyncio.run(_client(api).fetch_all_pages("tickets"))
+        assert len(records) == 95
+        assert sorted(r["offset"] for r in api.requests) == list(range(0, 100, 10))
+
+    def test_fetches_waves_without_total(self):
+        api = FakeTicketApi([_ticket(i, "2026-01-01T00:00:00+00:00") for i in range(123)], report_total=False)
+        records = asyncio.run(_client(api).fetch_all_pages("tickets"))
+        assert [r["id"] for r in records] == [f"T-{i}" for i in range(123)]
+
+    def test_get_tickets_fetch_all(self):
+        api = FakeTicketApi([_ticket(i, "2026-01-01T00:00:00+00:00") for i in range(25)])
+        tickets = asyncio.run(_client(api).get_tickets(fetch_all=True))
+        assert len(tickets) == 25
+        assert tickets[0].client_id == "C-1"
+
+
+class TestIncrementalSync:
+    def test_second_sync_fetches_only_changed_records(self, tmp_path):
+        tickets = [_ticket(i, "2026-01-01T00:00:00+00:00") for i in range(40)]
+        api = FakeTicketApi(tickets)
+        engine = IncrementalSyncEngine(_client(api), state_path=str(tmp_path / "state.json"), overlap_seconds=0)
+
+        first = asyncio.run(engine.sync("tickets"))
+        assert first.success and first.full_sync
+        assert len(first.records) == 40
+        assert "updated_after" not in api.requests[0]
+
+        tickets.append(_ticket(40, "2999-01-01T00:00:00+00:00"))
+        second = asyncio.run(engine.sync("tickets"))
+        assert second.success and not second.full_sync
+        assert second.previous_high_water_mark == first.high_water_mark
+        assert [t.id for t in second.records] == ["T-40"]
+
+    def test_failed_sync_keeps_high_water_mark(self, tmp_path):
+        api = FakeTicketApi([_ticket(0, "2026-01-01T00:00:00+00:00")])
+        engine = IncrementalSyncEngine(_client(api), state_path=str(tmp_path / "state.json"))
+        first = asyncio.run(engine.sync("tickets"))
+
+        async def failing(*args, **kwargs):
+            raise ConnectionError("network down")
+
+        engine.client._make_request = failing
+        second = asyncio.run(engine.sync("tickets"))
+        assert not second.success
+        assert engine.state.get_high_water_mark("tickets") == first.high_water_mark
+
+
+class ShiftingTicketApi(FakeTicketApi):
+    """Drops a record from the result set after serving the first page, as an update mid-sync would"""
+
+    def __init__(self, tickets, drops=1):
+        super().__init__(tickets)
+        self.drops = drops
+
+    async def __call__(self, method, endpoint, params=None, **kwargs):
+        data = await super().__call__(method, endpoint, params, **kwargs)
+        if params["offset"] == 0 and self.drops:
+            self.drops -= 1
+            self.tickets.pop(3)
+        return data
+
+
+class TestPaginationGaps:
+    def test_skipped_record_is_refetched(self, tmp_path):
+        api = ShiftingTicketApi([_ticket(i, "2026-01-01T00:00:00+00:00") for i in range(40)])
+        engine = IncrementalSyncEngine(_client(api), state_path=str(tmp_path / "state.json"))
+
+        result = asyncio.run(engine.sync("tickets"))
+        assert result.success
+        # T-10 shifted onto the first page's offsets after T-3 left the window
+        assert "T-10" in {t.id for t in result.records}
+        assert len(result.records) == 39
+        assert [r["offset"] for r in api.requests].count(0) == 2
+
+    def test_persistent_gap_keeps_high_water_mark(self, tmp_path):
+        api = ShiftingTicketApi([_ticket(i, "2026-01-01T00:00:00+00:00") for i in range(40)], drops=10)
+        engine = IncrementalSyncEngine(_client(api), state_path=str(tmp_path / "state.json"), gap_retries=1)
+
+        result = asyncio.run(engine.sync("tickets"))
+        assert not result.success
+        assert engine.state.get_high_water_mark("tickets") is None
+
+
+class TestAdaptiveRateLimiter:
+    def test_pauses_only_when_quota_nearly_spent(self):
+        limiter = AdaptiveRateLimiter(reserve=5)
+        limiter.update({"X-RateLimit-Remaining": "500", "X-RateLimit-Reset": "30"})
+        assert limiter._resume_at == 0.0
+
+        limiter.update({"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": "2"})
+        assert limiter._resume_at > 0.0
+        assert limiter.retry_delay({"Retry-After": "7"}, default=1) == 7.0
+        assert limiter.retry_delay({}, default=4) == 4
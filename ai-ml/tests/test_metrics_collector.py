@@ -0,0 +1,100 @@
+import sys
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.metrics_collector import MetricsCollector, RingBuffer, RollupSeries
+
+
+class TestRingBuffer:
+    def test_overwrites_oldest_rows(self):
+        ring = RingBuffer(4, {"value": np.float64})
+        for i in range(10):
+            ring.append(float(i), value=i * 10.0)
+        idx = ring.indices()
+        assert len(ring) == 4
+        assert ring.times[idx].tolist() == [6.0, 7.0, 8.0, 9.0]
+        assert ring.columns["value"][ring.latest()] == 90.0
+
+    def test_range_search_across_wraparound(self):
+        ring = RingBuffer(5, {"value": np.float64})
+        for i in range(8):
+            ring.append(float(i), value=float(i))
+        assert ring.times[ring.indices(4.0, 6.0)].tolist() == [4.0, 5.0, 6.0]
+        assert ring.times[ring.indices(6.5)].tolist() == [7.0]
+        assert len(ring.indices(100.0)) == 0
+
+
+class TestRollupSeries:
+    def test_buckets_close_with_exact_stats(self):
+        rollup = RollupSeries(60, 10)
+        for second in range(120):
+            rollup.add(float(second), float(second % 60))
+        buckets = rollup.query()
+        assert [b["count"] for b in buckets] == [60, 60]
+        assert buckets[0]["min"] == 0.0 and buckets[0]["max"] == 59.0
+        assert buckets[0]["avg"] == 29.5
+        assert buckets[0]["p95"] == np.percentile(np.arange(60.0), 95)
+
+    def test_p95_is_sampled_beyond_reservoir(self):
+        rollup = RollupSeries(3600, 10, reservoir_size=128, random_state=0)
+        values = np.random.default_rng(0).uniform(0, 100, 5000)
+        for i, value in enumerate(values):
+            rollup.add(float(i) / 10, value)
+        bucket = rollup.query()[0]
+        assert bucket["count"] == 5000
+        assert abs(bucket["p95"] - 95.0) < 5.0
+
+
+class TestMetricsCollector:
+    def test_keeps_last_points_and_rollups(self):
+        collector = MetricsCollector(max_points=50)
+        now = datetime.now()
+
+        async def run():
+            for i in range(200):
+                await collector.record_metric("api.latency", float(i), timestamp=now - timedelta(seconds=200 - i))
+            return (await collector.get_metrics("api.latency"),
+                    await collector.get_rollups("api.latency", "1h"),
+                    await collector.get_summary_stats())
+
+        metrics, rollups, summary = asyncio.run(run())
+        assert metrics["count"] == 50
+        assert metrics["points"][-1]["value"] == 199.0
+        assert sum(b["count"] for b in rollups["buckets"]) == 200
+        assert summary["api.latency"]["min"] == 150.0
+        assert summary["api.latency"]["latest"] == 199.0
+
+    def test_time_range_filters_points(self):
+        collector = MetricsCollector()
+        now = datetime.now()
+
+        async def run():
+            await collector.record_model_metric("churn", "latency", 1.0, timestamp=now - timedelta(hours=3))
+            await collector.record_model_metric("churn", "latency", 2.0, timestamp=now - timedelta(minutes=5))
+            return (await collector.get_metrics("model.churn.latency", "1h"),
+                    await collector.get_model_metrics("churn", "24h"))
+
+        recent, model_metrics = asyncio.run(run())
+        assert [p["value"] for p in recent["points"]] == [2.0]
+        assert model_metrics["model.churn.latency"]["count"] == 2
+
+    def test_rejects_out_of_order_points(self):
+        collector = MetricsCollector()
+        now = datetime.now()
+
+        async def run():
+            await collector.record_metric("api.latency", 1.0, timestamp=now)
+            await collector.record_metric("api.latency", 2.0, timestamp=now - timedelta(minutes=10))
+            await collector.record_metric("api.latency", 3.0, timestamp=now)
+            return (await collector.get_metrics("api.latency"),
+                    await collector.get_rollups("api.latency", "1h"))
+
+        metrics, rollups = asyncio.run(run())
+        assert [p["value"] for p in metrics["points"]] == [1.0, 3.0]
+        assert sum(b["count"] for b in rollups["buckets"]) == 2
+        assert collector.metrics_store["api.latency"].rejected_points == 1
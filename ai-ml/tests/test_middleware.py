@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.api.middleware.auth import AuthMiddleware
+from src.api.middleware.error_handler import ErrorHandlerMiddleware
+from src.api.middleware.logging import LoggingMiddleware
+from src.api.middleware.metrics import MetricsMiddleware
+from src.api.middleware.ratelimit import RateLimitMiddleware, InMemoryRateLimitBackend
+
+AUTH = {"Authorization": "Bearer admin_key"}
+
+
+def _client(ip_requests_per_minute=100):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("model exploded")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i};"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.post("/echo")
+    async def echo(payload: dict):
+        return payload
+
+    # Same order as src/api/main.py (last added is outermost)
+    app.add_middleware(AuthMiddleware)
+    app.add_middleware(RateLimitMiddleware, ip_requests_per_minute=ip_requests_per_minute,
+                       backend=InMemoryRateLimitBackend())
+    app.add_middleware(LoggingMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(ErrorHandlerMiddleware)
+    return TestClient(app)
+
+
+class TestMiddlewareStack:
+    def test_successful_request_carries_all_headers(self):
+        response = _client().get("/ping", headers=AUTH)
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+        for header in ("X-Correlation-ID", "X-Processing-Time", "X-Request-Count",
+                       "X-RateLimit-Limit-Minute", "X-RateLimit-Remaining"):
+            assert header in response.headers
+
+    def test_missing_api_key_is_formatted_by_error_handler(self):
+        response = _client().get("/ping")
+        assert response.status_code == 401
+        body = response.json()
+        assert body["message"] == "Missing or invalid API key"
+        assert body["correlation_id"] != "unknown"
+
+    def test_unexpected_exception_becomes_500(self):
+        response = _client().get("/boom", headers=AUTH)
+        assert response.status_code == 500
+        assert response.json()["error"] == "RuntimeError"
+
+    def test_ip_rate_limit_returns_retry_after(self):
+        client = _client(ip_requests_per_minute=2)
+        assert client.get("/ping", headers=AUTH).status_code == 200
+        assert client.get("/ping", headers=AUTH).status_code == 200
+        response = client.get("/ping", headers=AUTH)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+
+    def test_streaming_responses_pass_through(self):
+        with _client().stream("GET", "/stream", headers=AUTH) as response:
+            chunks = list(response.iter_text())
+        assert "".join(chunks) == "chunk-0;chunk-1;chunk-2;"
+        assert "X-Correlation-ID" in response.headers
+
+    def test_request_body_reaches_route(self):
+        response = _client().post("/echo", json={"client_id": "C-1"}, headers=AUTH)
+        assert response.json() == {"client_id": "C-1"}
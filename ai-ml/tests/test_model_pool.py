@@ -0,0 +1,128 @@
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.utils.model_pool import ModelServingPool, ModelNotLoadedError, MODEL_ARTIFACT_DIRS
+
+
+class TestModelServingPool:
+    def test_available_models_match_artifact_dirs(self):
+        pool = ModelServingPool()
+        assert set(pool.model_names) == set(MODEL_ARTIFACT_DIRS.keys())
+
+    def test_engine_loaded_once_and_shared(self):
+        pool = ModelServingPool()
+
+        async def run():
+            first = await pool.get_engine("budget_optimizer")
+            second = await pool.get_engine("budget_optimizer")
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is second
+        stats = pool.get_stats()["models"]["budget_optimizer"]
+        assert stats["request_count"] == 2
+        assert stats["load_time_ms"] >= 0
+
+    def test_concurrent_requests_share_single_load(self):
+        pool = ModelServingPool()
+
+        async def run():
+            return await asyncio.gather(*[pool.get_engine("budget_optimizer") for _ in range(5)])
+
+        engines = asyncio.run(run())
+        assert all(engine is engines[0] for engine in engines)
+        assert pool.get_stats()["loaded_models"] == 1
+
+    def test_unknown_model_raises(self):
+        pool = ModelServingPool()
+        with pytest.raises(KeyError):
+            asyncio.run(pool.get_engine("does_not_exist"))
+
+    def test_churn_inference_path_uses_persisted_models(self):
+        pool = ModelServingPool()
+        if not (pool.models_dir / "churn" / "ensemble.pkl").exists():
+            pytest.skip("Churn artifacts not available")
+
+        engine = asyncio.run(pool.get_engine("client_churn"))
+        assert engine.is_trained
+        predictions = engine.predict_records([
+            {"client_id": "c1", "contract_value": 12000, "avg_satisfaction_score": 4.2},
+            {"client_id": "c2", "contract_value": 3000, "late_payments": 4},
+        ])
+        assert list(predictions["client_id"]) == ["c1", "c2"]
+        assert predictions["churn_probability"].between(0, 1).all()
+        assert pool.get_stats()["models"]["client_churn"]["artifacts_loaded"]
+
+
+class TestInferenceOnlyMode:
+    def test_missing_artifacts_fail_fast(self, tmp_path):
+        pool = ModelServingPool(models_dir=str(tmp_path), inference_only=True)
+        with pytest.raises(ModelNotLoadedError):
+            asyncio.run(pool.get_engine("client_churn"))
+        assert "client_churn" in pool.get_stats()["load_errors"]
+        assert not pool.is_loaded("client_churn")
+
+    def test_missing_artifacts_allowed_when_not_strict(self, tmp_path):
+        pool = ModelServingPool(models_dir=str(tmp_path), inference_only=False)
+        engine = asyncio.run(pool.get_engine("client_churn"))
+        assert not engine.inference_only
+        assert not pool.get_stats()["models"]["client_churn"]["artifacts_loaded"]
+
+    def test_artifact_free_models_load_in_strict_mode(self, tmp_path):
+        pool = ModelServingPool(models_dir=str(tmp_path), inference_only=True)
+        assert asyncio.run(pool.get_engine("budget_optimizer")) is not None
+
+    def test_failed_load_is_cached_until_retry_interval(self, tmp_path):
+        pool = ModelServingPool(models_dir=str(tmp_path), inference_only=True, load_retry_interval=60)
+        calls = []
+
+        async def missing_artifacts(artifact_dir):
+            calls.append(artifact_dir)
+            return object(), False
+
+        pool._loaders["client_churn"] = missing_artifacts
+        for _ in range(3):
+            with pytest.raises(ModelNotLoadedError):
+                asyncio.run(pool.get_engine("client_churn"))
+        assert len(calls) == 1
+
+        # An explicit reload retries straight away
+        with pytest.raises(ModelNotLoadedError):
+            asyncio.run(pool.reload("client_churn"))
+        assert len(calls) == 2
+
+    def test_failed_reload_keeps_serving_engine(self, tmp_path):
+        pool = ModelServingPool(models_dir=str(tmp_path), inference_only=True)
+        engines = iter([(object(), True), (object(), False)])
+
+        async def loader(artifact_dir):
+            return next(engines)
+
+        pool._loaders["client_churn"] = loader
+        first = asyncio.run(pool.get_engine("client_churn"))
+        with pytest.raises(ModelNotLoadedError):
+            asyncio.run(pool.reload("client_churn"))
+        assert asyncio.run(pool.get_engine("client_churn")) is first
+
+    def test_churn_pipeline_refuses_to_train(self):
+        from src.models.churn_predictor.churn_predictor import ChurnPredictor
+
+        predictor = ChurnPredictor(inference_only=True)
+        result = asyncio.run(predictor.run_full_pipeline())
+        assert result["status"] == "model_not_loaded"
+        assert not predictor.is_trained
+
+    def test_demand_analysis_refuses_to_train(self):
+        from src.models.demand_forecaster.demand_forecaster import DemandForecaster
+        from src.models.demand_forecaster.forecasting_models import LSTMForecaster, ARIMAForecaster
+
+        forecaster = DemandForecaster(inference_only=True)
+        forecaster.lstm_forecaster = LSTMForecaster()
+        forecaster.arima_forecaster = ARIMAForecaster()
+        result = asyncio.run(forecaster.run_complete_demand_analysis())
+        assert result["status"] == "model_not_loaded"
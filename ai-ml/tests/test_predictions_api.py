@@ -0,0 +1,144 @@
+import sys
+import asyncio
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.models.schemas import BatchPredictionRequest, ClientChurnPredictionRequest
+from src.api.routes import churn as churn_routes
+from src.api.routes.predictions import _score_batch_records
+from src.utils.model_pool import ModelServingPool
+
+
+class TestBatchInference:
+    def test_churn_ensemble_single_pass_matches_separate_calls(self):
+        pool = ModelServingPool()
+        if not (pool.models_dir / "churn" / "ensemble.pkl").exists():
+            pytest.skip("Churn artifacts not available")
+
+        engine = asyncio.run(pool.get_engine("client_churn"))
+        feature_names = engine.get_model_feature_names()
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.gamma(2.0, 50.0, size=(20, len(feature_names))), columns=feature_names)
+
+        ensemble = engine.models["ensemble"]
+        predictions, probabilities = ensemble.predict_with_proba(X)
+        assert np.array_equal(predictions, ensemble.predict(X))
+        assert np.allclose(probabilities, ensemble.predict_proba(X))
+
+    def test_churn_batch_returns_one_probability_per_client(self):
+        pool = ModelServingPool()
+        if not (pool.models_dir / "churn" / "ensemble.pkl").exists():
+            pytest.skip("Churn artifacts not available")
+
+        engine = asyncio.run(pool.get_engine("client_churn"))
+        records = [
+            {"client_id": f"c{i}", "contract_value": 1000.0 * (i + 1), "late_payments": i % 4}
+            for i in range(50)
+        ]
+        predictions = engine.predict_records(records)
+        assert len(predictions) == len(records)
+        assert list(predictions["client_id"]) == [r["client_id"] for r in records]
+
+    def test_profitability_batch_scores_each_client(self):
+        pool = ModelServingPool()
+        if not (pool.models_dir / "profitability" / "profitability_xgboost_model.pkl").exists():
+            pytest.skip("Profitability artifacts not available")
+
+        engine = asyncio.run(pool.get_engine("client_profitability"))
+        records = [
+            {
+                "client_id": f"c{i}",
+                "contract_value": 50000.0,
+                "total_revenue": 10000.0 * (i + 1),
+                "total_costs": 8000.0 * (i + 1) * (1 - 0.1 * i),
+                "profit": 10000.0 * (i + 1) - 8000.0 * (i + 1) * (1 - 0.1 * i),
+                "profit_margin": 1 - 0.8 * (1 - 0.1 * i),
+                "service_count": i + 1,
+                "total_quantity": 10,
+                "start_date": "2024-01-01",
+                "end_date": "2026-12-31",
+                "contract_type": "annual",
+                "industry": "Finance",
+                "is_active": True,
+            }
+            for i in range(5)
+        ]
+        results = asyncio.run(engine.batch_predict(records))
+        assert len(results) == len(records)
+        assert all(0.0 <= r["prediction"] <= 1.0 for r in results)
+        assert len({r["prediction"] for r in results}) > 1
+
+    def test_empty_batch(self):
+        from src.models.profitability_predictor.profitability_predictor import ProfitabilityPredictor
+
+        assert asyncio.run(ProfitabilityPredictor().batch_predict([])) == []
+
+
+class TestBatchRoute:
+    def test_batch_scoring_runs_off_the_event_loop(self):
+        class Engine:
+            def predict_records(self, records):
+                self.thread = threading.get_ident()
+                return pd.DataFrame({"churn_probability": [0.25] * len(records)})
+
+        engine = Engine()
+
+        async def run():
+            scores = await _score_batch_records(engine, "client_churn", [{"client_id": "c1"}, {"client_id": "c2"}])
+            return scores, threading.get_ident()
+
+        scores, loop_thread = asyncio.run(run())
+        assert scores == [0.25, 0.25]
+        assert engine.thread != loop_thread
+
+
+class TestChurnRoutes:
+    class Engine:
+        def __init__(self):
+            self.threads = []
+
+        def predict_records(self, records):
+            self.threads.append(threading.get_ident())
+            return pd.DataFrame({"client_id": [r.get("client_id") for r in records],
+                                 "churn_probability": [0.8] * len(records)})
+
+    def _serve(self, monkeypatch):
+        engine = self.Engine()
+
+        async def get_serving_engine(model_name):
+            return engine
+
+        monkeypatch.setattr(churn_routes, "get_serving_engine", get_serving_engine)
+        return engine
+
+    def test_single_prediction_runs_off_the_event_loop(self, monkeypatch):
+        engine = self._serve(monkeypatch)
+        request = ClientChurnPredictionRequest(client_id="c1", features={"contract_value": 1000})
+
+        async def run():
+            response = await churn_routes.predict_client_churn(request, model_version=None, return_confidence=False)
+            return response, threading.get_ident()
+
+        response, loop_thread = asyncio.run(run())
+        assert response.churn_probability == 0.8 and response.risk_level == "high"
+        assert engine.threads and engine.threads[0] != loop_thread
+
+    def test_batch_prediction_runs_off_the_event_loop(self, monkeypatch):
+        engine = self._serve(monkeypatch)
+        request = BatchPredictionRequest(data=[
+            {"client_id": f"c{i}", "features": {"contract_value": 1000 * i}} for i in range(3)
+        ])
+
+        async def run():
+            response = await churn_routes.batch_predict_churn(request, model_version=None)
+            return response, threading.get_ident()
+
+        response, loop_thread = asyncio.run(run())
+        assert response.total_predictions == 3
+        assert engine.threads == [engine.threads[0]] and engine.threads[0] != loop_thread
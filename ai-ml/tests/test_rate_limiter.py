@@ -0,0 +1,122 @@
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.api.middleware.ratelimit import (
+    InMemoryRateLimitBackend, RateLimit, RateLimitBackend, RateLimitMiddleware,
+    RedisRateLimitBackend, REDIS_AVAILABLE,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestInMemoryRateLimitBackend:
+    def test_allows_burst_then_refills_at_sustained_rate(self):
+        clock = FakeClock()
+        backend = InMemoryRateLimitBackend(clock=clock)
+        limits = (RateLimit(10, 60),)
+
+        results = [backend.check_now("ip:1", limits) for _ in range(11)]
+        assert all(r.allowed for r in results[:10])
+        assert [r.remaining for r in results[:3]] == [9, 8, 7]
+        assert not results[10].allowed
+        assert abs(results[10].retry_after - 6.0) < 1e-6
+
+        clock.now += 6.0
+        assert backend.check_now("ip:1", limits).allowed
+        assert not backend.check_now("ip:1", limits).allowed
+
+    def test_denied_request_consumes_no_capacity(self):
+        clock = FakeClock()
+        backend = InMemoryRateLimitBackend(clock=clock)
+        limits = (RateLimit(100, 3600), RateLimit(2, 60))
+
+        assert backend.check_now("key", limits).allowed
+        assert backend.check_now("key", limits).allowed
+        for _ in range(5):
+            assert not backend.check_now("key", limits).allowed
+
+        clock.now += 60
+        result = backend.check_now("key", limits)
+        assert result.allowed
+        # Only the three admitted requests count against the hourly limit
+        assert result.remaining == 1
+        assert backend._tats["key"][0] == 1000.0 + 3 * 36.0
+
+    def test_keys_are_independent(self):
+        backend = InMemoryRateLimitBackend(clock=FakeClock())
+        limits = (RateLimit(1, 60),)
+        assert backend.check_now("a", limits).allowed
+        assert not backend.check_now("a", limits).allowed
+        assert backend.check_now("b", limits).allowed
+
+    def test_evicts_only_refilled_keys(self):
+        clock = FakeClock()
+        backend = InMemoryRateLimitBackend(eviction_interval=30, clock=clock)
+        limits = (RateLimit(10, 60),)
+        backend.check_now("idle", limits)
+        clock.now += 20
+        backend.check_now("busy", limits)
+        for _ in range(9):
+            backend.check_now("busy", limits)
+
+        clock.now += 15
+        assert backend.evict_idle() == 1
+        assert len(backend) == 1 and "busy" in backend._tats
+
+    def test_sweeps_periodically_during_checks(self):
+        clock = FakeClock()
+        backend = InMemoryRateLimitBackend(eviction_interval=60, clock=clock)
+        for i in range(1000):
+            backend.check_now(f"ip:{i}", (RateLimit(100, 60),))
+        clock.now += 61
+        backend.check_now("ip:new", (RateLimit(100, 60),))
+        assert len(backend) == 1
+
+
+class TestRateLimitMiddleware:
+    def test_small_hourly_limits_still_allow_requests(self):
+        middleware = RateLimitMiddleware(app=None, backend=InMemoryRateLimitBackend(clock=FakeClock()))
+        result = asyncio.run(middleware._check_api_key_rate_limit("user_key", {"rate_limit": 30}))
+        assert result.allowed
+
+
+class TestRedisRateLimitBackend:
+    def test_backend_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            RateLimitBackend()
+
+    @pytest.mark.skipif(not REDIS_AVAILABLE, reason="redis package not available")
+    def test_circuit_breaker_skips_redis_during_cooldown(self):
+        clock = FakeClock()
+        backend = RedisRateLimitBackend("redis://localhost:6379/0", cooldown=30.0, clock=clock,
+                                        fallback=InMemoryRateLimitBackend(clock=clock))
+        calls = []
+
+        async def unreachable(keys, args):
+            calls.append(keys)
+            raise ConnectionError("Timeout connecting to server")
+
+        backend._script = unreachable
+        limits = (RateLimit(10, 60),)
+
+        async def run():
+            results = [await backend.check("ip:1.2.3.4", limits) for _ in range(3)]
+            clock.now += 31
+            results.append(await backend.check("ip:1.2.3.4", limits))
+            return results
+
+        results = asyncio.run(run())
+        assert all(result.allowed for result in results)
+        # One attempt opens the circuit; the next Redis attempt waits for the cooldown
+        assert len(calls) == 2
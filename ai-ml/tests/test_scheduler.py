@@ -0,0 +1,138 @@
+import sys
+import json
+import time
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import DatabaseManager
+from src.utils.scheduler import ScheduledRunExecutor, count_missed_runs, next_fire_time
+
+NOW = datetime(2026, 10, 16, 12, 30, 0)
+
+
+def _create_run(db, run_id, model_name="client_churn", schedule="0 * * * *",
+                next_run=None, task="record"):
+    db.create_scheduled_run({
+        "id": run_id,
+        "model_name": model_name,
+        "schedule": schedule,
+        "parameters": json.dumps({"task": task}),
+        "next_run": (next_run or NOW - timedelta(minutes=1)).isoformat(),
+    })
+
+
+async def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class TestCronHelpers:
+    def test_next_fire_time_is_strictly_after(self):
+        assert next_fire_time("0 * * * *", NOW) == datetime(2026, 10, 16, 13, 0)
+
+    def test_missed_runs_are_counted_since_due_time(self):
+        first_due = datetime(2026, 10, 16, 10, 0)
+        assert count_missed_runs("0 * * * *", first_due, NOW) == 3
+        assert count_missed_runs("0 * * * *", NOW, NOW) == 1
+
+
+class TestScheduledRunExecutor:
+    def _executor(self, tmp_path, **kwargs):
+        executor = ScheduledRunExecutor(db_path=str(tmp_path / "scheduler.db"), clock=lambda: NOW, **kwargs)
+        executor.db.initialize_tables()
+        return executor
+
+    def test_claim_is_atomic_across_workers(self, tmp_path):
+        db = DatabaseManager(str(tmp_path / "scheduler.db"))
+        db.initialize_tables()
+        _create_run(db, "run_a")
+        due = db.get_due_scheduled_runs(NOW)[0]
+
+        args = ("run_a", due["next_run"], next_fire_time(due["schedule"], NOW).isoformat(), NOW.isoformat())
+        assert db.claim_scheduled_run(*args) is True
+        assert db.claim_scheduled_run(*args) is False
+        assert db.get_due_scheduled_runs(NOW) == []
+
+    def test_missed_runs_coalesce_into_one_execution(self, tmp_path):
+        executor = self._executor(tmp_path)
+        calls = []
+        executor.register_task("record", lambda model, params: calls.append(model) or {"success": True})
+        _create_run(executor.db, "run_a", next_run=datetime(2026, 10, 16, 10, 0))
+
+        async def run():
+            await executor.initialize()
+            await _wait_for(lambda: executor.get_stats()["runs_succeeded"] == 1)
+            await executor.cleanup()
+
+        asyncio.run(run())
+        assert calls == ["client_churn"]
+        stats = executor.get_stats()
+        assert stats["runs_coalesced"] == 2
+        assert stats["recent_runs"][0]["missed_runs"] == 3
+        row = executor.db.get_scheduled_run("run_a")
+        assert row["next_run"] == datetime(2026, 10, 16, 13, 0).isoformat()
+        assert row["last_run"] == NOW.isoformat()
+
+    def test_per_model_concurrency_limit(self, tmp_path):
+        executor = self._executor(tmp_path, max_workers=4, model_concurrency=1)
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def slow(model, params):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return {"success": True}
+
+        executor.register_task("record", slow)
+        for run_id in ("run_a", "run_b", "run_c"):
+            _create_run(executor.db, run_id)
+
+        async def run():
+            await executor.initialize()
+            await _wait_for(lambda: executor.get_stats()["runs_succeeded"] == 3)
+            await executor.cleanup()
+
+        asyncio.run(run())
+        assert active["peak"] == 1
+
+    def test_trigger_while_running_is_coalesced(self, tmp_path):
+        executor = self._executor(tmp_path)
+        release = threading.Event()
+        executor.register_task("record", lambda model, params: release.wait(5) and {"success": True})
+        run = {"id": "run_a", "model_name": "client_churn", "parameters": {"task": "record"}}
+
+        async def run_triggers():
+            first = await executor.trigger(run)
+            second = await executor.trigger(run)
+            release.set()
+            await _wait_for(lambda: executor.get_stats()["runs_succeeded"] == 1)
+            await executor.cleanup()
+            return first, second
+
+        assert asyncio.run(run_triggers()) == (True, False)
+        assert executor.get_stats()["runs_coalesced"] == 1
+
+    def test_notify_picks_up_new_deadlines(self, tmp_path):
+        executor = self._executor(tmp_path, resync_interval=3600)
+        executor.register_task("record", lambda model, params: {"success": True})
+
+        async def run():
+            await executor.initialize()
+            await _wait_for(lambda: executor.is_running)
+            _create_run(executor.db, "run_a")
+            executor.notify()
+            await _wait_for(lambda: executor.get_stats()["runs_succeeded"] == 1)
+            await executor.cleanup()
+
+        asyncio.run(run())